@@ -10,6 +10,7 @@ from alembic import context
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import app.infra.ai.ledger  # noqa: F401
 import app.modules.iam.model  # noqa: F401
 from app.core.config import settings
 from app.core.database import Base
@@ -0,0 +1,52 @@
+"""create ai call ledger
+
+Revision ID: e5f6a1b2c3d4
+Revises: d4e5f6a1b2c3
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a1b2c3d4"
+down_revision: str | None = "d4e5f6a1b2c3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_call_ledger",
+        sa.Column("id", sa.BigInteger(), sa.Identity(start=1), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("request_id", sa.String(64), nullable=True),
+        sa.Column("operation", sa.String(64), nullable=False),
+        sa.Column("tenant_id", sa.BigInteger(), nullable=True),
+        sa.Column("principal_id", sa.BigInteger(), nullable=True),
+        sa.Column("provider", sa.String(64), nullable=True),
+        sa.Column("model", sa.String(128), nullable=True),
+        sa.Column("resolved_provider", sa.String(64), nullable=True),
+        sa.Column("resolved_model", sa.String(128), nullable=True),
+        sa.Column("success", sa.Boolean(), nullable=False),
+        sa.Column("latency_ms", sa.Integer(), nullable=True),
+        sa.Column("attempt_count", sa.Integer(), nullable=True),
+        sa.Column("input_tokens", sa.Integer(), nullable=False),
+        sa.Column("output_tokens", sa.Integer(), nullable=False),
+        sa.Column("total_tokens", sa.Integer(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=True),
+        sa.Column("error_code", sa.String(64), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_ai_call_ledger")),
+    )
+    op.create_index(
+        "ix_ai_call_ledger_tenant_recorded", "ai_call_ledger", ["tenant_id", "recorded_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ai_call_ledger_tenant_recorded", table_name="ai_call_ledger")
+    op.drop_table("ai_call_ledger")
@@ -3,7 +3,9 @@
 from .auth import (
     AuthContext,
     CurrentAuthDep,
+    CurrentWsAuthDep,
     require_auth,
+    require_ws_auth,
 )
 from .config import settings
 from .database import (
@@ -48,8 +50,10 @@ __all__ = [
     "Result",
     "ApiModel",
     "require_auth",
+    "require_ws_auth",
     "AuthContext",
     "CurrentAuthDep",
+    "CurrentWsAuthDep",
     "redis_client",
     "RedisKeyDef",
     "RedisDep",
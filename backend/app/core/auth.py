@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import Depends, Request
+from fastapi import Depends, Request, WebSocket, WebSocketException, status
 from pydantic import Field
 
 from app.core.schema import ApiModel
@@ -48,14 +48,19 @@ async def require_auth(request: Request) -> AuthContext:
         3. Parse AccessSessionPayload → AuthContext
         4. 401 on any failure
     """
-    from app.modules.iam.schemas import AccessSessionPayload
-
     try:
         token = extract_token(request)
     except RuntimeError as exc:
         code: ErrorCode = exc.args[0] if exc.args else CommonErrorCode.UNAUTHORIZED
         raise AuthException(code) from exc
 
+    return await _auth_context_from_token(token)
+
+
+async def _auth_context_from_token(token: str) -> AuthContext:
+    """Resolve an opaque access token to its AuthContext; 401 when unknown."""
+    from app.modules.iam.schemas import AccessSessionPayload
+
     token_hash = hash_token(token)
     raw = await redis_client.get(_access_session_key(token_hash))
     if not raw:
@@ -76,4 +81,38 @@ async def require_auth(request: Request) -> AuthContext:
     )
 
 
+WS_BEARER_PROTOCOL_PREFIX = "bearer."
+
+
+async def require_ws_auth(websocket: WebSocket) -> AuthContext:
+    """WebSocket dependency: validate the access token before the handshake completes.
+
+    Browsers cannot set headers on a WebSocket, so besides ``Authorization`` the
+    token may be offered as a ``bearer.<token>`` subprotocol. Failures close the
+    handshake with policy-violation code 1008.
+    """
+    auth = websocket.headers.get("authorization")
+    token = ""
+    if auth:
+        scheme, _, token = auth.partition(" ")
+        if scheme.lower() != "bearer":
+            token = ""
+    else:
+        for protocol in websocket.scope.get("subprotocols", []):
+            if protocol.startswith(WS_BEARER_PROTOCOL_PREFIX):
+                token = protocol.removeprefix(WS_BEARER_PROTOCOL_PREFIX)
+                break
+    if not token:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason=CommonErrorCode.UNAUTHORIZED.error_msg
+        )
+    try:
+        return await _auth_context_from_token(token)
+    except AuthException as exc:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason=CommonErrorCode.TOKEN_INVALID.error_msg
+        ) from exc
+
+
 CurrentAuthDep = Annotated[AuthContext, Depends(require_auth)]
+CurrentWsAuthDep = Annotated[AuthContext, Depends(require_ws_auth)]
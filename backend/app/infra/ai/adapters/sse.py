@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..stream import AIStreamEvent
 
 
 async def parse_sse_messages(lines: AsyncIterator[str]) -> AsyncIterator[str]:
@@ -32,14 +36,48 @@ async def parse_sse_messages(lines: AsyncIterator[str]) -> AsyncIterator[str]:
         yield "\n".join(buffer)
 
 
-def encode_sse_event(event_name: str, payload: str) -> bytes:
+def encode_sse_event(
+    event_name: str, payload: str | bytes, *, event_id: str | None = None
+) -> bytes:
     """Encode one logical event payload into SSE wire format.
 
     Args:
         event_name: Logical SSE event name.
-        payload: Serialized event payload.
+        payload: Serialized single-line event payload.
+        event_id: Optional event id that clients echo back as ``Last-Event-ID``.
+
+    Returns:
+        Bytes ready to be written to an SSE response body.
+    """
+    data = payload if isinstance(payload, bytes) else payload.encode()
+    prefix = f"id: {event_id}\nevent: {event_name}\n" if event_id else f"event: {event_name}\n"
+    return b"".join((prefix.encode(), b"data: ", data, b"\n\n"))
+
+
+def encode_stream_event(event: AIStreamEvent, *, event_id: str | None = None) -> bytes:
+    """Serialize one SDK stream event straight to SSE bytes.
+
+    The pydantic-core serializer writes camelCase JSON bytes directly, skipping the
+    intermediate ``dict`` and ``str`` that ``model_dump_json`` would build.
+
+    Args:
+        event: SDK stream event.
+        event_id: Optional event id that clients echo back as ``Last-Event-ID``.
+
+    Returns:
+        Bytes ready to be written to an SSE response body.
+    """
+    payload = event.__pydantic_serializer__.to_json(event, by_alias=True)
+    return encode_sse_event(event.event, payload, event_id=event_id)
+
+
+def encode_sse_comment(text: str = "") -> bytes:
+    """Encode an SSE comment line, used as a heartbeat that clients ignore.
+
+    Args:
+        text: Optional single-line comment text.
 
     Returns:
         Bytes ready to be written to an SSE response body.
     """
-    return f"event: {event_name}\ndata: {payload}\n\n".encode()
+    return f": {text}\n\n".encode()
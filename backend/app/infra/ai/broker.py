@@ -0,0 +1,313 @@
+"""Resumable, multi-subscriber text streams buffered in Redis Streams.
+
+A generation is produced once by a background task that appends every normalized
+stream event to a capped Redis Stream keyed by generation id. Any number of
+subscribers read that stream from an arbitrary entry id, so a page refresh or a
+second tab resumes where it left off instead of re-running the generation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Annotated
+from uuid import uuid4
+
+from fastapi import Depends
+
+from app.core import log, redis_client
+
+from .exceptions import AIError
+from .stream import AnyAIStreamEvent
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+    from .config import AIStreamBrokerSettings
+
+_TERMINAL_EVENTS = frozenset({"done", "error"})
+_ENTRY_ID = re.compile(r"\d+-\d+")
+
+
+@dataclass(frozen=True, slots=True)
+class BrokeredEvent:
+    """Carry one stored stream event and its Redis Stream entry id."""
+
+    entry_id: str
+    event: str
+    data: str
+
+    @property
+    def terminal(self) -> bool:
+        """Return whether this event ends the generation.
+
+        Args:
+            None.
+
+        Returns:
+            ``True`` for ``done`` and ``error`` events.
+        """
+        return self.event in _TERMINAL_EVENTS
+
+
+class StreamBroker:
+    """Run each generation once and fan its events out through Redis Streams."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        key_prefix: str = "ello:ai:stream",
+        max_len: int = 4096,
+        ttl_s: int = 900,
+        block_ms: int = 5000,
+    ) -> None:
+        """Configure the broker.
+
+        Args:
+            redis: Async Redis client created with ``decode_responses=True``.
+            key_prefix: Prefix of the per-generation stream and owner keys.
+            max_len: Approximate maximum number of entries kept per stream.
+            ttl_s: Lifetime of a stream after its last write, in seconds.
+            block_ms: Longest single ``XREAD`` wait before re-checking expiry.
+
+        Returns:
+            None.
+        """
+        self._redis = redis
+        self._key_prefix = key_prefix
+        self._max_len = max_len
+        self._ttl_s = ttl_s
+        self._block_ms = block_ms
+        self._producers: set[asyncio.Task[None]] = set()
+
+    async def publish(self, events: AsyncIterator[AnyAIStreamEvent], *, owner: str) -> str:
+        """Start producing one generation in the background.
+
+        The producer task is not tied to any HTTP request, so the upstream provider
+        stream keeps running when subscribers come and go.
+
+        Args:
+            events: SDK stream events, typically ``ai_client.text.stream(...)``.
+            owner: Opaque owner tag checked before a subscriber may resume.
+
+        Returns:
+            The generation id used to subscribe.
+        """
+        generation_id = uuid4().hex
+        await self._redis.set(self._owner_key(generation_id), owner, ex=self._ttl_s)
+        task = asyncio.create_task(
+            self._produce(generation_id, events), name=f"ai-stream-{generation_id}"
+        )
+        self._producers.add(task)
+        task.add_done_callback(self._producers.discard)
+        return generation_id
+
+    async def owner_of(self, generation_id: str) -> str | None:
+        """Read the owner tag of a generation.
+
+        Args:
+            generation_id: Generation id returned by :meth:`publish`.
+
+        Returns:
+            The owner tag, or ``None`` when the generation is unknown or expired.
+        """
+        return await self._redis.get(self._owner_key(generation_id))
+
+    async def subscribe(
+        self, generation_id: str, *, last_event_id: str | None = None
+    ) -> AsyncIterator[BrokeredEvent]:
+        """Replay and then follow a generation from an entry id.
+
+        Args:
+            generation_id: Generation id returned by :meth:`publish`.
+            last_event_id: Last entry id the client saw; ``None`` or a value that is
+                not a Redis Stream entry id replays from the start.
+
+        Returns:
+            An async iterator of stored events that ends after the terminal event
+            or when the stream expires.
+        """
+        key = self._stream_key(generation_id)
+        # The id comes straight from a client header, so never hand XREAD anything
+        # but a well-formed entry id.
+        if last_event_id and _ENTRY_ID.fullmatch(last_event_id):
+            cursor = last_event_id
+        else:
+            cursor = "0-0"
+        while True:
+            batches = await self._redis.xread({key: cursor}, count=256, block=self._block_ms)
+            if not batches:
+                # The owner key exists from publish() on, so a missing stream only
+                # means "no events yet" until both keys have expired.
+                if not await self._redis.exists(key, self._owner_key(generation_id)):
+                    return
+                continue
+            for entry_id, fields in batches[0][1]:
+                cursor = entry_id
+                event = BrokeredEvent(entry_id=entry_id, event=fields["event"], data=fields["data"])
+                yield event
+                if event.terminal:
+                    return
+
+    async def aclose(self) -> None:
+        """Cancel running producers during shutdown.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        for task in list(self._producers):
+            task.cancel()
+        if self._producers:
+            await asyncio.gather(*self._producers, return_exceptions=True)
+
+    async def _produce(self, generation_id: str, events: AsyncIterator[AnyAIStreamEvent]) -> None:
+        """Append every event of one generation to its stream.
+
+        The SDK stream is closed when this task ends for any reason, so the
+        provider call never outlives its producer. A failure is recorded as a
+        terminal ``error`` event when Redis still accepts it, and only logged
+        otherwise.
+
+        Args:
+            generation_id: Generation id.
+            events: SDK stream events.
+
+        Returns:
+            None.
+        """
+        try:
+            async with aclosing(events) as stream:
+                async for event in stream:
+                    payload = event.__pydantic_serializer__.to_json(event, by_alias=True)
+                    await self._append(generation_id, event.event, payload.decode())
+            return
+        except AIError as exc:
+            # Routing and validation failures surface before the SDK emits a terminal event.
+            error = exc.to_payload()
+        except Exception as exc:
+            log.exception(f"AI stream producer {generation_id} failed: {exc}")
+            error = AIError("Stream producer failed").to_payload()
+        try:
+            await self._append(generation_id, "error", error.model_dump_json(by_alias=True))
+        except Exception as exc:
+            log.warning(f"Could not record the error of AI stream {generation_id}: {exc!r}")
+
+    async def _append(self, generation_id: str, event_name: str, data: str) -> None:
+        """Append one event and refresh the stream and owner lifetimes in one round-trip.
+
+        Args:
+            generation_id: Generation id.
+            event_name: Stream event name.
+            data: Serialized event JSON.
+
+        Returns:
+            None.
+        """
+        key = self._stream_key(generation_id)
+        pipeline = self._redis.pipeline(transaction=False)
+        pipeline.xadd(
+            key,
+            {"event": event_name, "data": data},
+            maxlen=self._max_len,
+            approximate=True,
+        )
+        pipeline.expire(key, self._ttl_s)
+        pipeline.expire(self._owner_key(generation_id), self._ttl_s)
+        await pipeline.execute()
+
+    def _stream_key(self, generation_id: str) -> str:
+        """Build the Redis Stream key of a generation.
+
+        Args:
+            generation_id: Generation id.
+
+        Returns:
+            The stream key.
+        """
+        return f"{self._key_prefix}:{generation_id}"
+
+    def _owner_key(self, generation_id: str) -> str:
+        """Build the owner tag key of a generation.
+
+        Args:
+            generation_id: Generation id.
+
+        Returns:
+            The owner key.
+        """
+        return f"{self._key_prefix}:{generation_id}:owner"
+
+
+def create_stream_broker(broker_settings: AIStreamBrokerSettings) -> StreamBroker | None:
+    """Create a broker from settings when it is enabled.
+
+    Args:
+        broker_settings: Stream broker settings.
+
+    Returns:
+        The configured broker, or ``None`` when disabled.
+    """
+    if not broker_settings.enabled:
+        return None
+    return StreamBroker(
+        redis_client,
+        key_prefix=broker_settings.key_prefix,
+        max_len=broker_settings.max_len,
+        ttl_s=broker_settings.ttl_s,
+        block_ms=broker_settings.block_ms,
+    )
+
+
+@lru_cache
+def get_stream_broker() -> StreamBroker | None:
+    """Return the process-wide stream broker.
+
+    Args:
+        None.
+
+    Returns:
+        The shared broker, or ``None`` when resumable streams are disabled.
+    """
+    from .client import get_ai_client
+
+    return create_stream_broker(get_ai_client().settings.stream_broker)
+
+
+async def close_stream_broker() -> None:
+    """Stop the shared broker's producers and clear the cache.
+
+    Args:
+        None.
+
+    Returns:
+        None.
+    """
+    if get_stream_broker.cache_info().currsize == 0:
+        return
+    broker = get_stream_broker()
+    if broker is not None:
+        await broker.aclose()
+    get_stream_broker.cache_clear()
+
+
+def get_stream_broker_dependency() -> StreamBroker | None:
+    """FastAPI dependency wrapper for the shared stream broker.
+
+    Args:
+        None.
+
+    Returns:
+        The shared broker, or ``None`` when disabled.
+    """
+    return get_stream_broker()
+
+
+StreamBrokerDep = Annotated[StreamBroker | None, Depends(get_stream_broker_dependency)]
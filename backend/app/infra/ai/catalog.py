@@ -0,0 +1,288 @@
+"""Declarative model catalog loading and hot-reload for the internal AI SDK."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pydantic import Field, ValidationError, model_validator
+
+from app.core import ApiModel, log
+
+from .exceptions import AIConfigError
+from .requests import (
+    AIRequest,
+    AudioGenerateRequest,
+    EmbeddingRequest,
+    ImageGenerateRequest,
+    TextGenerateRequest,
+)
+from .types import AICapability, AIModality, ModelPricing, ModelSpec
+
+if TYPE_CHECKING:
+    from .registry import ModelRegistry
+
+_REQUEST_TYPES: dict[AICapability, type[AIRequest]] = {
+    AICapability.TEXT_GENERATION: TextGenerateRequest,
+    AICapability.EMBEDDING: EmbeddingRequest,
+    AICapability.IMAGE_GENERATION: ImageGenerateRequest,
+    AICapability.AUDIO_GENERATION: AudioGenerateRequest,
+}
+
+
+class CatalogPricing(ApiModel):
+    """Describe list prices for one catalog entry."""
+
+    input_per_million_usd: float = 0.0
+    output_per_million_usd: float = 0.0
+
+
+class CatalogModelEntry(ApiModel):
+    """Describe one model in a catalog file."""
+
+    provider: str
+    model_id: str
+    alias: str | None = None
+    aliases: list[str] = Field(default_factory=list)
+    capabilities: list[AICapability]
+    input_modalities: list[AIModality] = Field(default_factory=lambda: [AIModality.TEXT])
+    output_modalities: list[AIModality] = Field(default_factory=lambda: [AIModality.TEXT])
+    supports_stream: bool = False
+    supports_json: bool = False
+    supports_vision: bool = False
+    context_window: int | None = None
+    max_output_tokens: int | None = None
+    pricing: CatalogPricing | None = None
+    default_params: dict[str, Any] = Field(default_factory=dict)
+    provider_options: dict[str, Any] = Field(default_factory=dict)
+
+    @model_validator(mode="after")
+    def validate_default_params(self) -> CatalogModelEntry:
+        """Reject defaults that no request of the entry's capabilities accepts.
+
+        Args:
+            None.
+
+        Returns:
+            The validated entry.
+        """
+        request_types = [_REQUEST_TYPES[capability] for capability in self.capabilities]
+        for name, value in self.default_params.items():
+            targets = [
+                request_type for request_type in request_types if name in request_type.model_fields
+            ]
+            if not targets:
+                raise ValueError(f"Default param '{name}' is not a request field of this model")
+            for request_type in targets:
+                # Validate as a field assignment so the field's constraints and
+                # validators apply without building a whole request.
+                request_type.__pydantic_validator__.validate_assignment(
+                    request_type.model_construct(), name, value
+                )
+        return self
+
+    def to_spec(self) -> ModelSpec:
+        """Convert the file entry into an immutable registry spec.
+
+        Args:
+            None.
+
+        Returns:
+            The equivalent model spec.
+        """
+        return ModelSpec(
+            alias=self.alias or f"{self.provider}:{self.model_id}",
+            provider=self.provider,
+            model_id=self.model_id,
+            capabilities=tuple(self.capabilities),
+            input_modalities=tuple(self.input_modalities),
+            output_modalities=tuple(self.output_modalities),
+            supports_stream=self.supports_stream,
+            supports_json=self.supports_json,
+            supports_vision=self.supports_vision,
+            provider_options=dict(self.provider_options),
+            aliases=tuple(self.aliases),
+            context_window=self.context_window,
+            max_output_tokens=self.max_output_tokens,
+            pricing=(
+                ModelPricing(
+                    input_per_million_usd=self.pricing.input_per_million_usd,
+                    output_per_million_usd=self.pricing.output_per_million_usd,
+                )
+                if self.pricing is not None
+                else None
+            ),
+            default_params=dict(self.default_params),
+        )
+
+
+class CatalogDocument(ApiModel):
+    """Describe the top-level catalog file layout."""
+
+    models: list[CatalogModelEntry] = Field(default_factory=list)
+
+
+def load_catalog_file(path: str | os.PathLike[str]) -> tuple[ModelSpec, ...]:
+    """Parse and validate one JSON or YAML catalog file.
+
+    Args:
+        path: Catalog file path; ``.yaml``/``.yml`` files are parsed as YAML.
+
+    Returns:
+        The model specs declared in the file.
+    """
+    catalog_path = Path(path)
+    try:
+        raw_text = catalog_path.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise AIConfigError(f"Unable to read model catalog '{catalog_path}': {exc}") from exc
+
+    if catalog_path.suffix.lower() in {".yaml", ".yml"}:
+        try:
+            import yaml
+        except ImportError as exc:
+            raise AIConfigError("PyYAML is required to load YAML model catalogs") from exc
+        try:
+            payload = yaml.safe_load(raw_text) or {}
+        except yaml.YAMLError as exc:
+            raise AIConfigError(f"Invalid YAML in model catalog '{catalog_path}': {exc}") from exc
+    else:
+        try:
+            payload = json.loads(raw_text)
+        except ValueError as exc:
+            raise AIConfigError(f"Invalid JSON in model catalog '{catalog_path}': {exc}") from exc
+
+    try:
+        document = CatalogDocument.model_validate(payload)
+    except ValidationError as exc:
+        raise AIConfigError(f"Invalid model catalog '{catalog_path}': {exc}") from exc
+    return tuple(entry.to_spec() for entry in document.models)
+
+
+class CatalogWatcher:
+    """Poll a catalog file and atomically swap it into a registry when it changes.
+
+    Parsing and table compilation run in a worker thread; the registry only
+    publishes the new table once it is fully built, so in-flight resolutions keep
+    reading the previous table. A broken file is logged and the previous catalog
+    stays active.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        path: str | os.PathLike[str],
+        *,
+        interval_s: float = 5.0,
+    ) -> None:
+        """Bind the watcher to one registry and catalog file.
+
+        Args:
+            registry: Registry that receives reloaded catalogs.
+            path: Catalog file to watch.
+            interval_s: Polling interval in seconds.
+
+        Returns:
+            None.
+        """
+        self._registry = registry
+        self._path = Path(path)
+        self._interval_s = max(interval_s, 0.1)
+        self._last_mtime_ns = self._stat_mtime_ns()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the polling task on the running event loop.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="ai-catalog-watcher")
+
+    async def stop(self) -> None:
+        """Cancel the polling task and wait for it to exit.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def reload_if_changed(self) -> bool:
+        """Reload the catalog when the file modification time changed.
+
+        Args:
+            None.
+
+        Returns:
+            ``True`` when a new catalog was published.
+        """
+        mtime_ns = await asyncio.to_thread(self._stat_mtime_ns)
+        if mtime_ns is None or mtime_ns == self._last_mtime_ns:
+            return False
+
+        try:
+            await asyncio.to_thread(self._load_and_publish)
+        except AIConfigError as exc:
+            log.warning(f"Keeping previous AI model catalog: {exc.message}")
+            return False
+        finally:
+            # Remember the attempted version so a broken file is not re-parsed every tick.
+            self._last_mtime_ns = mtime_ns
+
+        log.info(f"Reloaded AI model catalog from {self._path}")
+        return True
+
+    async def _run(self) -> None:
+        """Poll the catalog file until cancelled.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        while True:
+            await asyncio.sleep(self._interval_s)
+            await self.reload_if_changed()
+
+    def _load_and_publish(self) -> None:
+        """Parse the catalog and hand it to the registry.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        self._registry.replace_catalog(load_catalog_file(self._path))
+
+    def _stat_mtime_ns(self) -> int | None:
+        """Read the catalog file modification time.
+
+        Args:
+            None.
+
+        Returns:
+            The modification time in nanoseconds, or ``None`` when missing.
+        """
+        try:
+            return self._path.stat().st_mtime_ns
+        except OSError:
+            return None
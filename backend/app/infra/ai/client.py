@@ -4,21 +4,39 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, aclosing, nullcontext
 from functools import lru_cache
 from time import perf_counter
-from typing import Annotated, TypeVar
+from typing import Annotated, Any, TypeVar
 from uuid import uuid4
 
+import httpx
 from fastapi import Depends
 
-from app.core import settings
+from app.core import log, redis_client, settings
+from app.core.database import engine
 
+from .catalog import CatalogWatcher
+from .codec import get_json_codec
+from .compaction import ConversationCompactor, RedisSummaryStore, SummaryStore
 from .config import AISettings
-from .exceptions import AIError, AIRequestCancelledError, AITransportError
+from .decoding import PayloadDecoder
+from .exceptions import (
+    AIError,
+    AIOutputParseError,
+    AIRequestCancelledError,
+    AITimeoutError,
+    AITransportError,
+)
+from .idempotency import IdempotencyStore
+from .json_stream import IncrementalJSONParser
+from .ledger import AILedger, LedgerSink, ParquetLedgerSink, PostgresLedgerSink
 from .providers.anthropic import AnthropicProviderAdapter
 from .providers.base import ProviderAdapter
 from .providers.gemini import GeminiProviderAdapter
+from .providers.mock import LatencyDistribution, MockProfile, MockProviderAdapter
 from .providers.openai import OpenAICompatibleProviderAdapter
+from .quota import QuotaLimit, QuotaReservation, QuotaService, estimate_request_tokens
 from .registry import ModelRegistry, build_default_registry
 from .requests import (
     AIRequest,
@@ -26,28 +44,58 @@ from .requests import (
     EmbeddingRequest,
     ImageGenerateRequest,
     TextGenerateRequest,
+    TextMessage,
 )
 from .responses import (
     AIResponse,
     AudioGenerateResponse,
     EmbeddingResponse,
     ImageGenerateResponse,
+    ImageItemError,
     TextGenerateResponse,
 )
 from .retry import compute_backoff_seconds, should_retry
-from .router import AIRouter
+from .router import AIRouter, apply_model_defaults
+from .scheduler import PRIORITY_CLASSES, FairScheduler, PriorityClass
+from .segmentation import split_sentences
+from .semantic_cache import DiskCacheStore, RedisCacheStore, SemanticCache, SemanticCacheStore
+from .spool import ArtifactSpooler
 from .stream import (
+    AIAudioChunkEvent,
+    AIAudioDoneEvent,
     AIDoneEvent,
+    AIErrorEvent,
+    AIJSONPartialEvent,
     AITextDeltaEvent,
+    AnyAIAudioStreamEvent,
+    AnyAIJSONStreamEvent,
     AnyAIStreamEvent,
     build_error_event,
     set_event_attempt,
 )
 from .telemetry import AITelemetry
-from .types import AICapability, AttemptRecord, ProviderRequestContext, ResolvedModel
+from .timeouts import AdaptiveTimeouts, LatencyStore, RedisLatencyStore
+from .types import (
+    AICapability,
+    AIFinishReason,
+    AIUsage,
+    Artifact,
+    AttemptRecord,
+    ProviderRequestContext,
+    ResolvedModel,
+)
+from .uploads import UploadCache
+from .warmup import ConnectionWarmer, DNSCache, WarmupTarget, build_provider_transport
 
 ResponseT = TypeVar("ResponseT", bound=AIResponse)
 
+_RESPONSE_TYPES: dict[AICapability, type[AIResponse]] = {
+    AICapability.TEXT_GENERATION: TextGenerateResponse,
+    AICapability.EMBEDDING: EmbeddingResponse,
+    AICapability.IMAGE_GENERATION: ImageGenerateResponse,
+    AICapability.AUDIO_GENERATION: AudioGenerateResponse,
+}
+
 
 class TextClient:
     """Expose text generation operations under ``ai_client.text``."""
@@ -83,8 +131,25 @@ class TextClient:
         Returns:
             An async iterator of normalized stream events.
         """
-        async for event in self._owner._stream_text(request):
-            yield event
+        async with aclosing(self._owner._stream_text(request)) as stream:
+            async for event in stream:
+                yield event
+
+    async def stream_json(
+        self, request: TextGenerateRequest
+    ) -> AsyncIterator[AnyAIJSONStreamEvent]:
+        """Stream a JSON generation and emit values as soon as they finish parsing.
+
+        Args:
+            request: Normalized SDK text generation request; ``response_format`` is
+                forced to ``"json"``.
+
+        Returns:
+            An async iterator of stream events interleaved with ``json_partial`` events.
+        """
+        async with aclosing(self._owner._stream_json(request)) as stream:
+            async for event in stream:
+                yield event
 
 
 class EmbeddingClient:
@@ -164,6 +229,22 @@ class AudioClient:
         """
         return await self._owner._generate_audio(request)
 
+    async def stream(self, request: AudioGenerateRequest) -> AsyncIterator[AnyAIAudioStreamEvent]:
+        """Stream synthesized audio chunks in playback order.
+
+        Long inputs are split on sentence boundaries and synthesized concurrently
+        with bounded parallelism, so playback can start after the first segment.
+
+        Args:
+            request: Normalized SDK audio generation request.
+
+        Returns:
+            An async iterator of audio chunk events followed by one terminal event.
+        """
+        async with aclosing(self._owner._stream_audio(request)) as stream:
+            async for event in stream:
+                yield event
+
 
 class AIClient:
     """Provide the single public async entrypoint for all AI capabilities."""
@@ -174,6 +255,14 @@ class AIClient:
         registry: ModelRegistry,
         adapters: dict[str, ProviderAdapter],
         telemetry: AITelemetry,
+        settings: AISettings | None = None,
+        catalog_watcher: CatalogWatcher | None = None,
+        semantic_cache_store: SemanticCacheStore | None = None,
+        summary_store: SummaryStore | None = None,
+        connection_warmer: ConnectionWarmer | None = None,
+        latency_store: LatencyStore | None = None,
+        quota: QuotaService | None = None,
+        idempotency: IdempotencyStore | None = None,
     ) -> None:
         """Initialize the root client with routing, adapters, and telemetry.
 
@@ -181,22 +270,95 @@ class AIClient:
             registry: Shared model registry used to resolve providers and models.
             adapters: Provider adapters keyed by provider name.
             telemetry: Telemetry helper used to record spans and metrics.
+            settings: Optional AI SDK settings; defaults are loaded when omitted.
+            catalog_watcher: Optional watcher that hot-reloads the model catalog.
+            semantic_cache_store: Optional persistence backend for the semantic cache.
+            summary_store: Optional store for conversation compaction summaries.
+            connection_warmer: Optional warmer that pre-opens provider connections on start.
+            latency_store: Optional persistence backend for learned timeouts.
+            quota: Optional quota service that meters tenants and principals.
+            idempotency: Optional result store that deduplicates calls by idempotency key.
 
         Returns:
             None.
         """
+        self._settings = settings or AISettings()
         self._registry = registry
         self._router = AIRouter(registry)
         self._adapters = adapters
         self._telemetry = telemetry
+        self._catalog_watcher = catalog_watcher
+        self._connection_warmer = connection_warmer
+        self._semantic_cache: SemanticCache | None = None
+        cache_settings = self._settings.semantic_cache
+        if cache_settings.enabled:
+            self._semantic_cache = SemanticCache(
+                embed=self._embed_for_cache,
+                telemetry=telemetry,
+                similarity_threshold=cache_settings.similarity_threshold,
+                ttl_s=cache_settings.ttl_s,
+                max_entries_per_partition=cache_settings.max_entries_per_partition,
+                max_entries=cache_settings.max_entries,
+                sweep_interval_s=cache_settings.sweep_interval_s,
+                verify_sample_rate=cache_settings.verify_sample_rate,
+                store=semantic_cache_store,
+            )
+        self._compactor: ConversationCompactor | None = None
+        compaction_settings = self._settings.compaction
+        if compaction_settings.enabled:
+            self._compactor = ConversationCompactor(
+                telemetry=telemetry,
+                strategy=compaction_settings.strategy,
+                max_prompt_tokens=compaction_settings.max_prompt_tokens,
+                keep_recent_messages=compaction_settings.keep_recent_messages,
+                summarize=self._summarize_for_compaction,
+                store=summary_store
+                or SummaryStore(max_conversations=compaction_settings.max_conversations),
+            )
+        self._adaptive_timeouts: AdaptiveTimeouts | None = None
+        timeout_settings = self._settings.adaptive_timeouts
+        if timeout_settings.enabled:
+            self._adaptive_timeouts = AdaptiveTimeouts(
+                quantile=timeout_settings.quantile,
+                multiplier=timeout_settings.multiplier,
+                floor_ms=timeout_settings.floor_ms,
+                ceiling_ms=timeout_settings.ceiling_ms,
+                min_samples=timeout_settings.min_samples,
+                window_size=timeout_settings.window_size,
+                store=latency_store,
+                persist_interval_s=timeout_settings.persist_interval_s,
+            )
+        self._schedulers: dict[str, FairScheduler] = {}
+        self._quota = quota
+        self._idempotency = idempotency
 
         self.text = TextClient(self)
         self.embedding = EmbeddingClient(self)
         self.image = ImageClient(self)
         self.audio = AudioClient(self)
 
+    async def start(self) -> None:
+        """Start background maintenance tasks such as catalog hot-reload and warm-up.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._catalog_watcher is not None:
+            self._catalog_watcher.start()
+        if self._telemetry.ledger is not None:
+            self._telemetry.ledger.start()
+        if self._semantic_cache is not None:
+            await self._semantic_cache.load()
+        if self._adaptive_timeouts is not None:
+            await self._adaptive_timeouts.start()
+        if self._connection_warmer is not None:
+            await self._connection_warmer.start()
+
     async def aclose(self) -> None:
-        """Close all registered provider adapters.
+        """Stop background tasks and close all registered provider adapters.
 
         Args:
             None.
@@ -204,9 +366,186 @@ class AIClient:
         Returns:
             None.
         """
+        if self._catalog_watcher is not None:
+            await self._catalog_watcher.stop()
+        if self._connection_warmer is not None:
+            await self._connection_warmer.stop()
+        if self._semantic_cache is not None:
+            await self._semantic_cache.aclose()
+        if self._adaptive_timeouts is not None:
+            await self._adaptive_timeouts.aclose()
+        if self._quota is not None:
+            await self._quota.aclose()
         await asyncio.gather(*(adapter.aclose() for adapter in self._adapters.values()))
+        if self._telemetry.ledger is not None:
+            await self._telemetry.ledger.aclose()
+
+    @property
+    def settings(self) -> AISettings:
+        """Expose the effective SDK settings to HTTP-facing modules.
+
+        Args:
+            None.
+
+        Returns:
+            The settings this client was built with.
+        """
+        return self._settings
+
+    @property
+    def adaptive_timeouts(self) -> AdaptiveTimeouts | None:
+        """Expose learned per-route timeouts for inspection.
+
+        Args:
+            None.
+
+        Returns:
+            The adaptive timeout estimator, or ``None`` when disabled.
+        """
+        return self._adaptive_timeouts
+
+    @property
+    def semantic_cache(self) -> SemanticCache | None:
+        """Expose the semantic cache for stats and false-positive feedback.
+
+        Args:
+            None.
+
+        Returns:
+            The semantic cache, or ``None`` when disabled.
+        """
+        return self._semantic_cache
 
     async def _generate_text(self, request: TextGenerateRequest) -> TextGenerateResponse:
+        """Serve a text generation request from the semantic cache or the provider.
+
+        Args:
+            request: Normalized SDK text generation request.
+
+        Returns:
+            A normalized text generation response.
+        """
+        request = await self._compact(request)
+        cache = self._semantic_cache
+        if cache is None:
+            return await self._generate_text_uncached(request)
+
+        started_at = perf_counter()
+        try:
+            lookup = await cache.lookup(request)
+        except AIError:
+            # The cache is an optimization; an embedding outage must not fail generation.
+            lookup = None
+        if lookup is None:
+            return await self._generate_text_uncached(request)
+
+        if lookup.response is not None:
+            if cache.should_verify():
+                cache.verify_in_background(
+                    lookup, request.metadata, lambda: self._generate_text_uncached(request)
+                )
+            return lookup.response.model_copy(
+                update={
+                    "request_id": uuid4().hex,
+                    "provider_request_id": None,
+                    "latency_ms": int((perf_counter() - started_at) * 1000),
+                    "usage": AIUsage(),
+                    "attempt_count": 0,
+                    "attempts": [],
+                    "cache_hit": True,
+                }
+            )
+
+        response = await self._generate_text_uncached(request)
+        if response.finish_reason == AIFinishReason.STOP:
+            try:
+                await cache.store(lookup, response)
+            except Exception as exc:
+                # The response is already paid for; a failed cache write only loses the entry.
+                log.warning(f"Could not store semantic cache entry: {exc!r}")
+        return response
+
+    async def _embed_for_cache(self, text: str, metadata: dict[str, Any]) -> list[float]:
+        """Embed one normalized turn with the configured semantic cache model.
+
+        Args:
+            text: Normalized user turn.
+            metadata: Metadata of the originating request.
+
+        Returns:
+            The embedding vector.
+        """
+        cache_settings = self._settings.semantic_cache
+        response = await self._embed(
+            EmbeddingRequest(
+                provider=cache_settings.embedding_provider,
+                model=cache_settings.embedding_model,
+                input=text,
+                metadata=metadata,
+            )
+        )
+        return response.vectors[0]
+
+    async def _compact(self, request: TextGenerateRequest) -> TextGenerateRequest:
+        """Fit a chat request into the configured prompt budget.
+
+        Args:
+            request: Text generation request with the full conversation.
+
+        Returns:
+            The request to send, unchanged when compaction is disabled or not needed.
+        """
+        if self._compactor is None:
+            return request
+        compacted, _ = await self._compactor.compact(request)
+        return compacted
+
+    async def _summarize_for_compaction(
+        self,
+        previous_summary: str | None,
+        messages: list[TextMessage],
+        metadata: dict[str, Any],
+    ) -> str:
+        """Fold older conversation turns into a rolling summary with the summary model.
+
+        Args:
+            previous_summary: Summary of the turns before ``messages``, if any.
+            messages: Turns that are not covered by ``previous_summary`` yet.
+            metadata: Metadata of the originating request.
+
+        Returns:
+            The updated summary text.
+        """
+        compaction_settings = self._settings.compaction
+        transcript = "\n".join(f"{message.role}: {message.content}" for message in messages)
+        prompt = (
+            f"Existing summary:\n{previous_summary}\n\nNew turns:\n{transcript}"
+            if previous_summary
+            else f"Turns:\n{transcript}"
+        )
+        response = await self._generate_text_uncached(
+            TextGenerateRequest(
+                provider=compaction_settings.summary_provider,
+                model=compaction_settings.summary_model,
+                messages=[
+                    TextMessage(
+                        role="system",
+                        content=(
+                            "Summarize the conversation so it can replace the original turns. "
+                            "Keep facts, decisions, names, numbers, and open questions. "
+                            "Reply with the updated summary only."
+                        ),
+                    ),
+                    TextMessage(role="user", content=prompt),
+                ],
+                temperature=0,
+                max_tokens=compaction_settings.summary_max_tokens,
+                metadata=metadata,
+            )
+        )
+        return response.text.strip()
+
+    async def _generate_text_uncached(self, request: TextGenerateRequest) -> TextGenerateResponse:
         """Execute a full text generation request with technical retries.
 
         Args:
@@ -219,7 +558,9 @@ class AIClient:
             request=request,
             capability=AICapability.TEXT_GENERATION,
             operation_name="text.generate",
-            executor=lambda adapter, model, context: adapter.generate_text(request, model, context),
+            executor=lambda adapter, request, model, context: adapter.generate_text(
+                request, model, context
+            ),
         )
 
     async def _embed(self, request: EmbeddingRequest) -> EmbeddingResponse:
@@ -229,18 +570,134 @@ class AIClient:
             request: Normalized SDK embedding request.
 
         Returns:
-            A normalized embedding response.
+            A normalized embedding response in the requested vector format.
         """
-        return await self._execute_with_retry(
+        response = await self._execute_with_retry(
             request=request,
             capability=AICapability.EMBEDDING,
             operation_name="embedding.embed",
-            executor=lambda adapter, model, context: adapter.embed(request, model, context),
+            executor=lambda adapter, request, model, context: adapter.embed(
+                request, model, context
+            ),
         )
+        return response.with_vector_format(request.vector_format)
 
     async def _generate_image(self, request: ImageGenerateRequest) -> ImageGenerateResponse:
         """Execute an image generation request with technical retries.
 
+        A ``count`` above the adapter's per-call limit is split into concurrent calls.
+        Every artifact carries the ``index`` of the requested image it fulfils, so
+        callers can match artifacts and ``errors`` without relying on list order.
+
+        Args:
+            request: Normalized SDK image generation request.
+
+        Returns:
+            A normalized image generation response.
+        """
+        resolved = self._router.resolve(request=request, capability=AICapability.IMAGE_GENERATION)
+        limit = self._get_adapter(resolved.provider).max_images_per_call(resolved)
+        if limit is None or request.count <= limit:
+            response = await self._generate_image_call(request)
+            return response.model_copy(
+                update={"artifacts": _index_artifacts(response.artifacts, start=0)}
+            )
+        return await self._fan_out_images(request, limit=max(limit, 1))
+
+    async def _fan_out_images(
+        self, request: ImageGenerateRequest, *, limit: int
+    ) -> ImageGenerateResponse:
+        """Generate ``count`` images through concurrent calls of at most ``limit`` each.
+
+        Every call keeps its own retries, quota reservation and idempotency key
+        (``<key>:<first index>``), so repeating a partly failed request only
+        repeats the failed calls. Up to ``image_fan_out_concurrency`` calls of one
+        request run at once.
+
+        Args:
+            request: Normalized SDK image generation request.
+            limit: Images one provider call can return.
+
+        Returns:
+            The merged response; images of failed calls are listed in ``errors``.
+        """
+        started_at = perf_counter()
+        slots = asyncio.Semaphore(max(self._settings.image_fan_out_concurrency, 1))
+        starts = range(0, request.count, limit)
+
+        async def call(start: int) -> ImageGenerateResponse | AIError:
+            """Generate the images from ``start`` on, returning the error on failure.
+
+            Args:
+                start: Index of the call's first image.
+
+            Returns:
+                The call's response, or the error it failed with.
+            """
+            chunk = request.model_copy(
+                update={
+                    "count": min(limit, request.count - start),
+                    "idempotency_key": (
+                        None
+                        if request.idempotency_key is None
+                        else f"{request.idempotency_key}:{start}"
+                    ),
+                }
+            )
+            async with slots:
+                try:
+                    return await self._generate_image_call(chunk)
+                except AIError as exc:
+                    return exc
+
+        results = await asyncio.gather(*(call(start) for start in starts))
+        responses = [result for result in results if isinstance(result, ImageGenerateResponse)]
+        artifacts = [
+            artifact
+            for start, result in zip(starts, results, strict=True)
+            if isinstance(result, ImageGenerateResponse)
+            for artifact in _index_artifacts(result.artifacts, start=start)
+        ]
+        failures = {
+            start: result
+            for start, result in zip(starts, results, strict=True)
+            if isinstance(result, AIError)
+        }
+        if not responses:
+            raise failures[0]
+
+        usage = AIUsage.from_counts(
+            input_tokens=sum(response.usage.input_tokens for response in responses),
+            output_tokens=sum(response.usage.output_tokens for response in responses),
+            total_tokens=sum(response.usage.total_tokens for response in responses),
+        )
+        costs = [
+            response.usage.estimated_cost_usd
+            for response in responses
+            if response.usage.estimated_cost_usd is not None
+        ]
+        if costs:
+            usage.estimated_cost_usd = sum(costs)
+        attempts = [attempt for response in responses for attempt in response.attempts]
+        return responses[0].model_copy(
+            update={
+                "provider_request_id": None,
+                "latency_ms": int((perf_counter() - started_at) * 1000),
+                "usage": usage,
+                "attempts": attempts,
+                "attempt_count": len(attempts),
+                "artifacts": artifacts,
+                "errors": [
+                    ImageItemError(index=index, error=error.to_payload())
+                    for start, error in failures.items()
+                    for index in range(start, min(start + limit, request.count))
+                ],
+            }
+        )
+
+    async def _generate_image_call(self, request: ImageGenerateRequest) -> ImageGenerateResponse:
+        """Execute one provider image generation call with technical retries.
+
         Args:
             request: Normalized SDK image generation request.
 
@@ -251,7 +708,7 @@ class AIClient:
             request=request,
             capability=AICapability.IMAGE_GENERATION,
             operation_name="image.generate",
-            executor=lambda adapter, model, context: adapter.generate_image(
+            executor=lambda adapter, request, model, context: adapter.generate_image(
                 request, model, context
             ),
         )
@@ -269,12 +726,43 @@ class AIClient:
             request=request,
             capability=AICapability.AUDIO_GENERATION,
             operation_name="audio.generate",
-            executor=lambda adapter, model, context: adapter.generate_audio(
+            executor=lambda adapter, request, model, context: adapter.generate_audio(
                 request, model, context
             ),
         )
 
     async def _stream_text(self, request: TextGenerateRequest) -> AsyncIterator[AnyAIStreamEvent]:
+        """Stream text while holding the request's quota reservation.
+
+        The reservation is settled when the stream ends however it ends: with the
+        reported usage after a done event, refunded after an error event or
+        exception, and at the estimate when the consumer leaves mid-stream.
+
+        Args:
+            request: Normalized SDK text generation request.
+
+        Returns:
+            An async iterator of normalized stream events.
+        """
+        reservation = await self._reserve_quota(request)
+        usage: AIUsage | None = AIUsage()
+        try:
+            async with aclosing(self._stream_text_unmetered(request)) as stream:
+                async for event in stream:
+                    if isinstance(event, AIDoneEvent):
+                        usage = event.usage
+                    elif isinstance(event, AIErrorEvent):
+                        usage = None
+                    yield event
+        except AIError:
+            usage = None
+            raise
+        finally:
+            self._settle_quota(reservation, usage)
+
+    async def _stream_text_unmetered(
+        self, request: TextGenerateRequest
+    ) -> AsyncIterator[AnyAIStreamEvent]:
         """Execute a streaming text request with cautious pre-output retries.
 
         Args:
@@ -283,11 +771,13 @@ class AIClient:
         Returns:
             An async iterator of normalized stream events.
         """
+        request = await self._compact(request)
         resolved = self._router.resolve(
             request=request,
             capability=AICapability.TEXT_GENERATION,
             require_stream=True,
         )
+        request = apply_model_defaults(request, resolved)
         adapter = self._get_adapter(resolved.provider)
         request_id = uuid4().hex
         request_started_at = perf_counter()
@@ -318,65 +808,83 @@ class AIClient:
                     attempt=attempt_number,
                     retry_index=retry_index,
                 ) as attempt_span:
+                    stream_timer = self._telemetry.start_stream_timer(
+                        model=resolved, attempt=attempt_number
+                    )
                     try:
-                        async for event in adapter.stream_text(request, resolved, context):
-                            normalized_event = set_event_attempt(event, attempt=attempt_number)
-
-                            # Keep bookkeeping events private until text becomes visible.
-                            # This lets the SDK retry transport failures without exposing
-                            # noisy intermediate attempts to downstream consumers.
-                            if (
-                                isinstance(normalized_event, AITextDeltaEvent)
-                                and not output_visible
-                            ):
-                                output_visible = True
-                                for buffered_event in buffered_events:
-                                    yield buffered_event
-                                buffered_events.clear()
-
-                            if not output_visible and normalized_event.event in {
-                                "start",
-                                "text_start",
-                                "usage",
-                            }:
-                                buffered_events.append(normalized_event)
-                                continue
-
-                            if normalized_event.event == "text_end" and not output_visible:
-                                output_visible = True
-                                for buffered_event in buffered_events:
-                                    yield buffered_event
-                                buffered_events.clear()
-
-                            if isinstance(normalized_event, AIDoneEvent):
-                                for buffered_event in buffered_events:
-                                    yield buffered_event
-                                buffered_events.clear()
-                                yield normalized_event
-
-                                response = TextGenerateResponse(
-                                    request_id=request_id,
-                                    provider_request_id=normalized_event.provider_request_id,
-                                    provider=resolved.provider,
-                                    model=resolved.model_id,
-                                    resolved_provider=resolved.provider,
-                                    resolved_model=resolved.model_id,
-                                    latency_ms=int((perf_counter() - request_started_at) * 1000),
-                                    usage=normalized_event.usage,
-                                    attempt_count=attempt_number,
-                                    attempts=[],
-                                    text=normalized_event.text,
-                                    finish_reason=normalized_event.finish_reason,
-                                )
-                                self._telemetry.enrich_success_span(attempt_span, response)
-                                self._telemetry.enrich_success_span(request_span, response)
-                                self._telemetry.record_success(
-                                    operation_name="text.stream",
-                                    response=response,
-                                )
-                                return
+                        # Close the adapter stream deterministically on early return so the
+                        # upstream response is released now rather than by the GC finalizer.
+                        async with (
+                            self._provider_slot(resolved.provider, request),
+                            aclosing(adapter.stream_text(request, resolved, context)) as stream,
+                        ):
+                            # Time to first delta excludes the wait for a scheduler slot.
+                            stream_timer.restart()
+                            async for event in stream:
+                                normalized_event = set_event_attempt(event, attempt=attempt_number)
+                                if isinstance(normalized_event, AITextDeltaEvent):
+                                    stream_timer.on_delta()
+
+                                # Keep bookkeeping events private until text becomes visible.
+                                # This lets the SDK retry transport failures without exposing
+                                # noisy intermediate attempts to downstream consumers.
+                                if (
+                                    isinstance(normalized_event, AITextDeltaEvent)
+                                    and not output_visible
+                                ):
+                                    output_visible = True
+                                    for buffered_event in buffered_events:
+                                        yield buffered_event
+                                    buffered_events.clear()
+
+                                if not output_visible and normalized_event.event in {
+                                    "start",
+                                    "text_start",
+                                    "usage",
+                                }:
+                                    buffered_events.append(normalized_event)
+                                    continue
+
+                                if normalized_event.event == "text_end" and not output_visible:
+                                    output_visible = True
+                                    for buffered_event in buffered_events:
+                                        yield buffered_event
+                                    buffered_events.clear()
+
+                                if isinstance(normalized_event, AIDoneEvent):
+                                    # Record the attempt before yielding done: consumers
+                                    # that stop at done close this generator at that yield.
+                                    response = TextGenerateResponse(
+                                        request_id=request_id,
+                                        provider_request_id=normalized_event.provider_request_id,
+                                        provider=resolved.provider,
+                                        model=resolved.model_id,
+                                        resolved_provider=resolved.provider,
+                                        resolved_model=resolved.model_id,
+                                        latency_ms=int(
+                                            (perf_counter() - request_started_at) * 1000
+                                        ),
+                                        usage=self._price_usage(normalized_event.usage, resolved),
+                                        attempt_count=attempt_number,
+                                        attempts=[],
+                                        text=normalized_event.text,
+                                        finish_reason=normalized_event.finish_reason,
+                                    )
+                                    stream_timer.finish(attempt_span, normalized_event.usage)
+                                    self._telemetry.enrich_success_span(attempt_span, response)
+                                    self._telemetry.enrich_success_span(request_span, response)
+                                    self._telemetry.record_success(
+                                        operation_name="text.stream",
+                                        response=response,
+                                        metadata=request.metadata,
+                                    )
+                                    for buffered_event in buffered_events:
+                                        yield buffered_event
+                                    buffered_events.clear()
+                                    yield normalized_event
+                                    return
 
-                            yield normalized_event
+                                yield normalized_event
 
                         raise AITransportError(
                             "Provider stream ended without a terminal done event",
@@ -384,14 +892,32 @@ class AIClient:
                             model=resolved.model_id,
                         )
                     except asyncio.CancelledError as exc:
-                        normalized_error = AIRequestCancelledError(
+                        # The consumer went away (for example an SSE client disconnected):
+                        # record the cancellation, then let it propagate so the upstream
+                        # provider stream is torn down instead of being retried or drained.
+                        cancelled_error = AIRequestCancelledError(
                             "Text stream was cancelled",
                             provider=resolved.provider,
                             model=resolved.model_id,
                             raw_error=exc,
                         )
+                        stream_timer.finish(attempt_span)
+                        self._telemetry.enrich_error_span(attempt_span, cancelled_error)
+                        self._telemetry.enrich_error_span(request_span, cancelled_error)
+                        self._telemetry.record_failure(
+                            operation_name="text.stream",
+                            provider=resolved.provider,
+                            model=resolved.model_id,
+                            error=cancelled_error,
+                            latency_ms=int((perf_counter() - request_started_at) * 1000),
+                            request_id=request_id,
+                            attempt_count=attempt_number,
+                            metadata=request.metadata,
+                        )
+                        raise
                     except Exception as exc:
                         normalized_error = self._normalize_error(exc, resolved)
+                    stream_timer.finish(attempt_span)
                     self._telemetry.enrich_error_span(attempt_span, normalized_error)
 
                 last_error = normalized_error
@@ -421,6 +947,9 @@ class AIClient:
                     model=resolved.model_id,
                     error=normalized_error,
                     latency_ms=int((perf_counter() - request_started_at) * 1000),
+                    request_id=request_id,
+                    attempt_count=attempt_number,
+                    metadata=request.metadata,
                 )
                 yield build_error_event(
                     error=normalized_error,
@@ -438,6 +967,9 @@ class AIClient:
             model=resolved.model_id,
             error=final_error,
             latency_ms=int((perf_counter() - request_started_at) * 1000),
+            request_id=request_id,
+            attempt_count=retry_budget + 1,
+            metadata=request.metadata,
         )
         yield build_error_event(
             error=final_error,
@@ -447,6 +979,265 @@ class AIClient:
             attempt=max(retry_budget + 1, 1),
         )
 
+    async def _stream_json(
+        self, request: TextGenerateRequest
+    ) -> AsyncIterator[AnyAIJSONStreamEvent]:
+        """Feed streamed text into an incremental JSON parser.
+
+        Malformed output ends the stream with an ``AI_OUTPUT_PARSE_ERROR`` error event
+        at the first offending delta; closing the text stream at that point also
+        closes the provider response, so no further tokens are generated.
+
+        Args:
+            request: Normalized SDK text generation request.
+
+        Returns:
+            An async iterator of stream events interleaved with ``json_partial`` events.
+        """
+        if request.response_format != "json":
+            request = request.model_copy(update={"response_format": "json"})
+        parser = IncrementalJSONParser()
+        started_at = perf_counter()
+        text = ""
+        async with aclosing(self._stream_text(request)) as stream:
+            async for event in stream:
+                if isinstance(event, AITextDeltaEvent):
+                    yield event
+                    text = event.text
+                    try:
+                        completed = parser.feed(event.delta)
+                    except AIOutputParseError as exc:
+                        yield self._json_parse_error_event(
+                            exc, event, text, started_at, request.metadata
+                        )
+                        return
+                    for path, value in completed:
+                        yield AIJSONPartialEvent(
+                            request_id=event.request_id,
+                            provider=event.provider,
+                            model=event.model,
+                            attempt=event.attempt,
+                            provider_request_id=event.provider_request_id,
+                            path=list(path),
+                            value=value,
+                        )
+                    continue
+
+                if isinstance(event, AIDoneEvent):
+                    try:
+                        parser.close()
+                    except AIOutputParseError as exc:
+                        yield self._json_parse_error_event(
+                            exc, event, event.text, started_at, request.metadata
+                        )
+                        return
+                yield event
+
+    def _json_parse_error_event(
+        self,
+        error: AIOutputParseError,
+        event: AnyAIStreamEvent,
+        partial_text: str,
+        started_at: float,
+        metadata: dict[str, Any],
+    ) -> AnyAIStreamEvent:
+        """Build the terminal error event for malformed structured output.
+
+        Args:
+            error: Parser failure.
+            event: Stream event that exposed the failure.
+            partial_text: Output received so far.
+            started_at: ``perf_counter`` value when the stream started.
+            metadata: Metadata of the originating request.
+
+        Returns:
+            A terminal error stream event.
+        """
+        error.provider = event.provider
+        error.model = event.model
+        error.partial_text = partial_text
+        self._telemetry.record_failure(
+            operation_name="text.stream_json",
+            provider=event.provider,
+            model=event.model,
+            error=error,
+            latency_ms=int((perf_counter() - started_at) * 1000),
+            request_id=event.request_id,
+            attempt_count=event.attempt,
+            metadata=metadata,
+        )
+        return build_error_event(
+            error=error,
+            request_id=event.request_id,
+            provider=event.provider,
+            model=event.model,
+            attempt=event.attempt,
+            provider_request_id=event.provider_request_id,
+        )
+
+    async def _stream_audio(
+        self, request: AudioGenerateRequest
+    ) -> AsyncIterator[AnyAIAudioStreamEvent]:
+        """Synthesize sentence segments concurrently and emit their audio in order.
+
+        Args:
+            request: Normalized SDK audio generation request.
+
+        Returns:
+            An async iterator of audio chunk events followed by one terminal event.
+        """
+        resolved = self._router.resolve(request=request, capability=AICapability.AUDIO_GENERATION)
+        request = apply_model_defaults(request, resolved)
+        adapter = self._get_adapter(resolved.provider)
+        request_id = uuid4().hex
+        request_started_at = perf_counter()
+        retry_budget = max(resolved.max_retries, 0)
+        window = max(self._settings.audio_stream_concurrency, 1)
+        mime_type = adapter.audio_mime_type(request, resolved)
+        segments = split_sentences(
+            request.input_text, max_chars=self._settings.audio_stream_segment_chars
+        ) or [request.input_text]
+        queues: list[asyncio.Queue[tuple[int, bytes] | AIError | None]] = [
+            asyncio.Queue() for _ in segments
+        ]
+        tasks: list[asyncio.Task[None]] = []
+
+        async def produce(index: int) -> None:
+            """Synthesize one segment into its queue, retrying before any byte is emitted.
+
+            Args:
+                index: Zero-based segment index.
+
+            Returns:
+                None.
+            """
+            segment_request = request.model_copy(update={"input_text": segments[index]})
+            queue = queues[index]
+            for retry_index in range(retry_budget + 1):
+                context = self._build_request_context(
+                    request_id=request_id, request=segment_request, model=resolved
+                )
+                emitted = False
+                try:
+                    async for chunk in adapter.stream_audio(segment_request, resolved, context):
+                        emitted = True
+                        queue.put_nowait((retry_index + 1, chunk))
+                    queue.put_nowait(None)
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    error = self._normalize_error(exc, resolved)
+                    if emitted or retry_index >= retry_budget or not should_retry(error):
+                        queue.put_nowait(error)
+                        return
+                await asyncio.sleep(
+                    compute_backoff_seconds(resolved.provider_config.backoff_base_ms, retry_index)
+                )
+
+        def schedule(upto: int) -> None:
+            """Start producers so at most ``window`` segments run ahead of playback.
+
+            Args:
+                upto: Exclusive upper segment index that may be started.
+
+            Returns:
+                None.
+            """
+            while len(tasks) < min(upto, len(segments)):
+                tasks.append(asyncio.create_task(produce(len(tasks))))
+
+        with self._telemetry.start_request_span(
+            operation_name="audio.stream",
+            request_id=request_id,
+            model_label=resolved.alias,
+            capability=AICapability.AUDIO_GENERATION.value,
+        ) as request_span:
+            self._telemetry.record_request_preview(request_span, request.input_text)
+            request_span.set_attribute("ai.audio.segment_count", len(segments))
+            total_bytes = 0
+            last_attempt = 1
+
+            try:
+                for index in range(len(segments)):
+                    schedule(index + window)
+                    sequence = 0
+                    while (item := await queues[index].get()) is not None:
+                        if isinstance(item, AIError):
+                            self._telemetry.enrich_error_span(request_span, item)
+                            self._telemetry.record_failure(
+                                operation_name="audio.stream",
+                                provider=resolved.provider,
+                                model=resolved.model_id,
+                                error=item,
+                                latency_ms=int((perf_counter() - request_started_at) * 1000),
+                                request_id=request_id,
+                                attempt_count=last_attempt,
+                                metadata=request.metadata,
+                            )
+                            yield build_error_event(
+                                error=item,
+                                request_id=request_id,
+                                provider=resolved.provider,
+                                model=resolved.model_id,
+                                attempt=last_attempt,
+                            )
+                            return
+
+                        last_attempt, chunk = item
+                        if total_bytes == 0:
+                            self._telemetry.record_time_to_first_chunk(
+                                request_span,
+                                operation_name="audio.stream",
+                                model=resolved,
+                                latency_ms=(perf_counter() - request_started_at) * 1000,
+                            )
+                        total_bytes += len(chunk)
+                        yield AIAudioChunkEvent(
+                            request_id=request_id,
+                            provider=resolved.provider,
+                            model=resolved.model_id,
+                            attempt=last_attempt,
+                            segment_index=index,
+                            sequence=sequence,
+                            data=chunk,
+                            mime_type=mime_type,
+                        )
+                        sequence += 1
+            finally:
+                # Consumers may stop early; never leave segment synthesis running, and
+                # wait for cancelled segments so their provider streams are closed.
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            response = AudioGenerateResponse(
+                request_id=request_id,
+                provider=resolved.provider,
+                model=resolved.model_id,
+                resolved_provider=resolved.provider,
+                resolved_model=resolved.model_id,
+                latency_ms=int((perf_counter() - request_started_at) * 1000),
+                attempt_count=last_attempt,
+                artifacts=[],
+                mime_type=mime_type,
+            )
+            self._telemetry.enrich_success_span(request_span, response)
+            self._telemetry.record_success(
+                operation_name="audio.stream",
+                response=response,
+                metadata=request.metadata,
+            )
+            yield AIAudioDoneEvent(
+                request_id=request_id,
+                provider=resolved.provider,
+                model=resolved.model_id,
+                attempt=last_attempt,
+                segment_count=len(segments),
+                total_bytes=total_bytes,
+            )
+
     async def _execute_with_retry(
         self,
         *,
@@ -454,10 +1245,10 @@ class AIClient:
         capability: AICapability,
         operation_name: str,
         executor: Callable[
-            [ProviderAdapter, ResolvedModel, ProviderRequestContext], Awaitable[ResponseT]
+            [ProviderAdapter, Any, ResolvedModel, ProviderRequestContext], Awaitable[ResponseT]
         ],
     ) -> ResponseT:
-        """Execute a non-streaming operation with technical retries and telemetry.
+        """Execute a non-streaming operation within the caller's quota, once per idempotency key.
 
         Args:
             request: Normalized SDK request object.
@@ -465,10 +1256,65 @@ class AIClient:
             operation_name: Logical SDK operation name such as ``text.generate``.
             executor: Provider-specific coroutine that performs the actual request.
 
+        Returns:
+            A normalized SDK response produced by the successful attempt, or the
+            stored response of an earlier call with the same idempotency key.
+        """
+
+        async def execute() -> ResponseT:
+            reservation = await self._reserve_quota(request)
+            try:
+                response = await self._execute_unmetered(
+                    request=request,
+                    capability=capability,
+                    operation_name=operation_name,
+                    executor=executor,
+                )
+            except AIError:
+                self._settle_quota(reservation, None)
+                raise
+            self._settle_quota(reservation, response.usage)
+            return response
+
+        if self._idempotency is None or request.idempotency_key is None:
+            return await execute()
+        tenant = request.metadata.get("tenant_id", "default")
+        response, replayed = await self._idempotency.run(
+            scope=f"{tenant}:{operation_name}",
+            request=request,
+            response_type=_RESPONSE_TYPES[capability],
+            call=execute,
+        )
+        if replayed:
+            self._telemetry.record_idempotent_replay(
+                operation_name=operation_name, provider=request.provider, model=request.model
+            )
+        return response
+
+    async def _execute_unmetered(
+        self,
+        *,
+        request: AIRequest,
+        capability: AICapability,
+        operation_name: str,
+        executor: Callable[
+            [ProviderAdapter, Any, ResolvedModel, ProviderRequestContext], Awaitable[ResponseT]
+        ],
+    ) -> ResponseT:
+        """Execute a non-streaming operation with technical retries and telemetry.
+
+        Args:
+            request: Normalized SDK request object.
+            capability: Capability required by the current operation.
+            operation_name: Logical SDK operation name such as ``text.generate``.
+            executor: Provider-specific coroutine that performs the actual request; it
+                receives the request after catalog defaults were applied.
+
         Returns:
             A normalized SDK response produced by the successful attempt.
         """
         resolved = self._router.resolve(request=request, capability=capability)
+        request = apply_model_defaults(request, resolved)
         adapter = self._get_adapter(resolved.provider)
         request_id = uuid4().hex
         request_started_at = perf_counter()
@@ -488,7 +1334,7 @@ class AIClient:
             for retry_index in range(retry_budget + 1):
                 attempt_number = retry_index + 1
                 context = self._build_request_context(
-                    request_id=request_id, request=request, model=resolved
+                    request_id=request_id, request=request, model=resolved, capability=capability
                 )
                 attempt_started_at = perf_counter()
                 attempt_record = AttemptRecord(
@@ -507,7 +1353,10 @@ class AIClient:
                     retry_index=retry_index,
                 ) as attempt_span:
                     try:
-                        raw_response = await executor(adapter, resolved, context)
+                        async with self._provider_slot(resolved.provider, request):
+                            # Queueing for a slot is not provider latency.
+                            attempt_started_at = perf_counter()
+                            raw_response = await executor(adapter, request, resolved, context)
                         # Attach SDK-owned metadata after the provider-specific payload
                         # is normalized, so adapters stay focused on protocol mapping.
                         response = self._finalize_response(
@@ -528,11 +1377,13 @@ class AIClient:
                             ],
                             total_latency_ms=int((perf_counter() - request_started_at) * 1000),
                         )
+                        self._observe_latency(resolved, capability, attempt_started_at)
                         self._telemetry.enrich_success_span(attempt_span, response)
                         self._telemetry.enrich_success_span(request_span, response)
                         self._telemetry.record_success(
                             operation_name=operation_name,
                             response=response,
+                            metadata=request.metadata,
                         )
                         return response
                     except asyncio.CancelledError as exc:
@@ -544,6 +1395,10 @@ class AIClient:
                         )
                     except Exception as exc:
                         normalized_error = self._normalize_error(exc, resolved)
+                    if isinstance(normalized_error, AITimeoutError):
+                        # A timed-out attempt only bounds the latency from below; recording
+                        # the time waited lets a slowing route raise its own timeout.
+                        self._observe_latency(resolved, capability, attempt_started_at)
                     self._telemetry.enrich_error_span(attempt_span, normalized_error)
 
                 last_error = normalized_error
@@ -574,6 +1429,9 @@ class AIClient:
                     model=resolved.model_id,
                     error=normalized_error,
                     latency_ms=int((perf_counter() - request_started_at) * 1000),
+                    request_id=request_id,
+                    attempt_count=attempt_number,
+                    metadata=request.metadata,
                 )
                 raise normalized_error
 
@@ -584,6 +1442,9 @@ class AIClient:
             model=resolved.model_id,
             error=final_error,
             latency_ms=int((perf_counter() - request_started_at) * 1000),
+            request_id=request_id,
+            attempt_count=len(attempts),
+            metadata=request.metadata,
         )
         raise final_error
 
@@ -607,6 +1468,7 @@ class AIClient:
         request_id: str,
         request: AIRequest,
         model: ResolvedModel,
+        capability: AICapability | None = None,
     ) -> ProviderRequestContext:
         """Build the runtime context passed to provider adapters.
 
@@ -614,17 +1476,130 @@ class AIClient:
             request_id: Stable SDK request id shared across attempts.
             request: Normalized SDK request object.
             model: Resolved provider/model pair selected by the router.
+            capability: Capability of a non-streaming operation; enables learned
+                timeouts when set.
 
         Returns:
             The provider request context for the current attempt.
         """
+        timeout_ms = request.timeout_ms or model.timeout_ms
+        if request.timeout_ms is None and capability is not None and self._adaptive_timeouts:
+            timeout_ms = self._adaptive_timeouts.timeout_ms(
+                model.provider, model.model_id, capability.value, model.timeout_ms
+            )
         return ProviderRequestContext(
             request_id=request_id,
-            timeout_ms=request.timeout_ms or model.timeout_ms,
+            timeout_ms=timeout_ms,
             metadata=dict(request.metadata),
             idempotency_key=request.idempotency_key,
         )
 
+    async def _reserve_quota(self, request: AIRequest) -> QuotaReservation | None:
+        """Reserve a request's estimated tokens against its tenant and principal quotas.
+
+        Args:
+            request: Normalized SDK request carrying ``tenant_id`` and ``principal_id``
+                in its metadata.
+
+        Returns:
+            The reservation, or ``None`` when quotas are disabled.
+        """
+        if self._quota is None:
+            return None
+        try:
+            return await self._quota.reserve(
+                tenant_id=request.metadata.get("tenant_id"),
+                principal_id=request.metadata.get("principal_id"),
+                tokens=estimate_request_tokens(
+                    request, default_output_tokens=self._settings.quota.default_output_tokens
+                ),
+            )
+        except AIError as exc:
+            exc.provider = exc.provider or request.provider
+            exc.model = exc.model or request.model
+            raise
+
+    def _settle_quota(self, reservation: QuotaReservation | None, usage: AIUsage | None) -> None:
+        """Reconcile a quota reservation with the tokens actually used.
+
+        Args:
+            reservation: Reservation from :meth:`_reserve_quota`, or ``None``.
+            usage: Usage reported by the provider, or ``None`` to refund a failed
+                request. Responses without token counts keep the estimate.
+
+        Returns:
+            None.
+        """
+        if self._quota is None or reservation is None:
+            return
+        if usage is None:
+            self._quota.settle(reservation, 0)
+        elif usage.total_tokens:
+            self._quota.settle(reservation, usage.total_tokens)
+
+    def _provider_slot(
+        self, provider: str, request: AIRequest
+    ) -> AbstractAsyncContextManager[None]:
+        """Return the scheduler slot guarding one provider call.
+
+        The tenant comes from ``metadata["tenant_id"]`` and the priority class from
+        ``metadata["priority"]``; requests without them share the ``default`` tenant
+        and the configured default class.
+
+        Args:
+            provider: Provider about to be called.
+            request: Normalized SDK request object.
+
+        Returns:
+            The provider's fair-queue slot, or a no-op when scheduling is disabled.
+        """
+        scheduler_settings = self._settings.scheduler
+        if not scheduler_settings.enabled:
+            return nullcontext()
+        scheduler = self._schedulers.get(provider)
+        if scheduler is None:
+            scheduler = self._schedulers[provider] = FairScheduler(
+                provider=provider,
+                max_concurrency=scheduler_settings.max_concurrency_per_provider,
+                class_weights={
+                    "interactive": scheduler_settings.interactive_weight,
+                    "background": scheduler_settings.background_weight,
+                    "batch": scheduler_settings.batch_weight,
+                },
+                tenant_weights=scheduler_settings.tenant_weights,
+                max_queue=scheduler_settings.max_queue,
+                max_queue_per_tenant=scheduler_settings.max_queue_per_tenant,
+                max_wait_ms=scheduler_settings.max_wait_ms,
+                telemetry=self._telemetry,
+            )
+        tenant = str(request.metadata.get("tenant_id", "default"))
+        priority: PriorityClass = scheduler_settings.default_priority
+        if request.metadata.get("priority") in PRIORITY_CLASSES:
+            priority = request.metadata["priority"]
+        return scheduler.slot(tenant, priority)
+
+    def _observe_latency(
+        self, model: ResolvedModel, capability: AICapability, started_at: float
+    ) -> None:
+        """Feed one attempt's latency to the adaptive timeout estimator.
+
+        Args:
+            model: Resolved provider/model pair of the attempt.
+            capability: Capability of the operation.
+            started_at: ``perf_counter`` value when the attempt started.
+
+        Returns:
+            None.
+        """
+        if self._adaptive_timeouts is None:
+            return
+        self._adaptive_timeouts.observe(
+            model.provider,
+            model.model_id,
+            capability.value,
+            (perf_counter() - started_at) * 1000,
+        )
+
     def _normalize_error(self, error: Exception, model: ResolvedModel) -> AIError:
         """Coerce arbitrary exceptions into the unified AI error hierarchy.
 
@@ -703,9 +1678,25 @@ class AIClient:
                 "latency_ms": total_latency_ms,
                 "attempt_count": len(attempts),
                 "attempts": attempts,
+                "usage": self._price_usage(response.usage, resolved_model),
             }
         )
 
+    def _price_usage(self, usage: AIUsage, resolved_model: ResolvedModel) -> AIUsage:
+        """Attach a cost estimate when the catalog declares pricing for the model.
+
+        Args:
+            usage: Normalized usage reported by the provider.
+            resolved_model: Resolved provider/model pair selected by the router.
+
+        Returns:
+            The usage unchanged, or a copy carrying ``estimated_cost_usd``.
+        """
+        pricing = resolved_model.spec.pricing
+        if pricing is None or usage.estimated_cost_usd is not None:
+            return usage
+        return usage.model_copy(update={"estimated_cost_usd": pricing.estimate_usd(usage)})
+
     def _build_prompt_preview(self, request: AIRequest) -> str | None:
         """Extract a safe prompt preview used only for optional telemetry.
 
@@ -746,25 +1737,341 @@ def create_ai_client(
     """
     effective_settings = ai_settings or settings.ai
     effective_registry = registry or build_default_registry(effective_settings)
-    effective_telemetry = telemetry or AITelemetry(effective_settings)
+    catalog_watcher = None
+    if (
+        registry is None
+        and effective_settings.catalog_path
+        and effective_settings.catalog_reload_interval_s > 0
+    ):
+        catalog_watcher = CatalogWatcher(
+            effective_registry,
+            effective_settings.catalog_path,
+            interval_s=effective_settings.catalog_reload_interval_s,
+        )
+    effective_telemetry = telemetry or AITelemetry(
+        effective_settings, ledger=_build_ledger(effective_settings)
+    )
+
+    dns_cache = None
+    if effective_settings.warmup.enabled:
+        dns_cache = DNSCache(ttl_s=effective_settings.warmup.dns_ttl_s)
 
     if adapters is None:
+        spooler = None
+        if effective_settings.spool.enabled:
+            spooler = ArtifactSpooler(
+                directory=effective_settings.spool.directory,
+                inline_threshold_bytes=effective_settings.spool.inline_threshold_bytes,
+                chunk_size_bytes=effective_settings.spool.chunk_size_bytes,
+            )
+
+        codec = get_json_codec(effective_settings.json_codec)
+        uploads = _build_upload_cache(effective_settings)
+        decoder = None
+        if effective_settings.decode.enabled:
+            decoder = PayloadDecoder(
+                threshold_bytes=effective_settings.decode.threshold_bytes,
+                max_workers=effective_settings.decode.max_workers,
+                slice_bytes=effective_settings.decode.slice_bytes,
+            )
+
         adapters = {
             "anthropic": AnthropicProviderAdapter(
                 default_timeout_ms=effective_settings.default_timeout_ms,
+                codec=codec,
+                uploads=uploads,
+                transport=_build_provider_transport(effective_settings, dns_cache),
             ),
             "gemini": GeminiProviderAdapter(
                 default_timeout_ms=effective_settings.default_timeout_ms,
+                spooler=spooler,
+                decoder=decoder,
+                codec=codec,
+                uploads=uploads,
+                transport=_build_provider_transport(effective_settings, dns_cache),
             ),
             "openai": OpenAICompatibleProviderAdapter(
                 default_timeout_ms=effective_settings.default_timeout_ms,
+                spooler=spooler,
+                decoder=decoder,
+                codec=codec,
+                uploads=uploads,
+                transport=_build_provider_transport(effective_settings, dns_cache),
             ),
         }
+        if effective_settings.mock.enabled:
+            mock_settings = effective_settings.mock
+            adapters["mock"] = MockProviderAdapter(
+                MockProfile(
+                    seed=mock_settings.seed,
+                    latency=LatencyDistribution(
+                        kind=mock_settings.latency_kind,
+                        mean_ms=mock_settings.latency_ms,
+                        spread_ms=mock_settings.latency_spread_ms,
+                    ),
+                    tokens_per_second=mock_settings.tokens_per_second,
+                    output_tokens=mock_settings.output_tokens,
+                    rate_limit_rate=mock_settings.rate_limit_rate,
+                    server_error_rate=mock_settings.server_error_rate,
+                    stall_rate=mock_settings.stall_rate,
+                    stall_ms=mock_settings.stall_ms,
+                )
+            )
 
     return AIClient(
         registry=effective_registry,
         adapters=adapters,
         telemetry=effective_telemetry,
+        settings=effective_settings,
+        catalog_watcher=catalog_watcher,
+        semantic_cache_store=_build_semantic_cache_store(effective_settings),
+        summary_store=_build_summary_store(effective_settings),
+        connection_warmer=_build_connection_warmer(
+            effective_settings, effective_registry, adapters, dns_cache
+        ),
+        latency_store=_build_latency_store(effective_settings),
+        quota=_build_quota_service(effective_settings),
+        idempotency=_build_idempotency_store(effective_settings),
+    )
+
+
+def _build_semantic_cache_store(ai_settings: AISettings) -> SemanticCacheStore | None:
+    """Create the configured semantic cache persistence backend.
+
+    Args:
+        ai_settings: Effective AI SDK settings.
+
+    Returns:
+        The persistence store, or ``None`` for an in-memory cache.
+    """
+    cache_settings = ai_settings.semantic_cache
+    if not cache_settings.enabled or cache_settings.persistence == "none":
+        return None
+    if cache_settings.persistence == "disk":
+        return DiskCacheStore(cache_settings.disk_path)
+    return RedisCacheStore(redis_client, key_prefix=cache_settings.redis_key_prefix)
+
+
+def _build_summary_store(ai_settings: AISettings) -> SummaryStore | None:
+    """Create the configured conversation summary store.
+
+    Args:
+        ai_settings: Effective AI SDK settings.
+
+    Returns:
+        A Redis-backed store, or ``None`` for the in-memory default.
+    """
+    compaction_settings = ai_settings.compaction
+    if not compaction_settings.enabled or compaction_settings.persistence != "redis":
+        return None
+    return RedisSummaryStore(
+        redis_client,
+        key_prefix=compaction_settings.redis_key_prefix,
+        ttl_s=compaction_settings.ttl_s,
+    )
+
+
+def _build_quota_service(ai_settings: AISettings) -> QuotaService | None:
+    """Create the Redis-backed quota service from the configured limits.
+
+    Args:
+        ai_settings: Effective AI SDK settings.
+
+    Returns:
+        The quota service, or ``None`` when quotas are disabled.
+    """
+    quota_settings = ai_settings.quota
+    if not quota_settings.enabled:
+        return None
+    limits = [
+        QuotaLimit(
+            scope=scope,
+            window=window,
+            metric=metric,
+            limit=getattr(quota_settings, f"{scope}_{window}_{metric}"),
+        )
+        for scope in ("tenant", "principal")
+        for window in ("daily", "monthly")
+        for metric in ("tokens", "requests")
+    ]
+    return QuotaService(
+        redis_client,
+        limits,
+        key_prefix=quota_settings.key_prefix,
+        reject_cache_s=quota_settings.reject_cache_s,
+    )
+
+
+def _build_idempotency_store(ai_settings: AISettings) -> IdempotencyStore | None:
+    """Create the Redis result store behind request idempotency keys.
+
+    Args:
+        ai_settings: Effective AI SDK settings.
+
+    Returns:
+        The idempotency store, or ``None`` when deduplication is disabled.
+    """
+    idempotency_settings = ai_settings.idempotency
+    if not idempotency_settings.enabled:
+        return None
+    return IdempotencyStore(
+        redis_client,
+        key_prefix=idempotency_settings.key_prefix,
+        result_ttl_s=idempotency_settings.result_ttl_s,
+        lock_ttl_s=idempotency_settings.lock_ttl_s,
+        poll_interval_ms=idempotency_settings.poll_interval_ms,
+        max_poll_interval_ms=idempotency_settings.max_poll_interval_ms,
+    )
+
+
+def _build_upload_cache(ai_settings: AISettings) -> UploadCache | None:
+    """Create the cache of provider file references for large media inputs.
+
+    Args:
+        ai_settings: Effective AI SDK settings.
+
+    Returns:
+        The upload cache, or ``None`` when media always travels inline.
+    """
+    upload_settings = ai_settings.uploads
+    if not upload_settings.enabled:
+        return None
+    return UploadCache(
+        redis_client,
+        key_prefix=upload_settings.key_prefix,
+        ttl_s=upload_settings.ttl_s,
+        min_bytes=upload_settings.min_bytes,
+    )
+
+
+def _build_ledger(ai_settings: AISettings) -> AILedger | None:
+    """Create the call ledger with its configured sink.
+
+    Args:
+        ai_settings: Effective AI SDK settings.
+
+    Returns:
+        The ledger, or ``None`` when calls are not recorded.
+    """
+    ledger_settings = ai_settings.ledger
+    if not ledger_settings.enabled:
+        return None
+    sink: LedgerSink
+    if ledger_settings.sink == "parquet":
+        sink = ParquetLedgerSink(
+            ledger_settings.parquet_directory,
+            rotate_rows=ledger_settings.rotate_rows,
+            rotate_interval_s=ledger_settings.rotate_interval_s,
+        )
+    else:
+        sink = PostgresLedgerSink(engine, table=ledger_settings.table)
+    return AILedger(
+        sink,
+        capacity=ledger_settings.capacity,
+        batch_size=ledger_settings.batch_size,
+        flush_interval_s=ledger_settings.flush_interval_s,
+    )
+
+
+def _build_latency_store(ai_settings: AISettings) -> LatencyStore | None:
+    """Create the configured persistence backend for learned timeouts.
+
+    Args:
+        ai_settings: Effective AI SDK settings.
+
+    Returns:
+        A Redis-backed store, or ``None`` to keep windows in memory only.
+    """
+    timeout_settings = ai_settings.adaptive_timeouts
+    if not timeout_settings.enabled or timeout_settings.persistence != "redis":
+        return None
+    return RedisLatencyStore(
+        redis_client, key=timeout_settings.redis_key, ttl_s=timeout_settings.ttl_s
+    )
+
+
+def _index_artifacts(artifacts: list[Artifact], *, start: int) -> list[Artifact]:
+    """Number artifacts by the position of the requested image they fulfil.
+
+    Args:
+        artifacts: Artifacts of one provider call, in provider order.
+        start: Index of the call's first requested image.
+
+    Returns:
+        Copies of the artifacts with ``index`` set.
+    """
+    return [
+        artifact.model_copy(update={"index": start + offset})
+        for offset, artifact in enumerate(artifacts)
+    ]
+
+
+def _build_provider_transport(
+    ai_settings: AISettings, dns_cache: DNSCache | None
+) -> httpx.AsyncBaseTransport | None:
+    """Create the DNS-caching, long keep-alive transport for one adapter.
+
+    Args:
+        ai_settings: Effective AI SDK settings.
+        dns_cache: Shared DNS cache, or ``None`` when warm-up is disabled.
+
+    Returns:
+        The transport, or ``None`` to keep the HTTPX default.
+    """
+    if dns_cache is None:
+        return None
+    return build_provider_transport(
+        dns_cache,
+        keepalive_expiry_s=ai_settings.warmup.keepalive_expiry_s,
+        max_keepalive_connections=ai_settings.warmup.max_keepalive_connections,
+    )
+
+
+def _build_connection_warmer(
+    ai_settings: AISettings,
+    registry: ModelRegistry,
+    adapters: dict[str, ProviderAdapter],
+    dns_cache: DNSCache | None,
+) -> ConnectionWarmer | None:
+    """Create the warmer for every configured HTTP provider.
+
+    Args:
+        ai_settings: Effective AI SDK settings.
+        registry: Registry listing provider endpoints.
+        adapters: Provider adapters keyed by provider name.
+        dns_cache: DNS cache shared by the adapter transports.
+
+    Returns:
+        A connection warmer, or ``None`` when warm-up is disabled.
+    """
+    warmup_settings = ai_settings.warmup
+    if not warmup_settings.enabled:
+        return None
+    targets = []
+    for provider in registry.list_providers():
+        adapter = adapters.get(provider.name)
+        http_client = adapter.http_client if adapter is not None else None
+        if http_client is None or not provider.api_key:
+            continue
+        if not provider.base_url.startswith(("http://", "https://")):
+            continue
+        targets.append(
+            WarmupTarget(
+                provider=provider.name, base_url=provider.base_url, http_client=http_client
+            )
+        )
+    if warmup_settings.ping_interval_s >= warmup_settings.keepalive_expiry_s:
+        log.warning(
+            f"AI warm-up ping interval ({warmup_settings.ping_interval_s}s) is not shorter "
+            f"than the keep-alive expiry ({warmup_settings.keepalive_expiry_s}s); "
+            "idle connections may close between pings"
+        )
+    return ConnectionWarmer(
+        targets,
+        connections_per_provider=warmup_settings.connections_per_provider,
+        ping_interval_s=warmup_settings.ping_interval_s,
+        timeout_s=warmup_settings.timeout_s,
+        dns_cache=dns_cache,
     )
 
 
@@ -781,6 +2088,18 @@ def get_ai_client() -> AIClient:
     return create_ai_client()
 
 
+async def start_ai_client() -> None:
+    """Create the shared async AI client and start its background tasks.
+
+    Args:
+        None.
+
+    Returns:
+        None.
+    """
+    await get_ai_client().start()
+
+
 async def close_ai_client() -> None:
     """Close the shared async AI client and clear the cache.
 
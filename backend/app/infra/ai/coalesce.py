@@ -0,0 +1,106 @@
+"""Merge small text deltas before they reach a client-facing transport."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from time import perf_counter
+
+from .prefetch import Prefetcher
+from .stream import AITextDeltaEvent, AnyAIStreamEvent
+
+
+def _merge_deltas(deltas: list[AITextDeltaEvent]) -> AITextDeltaEvent:
+    """Collapse consecutive deltas into one event.
+
+    Args:
+        deltas: Non-empty run of deltas from the same attempt.
+
+    Returns:
+        The last delta with the concatenated text of the whole run.
+    """
+    if len(deltas) == 1:
+        return deltas[0]
+    return deltas[-1].model_copy(update={"delta": "".join(delta.delta for delta in deltas)})
+
+
+async def coalesce_text_deltas(
+    events: AsyncIterator[AnyAIStreamEvent],
+    *,
+    max_delay_ms: float = 20.0,
+    max_chars: int = 64,
+    max_chars_ceiling: int = 1024,
+) -> AsyncIterator[AnyAIStreamEvent]:
+    """Merge runs of text deltas until a size or time threshold is hit.
+
+    The first delta passes through untouched so time-to-first-token is not
+    delayed. Later deltas are held for at most ``max_delay_ms`` or until
+    ``max_chars`` characters are buffered, whichever comes first; any other event
+    flushes the buffer and passes through in order. The size budget adapts to the
+    consumer: when handing a frame over takes longer than the delay window (a slow
+    client or congested socket), the budget doubles up to ``max_chars_ceiling``;
+    when the consumer keeps up again, it decays back to ``max_chars``. One task
+    reads the upstream at most one event ahead, so consumer backpressure still
+    reaches the provider stream and the SDK's span scopes stay in one context.
+
+    Args:
+        events: SDK stream events, typically ``ai_client.text.stream(...)``.
+        max_delay_ms: Longest time a delta may wait in the buffer.
+        max_chars: Base flush size in characters.
+        max_chars_ceiling: Largest flush size the adaptive budget may reach.
+
+    Returns:
+        An async iterator of stream events with merged deltas.
+    """
+    loop = asyncio.get_running_loop()
+    max_delay_s = max_delay_ms / 1000
+    prefetcher = Prefetcher(events)
+    buffered: list[AITextDeltaEvent] = []
+    buffered_chars = 0
+    deadline = 0.0
+    budget = max_chars
+    first_delta_sent = False
+    try:
+        while True:
+            timeout = max(deadline - loop.time(), 0.0) if buffered else None
+            ready = await prefetcher.wait(timeout)
+
+            flush = not ready
+            event: AnyAIStreamEvent | None = None
+            exhausted = False
+            if ready:
+                try:
+                    event = prefetcher.get_nowait()
+                except StopAsyncIteration:
+                    exhausted = True
+
+            if isinstance(event, AITextDeltaEvent) and first_delta_sent:
+                if not buffered:
+                    deadline = loop.time() + max_delay_s
+                buffered.append(event)
+                buffered_chars += len(event.delta)
+                flush = buffered_chars >= budget
+                event = None
+            elif event is not None or exhausted:
+                flush = True
+
+            if flush and buffered:
+                merged = _merge_deltas(buffered)
+                buffered = []
+                buffered_chars = 0
+                handoff_started = perf_counter()
+                yield merged
+                handoff_s = perf_counter() - handoff_started
+                if handoff_s > max_delay_s:
+                    budget = min(budget * 2, max_chars_ceiling)
+                elif handoff_s < max_delay_s / 4:
+                    budget = max(budget // 2, max_chars)
+
+            if exhausted:
+                return
+            if event is not None:
+                if isinstance(event, AITextDeltaEvent):
+                    first_delta_sent = True
+                yield event
+    finally:
+        await prefetcher.aclose()
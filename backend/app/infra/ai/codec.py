@@ -0,0 +1,118 @@
+"""Pluggable JSON codec for provider request bodies and response parsing.
+
+Provider adapters encode every request payload and parse every response body
+and stream chunk as JSON, which at high token rates is a visible share of CPU.
+:func:`get_json_codec` picks ``orjson`` or ``msgspec`` when installed and falls
+back to the standard library, so installing the ``fastjson`` extra speeds these
+paths up without changing any call site.
+
+Every codec writes compact UTF-8 JSON bytes, and a failed decode raises
+``ValueError``, as ``json.loads`` does. ``orjson`` and ``msgspec`` write ``NaN``
+as ``null`` where the standard library raises.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from .exceptions import AIConfigError
+
+JsonCodecName = Literal["auto", "orjson", "msgspec", "stdlib"]
+
+
+@dataclass(frozen=True, slots=True)
+class JsonCodec:
+    """Bundle the encode and decode functions of one JSON library."""
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes | str], Any]
+
+
+def _stdlib_codec() -> JsonCodec:
+    """Build the standard-library codec with the compact form HTTPX sends.
+
+    Args:
+        None.
+
+    Returns:
+        The ``json`` module codec.
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+    return JsonCodec(
+        name="stdlib", dumps=lambda value: encoder.encode(value).encode(), loads=json.loads
+    )
+
+
+def _orjson_codec() -> JsonCodec:
+    """Build the ``orjson`` codec.
+
+    Args:
+        None.
+
+    Returns:
+        The ``orjson`` codec.
+    """
+    import orjson
+
+    return JsonCodec(
+        name="orjson",
+        dumps=lambda value: orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS),
+        loads=orjson.loads,
+    )
+
+
+def _msgspec_codec() -> JsonCodec:
+    """Build the ``msgspec`` codec.
+
+    Args:
+        None.
+
+    Returns:
+        The ``msgspec`` codec.
+    """
+    import msgspec
+
+    return JsonCodec(
+        name="msgspec", dumps=msgspec.json.Encoder().encode, loads=msgspec.json.Decoder().decode
+    )
+
+
+_FACTORIES: dict[str, Callable[[], JsonCodec]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "stdlib": _stdlib_codec,
+}
+
+
+def get_json_codec(name: JsonCodecName = "auto") -> JsonCodec:
+    """Resolve a JSON codec by name.
+
+    Args:
+        name: Library to use; ``auto`` prefers ``orjson``, then ``msgspec``, then
+            the standard library.
+
+    Returns:
+        The selected codec.
+    """
+    if name != "auto":
+        try:
+            return _FACTORIES[name]()
+        except ImportError as exc:
+            raise AIConfigError(
+                f"JSON codec '{name}' requires the '{name}' package to be installed"
+            ) from exc
+
+    for candidate in ("orjson", "msgspec"):
+        try:
+            return _FACTORIES[candidate]()
+        except ImportError:
+            continue
+    return _stdlib_codec()
+
+
+# Used by adapters built without a codec.
+DEFAULT_JSON_CODEC = get_json_codec()
@@ -0,0 +1,449 @@
+"""Conversation compaction for long chat histories.
+
+``TextGenerateRequest.messages`` is otherwise forwarded verbatim, so prompt size,
+latency, and cost grow with every turn. The compactor keeps a request under a
+token budget while pinning the leading system messages and the most recent
+turns:
+
+- ``window`` drops the oldest unpinned messages until the prompt fits.
+- ``summarize`` replaces them with a rolling summary written by a cheaper model.
+  Summaries are cached per ``metadata["conversation_id"]`` together with a digest
+  of the messages they cover, so each turn only summarizes messages that are new
+  since the cached summary, and no summarization call is made while the cached
+  summary plus the uncovered messages still fit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass
+from time import time
+from typing import TYPE_CHECKING, Any, Literal
+
+from app.core import log
+
+from .exceptions import AIError
+from .requests import TextGenerateRequest, TextMessage, TextPart
+from .telemetry import AITelemetry
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+CompactionStrategy = Literal["window", "summarize"]
+CompactionOutcome = Literal["skipped", "over_budget", "windowed", "summary_reused", "summarized"]
+SummarizeFunction = Callable[[str | None, list[TextMessage], dict[str, Any]], Awaitable[str]]
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+# Rough per-message framing cost (role markers, separators) added by chat templates.
+_MESSAGE_OVERHEAD_TOKENS = 4
+# Providers bill a large image or document page at roughly this many tokens.
+_MEDIA_PART_TOKENS = 1_500
+
+
+def estimate_message_tokens(message: TextMessage) -> int:
+    """Approximate the prompt tokens one message costs.
+
+    Args:
+        message: Chat message.
+
+    Returns:
+        A positive token estimate using the common four-characters-per-token rule.
+    """
+    tokens = len(message.content) // 4 + _MESSAGE_OVERHEAD_TOKENS
+    for part in message.parts:
+        tokens += len(part.text) // 4 if isinstance(part, TextPart) else _MEDIA_PART_TOKENS
+    return tokens
+
+
+def digest_messages(messages: Sequence[TextMessage]) -> str:
+    """Fingerprint a message prefix so a cached summary can be validated.
+
+    Args:
+        messages: Messages covered by a summary.
+
+    Returns:
+        A hex SHA-256 digest of the roles, contents and content parts.
+    """
+    hasher = hashlib.sha256()
+    for message in messages:
+        hasher.update(message.role.encode())
+        hasher.update(b"\0")
+        hasher.update(message.content.encode())
+        hasher.update(b"\0")
+        for part in message.parts:
+            if isinstance(part, TextPart):
+                hasher.update(part.text.encode())
+            else:
+                hasher.update((part.url or part.digest).encode())
+            hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+@dataclass(slots=True)
+class ConversationSummary:
+    """Cache one rolling summary and the message prefix it covers."""
+
+    covered_count: int
+    covered_digest: str
+    text: str
+    updated_at: float
+
+    def to_json(self) -> str:
+        """Serialize the summary for persistence stores.
+
+        Args:
+            None.
+
+        Returns:
+            A compact JSON document.
+        """
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, payload: str) -> ConversationSummary:
+        """Restore a summary written by :meth:`to_json`.
+
+        Args:
+            payload: JSON document.
+
+        Returns:
+            The decoded summary.
+        """
+        return cls(**json.loads(payload))
+
+
+@dataclass(slots=True)
+class CompactionDecision:
+    """Describe what the compactor did to one request."""
+
+    strategy: CompactionStrategy
+    outcome: CompactionOutcome
+    original_messages: int
+    kept_messages: int
+    original_tokens: int
+    compacted_tokens: int
+    summarized_messages: int = 0
+
+
+class SummaryStore:
+    """Keep conversation summaries in process memory with LRU eviction."""
+
+    def __init__(self, *, max_conversations: int = 10_000) -> None:
+        """Configure the in-memory store.
+
+        Args:
+            max_conversations: Number of conversations kept before evicting the
+                least recently used one.
+
+        Returns:
+            None.
+        """
+        self._max_conversations = max(max_conversations, 1)
+        self._summaries: OrderedDict[str, ConversationSummary] = OrderedDict()
+
+    async def get(self, conversation_id: str) -> ConversationSummary | None:
+        """Return the cached summary of a conversation.
+
+        Args:
+            conversation_id: Caller-provided conversation identifier.
+
+        Returns:
+            The cached summary, or ``None``.
+        """
+        summary = self._summaries.get(conversation_id)
+        if summary is not None:
+            self._summaries.move_to_end(conversation_id)
+        return summary
+
+    async def put(self, conversation_id: str, summary: ConversationSummary) -> None:
+        """Cache the latest summary of a conversation.
+
+        Args:
+            conversation_id: Caller-provided conversation identifier.
+            summary: Summary to cache.
+
+        Returns:
+            None.
+        """
+        self._summaries[conversation_id] = summary
+        self._summaries.move_to_end(conversation_id)
+        while len(self._summaries) > self._max_conversations:
+            self._summaries.popitem(last=False)
+
+
+class RedisSummaryStore(SummaryStore):
+    """Share conversation summaries across workers through Redis."""
+
+    def __init__(
+        self, redis: Redis, *, key_prefix: str = "ello:ai:compaction", ttl_s: int = 86_400
+    ) -> None:
+        """Bind the store to a Redis client.
+
+        Args:
+            redis: Async Redis client created with ``decode_responses=True``.
+            key_prefix: Prefix for per-conversation keys.
+            ttl_s: Idle lifetime of one summary in seconds.
+
+        Returns:
+            None.
+        """
+        self._redis = redis
+        self._key_prefix = key_prefix
+        self._ttl_s = ttl_s
+
+    async def get(self, conversation_id: str) -> ConversationSummary | None:
+        """Load the cached summary of a conversation.
+
+        Args:
+            conversation_id: Caller-provided conversation identifier.
+
+        Returns:
+            The cached summary, or ``None``.
+        """
+        payload = await self._redis.get(f"{self._key_prefix}:{conversation_id}")
+        return ConversationSummary.from_json(payload) if payload else None
+
+    async def put(self, conversation_id: str, summary: ConversationSummary) -> None:
+        """Store the latest summary of a conversation.
+
+        Args:
+            conversation_id: Caller-provided conversation identifier.
+            summary: Summary to store.
+
+        Returns:
+            None.
+        """
+        await self._redis.set(
+            f"{self._key_prefix}:{conversation_id}", summary.to_json(), ex=self._ttl_s
+        )
+
+
+class ConversationCompactor:
+    """Shrink chat requests to a token budget before they reach a provider."""
+
+    def __init__(
+        self,
+        *,
+        telemetry: AITelemetry,
+        strategy: CompactionStrategy = "window",
+        max_prompt_tokens: int = 8_000,
+        keep_recent_messages: int = 6,
+        summarize: SummarizeFunction | None = None,
+        store: SummaryStore | None = None,
+    ) -> None:
+        """Configure the compactor.
+
+        Args:
+            telemetry: Telemetry helper that records compaction decisions.
+            strategy: ``window`` or ``summarize``.
+            max_prompt_tokens: Estimated prompt budget per request.
+            keep_recent_messages: Trailing messages that are never dropped or
+                summarized.
+            summarize: Callback that folds new messages into an existing summary;
+                required for the ``summarize`` strategy.
+            store: Summary cache; defaults to an in-memory LRU.
+
+        Returns:
+            None.
+        """
+        if strategy == "summarize" and summarize is None:
+            raise ValueError("The summarize strategy needs a summarize callback")
+        self._telemetry = telemetry
+        self._strategy = strategy
+        self._max_prompt_tokens = max_prompt_tokens
+        self._keep_recent = max(keep_recent_messages, 1)
+        self._summarize = summarize
+        self._store = store or SummaryStore()
+
+    async def compact(
+        self, request: TextGenerateRequest
+    ) -> tuple[TextGenerateRequest, CompactionDecision]:
+        """Fit one request into the prompt budget.
+
+        Args:
+            request: Text generation request with the full conversation.
+
+        Returns:
+            The request to send, unchanged when it already fits, and the decision.
+        """
+        messages = request.messages
+        costs = [estimate_message_tokens(message) for message in messages]
+        total = sum(costs)
+        head = 0
+        while head < len(messages) and messages[head].role == "system":
+            head += 1
+        tail = max(len(messages) - self._keep_recent, head)
+        # Tool results must stay next to the assistant turn that requested them.
+        while tail > head and messages[tail].role == "tool":
+            tail -= 1
+
+        if total <= self._max_prompt_tokens:
+            return self._report(request, request, "skipped")
+        if tail == head:
+            # Only pinned messages are left; there is nothing to drop or summarize.
+            return self._report(request, request, "over_budget")
+
+        conversation_id = request.metadata.get("conversation_id")
+        if self._strategy == "summarize" and conversation_id:
+            try:
+                compacted, outcome, summarized = await self._summarize_prefix(
+                    request, str(conversation_id), costs, head, tail
+                )
+            except AIError as exc:
+                # Summaries are an optimization; fall back to the window on failure.
+                log.warning(f"Conversation summarization failed, using window: {exc.message}")
+            else:
+                return self._report(request, compacted, outcome, summarized)
+        return self._report(request, self._window(request, costs, head, tail), "windowed")
+
+    def _window(
+        self, request: TextGenerateRequest, costs: list[int], head: int, tail: int
+    ) -> TextGenerateRequest:
+        """Drop the oldest unpinned messages until the prompt fits.
+
+        Args:
+            request: Original request.
+            costs: Estimated tokens per message.
+            head: Number of leading system messages.
+            tail: Index of the first pinned recent message.
+
+        Returns:
+            The windowed request.
+        """
+        budget = self._max_prompt_tokens - sum(costs[:head]) - sum(costs[tail:])
+        start = tail
+        while start > head and costs[start - 1] <= budget:
+            budget -= costs[start - 1]
+            start -= 1
+        while start < tail and request.messages[start].role == "tool":
+            start += 1
+        return self._build(request, head, start, summary=None)
+
+    async def _summarize_prefix(
+        self,
+        request: TextGenerateRequest,
+        conversation_id: str,
+        costs: list[int],
+        head: int,
+        tail: int,
+    ) -> tuple[TextGenerateRequest, CompactionOutcome, int]:
+        """Replace unpinned history with a cached or incrementally updated summary.
+
+        Args:
+            request: Original request.
+            conversation_id: Conversation whose summary is cached.
+            costs: Estimated tokens per message.
+            head: Number of leading system messages.
+            tail: Index of the first pinned recent message.
+
+        Returns:
+            The compacted request, the outcome, and how many messages were newly
+            summarized.
+        """
+        messages = request.messages
+        cached = await self._store.get(conversation_id)
+        if (
+            cached is not None
+            and head < cached.covered_count <= tail
+            and digest_messages(messages[: cached.covered_count]) == cached.covered_digest
+        ):
+            summary_cost = estimate_message_tokens(_summary_message(cached.text))
+            uncovered = sum(costs[cached.covered_count :])
+            fits = sum(costs[:head]) + summary_cost + uncovered <= self._max_prompt_tokens
+            if fits or cached.covered_count == tail:
+                compacted = self._build(request, head, cached.covered_count, summary=cached.text)
+                return compacted, "summary_reused", 0
+            previous, start = cached.text, cached.covered_count
+        else:
+            previous, start = None, head
+
+        assert self._summarize is not None
+        text = await self._summarize(previous, messages[start:tail], request.metadata)
+        await self._store.put(
+            conversation_id,
+            ConversationSummary(
+                covered_count=tail,
+                covered_digest=digest_messages(messages[:tail]),
+                text=text,
+                updated_at=time(),
+            ),
+        )
+        return self._build(request, head, tail, summary=text), "summarized", tail - start
+
+    def _build(
+        self,
+        request: TextGenerateRequest,
+        head: int,
+        start: int,
+        *,
+        summary: str | None,
+    ) -> TextGenerateRequest:
+        """Assemble pinned system messages, an optional summary, and kept history.
+
+        Args:
+            request: Original request.
+            head: Number of leading system messages.
+            start: Index of the first kept unpinned message.
+            summary: Summary replacing ``messages[head:start]``, if any.
+
+        Returns:
+            The compacted request.
+        """
+        messages = list(request.messages[:head])
+        if summary is not None:
+            messages.append(_summary_message(summary))
+        messages.extend(request.messages[start:])
+        return request.model_copy(update={"messages": messages})
+
+    def _report(
+        self,
+        request: TextGenerateRequest,
+        compacted: TextGenerateRequest,
+        outcome: CompactionOutcome,
+        summarized_messages: int = 0,
+    ) -> tuple[TextGenerateRequest, CompactionDecision]:
+        """Describe and record one compaction decision.
+
+        Args:
+            request: Original request.
+            compacted: Request that will be sent.
+            outcome: What the compactor did.
+            summarized_messages: Messages newly folded into the summary.
+
+        Returns:
+            The compacted request and its decision.
+        """
+        decision = CompactionDecision(
+            strategy=self._strategy,
+            outcome=outcome,
+            original_messages=len(request.messages),
+            kept_messages=len(compacted.messages),
+            original_tokens=sum(estimate_message_tokens(m) for m in request.messages),
+            compacted_tokens=sum(estimate_message_tokens(m) for m in compacted.messages),
+            summarized_messages=summarized_messages,
+        )
+        self._telemetry.record_compaction(
+            provider=request.provider,
+            model=request.model,
+            strategy=decision.strategy,
+            outcome=decision.outcome,
+            original_tokens=decision.original_tokens,
+            compacted_tokens=decision.compacted_tokens,
+        )
+        return compacted, decision
+
+
+def _summary_message(text: str) -> TextMessage:
+    """Wrap a summary as the system message that replaces older turns.
+
+    Args:
+        text: Summary text.
+
+    Returns:
+        The system message inserted after the pinned system prompt.
+    """
+    return TextMessage(role="system", content=f"{SUMMARY_PREFIX}{text}")
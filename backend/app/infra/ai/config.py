@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -19,6 +21,193 @@ class AIAnthropicSettings(AIProviderSettings):
     api_version: str = "2023-06-01"
 
 
+class AISpoolSettings(BaseModel):
+    """Control disk spooling of large audio and image artifacts."""
+
+    enabled: bool = False
+    directory: str | None = None
+    inline_threshold_bytes: int = 1024 * 1024
+    chunk_size_bytes: int = 64 * 1024
+
+
+class AIDecodeSettings(BaseModel):
+    """Control decoding of large provider responses off the event loop."""
+
+    enabled: bool = False
+    threshold_bytes: int = 256 * 1024
+    max_workers: int = 2
+    slice_bytes: int = 256 * 1024
+
+
+class AIMockSettings(BaseModel):
+    """Control the offline mock provider registered as ``mock``."""
+
+    enabled: bool = False
+    seed: int = 0
+    latency_kind: Literal["fixed", "uniform", "lognormal"] = "fixed"
+    latency_ms: float = 0.0
+    latency_spread_ms: float = 0.0
+    tokens_per_second: float = 0.0
+    output_tokens: int = 16
+    rate_limit_rate: float = 0.0
+    server_error_rate: float = 0.0
+    stall_rate: float = 0.0
+    stall_ms: float = 30_000.0
+
+
+class AISemanticCacheSettings(BaseModel):
+    """Control the embedding-backed response cache for ``text.generate``."""
+
+    enabled: bool = False
+    embedding_provider: str = "openai"
+    embedding_model: str = "text-embedding-3-small"
+    similarity_threshold: float = 0.92
+    ttl_s: float = 3600.0
+    max_entries_per_partition: int = 1000
+    max_entries: int = 10000
+    sweep_interval_s: float = 60.0
+    verify_sample_rate: float = 0.0
+    persistence: Literal["none", "disk", "redis"] = "none"
+    disk_path: str = ".cache/ai-semantic-cache.jsonl"
+    redis_key_prefix: str = "ai:semantic-cache"
+
+
+class AIStreamCoalesceSettings(BaseModel):
+    """Control merging of small text deltas on client-facing streams."""
+
+    enabled: bool = True
+    max_delay_ms: float = 20.0
+    max_chars: int = 64
+    max_chars_ceiling: int = 1024
+
+
+class AIStreamMultiplexSettings(BaseModel):
+    """Control the WebSocket endpoint that multiplexes chat streams."""
+
+    max_streams_per_connection: int = 32
+    initial_credit: int = 64
+
+
+class AIStreamBrokerSettings(BaseModel):
+    """Control resumable text streams buffered in Redis Streams."""
+
+    enabled: bool = False
+    key_prefix: str = "ello:ai:stream"
+    max_len: int = 4096
+    ttl_s: int = 900
+    block_ms: int = 5000
+
+
+class AICompactionSettings(BaseModel):
+    """Control conversation compaction for ``text.generate`` and ``text.stream``."""
+
+    enabled: bool = False
+    strategy: Literal["window", "summarize"] = "window"
+    max_prompt_tokens: int = 8000
+    keep_recent_messages: int = 6
+    summary_provider: str = "openai"
+    summary_model: str = "gpt-4o-mini"
+    summary_max_tokens: int = 512
+    persistence: Literal["memory", "redis"] = "memory"
+    max_conversations: int = 10_000
+    redis_key_prefix: str = "ello:ai:compaction"
+    ttl_s: int = 86_400
+
+
+class AIWarmupSettings(BaseModel):
+    """Control provider connection pre-warming and DNS caching at startup."""
+
+    enabled: bool = False
+    connections_per_provider: int = 2
+    ping_interval_s: float = 30.0
+    timeout_s: float = 5.0
+    keepalive_expiry_s: float = 120.0
+    max_keepalive_connections: int = 20
+    dns_ttl_s: float = 300.0
+
+
+class AIAdaptiveTimeoutSettings(BaseModel):
+    """Control per-route timeouts learned from observed latency."""
+
+    enabled: bool = False
+    quantile: float = 0.99
+    multiplier: float = 2.0
+    floor_ms: int = 1_000
+    ceiling_ms: int = 300_000
+    min_samples: int = 20
+    window_size: int = 512
+    persistence: Literal["memory", "redis"] = "memory"
+    redis_key: str = "ello:ai:timeouts"
+    persist_interval_s: float = 30.0
+    ttl_s: int = 604_800
+
+
+class AISchedulerSettings(BaseModel):
+    """Control weighted fair queueing of provider calls by priority class and tenant."""
+
+    enabled: bool = False
+    max_concurrency_per_provider: int = 64
+    interactive_weight: float = 8.0
+    background_weight: float = 2.0
+    batch_weight: float = 1.0
+    tenant_weights: dict[str, float] = Field(default_factory=dict)
+    default_priority: Literal["interactive", "background", "batch"] = "interactive"
+    max_queue: int = 1_000
+    max_queue_per_tenant: int = 100
+    max_wait_ms: int = 30_000
+
+
+class AIQuotaSettings(BaseModel):
+    """Control per-tenant and per-principal quotas; ``0`` leaves a limit unset."""
+
+    enabled: bool = False
+    tenant_daily_tokens: int = 0
+    tenant_monthly_tokens: int = 0
+    tenant_daily_requests: int = 0
+    tenant_monthly_requests: int = 0
+    principal_daily_tokens: int = 0
+    principal_monthly_tokens: int = 0
+    principal_daily_requests: int = 0
+    principal_monthly_requests: int = 0
+    default_output_tokens: int = 1024
+    key_prefix: str = "ello:ai:quota"
+    reject_cache_s: float = 5.0
+
+
+class AIIdempotencySettings(BaseModel):
+    """Control the Redis result store behind ``AIRequest.idempotency_key``."""
+
+    enabled: bool = False
+    key_prefix: str = "ello:ai:idempotency"
+    result_ttl_s: int = 86_400
+    lock_ttl_s: int = 600
+    poll_interval_ms: int = 50
+    max_poll_interval_ms: int = 1_000
+
+
+class AILedgerSettings(BaseModel):
+    """Control the append-only ledger of finished AI calls."""
+
+    enabled: bool = False
+    sink: Literal["postgres", "parquet"] = "postgres"
+    capacity: int = 10_000
+    batch_size: int = 500
+    flush_interval_s: float = 5.0
+    table: str = "ai_call_ledger"
+    parquet_directory: str = ".cache/ai-ledger"
+    rotate_rows: int = 100_000
+    rotate_interval_s: float = 3_600.0
+
+
+class AIUploadSettings(BaseModel):
+    """Control provider file uploads for large image and document inputs."""
+
+    enabled: bool = False
+    key_prefix: str = "ello:ai:upload"
+    ttl_s: int = 86_400
+    min_bytes: int = 262_144
+
+
 class AISettings(BaseSettings):
     """Store global AI SDK settings and provider runtime credentials."""
 
@@ -36,7 +225,30 @@ class AISettings(BaseSettings):
     default_timeout_ms: int = 60_000
     technical_retry_count: int = 1
     technical_retry_backoff_ms: int = 250
+    stream_stats_window: int = 512
+    audio_stream_segment_chars: int = 400
+    audio_stream_concurrency: int = 3
+    image_fan_out_concurrency: int = 4
+    json_codec: Literal["auto", "orjson", "msgspec", "stdlib"] = "auto"
+    catalog_path: str | None = None
+    catalog_reload_interval_s: float = 5.0
+    stream_heartbeat_s: float = 15.0
 
     openai: AIProviderSettings = Field(default_factory=AIProviderSettings)
     anthropic: AIAnthropicSettings = Field(default_factory=AIAnthropicSettings)
     gemini: AIProviderSettings = Field(default_factory=AIProviderSettings)
+    spool: AISpoolSettings = Field(default_factory=AISpoolSettings)
+    decode: AIDecodeSettings = Field(default_factory=AIDecodeSettings)
+    mock: AIMockSettings = Field(default_factory=AIMockSettings)
+    semantic_cache: AISemanticCacheSettings = Field(default_factory=AISemanticCacheSettings)
+    stream_coalesce: AIStreamCoalesceSettings = Field(default_factory=AIStreamCoalesceSettings)
+    stream_multiplex: AIStreamMultiplexSettings = Field(default_factory=AIStreamMultiplexSettings)
+    stream_broker: AIStreamBrokerSettings = Field(default_factory=AIStreamBrokerSettings)
+    compaction: AICompactionSettings = Field(default_factory=AICompactionSettings)
+    warmup: AIWarmupSettings = Field(default_factory=AIWarmupSettings)
+    adaptive_timeouts: AIAdaptiveTimeoutSettings = Field(default_factory=AIAdaptiveTimeoutSettings)
+    scheduler: AISchedulerSettings = Field(default_factory=AISchedulerSettings)
+    quota: AIQuotaSettings = Field(default_factory=AIQuotaSettings)
+    idempotency: AIIdempotencySettings = Field(default_factory=AIIdempotencySettings)
+    ledger: AILedgerSettings = Field(default_factory=AILedgerSettings)
+    uploads: AIUploadSettings = Field(default_factory=AIUploadSettings)
@@ -0,0 +1,174 @@
+"""Decode large provider payloads on a thread pool instead of the event loop.
+
+Parsing a multi-megabyte image or embedding response and decoding its base64
+data inline stalls every other coroutine of the worker for tens of
+milliseconds. :class:`PayloadDecoder` runs payloads at or above
+``threshold_bytes`` on a small thread pool. Smaller payloads still decode inline
+because the thread handoff would cost more than it saves.
+
+A single C call such as ``json.loads`` or ``base64.b64decode`` keeps the GIL
+until it returns, so a thread alone only helps when the work is split. Base64
+is therefore decoded in ``slice_bytes`` pieces and embeddings row by row, which
+lets the event loop run between slices. ``json.loads`` cannot be split and
+mainly benefits on free-threaded builds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any
+
+import httpx
+from opentelemetry import metrics
+
+from .codec import DEFAULT_JSON_CODEC, JsonCodec
+from .embedding_matrix import EmbeddingMatrix
+
+
+def decode_base64_sliced(data: str | bytes, slice_bytes: int) -> bytes:
+    """Decode base64 in group-aligned slices so the GIL is released between them.
+
+    Args:
+        data: Base64-encoded payload.
+        slice_bytes: Decoded bytes produced per slice.
+
+    Returns:
+        The decoded bytes.
+    """
+    # Base64 decodes in 4-character groups, so each slice must stay group-aligned.
+    step = max(slice_bytes // 3, 1) * 4
+    if len(data) <= step:
+        return base64.b64decode(data)
+    return b"".join(
+        base64.b64decode(data[offset : offset + step]) for offset in range(0, len(data), step)
+    )
+
+
+class PayloadDecoder:
+    """Route large JSON, base64, and embedding payloads through a thread pool."""
+
+    def __init__(
+        self,
+        *,
+        threshold_bytes: int | None = 256 * 1024,
+        max_workers: int = 2,
+        slice_bytes: int = 256 * 1024,
+    ) -> None:
+        """Configure when and where payloads are decoded.
+
+        Args:
+            threshold_bytes: Smallest payload decoded off the event loop, or
+                ``None`` to always decode inline.
+            max_workers: Threads of the decoding pool.
+            slice_bytes: Decoded bytes per base64 slice.
+
+        Returns:
+            None.
+        """
+        self._threshold_bytes = threshold_bytes
+        self._max_workers = max_workers
+        self._slice_bytes = slice_bytes
+        self._executor: ThreadPoolExecutor | None = None
+        meter = metrics.get_meter("app.infra.ai")
+        self._offloaded_bytes = meter.create_counter("ai.decode.offloaded_bytes")
+        self._time_saved = meter.create_histogram("ai.decode.time_saved.ms")
+
+    async def json(self, response: httpx.Response, *, codec: JsonCodec = DEFAULT_JSON_CODEC) -> Any:
+        """Parse a provider response body as JSON.
+
+        Args:
+            response: Completed HTTPX response.
+            codec: JSON codec of the calling adapter.
+
+        Returns:
+            The parsed JSON value.
+        """
+        content = response.content
+        return await self.run("json", len(content), codec.loads, content)
+
+    async def b64decode(self, data: str) -> bytes:
+        """Decode a base64 payload such as an inline image.
+
+        Args:
+            data: Base64-encoded payload.
+
+        Returns:
+            The decoded bytes.
+        """
+        return await self.run("base64", len(data), decode_base64_sliced, data, self._slice_bytes)
+
+    async def embedding_matrix(
+        self, rows: Sequence[str | Sequence[float]], *, size: int
+    ) -> EmbeddingMatrix:
+        """Decode provider embedding rows into a float32 matrix.
+
+        Args:
+            rows: Provider embedding payloads, one per input.
+            size: Size of the response body the rows came from, in bytes.
+
+        Returns:
+            A float32 embedding matrix.
+        """
+        return await self.run("embedding", size, EmbeddingMatrix.from_provider_rows, rows)
+
+    async def run[T](self, kind: str, size: int, decode: Callable[..., T], *args: Any) -> T:
+        """Run a decode step inline or on the pool depending on payload size.
+
+        Args:
+            kind: Metric label of the step, such as ``json`` or ``base64``.
+            size: Payload size in bytes.
+            decode: Synchronous decode function.
+            *args: Arguments for ``decode``.
+
+        Returns:
+            The result of ``decode``.
+        """
+        if self._threshold_bytes is None or size < self._threshold_bytes:
+            return decode(*args)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="ai-decode"
+            )
+        result, elapsed_s = await asyncio.get_running_loop().run_in_executor(
+            self._executor, _timed, decode, args
+        )
+        attributes = {"ai.decode.kind": kind}
+        self._offloaded_bytes.add(size, attributes)
+        self._time_saved.record(elapsed_s * 1000, attributes)
+        return result
+
+    def close(self) -> None:
+        """Shut the pool down; the next offloaded payload starts a new one.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def _timed[T](decode: Callable[..., T], args: tuple[Any, ...]) -> tuple[T, float]:
+    """Run a decode step and measure how long it held the worker thread.
+
+    Args:
+        decode: Synchronous decode function.
+        args: Arguments for ``decode``.
+
+    Returns:
+        The result and the elapsed seconds.
+    """
+    started_at = perf_counter()
+    result = decode(*args)
+    return result, perf_counter() - started_at
+
+
+# Used by adapters built without a decoder; it never leaves the event loop.
+INLINE_DECODER = PayloadDecoder(threshold_bytes=None)
@@ -0,0 +1,278 @@
+"""Array-backed embedding batches.
+
+A ``list[list[float]]`` costs roughly 32 bytes per dimension in Python objects;
+the same batch as a row-major float32 array costs 4, an int8 array 1, and a
+sign-bit array 1/8. NumPy is an optional dependency (``pip install
+ello-bot[embeddings]``) and is only imported when an array-backed batch is built.
+"""
+
+from __future__ import annotations
+
+import base64
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Literal
+
+from .exceptions import AIConfigError
+
+if TYPE_CHECKING:
+    import numpy as np
+
+VectorFormat = Literal["list", "float32", "int8", "binary"]
+
+
+def _numpy() -> Any:
+    """Import NumPy or explain which extra provides it.
+
+    Args:
+        None.
+
+    Returns:
+        The ``numpy`` module.
+    """
+    try:
+        import numpy
+    except ImportError as exc:
+        raise AIConfigError(
+            "Array-backed embeddings require NumPy; install the 'embeddings' extra"
+        ) from exc
+    return numpy
+
+
+class EmbeddingMatrix:
+    """Hold one embedding batch as a single contiguous, read-only NumPy array.
+
+    Row ``i`` belongs to input ``i``. ``float32`` batches store the vectors as
+    returned by the provider. ``int8`` batches store symmetric per-row quantized
+    values plus one float32 scale per row, so ``array[i] * scales[i]`` approximates
+    the original vector. ``binary`` batches store one sign bit per dimension packed
+    into ``uint8`` bytes, which suits Hamming-distance prefilters.
+    """
+
+    __slots__ = ("_array", "_dimensions", "_format", "_scales")
+
+    def __init__(
+        self,
+        array: np.ndarray,
+        *,
+        format: VectorFormat = "float32",
+        dimensions: int | None = None,
+        scales: np.ndarray | None = None,
+    ) -> None:
+        """Wrap an already encoded array.
+
+        Args:
+            array: Two-dimensional array in the encoding named by ``format``.
+            format: Encoding of ``array``; ``list`` is not an array encoding.
+            dimensions: Embedding width; required for ``binary`` batches, whose
+                packed rows are shorter than the embedding.
+            scales: Per-row dequantization scales for ``int8`` batches.
+
+        Returns:
+            None.
+        """
+        np = _numpy()
+        dtypes = {"float32": np.float32, "int8": np.int8, "binary": np.uint8}
+        if format not in dtypes:
+            raise ValueError(f"Unsupported embedding matrix format {format!r}")
+        array = np.ascontiguousarray(array, dtype=dtypes[format])
+        if array.ndim != 2:
+            raise ValueError("Embedding matrix must be two-dimensional")
+        if (format == "int8") != (scales is not None):
+            raise ValueError("Per-row scales are required for, and only for, int8 batches")
+        if format == "binary" and dimensions is None:
+            raise ValueError("Binary embedding batches need the original dimensions")
+        array.flags.writeable = False
+        if scales is not None:
+            scales = np.ascontiguousarray(scales, dtype=np.float32)
+            scales.flags.writeable = False
+        self._array = array
+        self._format: VectorFormat = format
+        self._dimensions = dimensions if dimensions is not None else array.shape[1]
+        self._scales = scales
+
+    @classmethod
+    def from_vectors(cls, vectors: Sequence[Sequence[float]]) -> EmbeddingMatrix:
+        """Pack plain vectors into a float32 batch.
+
+        Args:
+            vectors: Equal-length vectors, one per input.
+
+        Returns:
+            A float32 embedding matrix.
+        """
+        np = _numpy()
+        if not vectors:
+            return cls(np.zeros((0, 0), dtype=np.float32))
+        return cls(np.asarray(vectors, dtype=np.float32))
+
+    @classmethod
+    def from_provider_rows(cls, rows: Sequence[str | Sequence[float]]) -> EmbeddingMatrix:
+        """Decode provider embeddings directly into one preallocated float32 array.
+
+        Rows may be base64 strings of little-endian float32 values (the OpenAI
+        ``encoding_format="base64"`` wire form) or plain number lists from servers
+        that ignore that option. No per-value Python floats are created for base64
+        rows.
+
+        Args:
+            rows: Provider embedding payloads, one per input.
+
+        Returns:
+            A float32 embedding matrix.
+        """
+        np = _numpy()
+        if not rows:
+            return cls(np.zeros((0, 0), dtype=np.float32))
+
+        def decode(row: str | Sequence[float]) -> Any:
+            if isinstance(row, str):
+                return np.frombuffer(base64.b64decode(row), dtype="<f4")
+            return row
+
+        first = decode(rows[0])
+        array = np.empty((len(rows), len(first)), dtype=np.float32)
+        array[0] = first
+        for index in range(1, len(rows)):
+            values = decode(rows[index])
+            if len(values) != array.shape[1]:
+                raise ValueError("Provider returned inconsistent embedding dimensions")
+            array[index] = values
+        return cls(array)
+
+    @property
+    def format(self) -> VectorFormat:
+        """Return the array encoding.
+
+        Args:
+            None.
+
+        Returns:
+            ``float32``, ``int8``, or ``binary``.
+        """
+        return self._format
+
+    @property
+    def array(self) -> np.ndarray:
+        """Return the backing array without copying.
+
+        Args:
+            None.
+
+        Returns:
+            The read-only, C-contiguous array of shape ``(rows, width)``.
+        """
+        return self._array
+
+    @property
+    def scales(self) -> np.ndarray | None:
+        """Return per-row dequantization scales.
+
+        Args:
+            None.
+
+        Returns:
+            A read-only float32 array for ``int8`` batches, otherwise ``None``.
+        """
+        return self._scales
+
+    @property
+    def dimensions(self) -> int:
+        """Return the embedding width.
+
+        Args:
+            None.
+
+        Returns:
+            The number of dimensions per vector, including for packed batches.
+        """
+        return self._dimensions
+
+    def __len__(self) -> int:
+        """Return the number of vectors.
+
+        Args:
+            None.
+
+        Returns:
+            The row count.
+        """
+        return self._array.shape[0]
+
+    def __array__(self, dtype: Any = None, copy: bool | None = None) -> np.ndarray:
+        """Expose the backing array to ``numpy.asarray`` without copying.
+
+        Args:
+            dtype: Optional target dtype requested by NumPy.
+            copy: NumPy copy hint.
+
+        Returns:
+            The backing array, converted only when ``dtype`` or ``copy`` demands it.
+        """
+        if dtype is None and not copy:
+            return self._array
+        return self._array.astype(dtype or self._array.dtype, copy=True)
+
+    def buffer(self) -> memoryview:
+        """Return a zero-copy buffer over the backing array.
+
+        Args:
+            None.
+
+        Returns:
+            A read-only ``memoryview`` suitable for ``bytes``-oriented storage APIs.
+        """
+        return memoryview(self._array)
+
+    def quantize(self, format: VectorFormat) -> EmbeddingMatrix:
+        """Re-encode a float32 batch into a more compact form.
+
+        Args:
+            format: Target encoding: ``float32`` (no-op), ``int8``, or ``binary``.
+
+        Returns:
+            An embedding matrix in the requested encoding.
+        """
+        if format == self._format:
+            return self
+        if self._format != "float32":
+            raise ValueError("Only float32 embedding batches can be quantized")
+        np = _numpy()
+        if format == "int8":
+            peaks = np.abs(self._array).max(axis=1) if self._array.size else np.zeros(len(self))
+            scales = np.where(peaks > 0, peaks / 127.0, 1.0).astype(np.float32)
+            quantized = np.rint(self._array / scales[:, None]).astype(np.int8)
+            return EmbeddingMatrix(quantized, format="int8", scales=scales)
+        if format == "binary":
+            packed = np.packbits(self._array > 0, axis=1)
+            return EmbeddingMatrix(packed, format="binary", dimensions=self._dimensions)
+        raise ValueError(f"Cannot quantize embeddings to {format!r}")
+
+    def to_float32(self) -> np.ndarray:
+        """Return float32 vectors, dequantizing when needed.
+
+        Args:
+            None.
+
+        Returns:
+            The backing array for float32 batches; otherwise a new float32 array
+            with ``int8`` values rescaled and ``binary`` bits mapped to ``±1``.
+        """
+        np = _numpy()
+        if self._format == "float32":
+            return self._array
+        if self._format == "int8":
+            return self._array.astype(np.float32) * self._scales[:, None]
+        bits = np.unpackbits(self._array, axis=1, count=self._dimensions)
+        return bits.astype(np.float32) * 2 - 1
+
+    def tolist(self) -> list[list[float]]:
+        """Materialize the batch as plain Python lists.
+
+        Args:
+            None.
+
+        Returns:
+            One list of floats per input; quantized batches return their
+            dequantized approximation.
+        """
+        return self.to_float32().tolist()
@@ -149,6 +149,24 @@ class AIProviderUnavailableError(AIError):
     default_retryable = True
 
 
+class AIOverloadedError(AIError):
+    """Raise when the local scheduler sheds a call instead of queueing it."""
+
+    default_code = "AI_OVERLOADED_ERROR"
+
+
+class AIQuotaExceededError(AIError):
+    """Raise when a tenant or principal has used up a token or request quota."""
+
+    default_code = "AI_QUOTA_EXCEEDED_ERROR"
+
+
+class AIIdempotencyConflictError(AIError):
+    """Raise when an idempotency key is reused for a different request."""
+
+    default_code = "AI_IDEMPOTENCY_CONFLICT_ERROR"
+
+
 class AIUnsupportedCapabilityError(AIError):
     """Raise when the selected model or provider lacks a requested capability."""
 
@@ -172,3 +190,9 @@ class AIRequestCancelledError(AIError):
     """Raise when request execution is cancelled by the caller."""
 
     default_code = "AI_REQUEST_CANCELLED"
+
+
+class AIOutputParseError(AIError):
+    """Raise when structured model output cannot be parsed."""
+
+    default_code = "AI_OUTPUT_PARSE_ERROR"
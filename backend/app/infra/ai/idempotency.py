@@ -0,0 +1,269 @@
+"""Durable idempotency for non-streaming AI calls, shared across workers via Redis.
+
+A caller that retries after a timeout would otherwise pay for a second
+generation. :class:`IdempotencyStore` claims the request's idempotency key with
+``SET NX`` before dispatch and replaces the in-progress marker with the finished
+response. A retry with the same key and request either returns the stored
+response or waits for the call already in flight, on this worker or another one,
+without touching the provider. A failed call releases its key so the next retry
+runs again, and a marker whose owner died expires after ``lock_ttl_s``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from app.core import log
+
+from .exceptions import AIIdempotencyConflictError
+from .requests import AIRequest
+from .responses import AIResponse, EmbeddingResponse
+from .types import ArtifactKind
+
+# Deletes the in-progress marker only while this caller still owns it.
+_RELEASE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current and cjson.decode(current)['owner'] == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def request_fingerprint(request: AIRequest) -> str:
+    """Hash the parts of a request that decide its result.
+
+    Args:
+        request: Normalized SDK request.
+
+    Returns:
+        A hex digest that ignores the idempotency key and metadata.
+    """
+    payload = request.model_dump_json(exclude={"idempotency_key", "metadata"})
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def _dump_response(response: AIResponse) -> dict[str, Any]:
+    """Convert a response into JSON-safe data.
+
+    Spooled ``FILE`` artifacts point at a temporary file on this worker, which
+    a replay on another worker, or after cleanup, could not read. Their content
+    is inlined so the stored response is self-contained.
+
+    Args:
+        response: Response to store.
+
+    Returns:
+        The response fields with binary artifact content encoded as base64.
+    """
+    data = response.model_dump()
+    for artifact in data.get("artifacts", ()):
+        if artifact["kind"] == ArtifactKind.FILE and artifact["path"] is not None:
+            artifact["content"] = await asyncio.to_thread(Path(artifact["path"]).read_bytes)
+            artifact["kind"], artifact["path"] = ArtifactKind.BINARY, None
+        if artifact["content"] is not None:
+            artifact["content"] = base64.b64encode(artifact["content"]).decode()
+    return data
+
+
+def _load_response[ResponseT: AIResponse](
+    response_type: type[ResponseT], data: dict[str, Any]
+) -> ResponseT:
+    """Rebuild a response stored by :func:`_dump_response`.
+
+    Args:
+        response_type: Response model of the operation.
+        data: Stored response fields.
+
+    Returns:
+        The validated response; array-backed embeddings get their matrix back.
+    """
+    for artifact in data.get("artifacts", ()):
+        if artifact["content"] is not None:
+            artifact["content"] = base64.b64decode(artifact["content"])
+    response = response_type.model_validate(data)
+    if isinstance(response, EmbeddingResponse) and response.vector_format != "list":
+        # Stored as plain vectors; rebuild the encoding the caller asked for.
+        vector_format = response.vector_format
+        plain = response.model_copy(update={"vector_format": "list"})
+        response = plain.with_vector_format(vector_format)
+    return response
+
+
+@dataclass(slots=True)
+class _InFlight:
+    """Track a call this worker is running for an idempotency key."""
+
+    fingerprint: str
+    future: asyncio.Future[AIResponse | None]
+
+
+class IdempotencyStore:
+    """Deduplicate retried calls by idempotency key with a Redis result store."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        key_prefix: str = "ello:ai:idempotency",
+        result_ttl_s: int = 86_400,
+        lock_ttl_s: int = 600,
+        poll_interval_ms: int = 50,
+        max_poll_interval_ms: int = 1_000,
+    ) -> None:
+        """Configure the store.
+
+        Args:
+            redis: Async Redis client created with ``decode_responses=True``.
+            key_prefix: Prefix of the idempotency keys.
+            result_ttl_s: Seconds a finished response stays replayable.
+            lock_ttl_s: Seconds an in-progress marker survives without its owner.
+            poll_interval_ms: First delay between checks on another worker's call.
+            max_poll_interval_ms: Longest delay between those checks.
+
+        Returns:
+            None.
+        """
+        self._redis = redis
+        self._release = redis.register_script(_RELEASE_SCRIPT)
+        self._key_prefix = key_prefix
+        self._result_ttl_s = result_ttl_s
+        self._lock_ttl_s = lock_ttl_s
+        self._poll_interval_s = poll_interval_ms / 1000
+        self._max_poll_interval_s = max_poll_interval_ms / 1000
+        self._in_flight: dict[str, _InFlight] = {}
+
+    async def run[ResponseT: AIResponse](
+        self,
+        *,
+        scope: str,
+        request: AIRequest,
+        response_type: type[ResponseT],
+        call: Callable[[], Awaitable[ResponseT]],
+    ) -> tuple[ResponseT, bool]:
+        """Run a call once per idempotency key, replaying its result to retries.
+
+        Args:
+            scope: Namespace of the key, such as the tenant and operation.
+            request: Request carrying ``idempotency_key``.
+            response_type: Response model of the operation.
+            call: Coroutine factory that performs the call.
+
+        Returns:
+            The response and whether it was replayed instead of produced by ``call``.
+        """
+        key = f"{self._key_prefix}:{scope}:{request.idempotency_key}"
+        fingerprint = request_fingerprint(request)
+        delay_s = self._poll_interval_s
+        while True:
+            local = self._in_flight.get(key)
+            if local is not None:
+                self._check_fingerprint(local.fingerprint, fingerprint)
+                response = await asyncio.shield(local.future)
+                if response is not None:
+                    return response.model_copy(deep=True), True
+                continue
+
+            owner = uuid4().hex
+            try:
+                claimed = await self._redis.set(
+                    key,
+                    json.dumps({"owner": owner, "fingerprint": fingerprint}),
+                    nx=True,
+                    ex=self._lock_ttl_s,
+                )
+                stored = None if claimed else await self._redis.get(key)
+            except Exception as exc:
+                log.warning(f"Idempotency store unavailable, running call directly: {exc!r}")
+                return await call(), False
+
+            if claimed:
+                return await self._run_owned(key, owner, fingerprint, call), False
+            if stored is None:
+                # The previous owner failed or its marker expired; try to claim again.
+                continue
+            record = json.loads(stored)
+            self._check_fingerprint(record["fingerprint"], fingerprint)
+            if "response" in record:
+                return _load_response(response_type, record["response"]), True
+            await asyncio.sleep(delay_s)
+            delay_s = min(delay_s * 2, self._max_poll_interval_s)
+
+    async def _run_owned[ResponseT: AIResponse](
+        self,
+        key: str,
+        owner: str,
+        fingerprint: str,
+        call: Callable[[], Awaitable[ResponseT]],
+    ) -> ResponseT:
+        """Run the call for a claimed key and publish its outcome.
+
+        Args:
+            key: Claimed idempotency key.
+            owner: Token written into the in-progress marker.
+            fingerprint: Fingerprint of the claiming request.
+            call: Coroutine factory that performs the call.
+
+        Returns:
+            The response produced by ``call``.
+        """
+        future: asyncio.Future[AIResponse | None] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = _InFlight(fingerprint=fingerprint, future=future)
+        try:
+            response = await call()
+        except BaseException:
+            # Local waiters retry instead of inheriting this failure.
+            del self._in_flight[key]
+            future.set_result(None)
+            try:
+                await self._release(keys=[key], args=[owner])
+            except Exception as exc:
+                log.warning(f"Could not release idempotency key {key}: {exc!r}")
+            raise
+        del self._in_flight[key]
+        future.set_result(response)
+        try:
+            stored = await _dump_response(response)
+        except OSError as exc:
+            # Without its artifact the response cannot be replayed; let retries run again.
+            log.warning(f"Could not read artifacts of idempotent response for {key}: {exc!r}")
+            try:
+                await self._release(keys=[key], args=[owner])
+            except Exception as release_exc:
+                log.warning(f"Could not release idempotency key {key}: {release_exc!r}")
+            return response
+        try:
+            await self._redis.set(
+                key,
+                json.dumps({"fingerprint": fingerprint, "response": stored}),
+                ex=self._result_ttl_s,
+            )
+        except Exception as exc:
+            log.warning(f"Could not store idempotent response for {key}: {exc!r}")
+        return response
+
+    @staticmethod
+    def _check_fingerprint(stored: str, fingerprint: str) -> None:
+        """Reject a key reused for a different request.
+
+        Args:
+            stored: Fingerprint recorded with the key.
+            fingerprint: Fingerprint of the current request.
+
+        Returns:
+            None.
+        """
+        if stored != fingerprint:
+            raise AIIdempotencyConflictError(
+                "Idempotency key was already used for a different request"
+            )
@@ -0,0 +1,356 @@
+"""Incremental JSON parsing for streamed structured output."""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, NoReturn
+
+from .exceptions import AIOutputParseError
+
+JSONPath = tuple[str | int, ...]
+
+_WHITESPACE = frozenset(" \t\r\n")
+_SCALAR_CHARS = frozenset("-+.0123456789eEtruefalsn")
+_SCALAR_START = frozenset("-0123456789tfn")
+_STRING_STOP = re.compile(r'["\\]')
+_FENCE_PRELUDES = frozenset({"", "```", "```json"})
+_MAX_PRELUDE_CHARS = 16
+_MAX_SCALAR_CHARS = 64
+
+# What the innermost open container accepts next.
+_KEY_OR_END = 0
+_KEY = 1
+_COLON = 2
+_VALUE_OR_END = 3
+_VALUE = 4
+_COMMA_OR_END = 5
+
+
+@dataclass(slots=True)
+class _Container:
+    """Track one open object or array."""
+
+    value: dict[str, Any] | list[Any]
+    path: JSONPath
+    expect: int
+    key: str | None = None
+
+
+class IncrementalJSONParser:
+    """Parse a JSON document from text chunks and report values as they complete.
+
+    The parser is a push-based state machine: :meth:`feed` consumes one chunk and
+    returns every value (object field, array item, or the root) that became
+    complete within it, so downstream steps can act before generation finishes.
+    Containers are built in place as their children complete, so total work is
+    linear in the output size. The root must be an object or array, optionally
+    wrapped in a Markdown code fence. Any byte that cannot lead to valid JSON raises
+    :class:`AIOutputParseError` immediately, which lets callers abort the stream
+    instead of paying for the rest of a malformed answer.
+    """
+
+    def __init__(self, *, max_depth: int = 64, max_emit_depth: int | None = None) -> None:
+        """Configure parser limits.
+
+        Args:
+            max_depth: Maximum container nesting accepted before failing.
+            max_emit_depth: Deepest path length reported by :meth:`feed`; ``None``
+                reports every completed value.
+
+        Returns:
+            None.
+        """
+        self._max_depth = max_depth
+        self._max_emit_depth = max_emit_depth
+        self._stack: list[_Container] = []
+        self._prelude: list[str] = []
+        self._fenced = False
+        self._started = False
+        self._finished = False
+        self._root: Any = None
+        self._token: list[str] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._escape = False
+        self._in_scalar = False
+
+    @property
+    def finished(self) -> bool:
+        """Return whether the root value has been fully parsed.
+
+        Args:
+            None.
+
+        Returns:
+            ``True`` once the root object or array closed.
+        """
+        return self._finished
+
+    def feed(self, chunk: str) -> list[tuple[JSONPath, Any]]:
+        """Consume one text chunk.
+
+        Args:
+            chunk: Next piece of model output.
+
+        Returns:
+            ``(path, value)`` pairs for every value completed in this chunk, in
+            document order; the root is reported last with an empty path.
+        """
+        completed: list[tuple[JSONPath, Any]] = []
+        index = 0
+        length = len(chunk)
+        while index < length:
+            if self._in_string:
+                index = self._scan_string(chunk, index, completed)
+                continue
+
+            char = chunk[index]
+            if self._in_scalar:
+                if char in _SCALAR_CHARS:
+                    self._token.append(char)
+                    if len(self._token) > _MAX_SCALAR_CHARS:
+                        self._fail("Scalar value is too long")
+                    index += 1
+                    continue
+                self._finish_scalar(completed)
+
+            if self._finished:
+                self._check_trailer(char)
+            elif not self._started:
+                self._consume_prelude(char)
+            elif char not in _WHITESPACE:
+                self._consume_structural(char, completed)
+            index += 1
+        return completed
+
+    def close(self) -> Any:
+        """Finish parsing once the stream ended.
+
+        Args:
+            None.
+
+        Returns:
+            The parsed root value.
+        """
+        if not self._finished:
+            self._fail("JSON output ended before the root value closed")
+        return self._root
+
+    def _scan_string(self, chunk: str, index: int, completed: list[tuple[JSONPath, Any]]) -> int:
+        """Consume string content up to the closing quote or chunk end.
+
+        Args:
+            chunk: Current chunk.
+            index: Position inside the string.
+            completed: Output list for completed values.
+
+        Returns:
+            The next unread position.
+        """
+        if self._escape:
+            self._token.append(chunk[index])
+            self._escape = False
+            return index + 1
+        match = _STRING_STOP.search(chunk, index)
+        if match is None:
+            self._token.append(chunk[index:])
+            return len(chunk)
+        stop = match.start()
+        if chunk[stop] == "\\":
+            self._token.append(chunk[index : stop + 1])
+            self._escape = True
+            return stop + 1
+
+        self._token.append(chunk[index:stop])
+        raw = "".join(self._token)
+        self._token.clear()
+        self._in_string = False
+        try:
+            text = json.loads(f'"{raw}"')
+        except ValueError:
+            self._fail("Invalid string literal")
+        if self._string_is_key:
+            container = self._stack[-1]
+            container.key = text
+            container.expect = _COLON
+        else:
+            self._complete(text, completed)
+        return stop + 1
+
+    def _finish_scalar(self, completed: list[tuple[JSONPath, Any]]) -> None:
+        """Decode a number or literal once a delimiter follows it.
+
+        Args:
+            completed: Output list for completed values.
+
+        Returns:
+            None.
+        """
+        raw = "".join(self._token)
+        self._token.clear()
+        self._in_scalar = False
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            self._fail(f"Invalid literal {raw!r}")
+        self._complete(value, completed)
+
+    def _consume_prelude(self, char: str) -> None:
+        """Skip whitespace and an optional code fence before the root value.
+
+        Args:
+            char: Current character.
+
+        Returns:
+            None.
+        """
+        if char in "{[":
+            prelude = "".join(self._prelude).strip().lower()
+            if prelude not in _FENCE_PRELUDES:
+                self._fail("Output does not start with a JSON object or array")
+            self._fenced = bool(prelude)
+            self._started = True
+            self._open(char)
+            return
+        self._prelude.append(char)
+        if len(self._prelude) > _MAX_PRELUDE_CHARS or char not in " \t\r\n`jsonJSON":
+            self._fail("Output does not start with a JSON object or array")
+
+    def _check_trailer(self, char: str) -> None:
+        """Allow only whitespace and a closing fence after the root value.
+
+        Args:
+            char: Current character.
+
+        Returns:
+            None.
+        """
+        if char in _WHITESPACE or (self._fenced and char == "`"):
+            return
+        self._fail("Unexpected data after the JSON value")
+
+    def _consume_structural(self, char: str, completed: list[tuple[JSONPath, Any]]) -> None:
+        """Apply one non-whitespace character outside strings and scalars.
+
+        Args:
+            char: Current character.
+            completed: Output list for completed values.
+
+        Returns:
+            None.
+        """
+        container = self._stack[-1]
+        expect = container.expect
+        if char == '"':
+            if expect in (_KEY_OR_END, _KEY):
+                self._string_is_key = True
+            elif expect in (_VALUE_OR_END, _VALUE):
+                self._string_is_key = False
+            else:
+                self._fail("Unexpected string")
+            self._in_string = True
+        elif char in "{[":
+            if expect not in (_VALUE_OR_END, _VALUE):
+                self._fail(f"Unexpected {char!r}")
+            self._open(char)
+        elif char == "}":
+            if not isinstance(container.value, dict) or expect not in (_KEY_OR_END, _COMMA_OR_END):
+                self._fail("Unexpected '}'")
+            self._close(completed)
+        elif char == "]":
+            if not isinstance(container.value, list) or expect not in (
+                _VALUE_OR_END,
+                _COMMA_OR_END,
+            ):
+                self._fail("Unexpected ']'")
+            self._close(completed)
+        elif char == ":":
+            if expect != _COLON:
+                self._fail("Unexpected ':'")
+            container.expect = _VALUE
+        elif char == ",":
+            if expect != _COMMA_OR_END:
+                self._fail("Unexpected ','")
+            container.expect = _KEY if isinstance(container.value, dict) else _VALUE
+        elif char in _SCALAR_START and expect in (_VALUE_OR_END, _VALUE):
+            self._in_scalar = True
+            self._token.append(char)
+        else:
+            self._fail(f"Unexpected character {char!r}")
+
+    def _open(self, char: str) -> None:
+        """Push a new object or array.
+
+        Args:
+            char: ``{`` or ``[``.
+
+        Returns:
+            None.
+        """
+        if len(self._stack) >= self._max_depth:
+            self._fail("JSON output is nested too deeply")
+        if self._stack:
+            parent = self._stack[-1]
+            slot: str | int = (
+                parent.key if isinstance(parent.value, dict) else len(parent.value)  # type: ignore[assignment]
+            )
+            path = (*parent.path, slot)
+        else:
+            path = ()
+        if char == "{":
+            self._stack.append(_Container(value={}, path=path, expect=_KEY_OR_END))
+        else:
+            self._stack.append(_Container(value=[], path=path, expect=_VALUE_OR_END))
+
+    def _close(self, completed: list[tuple[JSONPath, Any]]) -> None:
+        """Pop the innermost container and report it as a completed value.
+
+        Args:
+            completed: Output list for completed values.
+
+        Returns:
+            None.
+        """
+        container = self._stack.pop()
+        if self._stack:
+            self._complete(container.value, completed)
+            return
+        self._finished = True
+        self._root = container.value
+        completed.append(((), container.value))
+
+    def _complete(self, value: Any, completed: list[tuple[JSONPath, Any]]) -> None:
+        """Attach a completed value to its parent and report it.
+
+        Args:
+            value: Completed value.
+            completed: Output list for completed values.
+
+        Returns:
+            None.
+        """
+        container = self._stack[-1]
+        if isinstance(container.value, dict):
+            slot: str | int = container.key  # type: ignore[assignment]
+            container.value[slot] = value
+            container.key = None
+        else:
+            slot = len(container.value)
+            container.value.append(value)
+        container.expect = _COMMA_OR_END
+        path = (*container.path, slot)
+        if self._max_emit_depth is None or len(path) <= self._max_emit_depth:
+            completed.append((path, value))
+
+    def _fail(self, reason: str) -> NoReturn:
+        """Raise a parse error for malformed output.
+
+        Args:
+            reason: Human-readable failure reason.
+
+        Returns:
+            Never returns; always raises :class:`AIOutputParseError`.
+        """
+        raise AIOutputParseError(f"Malformed JSON output: {reason}")
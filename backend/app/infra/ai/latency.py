@@ -0,0 +1,104 @@
+"""In-process latency windows used by telemetry, routing, and timeout logic."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from math import ceil
+
+
+class RollingPercentiles:
+    """Keep a bounded window of recent samples and answer percentile queries."""
+
+    __slots__ = ("_samples",)
+
+    def __init__(self, window_size: int = 512) -> None:
+        """Create an empty rolling window.
+
+        Args:
+            window_size: Maximum number of recent samples kept in memory.
+
+        Returns:
+            None.
+        """
+        self._samples: deque[float] = deque(maxlen=max(window_size, 1))
+
+    def __len__(self) -> int:
+        """Return the number of samples currently held in the window.
+
+        Args:
+            None.
+
+        Returns:
+            The current sample count.
+        """
+        return len(self._samples)
+
+    def add(self, value: float) -> None:
+        """Append one sample, evicting the oldest sample when the window is full.
+
+        Args:
+            value: Observed sample value.
+
+        Returns:
+            None.
+        """
+        self._samples.append(value)
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Append several samples in arrival order.
+
+        Args:
+            values: Observed sample values.
+
+        Returns:
+            None.
+        """
+        self._samples.extend(values)
+
+    def samples(self) -> list[float]:
+        """Return a copy of the samples in arrival order.
+
+        Args:
+            None.
+
+        Returns:
+            The current window contents, oldest first.
+        """
+        return list(self._samples)
+
+    def percentile(self, quantile: float) -> float | None:
+        """Return the nearest-rank percentile of the current window.
+
+        Args:
+            quantile: Requested quantile in the ``[0, 1]`` range.
+
+        Returns:
+            The percentile value, or ``None`` when the window is empty.
+        """
+        if not self._samples:
+            return None
+
+        ordered = sorted(self._samples)
+        rank = min(max(ceil(quantile * len(ordered)), 1), len(ordered))
+        return ordered[rank - 1]
+
+    def snapshot(self, quantiles: Iterable[float] = (0.5, 0.9, 0.99)) -> dict[str, float]:
+        """Return several percentiles computed from one sorted copy of the window.
+
+        Args:
+            quantiles: Quantiles to compute, each in the ``[0, 1]`` range.
+
+        Returns:
+            A mapping such as ``{"p50": 12.0, "p99": 80.0}``; empty when no samples exist.
+        """
+        if not self._samples:
+            return {}
+
+        ordered = sorted(self._samples)
+        size = len(ordered)
+        result: dict[str, float] = {}
+        for quantile in quantiles:
+            rank = min(max(ceil(quantile * size), 1), size)
+            result[f"p{quantile * 100:g}"] = ordered[rank - 1]
+        return result
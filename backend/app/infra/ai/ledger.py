@@ -0,0 +1,570 @@
+"""Append-only ledger of AI calls for capacity planning.
+
+Every finished call (tenant, model, tokens, latency, attempts, error) becomes one
+:class:`LedgerRecord`. Writing a row inline would add a database round trip to
+each call, so :class:`AILedger` only appends records to a bounded in-memory
+ring buffer from :class:`AITelemetry`. A background task drains the buffer in
+batches into a :class:`LedgerSink`: PostgreSQL through ``COPY``, or rotating
+Parquet files on local disk. When the buffer is full, the oldest record is
+dropped and counted; a request never waits for the ledger.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from opentelemetry import metrics
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    Identity,
+    Index,
+    Integer,
+    String,
+    Table,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core import Base, log
+
+from .exceptions import AIConfigError, AIError
+from .responses import AIResponse
+
+LEDGER_COLUMNS = (
+    "recorded_at",
+    "request_id",
+    "operation",
+    "tenant_id",
+    "principal_id",
+    "provider",
+    "model",
+    "resolved_provider",
+    "resolved_model",
+    "success",
+    "latency_ms",
+    "attempt_count",
+    "input_tokens",
+    "output_tokens",
+    "total_tokens",
+    "cost_usd",
+    "error_code",
+)
+
+ai_call_ledger = Table(
+    "ai_call_ledger",
+    Base.metadata,
+    Column("id", BigInteger, Identity(start=1), primary_key=True),
+    Column("recorded_at", DateTime(timezone=True), nullable=False),
+    Column("request_id", String(64)),
+    Column("operation", String(64), nullable=False),
+    Column("tenant_id", BigInteger),
+    Column("principal_id", BigInteger),
+    Column("provider", String(64)),
+    Column("model", String(128)),
+    Column("resolved_provider", String(64)),
+    Column("resolved_model", String(128)),
+    Column("success", Boolean, nullable=False),
+    Column("latency_ms", Integer),
+    Column("attempt_count", Integer),
+    Column("input_tokens", Integer, nullable=False),
+    Column("output_tokens", Integer, nullable=False),
+    Column("total_tokens", Integer, nullable=False),
+    Column("cost_usd", Float),
+    Column("error_code", String(64)),
+    Index("ix_ai_call_ledger_tenant_recorded", "tenant_id", "recorded_at"),
+)
+
+
+def _as_id(value: Any) -> int | None:
+    """Read a tenant or principal id from request metadata.
+
+    Args:
+        value: Metadata value.
+
+    Returns:
+        The integer id, or ``None`` when the value is missing or not numeric.
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+@dataclass(slots=True, frozen=True)
+class LedgerRecord:
+    """Describe one finished AI call."""
+
+    recorded_at: datetime
+    request_id: str | None
+    operation: str
+    tenant_id: int | None
+    principal_id: int | None
+    provider: str | None
+    model: str | None
+    resolved_provider: str | None
+    resolved_model: str | None
+    success: bool
+    latency_ms: int | None
+    attempt_count: int | None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    cost_usd: float | None = None
+    error_code: str | None = None
+
+    @classmethod
+    def from_response(
+        cls, operation_name: str, response: AIResponse, metadata: Mapping[str, Any]
+    ) -> LedgerRecord:
+        """Describe a successful call.
+
+        Args:
+            operation_name: Logical SDK operation name such as ``text.generate``.
+            response: Final normalized SDK response.
+            metadata: Metadata of the originating request.
+
+        Returns:
+            The ledger record.
+        """
+        usage = response.usage
+        return cls(
+            recorded_at=datetime.now(UTC),
+            request_id=response.request_id,
+            operation=operation_name,
+            tenant_id=_as_id(metadata.get("tenant_id")),
+            principal_id=_as_id(metadata.get("principal_id")),
+            provider=response.provider,
+            model=response.model,
+            resolved_provider=response.resolved_provider,
+            resolved_model=response.resolved_model,
+            success=True,
+            latency_ms=response.latency_ms,
+            attempt_count=response.attempt_count,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            total_tokens=usage.total_tokens,
+            cost_usd=usage.estimated_cost_usd,
+        )
+
+    @classmethod
+    def from_error(
+        cls,
+        operation_name: str,
+        *,
+        provider: str | None,
+        model: str | None,
+        error: AIError,
+        latency_ms: int | None,
+        request_id: str | None,
+        attempt_count: int | None,
+        metadata: Mapping[str, Any],
+    ) -> LedgerRecord:
+        """Describe a failed call.
+
+        Args:
+            operation_name: Logical SDK operation name such as ``text.generate``.
+            provider: Provider of the last attempt, if known.
+            model: Model of the last attempt, if known.
+            error: Normalized SDK exception raised by the call.
+            latency_ms: Time spent before the failure.
+            request_id: SDK request id of the call, if one was assigned.
+            attempt_count: Attempts made before giving up, if known.
+            metadata: Metadata of the originating request.
+
+        Returns:
+            The ledger record.
+        """
+        return cls(
+            recorded_at=datetime.now(UTC),
+            request_id=request_id,
+            operation=operation_name,
+            tenant_id=_as_id(metadata.get("tenant_id")),
+            principal_id=_as_id(metadata.get("principal_id")),
+            provider=provider,
+            model=model,
+            resolved_provider=provider,
+            resolved_model=model,
+            success=False,
+            latency_ms=latency_ms,
+            attempt_count=attempt_count,
+            error_code=error.error_code,
+        )
+
+    def as_row(self) -> tuple[Any, ...]:
+        """Return the record's values in :data:`LEDGER_COLUMNS` order.
+
+        Args:
+            None.
+
+        Returns:
+            One row for a columnar or ``COPY`` writer.
+        """
+        return tuple(getattr(self, column) for column in LEDGER_COLUMNS)
+
+
+class LedgerSink:
+    """Persist batches of ledger records; the base class discards them."""
+
+    async def write(self, records: list[LedgerRecord]) -> None:
+        """Persist one batch.
+
+        Args:
+            records: Records in the order they were appended.
+
+        Returns:
+            None.
+        """
+
+    async def aclose(self) -> None:
+        """Release resources held by the sink.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+
+
+class PostgresLedgerSink(LedgerSink):
+    """Append batches to ``ai_call_ledger`` with ``COPY FROM STDIN``."""
+
+    def __init__(self, engine: AsyncEngine, *, table: str = "ai_call_ledger") -> None:
+        """Bind the sink to the application's database.
+
+        Args:
+            engine: Async SQLAlchemy engine using the asyncpg driver.
+            table: Target table created by the ledger migration.
+
+        Returns:
+            None.
+        """
+        self._engine = engine
+        self._table = table
+
+    async def write(self, records: list[LedgerRecord]) -> None:
+        """Copy one batch in a single round trip.
+
+        Args:
+            records: Records in the order they were appended.
+
+        Returns:
+            None.
+        """
+        async with self._engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                self._table,
+                records=[record.as_row() for record in records],
+                columns=LEDGER_COLUMNS,
+            )
+
+
+def _pyarrow() -> tuple[Any, Any]:
+    """Import PyArrow or explain which extra provides it.
+
+    Args:
+        None.
+
+    Returns:
+        The ``pyarrow`` and ``pyarrow.parquet`` modules.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise AIConfigError(
+            "The Parquet ledger sink requires PyArrow; install the 'ledger' extra"
+        ) from exc
+    return pyarrow, pyarrow.parquet
+
+
+class ParquetLedgerSink(LedgerSink):
+    """Write batches as row groups of rotating Parquet files.
+
+    The open file is named ``*.parquet.inprogress`` and renamed to ``*.parquet``
+    once it is closed, so readers only ever see complete files.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        rotate_rows: int = 100_000,
+        rotate_interval_s: float = 3_600.0,
+    ) -> None:
+        """Configure the sink.
+
+        Args:
+            directory: Directory that receives the ledger files.
+            rotate_rows: Rows after which the current file is closed.
+            rotate_interval_s: Age in seconds after which the current file is closed.
+
+        Returns:
+            None.
+        """
+        self._pa, self._pq = _pyarrow()
+        self._directory = Path(directory)
+        self._rotate_rows = rotate_rows
+        self._rotate_interval_s = rotate_interval_s
+        self._schema = self._pa.schema(
+            [
+                ("recorded_at", self._pa.timestamp("us", tz="UTC")),
+                ("request_id", self._pa.string()),
+                ("operation", self._pa.string()),
+                ("tenant_id", self._pa.int64()),
+                ("principal_id", self._pa.int64()),
+                ("provider", self._pa.string()),
+                ("model", self._pa.string()),
+                ("resolved_provider", self._pa.string()),
+                ("resolved_model", self._pa.string()),
+                ("success", self._pa.bool_()),
+                ("latency_ms", self._pa.int64()),
+                ("attempt_count", self._pa.int64()),
+                ("input_tokens", self._pa.int64()),
+                ("output_tokens", self._pa.int64()),
+                ("total_tokens", self._pa.int64()),
+                ("cost_usd", self._pa.float64()),
+                ("error_code", self._pa.string()),
+            ]
+        )
+        self._writer: Any = None
+        self._path: Path | None = None
+        self._rows = 0
+        self._opened_at = 0.0
+        self._sequence = 0
+
+    async def write(self, records: list[LedgerRecord]) -> None:
+        """Append one batch as a row group, rotating the file when due.
+
+        Args:
+            records: Records in the order they were appended.
+
+        Returns:
+            None.
+        """
+        await asyncio.to_thread(self._write, records)
+
+    async def aclose(self) -> None:
+        """Finish the open file.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        await asyncio.to_thread(self._close)
+
+    def _write(self, records: list[LedgerRecord]) -> None:
+        """Write one batch on a worker thread.
+
+        Args:
+            records: Records to write.
+
+        Returns:
+            None.
+        """
+        now = datetime.now(UTC)
+        if (
+            self._writer is not None
+            and now.timestamp() - self._opened_at >= self._rotate_interval_s
+        ):
+            self._close()
+        if self._writer is None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            self._sequence += 1
+            name = f"ai-ledger-{now:%Y%m%dT%H%M%S}-{os.getpid()}-{self._sequence}.parquet"
+            self._path = self._directory / name
+            self._writer = self._pq.ParquetWriter(
+                f"{self._path}.inprogress", self._schema, compression="zstd"
+            )
+            self._opened_at = now.timestamp()
+        columns = {
+            column: [getattr(record, column) for record in records] for column in LEDGER_COLUMNS
+        }
+        self._writer.write_table(self._pa.table(columns, schema=self._schema))
+        self._rows += len(records)
+        if self._rows >= self._rotate_rows:
+            self._close()
+
+    def _close(self) -> None:
+        """Close the open file and publish it under its final name.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._writer is None or self._path is None:
+            return
+        self._writer.close()
+        os.replace(f"{self._path}.inprogress", self._path)
+        self._writer = None
+        self._path = None
+        self._rows = 0
+
+
+class AILedger:
+    """Buffer ledger records in memory and flush them to a sink in batches."""
+
+    def __init__(
+        self,
+        sink: LedgerSink,
+        *,
+        capacity: int = 10_000,
+        batch_size: int = 500,
+        flush_interval_s: float = 5.0,
+    ) -> None:
+        """Configure the ledger.
+
+        Args:
+            sink: Destination of flushed batches.
+            capacity: Records the ring buffer holds before dropping the oldest.
+            batch_size: Records per sink write; a full batch triggers a flush.
+            flush_interval_s: Longest time a record waits before being flushed.
+
+        Returns:
+            None.
+        """
+        self._sink = sink
+        self._buffer: deque[LedgerRecord] = deque(maxlen=max(capacity, 1))
+        self._batch_size = max(batch_size, 1)
+        self._flush_interval_s = flush_interval_s
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._dropped = 0
+        meter = metrics.get_meter("app.infra.ai")
+        self._written_counter = meter.create_counter("ai.ledger.written")
+        self._dropped_counter = meter.create_counter("ai.ledger.dropped")
+
+    @property
+    def dropped(self) -> int:
+        """Return how many records were lost to a full buffer or a failed write.
+
+        Args:
+            None.
+
+        Returns:
+            The dropped record count since start.
+        """
+        return self._dropped
+
+    @property
+    def pending(self) -> int:
+        """Return how many records wait in the buffer.
+
+        Args:
+            None.
+
+        Returns:
+            The buffered record count.
+        """
+        return len(self._buffer)
+
+    def append(self, record: LedgerRecord) -> None:
+        """Buffer one record without waiting.
+
+        Args:
+            record: Record to persist.
+
+        Returns:
+            None.
+        """
+        if len(self._buffer) == self._buffer.maxlen:
+            self._drop(1, "buffer_full")
+        self._buffer.append(record)
+        if len(self._buffer) >= self._batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the background flush loop.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        """Stop the flush loop, flush what is buffered, and close the sink.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+        await self._sink.aclose()
+
+    async def flush(self) -> None:
+        """Write every buffered record to the sink in batches.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        async with self._flush_lock:
+            while self._buffer:
+                count = min(self._batch_size, len(self._buffer))
+                batch = [self._buffer.popleft() for _ in range(count)]
+                try:
+                    await self._sink.write(batch)
+                except Exception as exc:
+                    log.warning(f"Could not write {count} AI ledger records: {exc!r}")
+                    self._drop(count, "sink_error")
+                    continue
+                self._written_counter.add(count)
+
+    async def _run(self) -> None:
+        """Flush on a full batch or after the flush interval, whichever comes first.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval_s)
+            self._wakeup.clear()
+            await self.flush()
+
+    def _drop(self, count: int, reason: str) -> None:
+        """Count records that will never reach the sink.
+
+        Args:
+            count: Number of records lost.
+            reason: ``buffer_full`` or ``sink_error``.
+
+        Returns:
+            None.
+        """
+        self._dropped += count
+        self._dropped_counter.add(count, {"reason": reason})
@@ -0,0 +1,154 @@
+"""Read an async iterator from one task so consumers can wait on it with timeouts.
+
+Racing ``anext()`` against a timer or a disconnect needs the read to run in its
+own task. Creating that task per item steps the source generator in a new
+context every time, which breaks context variables the SDK keeps set across
+yields, such as the OpenTelemetry span scopes opened by ``start_as_current_span``.
+:class:`Prefetcher` runs the whole iteration in one long-lived task that hands
+items over through a bounded queue, so the source always runs in the same
+context while the consumer waits on the queue with any timeout it needs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+from typing import Any, cast
+
+_END = object()
+_EMPTY = object()
+
+
+@dataclass(slots=True)
+class _Failure:
+    """Carry an exception raised by the source to the consumer."""
+
+    error: Exception
+
+
+class Prefetcher[T]:
+    """Drain an async iterable from one task into a bounded queue."""
+
+    def __init__(self, source: AsyncIterable[T], *, maxsize: int = 1) -> None:
+        """Start draining the source.
+
+        Args:
+            source: Async iterable to read; it is closed from the draining task.
+            maxsize: Items read ahead of the consumer; ``1`` keeps backpressure
+                on the source.
+
+        Returns:
+            None.
+        """
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize)
+        self._head: Any = _EMPTY
+        self._task = asyncio.create_task(self._drain(source))
+
+    async def _drain(self, source: AsyncIterable[T]) -> None:
+        """Copy the source into the queue, then enqueue its end or its error.
+
+        Args:
+            source: Async iterable to read.
+
+        Returns:
+            None.
+        """
+        iterator = aiter(source)
+        outcome: object = _END
+        try:
+            try:
+                try:
+                    async for item in iterator:
+                        await self._queue.put(item)
+                finally:
+                    aclose = getattr(iterator, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+            except Exception as exc:
+                outcome = _Failure(exc)
+            await self._queue.put(outcome)
+        except asyncio.CancelledError:
+            # Stopped early: drop unread items and wake a waiting consumer.
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(_END)
+            raise
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """Wait until the next item, the end, or an error is available.
+
+        Args:
+            timeout: Longest wait in seconds; ``None`` waits indefinitely.
+
+        Returns:
+            ``True`` when :meth:`get_nowait` will not raise ``QueueEmpty``.
+        """
+        if self._head is _EMPTY:
+            try:
+                async with asyncio.timeout(timeout):
+                    self._head = await self._queue.get()
+            except TimeoutError:
+                return False
+        return True
+
+    def get_nowait(self) -> T:
+        """Take the next available item.
+
+        Args:
+            None.
+
+        Returns:
+            The next item of the source.
+
+        Raises:
+            asyncio.QueueEmpty: When nothing is available yet.
+            StopAsyncIteration: When the source is exhausted or was stopped.
+        """
+        if self._head is _EMPTY:
+            self._head = self._queue.get_nowait()
+        item, self._head = self._head, _EMPTY
+        if item is _END:
+            self._head = _END
+            raise StopAsyncIteration
+        if isinstance(item, _Failure):
+            self._head = _END
+            raise item.error
+        return cast(T, item)
+
+    async def get(self) -> T:
+        """Wait for and take the next item.
+
+        Args:
+            None.
+
+        Returns:
+            The next item of the source.
+        """
+        await self.wait()
+        return self.get_nowait()
+
+    def stop(self) -> None:
+        """Stop reading without waiting; a waiting consumer then sees the end.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        self._task.cancel()
+
+    async def aclose(self) -> None:
+        """Stop reading and wait until the source is closed.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        self._task.cancel()
+        with contextlib.suppress(Exception, asyncio.CancelledError):
+            await self._task
@@ -3,11 +3,13 @@
 from .anthropic import AnthropicProviderAdapter
 from .base import ProviderAdapter
 from .gemini import GeminiProviderAdapter
+from .mock import MockProviderAdapter
 from .openai import OpenAICompatibleProviderAdapter
 
 __all__ = [
     "AnthropicProviderAdapter",
     "GeminiProviderAdapter",
+    "MockProviderAdapter",
     "OpenAICompatibleProviderAdapter",
     "ProviderAdapter",
 ]
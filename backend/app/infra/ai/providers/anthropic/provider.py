@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from collections.abc import AsyncIterator
+import base64
+from collections.abc import AsyncIterator, Mapping
+from functools import partial
 from time import perf_counter
 from typing import Any
 
 import httpx
 
 from ...adapters.sse import parse_sse_messages
+from ...codec import DEFAULT_JSON_CODEC, JsonCodec
 from ...exceptions import (
     AIAuthError,
     AIConfigError,
@@ -23,7 +25,7 @@ from ...exceptions import (
     AITransportError,
     AIValidationError,
 )
-from ...requests import TextGenerateRequest, TextMessage
+from ...requests import ContentPart, MediaPart, TextGenerateRequest, TextMessage, TextPart
 from ...responses import TextGenerateResponse
 from ...stream import (
     AIDoneEvent,
@@ -33,9 +35,13 @@ from ...stream import (
     AITextStartEvent,
     AIUsageEvent,
 )
-from ...types import AIFinishReason, AIUsage, ProviderRequestContext, ResolvedModel
+from ...types import AIFinishReason, AIUsage, ProviderRequestContext, ResolvedModel, ToolCall
+from ...uploads import UploadCache, upload_filename
 from ..base import ProviderAdapter
 
+# Messages that reference uploaded files need the Files API beta.
+FILES_API_BETA = "files-api-2025-04-14"
+
 
 class AnthropicProviderAdapter(ProviderAdapter):
     """Talk to Anthropic's Messages API through stable SDK interfaces."""
@@ -45,19 +51,29 @@ class AnthropicProviderAdapter(ProviderAdapter):
         *,
         default_timeout_ms: int,
         http_client: httpx.AsyncClient | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        codec: JsonCodec | None = None,
+        uploads: UploadCache | None = None,
     ) -> None:
         """Create the provider adapter.
 
         Args:
             default_timeout_ms: Default timeout applied when the request does not override it.
             http_client: Optional shared HTTP client injected by tests or application code.
+            transport: Optional transport for the adapter-owned client, such as the
+                DNS-caching transport used when connection warm-up is enabled.
+            codec: Optional JSON codec for request bodies and responses.
+            uploads: Optional cache that uploads large images and documents once
+                and references them by file id.
 
         Returns:
             None.
         """
         self._default_timeout_ms = default_timeout_ms
+        self._codec = codec or DEFAULT_JSON_CODEC
+        self._uploads = uploads
         self._owns_client = http_client is None
-        self._client = http_client or httpx.AsyncClient()
+        self._client = http_client or httpx.AsyncClient(transport=transport)
 
     async def aclose(self) -> None:
         """Close the underlying HTTP client when the adapter owns it.
@@ -71,6 +87,18 @@ class AnthropicProviderAdapter(ProviderAdapter):
         if self._owns_client:
             await self._client.aclose()
 
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Expose the pooled HTTP client so its connections can be pre-warmed.
+
+        Args:
+            None.
+
+        Returns:
+            The HTTPX client used for provider calls.
+        """
+        return self._client
+
     async def generate_text(
         self,
         request: TextGenerateRequest,
@@ -88,15 +116,19 @@ class AnthropicProviderAdapter(ProviderAdapter):
             A normalized text generation response.
         """
         started_at = perf_counter()
-        payload = self._build_messages_payload(request=request, model=model, stream=False)
+        file_ids = await self._upload_media(request, model, context)
+        payload = self._build_messages_payload(
+            request=request, model=model, stream=False, file_ids=file_ids
+        )
         response = await self._request(
             "POST",
             "/messages",
             model=model,
             context=context,
             json_body=payload,
+            beta=FILES_API_BETA if file_ids else None,
         )
-        body = response.json()
+        body = self._codec.loads(response.content)
 
         return TextGenerateResponse(
             request_id=context.request_id,
@@ -109,6 +141,7 @@ class AnthropicProviderAdapter(ProviderAdapter):
             usage=self._parse_usage(body.get("usage")),
             text=self._extract_text(body.get("content", [])),
             finish_reason=self._map_finish_reason(body.get("stop_reason")),
+            tool_calls=self._extract_tool_calls(body.get("content", [])),
         )
 
     async def stream_text(
@@ -134,7 +167,10 @@ class AnthropicProviderAdapter(ProviderAdapter):
         Returns:
             An async iterator of normalized stream events.
         """
-        payload = self._build_messages_payload(request=request, model=model, stream=True)
+        file_ids = await self._upload_media(request, model, context)
+        payload = self._build_messages_payload(
+            request=request, model=model, stream=True, file_ids=file_ids
+        )
         accumulated_text = ""
         usage = AIUsage()
         text_started = False
@@ -145,12 +181,16 @@ class AnthropicProviderAdapter(ProviderAdapter):
             async with self._client.stream(
                 "POST",
                 self._build_url(model, "/messages"),
-                json=payload,
-                headers=self._build_headers(model=model, context=context),
+                content=self._codec.dumps(payload),
+                headers=self._build_headers(
+                    model=model, context=context, beta=FILES_API_BETA if file_ids else None
+                ),
                 timeout=self._resolve_timeout(model, context),
             ) as response:
                 provider_request_id = self._extract_request_id(response)
                 if response.is_error:
+                    # Streamed bodies must be read before the error payload can be parsed.
+                    await response.aread()
                     await self._raise_response_error(response, model=model)
 
                 yield AIStartEvent(
@@ -165,7 +205,7 @@ class AnthropicProviderAdapter(ProviderAdapter):
                     if not message:
                         continue
 
-                    payload_chunk = json.loads(message)
+                    payload_chunk = self._codec.loads(message)
                     payload_type = payload_chunk.get("type")
 
                     if payload_type == "ping":
@@ -324,6 +364,58 @@ class AnthropicProviderAdapter(ProviderAdapter):
                 partial_text=accumulated_text or None,
             ) from exc
 
+    async def upload_file(
+        self,
+        part: MediaPart,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> str:
+        """Upload one inline image or document through the Files API.
+
+        Args:
+            part: Image or file part with inline data.
+            model: Resolved provider/model pair whose account receives the file.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            The file id later messages reference.
+        """
+        if part.data is None:
+            raise AIValidationError("Only inline media parts can be uploaded")
+        response = await self._request(
+            "POST",
+            "/files",
+            model=model,
+            context=context,
+            files={"file": (upload_filename(part), part.data, part.mime_type)},
+            beta=FILES_API_BETA,
+        )
+        return self._codec.loads(response.content)["id"]
+
+    async def _upload_media(
+        self,
+        request: TextGenerateRequest,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> dict[str, str]:
+        """Upload the request's large media parts when an upload cache is configured.
+
+        Args:
+            request: Normalized SDK text generation request.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            File ids keyed by part digest.
+        """
+        if self._uploads is None:
+            return {}
+        return await self._uploads.references(
+            request,
+            provider=model.provider,
+            upload=partial(self.upload_file, model=model, context=context),
+        )
+
     async def _request(
         self,
         method: str,
@@ -332,8 +424,10 @@ class AnthropicProviderAdapter(ProviderAdapter):
         model: ResolvedModel,
         context: ProviderRequestContext,
         json_body: dict[str, Any] | None = None,
+        files: dict[str, Any] | None = None,
+        beta: str | None = None,
     ) -> httpx.Response:
-        """Send one JSON request and normalize transport failures.
+        """Send one JSON or multipart request and normalize transport failures.
 
         Args:
             method: HTTP method name.
@@ -341,16 +435,22 @@ class AnthropicProviderAdapter(ProviderAdapter):
             model: Resolved provider/model pair selected by the router.
             context: Per-call runtime context such as timeout and request id.
             json_body: Optional JSON request payload.
+            files: Optional multipart files; HTTPX then sets the content type.
+            beta: Optional ``anthropic-beta`` feature to enable.
 
         Returns:
             The successful HTTP response object.
         """
+        headers = self._build_headers(model=model, context=context, beta=beta)
+        if files is not None:
+            headers.pop("content-type")
         try:
             response = await self._client.request(
                 method,
                 self._build_url(model, path),
-                json=json_body,
-                headers=self._build_headers(model=model, context=context),
+                content=None if json_body is None else self._codec.dumps(json_body),
+                files=files,
+                headers=headers,
                 timeout=self._resolve_timeout(model, context),
             )
         except asyncio.CancelledError as exc:
@@ -405,6 +505,7 @@ class AnthropicProviderAdapter(ProviderAdapter):
         request: TextGenerateRequest,
         model: ResolvedModel,
         stream: bool,
+        file_ids: Mapping[str, str] | None = None,
     ) -> dict[str, Any]:
         """Translate the stable text request into an Anthropic payload.
 
@@ -412,19 +513,27 @@ class AnthropicProviderAdapter(ProviderAdapter):
             request: Normalized SDK text generation request.
             model: Resolved provider/model pair selected by the router.
             stream: Whether Anthropic should return SSE events.
+            file_ids: Uploaded file ids keyed by media part digest.
 
         Returns:
             A JSON-serializable payload accepted by the Messages API.
         """
         system_prompt = self._extract_system_prompt(request.messages)
-        messages = [
-            {
-                "role": self._map_message_role(message.role),
-                "content": message.content,
-            }
-            for message in request.messages
-            if message.role != "system"
-        ]
+        messages: list[dict[str, Any]] = []
+        for message in request.messages:
+            if message.role == "system":
+                continue
+            entry = self._build_message(message, file_ids or {})
+            # Results of one parallel tool turn must arrive in a single user message.
+            if (
+                message.role == "tool"
+                and messages
+                and messages[-1]["role"] == "user"
+                and isinstance(messages[-1]["content"], list)
+            ):
+                messages[-1]["content"].extend(entry["content"])
+            else:
+                messages.append(entry)
         if not messages:
             raise AIValidationError("Anthropic requires at least one non-system message")
 
@@ -441,16 +550,93 @@ class AnthropicProviderAdapter(ProviderAdapter):
             payload["temperature"] = request.temperature
         if request.stop:
             payload["stop_sequences"] = request.stop
+        if request.tools and request.tool_choice != "none":
+            payload["tools"] = [
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "input_schema": tool.parameters,
+                }
+                for tool in request.tools
+            ]
+            payload["tool_choice"] = {
+                "type": "any" if request.tool_choice == "required" else "auto"
+            }
         return payload
 
+    def _build_message(self, message: TextMessage, file_ids: Mapping[str, str]) -> dict[str, Any]:
+        """Translate one non-system SDK message, including tool calls, results and media.
+
+        Args:
+            message: SDK conversation message.
+            file_ids: Uploaded file ids keyed by media part digest.
+
+        Returns:
+            An Anthropic message object.
+        """
+        if message.parts:
+            blocks = [{"type": "text", "text": message.content}] if message.content else []
+            blocks.extend(self._build_part(part, file_ids) for part in message.parts)
+            return {"role": "user", "content": blocks}
+        if message.role == "tool":
+            return {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": message.tool_call_id,
+                        "content": message.content,
+                    }
+                ],
+            }
+        if not message.tool_calls:
+            return {"role": self._map_message_role(message.role), "content": message.content}
+        blocks: list[dict[str, Any]] = []
+        if message.content:
+            blocks.append({"type": "text", "text": message.content})
+        blocks.extend(
+            {"type": "tool_use", "id": call.id, "name": call.name, "input": call.arguments}
+            for call in message.tool_calls
+        )
+        return {"role": "assistant", "content": blocks}
+
+    def _build_part(self, part: ContentPart, file_ids: Mapping[str, str]) -> dict[str, Any]:
+        """Translate one content part into an Anthropic content block.
+
+        Args:
+            part: Text, image or file part.
+            file_ids: Uploaded file ids keyed by media part digest.
+
+        Returns:
+            A text, image or document block.
+        """
+        if isinstance(part, TextPart):
+            return {"type": "text", "text": part.text}
+        if part.url is not None:
+            source = {"type": "url", "url": part.url}
+        elif file_ids and part.digest in file_ids:
+            source = {"type": "file", "file_id": file_ids[part.digest]}
+        else:
+            source = {
+                "type": "base64",
+                "media_type": part.mime_type,
+                "data": base64.b64encode(part.data).decode(),
+            }
+        return {"type": "image" if part.type == "image" else "document", "source": source}
+
     def _build_headers(
-        self, *, model: ResolvedModel, context: ProviderRequestContext
+        self,
+        *,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+        beta: str | None = None,
     ) -> dict[str, str]:
         """Compose normalized headers for one Anthropic call.
 
         Args:
             model: Resolved provider/model pair selected by the router.
             context: Per-call runtime context such as timeout and request id.
+            beta: Optional beta feature appended to any configured ``anthropic-beta``.
 
         Returns:
             A dictionary of HTTP headers.
@@ -466,6 +652,9 @@ class AnthropicProviderAdapter(ProviderAdapter):
         }
         if context.idempotency_key:
             headers["Idempotency-Key"] = context.idempotency_key
+        if beta:
+            configured = headers.get("anthropic-beta")
+            headers["anthropic-beta"] = f"{configured},{beta}" if configured else beta
         return headers
 
     def _build_url(self, model: ResolvedModel, path: str) -> str:
@@ -517,6 +706,25 @@ class AnthropicProviderAdapter(ProviderAdapter):
             block.get("text", "") for block in content_blocks if block.get("type") == "text"
         )
 
+    def _extract_tool_calls(self, content_blocks: list[dict[str, Any]]) -> list[ToolCall]:
+        """Collect ``tool_use`` blocks from an Anthropic message response.
+
+        Args:
+            content_blocks: Raw Anthropic content blocks.
+
+        Returns:
+            Function calls in provider-neutral form.
+        """
+        return [
+            ToolCall(
+                id=block.get("id", ""),
+                name=block.get("name", ""),
+                arguments=block.get("input") or {},
+            )
+            for block in content_blocks
+            if block.get("type") == "tool_use"
+        ]
+
     def _extract_system_prompt(self, messages: list[TextMessage]) -> str | None:
         """Join all system messages into Anthropic's dedicated system field.
 
@@ -4,11 +4,14 @@ from __future__ import annotations
 
 from collections.abc import AsyncIterator
 
+import httpx
+
 from ..exceptions import AIUnsupportedCapabilityError
 from ..requests import (
     AudioGenerateRequest,
     EmbeddingRequest,
     ImageGenerateRequest,
+    MediaPart,
     TextGenerateRequest,
 )
 from ..responses import (
@@ -35,6 +38,18 @@ class ProviderAdapter:
         """
         return None
 
+    @property
+    def http_client(self) -> httpx.AsyncClient | None:
+        """Return the pooled HTTP client used for provider calls, if any.
+
+        Args:
+            None.
+
+        Returns:
+            The HTTPX client, or ``None`` for adapters without network connections.
+        """
+        return None
+
     async def generate_text(
         self,
         request: TextGenerateRequest,
@@ -144,3 +159,73 @@ class ProviderAdapter:
             provider=model.provider,
             model=model.model_id,
         )
+
+    async def stream_audio(
+        self,
+        request: AudioGenerateRequest,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> AsyncIterator[bytes]:
+        """Stream synthesized audio bytes as the provider produces them.
+
+        Args:
+            request: Normalized SDK audio generation request.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            An async iterator of raw audio chunks.
+        """
+        raise AIUnsupportedCapabilityError(
+            "Audio streaming is not supported by this provider adapter",
+            provider=model.provider,
+            model=model.model_id,
+        )
+
+    def audio_mime_type(self, request: AudioGenerateRequest, model: ResolvedModel) -> str | None:
+        """Return the MIME type of the bytes :meth:`stream_audio` yields.
+
+        Args:
+            request: Normalized SDK audio generation request.
+            model: Resolved provider/model pair selected by the router.
+
+        Returns:
+            The MIME type, or ``None`` when the adapter cannot tell.
+        """
+        return None
+
+    def max_images_per_call(self, model: ResolvedModel) -> int | None:
+        """Return how many images one image generation call can produce.
+
+        The client splits larger ``count`` values into concurrent calls. Catalog
+        entries may declare the limit as ``provider_options.max_images_per_call``.
+
+        Args:
+            model: Resolved provider/model pair selected by the router.
+
+        Returns:
+            The per-call limit, or ``None`` when ``count`` is passed through as is.
+        """
+        return model.spec.provider_options.get("max_images_per_call")
+
+    async def upload_file(
+        self,
+        part: MediaPart,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> str:
+        """Upload one inline media part to the provider's file API.
+
+        Args:
+            part: Image or file part with inline data.
+            model: Resolved provider/model pair whose account receives the file.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            The reference later messages use instead of the inline bytes.
+        """
+        raise AIUnsupportedCapabilityError(
+            "File uploads are not supported by this provider adapter",
+            provider=model.provider,
+            model=model.model_id,
+        )
@@ -4,8 +4,8 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import json
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Mapping
+from functools import partial
 from math import gcd
 from time import perf_counter
 from typing import Any
@@ -13,6 +13,8 @@ from typing import Any
 import httpx
 
 from ...adapters.sse import parse_sse_messages
+from ...codec import DEFAULT_JSON_CODEC, JsonCodec
+from ...decoding import INLINE_DECODER, PayloadDecoder
 from ...exceptions import (
     AIAuthError,
     AIConfigError,
@@ -26,12 +28,16 @@ from ...exceptions import (
     AIValidationError,
 )
 from ...requests import (
+    ContentPart,
     EmbeddingRequest,
     ImageGenerateRequest,
+    MediaPart,
     TextGenerateRequest,
     TextMessage,
+    TextPart,
 )
 from ...responses import EmbeddingResponse, ImageGenerateResponse, TextGenerateResponse
+from ...spool import ArtifactSpooler
 from ...stream import (
     AIDoneEvent,
     AIStartEvent,
@@ -47,7 +53,9 @@ from ...types import (
     ArtifactKind,
     ProviderRequestContext,
     ResolvedModel,
+    ToolCall,
 )
+from ...uploads import UploadCache, upload_filename
 from ..base import ProviderAdapter
 
 
@@ -59,19 +67,35 @@ class GeminiProviderAdapter(ProviderAdapter):
         *,
         default_timeout_ms: int,
         http_client: httpx.AsyncClient | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        spooler: ArtifactSpooler | None = None,
+        decoder: PayloadDecoder | None = None,
+        codec: JsonCodec | None = None,
+        uploads: UploadCache | None = None,
     ) -> None:
         """Create the provider adapter.
 
         Args:
             default_timeout_ms: Default timeout applied when the request does not override it.
             http_client: Optional shared HTTP client injected by tests or application code.
+            transport: Optional transport for the adapter-owned client, such as the
+                DNS-caching transport used when connection warm-up is enabled.
+            spooler: Optional spooler that moves large image payloads to disk.
+            decoder: Optional decoder that moves large response decoding off the event loop.
+            codec: Optional JSON codec for request bodies and responses.
+            uploads: Optional cache that uploads large images and documents once
+                and references them by file URI.
 
         Returns:
             None.
         """
         self._default_timeout_ms = default_timeout_ms
+        self._spooler = spooler
+        self._decoder = decoder or INLINE_DECODER
+        self._codec = codec or DEFAULT_JSON_CODEC
+        self._uploads = uploads
         self._owns_client = http_client is None
-        self._client = http_client or httpx.AsyncClient()
+        self._client = http_client or httpx.AsyncClient(transport=transport)
 
     async def aclose(self) -> None:
         """Close the underlying HTTP client when the adapter owns it.
@@ -84,6 +108,19 @@ class GeminiProviderAdapter(ProviderAdapter):
         """
         if self._owns_client:
             await self._client.aclose()
+        self._decoder.close()
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Expose the pooled HTTP client so its connections can be pre-warmed.
+
+        Args:
+            None.
+
+        Returns:
+            The HTTPX client used for provider calls.
+        """
+        return self._client
 
     async def generate_text(
         self,
@@ -102,7 +139,8 @@ class GeminiProviderAdapter(ProviderAdapter):
             A normalized text generation response.
         """
         started_at = perf_counter()
-        payload = self._build_generate_content_payload(request)
+        file_uris = await self._upload_media(request, model, context)
+        payload = self._build_generate_content_payload(request, file_uris)
         response = await self._request(
             "POST",
             self._build_model_path(model, "generateContent"),
@@ -110,7 +148,8 @@ class GeminiProviderAdapter(ProviderAdapter):
             context=context,
             json_body=payload,
         )
-        body = response.json()
+        body = self._codec.loads(response.content)
+        tool_calls = self._extract_tool_calls(body)
 
         return TextGenerateResponse(
             request_id=context.request_id,
@@ -122,7 +161,13 @@ class GeminiProviderAdapter(ProviderAdapter):
             latency_ms=int((perf_counter() - started_at) * 1000),
             usage=self._parse_usage(body.get("usageMetadata")),
             text=self._extract_text(body),
-            finish_reason=self._map_finish_reason(self._first_candidate(body).get("finishReason")),
+            # Gemini reports STOP for function-call turns, so the calls decide.
+            finish_reason=(
+                AIFinishReason.TOOL_USE
+                if tool_calls
+                else self._map_finish_reason(self._first_candidate(body).get("finishReason"))
+            ),
+            tool_calls=tool_calls,
         )
 
     async def stream_text(
@@ -148,7 +193,8 @@ class GeminiProviderAdapter(ProviderAdapter):
         Returns:
             An async iterator of normalized stream events.
         """
-        payload = self._build_generate_content_payload(request)
+        file_uris = await self._upload_media(request, model, context)
+        payload = self._build_generate_content_payload(request, file_uris)
         accumulated_text = ""
         usage = AIUsage()
         text_started = False
@@ -160,12 +206,14 @@ class GeminiProviderAdapter(ProviderAdapter):
                 "POST",
                 self._build_url(model, self._build_model_path(model, "streamGenerateContent")),
                 params={"alt": "sse"},
-                json=payload,
+                content=self._codec.dumps(payload),
                 headers=self._build_headers(model=model, context=context),
                 timeout=self._resolve_timeout(model, context),
             ) as response:
                 provider_request_id = self._extract_request_id(response)
                 if response.is_error:
+                    # Streamed bodies must be read before the error payload can be parsed.
+                    await response.aread()
                     await self._raise_response_error(response, model=model)
 
                 yield AIStartEvent(
@@ -180,7 +228,7 @@ class GeminiProviderAdapter(ProviderAdapter):
                     if not message:
                         continue
 
-                    payload_chunk = json.loads(message)
+                    payload_chunk = self._codec.loads(message)
                     candidate = self._first_candidate(payload_chunk)
                     parts = candidate.get("content", {}).get("parts", [])
                     delta_text = "".join(part.get("text", "") for part in parts if part.get("text"))
@@ -310,7 +358,7 @@ class GeminiProviderAdapter(ProviderAdapter):
                 context=context,
                 json_body=payload,
             )
-            body = response.json()
+            body = await self._decoder.json(response, codec=self._codec)
             embedding = body.get("embedding", {}).get("values", [])
             vectors.append(embedding)
 
@@ -346,6 +394,17 @@ class GeminiProviderAdapter(ProviderAdapter):
             dimensions=dimensions,
         )
 
+    def max_images_per_call(self, model: ResolvedModel) -> int | None:
+        """Return one image per call, as Gemini image models ignore ``candidateCount``.
+
+        Args:
+            model: Resolved provider/model pair selected by the router.
+
+        Returns:
+            The catalog override, otherwise ``1``.
+        """
+        return super().max_images_per_call(model) or 1
+
     async def generate_image(
         self,
         request: ImageGenerateRequest,
@@ -371,8 +430,8 @@ class GeminiProviderAdapter(ProviderAdapter):
             context=context,
             json_body=payload,
         )
-        body = response.json()
-        artifacts = self._parse_image_artifacts(body)
+        body = await self._decoder.json(response, codec=self._codec)
+        artifacts = await self._parse_image_artifacts(body)
         mime_type = artifacts[0].mime_type if artifacts else None
 
         return ImageGenerateResponse(
@@ -388,6 +447,83 @@ class GeminiProviderAdapter(ProviderAdapter):
             mime_type=mime_type,
         )
 
+    async def upload_file(
+        self,
+        part: MediaPart,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> str:
+        """Upload one inline image or document through the resumable Files API.
+
+        Args:
+            part: Image or file part with inline data.
+            model: Resolved provider/model pair whose account receives the file.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            The file URI later messages reference.
+        """
+        if part.data is None:
+            raise AIValidationError("Only inline media parts can be uploaded")
+        root, _, version = model.provider_config.base_url.rstrip("/").rpartition("/")
+        started = await self._request(
+            "POST",
+            f"{root}/upload/{version}/files",
+            model=model,
+            context=context,
+            json_body={"file": {"display_name": upload_filename(part)}},
+            extra_headers={
+                "X-Goog-Upload-Protocol": "resumable",
+                "X-Goog-Upload-Command": "start",
+                "X-Goog-Upload-Header-Content-Length": str(len(part.data)),
+                "X-Goog-Upload-Header-Content-Type": part.mime_type,
+            },
+        )
+        session_url = started.headers.get("x-goog-upload-url")
+        if not session_url:
+            raise AIProviderUnavailableError(
+                "Gemini did not return an upload URL",
+                provider=model.provider,
+                model=model.model_id,
+            )
+        response = await self._request(
+            "POST",
+            session_url,
+            model=model,
+            context=context,
+            content=part.data,
+            extra_headers={
+                "content-type": part.mime_type,
+                "X-Goog-Upload-Command": "upload, finalize",
+                "X-Goog-Upload-Offset": "0",
+            },
+        )
+        return self._codec.loads(response.content)["file"]["uri"]
+
+    async def _upload_media(
+        self,
+        request: TextGenerateRequest,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> dict[str, str]:
+        """Upload the request's large media parts when an upload cache is configured.
+
+        Args:
+            request: Normalized SDK text generation request.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            File URIs keyed by part digest.
+        """
+        if self._uploads is None:
+            return {}
+        return await self._uploads.references(
+            request,
+            provider=model.provider,
+            upload=partial(self.upload_file, model=model, context=context),
+        )
+
     async def _request(
         self,
         method: str,
@@ -396,25 +532,31 @@ class GeminiProviderAdapter(ProviderAdapter):
         model: ResolvedModel,
         context: ProviderRequestContext,
         json_body: dict[str, Any] | None = None,
+        content: bytes | None = None,
+        extra_headers: Mapping[str, str] | None = None,
     ) -> httpx.Response:
-        """Send one JSON request and normalize transport failures.
+        """Send one JSON or raw-byte request and normalize transport failures.
 
         Args:
             method: HTTP method name.
-            path: Provider-relative endpoint path.
+            path: Provider-relative endpoint path, or an absolute upload URL.
             model: Resolved provider/model pair selected by the router.
             context: Per-call runtime context such as timeout and request id.
             json_body: Optional JSON request payload.
+            content: Optional raw request body used instead of ``json_body``.
+            extra_headers: Optional headers added to the normalized ones.
 
         Returns:
             The successful HTTP response object.
         """
+        headers = self._build_headers(model=model, context=context)
+        headers.update(extra_headers or {})
         try:
             response = await self._client.request(
                 method,
-                self._build_url(model, path),
-                json=json_body,
-                headers=self._build_headers(model=model, context=context),
+                path if "://" in path else self._build_url(model, path),
+                content=content if json_body is None else self._codec.dumps(json_body),
+                headers=headers,
                 timeout=self._resolve_timeout(model, context),
             )
         except asyncio.CancelledError as exc:
@@ -497,17 +639,20 @@ class GeminiProviderAdapter(ProviderAdapter):
             http_status=status_code,
         )
 
-    def _build_generate_content_payload(self, request: TextGenerateRequest) -> dict[str, Any]:
+    def _build_generate_content_payload(
+        self, request: TextGenerateRequest, file_uris: Mapping[str, str] | None = None
+    ) -> dict[str, Any]:
         """Translate the stable text request into Gemini's generateContent payload.
 
         Args:
             request: Normalized SDK text generation request.
+            file_uris: Uploaded file URIs keyed by media part digest.
 
         Returns:
             A JSON-serializable payload accepted by Gemini.
         """
         payload: dict[str, Any] = {
-            "contents": self._build_contents(request.messages),
+            "contents": self._build_contents(request.messages, file_uris or {}),
         }
         generation_config: dict[str, Any] = {}
         if request.temperature is not None:
@@ -524,6 +669,21 @@ class GeminiProviderAdapter(ProviderAdapter):
         system_prompt = self._extract_system_prompt(request.messages)
         if system_prompt:
             payload["systemInstruction"] = {"parts": [{"text": system_prompt}]}
+        if request.tools:
+            payload["tools"] = [
+                {
+                    "functionDeclarations": [
+                        {
+                            "name": tool.name,
+                            "description": tool.description,
+                            "parameters": tool.parameters,
+                        }
+                        for tool in request.tools
+                    ]
+                }
+            ]
+            mode = {"auto": "AUTO", "required": "ANY", "none": "NONE"}[request.tool_choice]
+            payload["toolConfig"] = {"functionCallingConfig": {"mode": mode}}
         return payload
 
     def _build_embedding_payload(self, *, text: str, dimensions: int | None) -> dict[str, Any]:
@@ -567,27 +727,71 @@ class GeminiProviderAdapter(ProviderAdapter):
             "generationConfig": generation_config,
         }
 
-    def _build_contents(self, messages: list[TextMessage]) -> list[dict[str, Any]]:
+    def _build_contents(
+        self, messages: list[TextMessage], file_uris: Mapping[str, str]
+    ) -> list[dict[str, Any]]:
         """Convert SDK chat messages into Gemini content entries.
 
         Args:
             messages: Ordered SDK conversation messages.
+            file_uris: Uploaded file URIs keyed by media part digest.
 
         Returns:
             A list of Gemini content entries.
         """
-        contents = [
-            {
-                "role": self._map_message_role(message.role),
-                "parts": [{"text": message.content}],
-            }
-            for message in messages
-            if message.role != "system"
-        ]
+        contents: list[dict[str, Any]] = []
+        tool_names: dict[str, str] = {}
+        tool_results: list[dict[str, Any]] | None = None
+        for message in messages:
+            if message.role == "system":
+                continue
+            if message.role == "tool":
+                part = {
+                    "functionResponse": {
+                        "name": message.name or tool_names.get(message.tool_call_id or "", ""),
+                        "response": {"content": message.content},
+                    }
+                }
+                # Results of one parallel tool turn travel together in one content entry.
+                if tool_results is None:
+                    tool_results = []
+                    contents.append({"role": "user", "parts": tool_results})
+                tool_results.append(part)
+                continue
+            tool_results = None
+            parts: list[dict[str, Any]] = [{"text": message.content}] if message.content else []
+            parts.extend(self._build_part(part, file_uris) for part in message.parts)
+            for call in message.tool_calls:
+                tool_names[call.id] = call.name
+                parts.append({"functionCall": {"name": call.name, "args": call.arguments}})
+            contents.append({"role": self._map_message_role(message.role), "parts": parts})
         if not contents:
             raise AIValidationError("Gemini requires at least one non-system message")
         return contents
 
+    def _build_part(self, part: ContentPart, file_uris: Mapping[str, str]) -> dict[str, Any]:
+        """Translate one content part into a Gemini part.
+
+        Args:
+            part: Text, image or file part.
+            file_uris: Uploaded file URIs keyed by media part digest.
+
+        Returns:
+            A ``text``, ``fileData`` or ``inlineData`` part.
+        """
+        if isinstance(part, TextPart):
+            return {"text": part.text}
+        if part.url is not None:
+            return {"fileData": {"mimeType": part.mime_type, "fileUri": part.url}}
+        if file_uris and part.digest in file_uris:
+            return {"fileData": {"mimeType": part.mime_type, "fileUri": file_uris[part.digest]}}
+        return {
+            "inlineData": {
+                "mimeType": part.mime_type,
+                "data": base64.b64encode(part.data).decode(),
+            }
+        }
+
     def _extract_system_prompt(self, messages: list[TextMessage]) -> str | None:
         """Join all system messages into Gemini's dedicated system instruction.
 
@@ -714,6 +918,28 @@ class GeminiProviderAdapter(ProviderAdapter):
         parts = candidate.get("content", {}).get("parts", [])
         return "".join(part.get("text", "") for part in parts if part.get("text"))
 
+    def _extract_tool_calls(self, payload: dict[str, Any]) -> list[ToolCall]:
+        """Collect ``functionCall`` parts from the first Gemini candidate.
+
+        Args:
+            payload: Raw Gemini response payload.
+
+        Returns:
+            Function calls in provider-neutral form; Gemini does not always assign
+            call ids, so positional ids are generated when missing.
+        """
+        candidate = self._first_candidate(payload)
+        parts = candidate.get("content", {}).get("parts", [])
+        calls = [part["functionCall"] for part in parts if part.get("functionCall")]
+        return [
+            ToolCall(
+                id=call.get("id") or f"call_{index}",
+                name=call.get("name", ""),
+                arguments=call.get("args") or {},
+            )
+            for index, call in enumerate(calls)
+        ]
+
     def _parse_usage(self, usage_payload: dict[str, Any] | None) -> AIUsage:
         """Normalize Gemini usage payloads into the SDK usage structure.
 
@@ -774,7 +1000,7 @@ class GeminiProviderAdapter(ProviderAdapter):
 
         return None, response.text or f"Gemini request failed with status {response.status_code}"
 
-    def _parse_image_artifacts(self, payload: dict[str, Any]) -> list[Artifact]:
+    async def _parse_image_artifacts(self, payload: dict[str, Any]) -> list[Artifact]:
         """Collect image parts from Gemini candidates into SDK artifacts.
 
         Args:
@@ -792,12 +1018,22 @@ class GeminiProviderAdapter(ProviderAdapter):
                     continue
 
                 # Gemini image responses inline base64 image data inside the content parts.
+                mime_type = inline_data.get("mimeType", "image/png")
+                filename = f"gemini-image-{candidate_index}-{part_index}"
+                if self._spooler is not None:
+                    artifacts.append(
+                        await self._spooler.spool_base64(
+                            inline_data["data"], mime_type=mime_type, filename=filename
+                        )
+                    )
+                    continue
+
                 artifacts.append(
                     Artifact(
                         kind=ArtifactKind.BINARY,
-                        content=base64.b64decode(inline_data["data"]),
-                        mime_type=inline_data.get("mimeType", "image/png"),
-                        filename=f"gemini-image-{candidate_index}-{part_index}",
+                        content=await self._decoder.b64decode(inline_data["data"]),
+                        mime_type=mime_type,
+                        filename=filename,
                     )
                 )
         return artifacts
@@ -0,0 +1,10 @@
+"""Mock provider exports for offline load tests and benchmarks.
+
+The wire-format stand-in server lives in ``.server`` and is imported directly so
+the adapter stays usable without loading the ASGI app.
+"""
+
+from .profile import LatencyDistribution, MockFault, MockProfile
+from .provider import MockProviderAdapter
+
+__all__ = ["LatencyDistribution", "MockFault", "MockProfile", "MockProviderAdapter"]
@@ -0,0 +1,195 @@
+"""Deterministic behavior profiles shared by the mock adapter and stand-in server."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+from dataclasses import dataclass, field
+from enum import StrEnum
+from functools import lru_cache
+from itertools import count
+from typing import Literal
+
+_VOCABULARY = (
+    "alpha",
+    "bravo",
+    "charlie",
+    "delta",
+    "echo",
+    "foxtrot",
+    "golf",
+    "hotel",
+    "india",
+    "juliet",
+    "kilo",
+    "lima",
+    "mike",
+    "november",
+    "oscar",
+    "papa",
+)
+
+# PNG signature plus padding; enough for clients that sniff image headers.
+MOCK_PNG_BYTES = b"\x89PNG\r\n\x1a\n" + bytes(24)
+
+
+class MockFault(StrEnum):
+    """Enumerate the faults a profile can inject into one call."""
+
+    NONE = "none"
+    RATE_LIMIT = "rate_limit"
+    SERVER_ERROR = "server_error"
+    STALL = "stall"
+
+
+@dataclass(slots=True, frozen=True)
+class LatencyDistribution:
+    """Describe how long the simulated provider waits before its first byte."""
+
+    kind: Literal["fixed", "uniform", "lognormal"] = "fixed"
+    mean_ms: float = 0.0
+    spread_ms: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency sample in milliseconds.
+
+        Args:
+            rng: Per-call random generator.
+
+        Returns:
+            A non-negative latency in milliseconds.
+        """
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.kind == "uniform":
+            return max(rng.uniform(self.mean_ms - self.spread_ms, self.mean_ms + self.spread_ms), 0)
+        if self.kind == "lognormal":
+            # Parameterize so the distribution mean equals ``mean_ms``.
+            sigma = math.log1p((self.spread_ms / self.mean_ms) ** 2) ** 0.5 if self.spread_ms else 0
+            mu = math.log(self.mean_ms) - sigma**2 / 2
+            return rng.lognormvariate(mu, sigma)
+        return self.mean_ms
+
+
+@dataclass(slots=True, frozen=True)
+class MockProfile:
+    """Configure latency, throughput, output shape, and fault injection."""
+
+    seed: int = 0
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    tokens_per_second: float = 0.0
+    output_tokens: int = 16
+    embedding_dimensions: int = 8
+    rate_limit_rate: float = 0.0
+    server_error_rate: float = 0.0
+    stall_rate: float = 0.0
+    stall_ms: float = 30_000.0
+    replay_path: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class MockCallPlan:
+    """Capture every random decision for one simulated call up front."""
+
+    first_byte_delay_s: float
+    token_delay_s: float
+    fault: MockFault
+    stall_s: float
+    tokens: tuple[str, ...]
+
+
+class MockPlanner:
+    """Turn a profile into reproducible per-call plans.
+
+    Plans are seeded from the profile seed and a monotonically increasing call
+    counter, so the same sequence of calls always sees the same latencies,
+    outputs, and faults regardless of wall-clock timing.
+    """
+
+    def __init__(self, profile: MockProfile) -> None:
+        """Bind the planner to one profile.
+
+        Args:
+            profile: Behavior profile to sample from.
+
+        Returns:
+            None.
+        """
+        self.profile = profile
+        self._calls = count()
+
+    def plan(self) -> MockCallPlan:
+        """Draw the plan for the next call.
+
+        Args:
+            None.
+
+        Returns:
+            The plan describing delays, faults, and output tokens.
+        """
+        profile = self.profile
+        rng = random.Random(f"{profile.seed}:{next(self._calls)}")
+        roll = rng.random()
+        fault = MockFault.NONE
+        if roll < profile.rate_limit_rate:
+            fault = MockFault.RATE_LIMIT
+        elif roll < profile.rate_limit_rate + profile.server_error_rate:
+            fault = MockFault.SERVER_ERROR
+        elif roll < profile.rate_limit_rate + profile.server_error_rate + profile.stall_rate:
+            fault = MockFault.STALL
+
+        tokens = tuple(
+            (" " if index else "") + _VOCABULARY[rng.randrange(len(_VOCABULARY))]
+            for index in range(max(profile.output_tokens, 1))
+        )
+        return MockCallPlan(
+            first_byte_delay_s=profile.latency.sample(rng) / 1000,
+            token_delay_s=1 / profile.tokens_per_second if profile.tokens_per_second > 0 else 0.0,
+            fault=fault,
+            stall_s=profile.stall_ms / 1000,
+            tokens=tokens,
+        )
+
+
+def mock_embedding(text: str, dimensions: int) -> list[float]:
+    """Build a deterministic unit-length embedding for one input text.
+
+    Args:
+        text: Input text to embed.
+        dimensions: Requested vector size.
+
+    Returns:
+        A normalized vector that only depends on ``text`` and ``dimensions``.
+    """
+    return list(_cached_embedding(text, dimensions))
+
+
+@lru_cache(maxsize=4096)
+def _cached_embedding(text: str, dimensions: int) -> tuple[float, ...]:
+    """Compute and memoize one embedding so benchmarks measure SDK cost, not the fake.
+
+    Args:
+        text: Input text to embed.
+        dimensions: Requested vector size.
+
+    Returns:
+        The normalized vector as an immutable tuple.
+    """
+    digest = hashlib.sha256(text.encode()).digest()
+    rng = random.Random(digest)
+    vector = [rng.gauss(0, 1) for _ in range(max(dimensions, 1))]
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return tuple(value / norm for value in vector)
+
+
+def estimate_prompt_tokens(text: str) -> int:
+    """Approximate a prompt token count the way the stand-in reports usage.
+
+    Args:
+        text: Prompt text.
+
+    Returns:
+        A positive token estimate.
+    """
+    return max(len(text) // 4, 1)
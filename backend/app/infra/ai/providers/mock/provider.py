@@ -0,0 +1,392 @@
+"""In-process mock provider adapter for offline load tests and benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from ...exceptions import AIProviderUnavailableError, AIRateLimitError, AITimeoutError
+from ...requests import (
+    AudioGenerateRequest,
+    EmbeddingRequest,
+    ImageGenerateRequest,
+    TextGenerateRequest,
+)
+from ...responses import (
+    AudioGenerateResponse,
+    EmbeddingResponse,
+    ImageGenerateResponse,
+    TextGenerateResponse,
+)
+from ...stream import (
+    AIDoneEvent,
+    AIStartEvent,
+    AITextDeltaEvent,
+    AITextEndEvent,
+    AITextStartEvent,
+    AIUsageEvent,
+)
+from ...types import (
+    AIFinishReason,
+    AIUsage,
+    Artifact,
+    ArtifactKind,
+    ProviderRequestContext,
+    ResolvedModel,
+)
+from ..base import ProviderAdapter
+from .profile import (
+    MOCK_PNG_BYTES,
+    MockCallPlan,
+    MockFault,
+    MockPlanner,
+    MockProfile,
+    estimate_prompt_tokens,
+    mock_embedding,
+)
+
+
+class MockProviderAdapter(ProviderAdapter):
+    """Simulate a provider with deterministic output, latency, and injected faults."""
+
+    def __init__(self, profile: MockProfile | None = None) -> None:
+        """Create the adapter.
+
+        Args:
+            profile: Optional behavior profile; defaults to zero latency and no faults.
+
+        Returns:
+            None.
+        """
+        self._planner = MockPlanner(profile or MockProfile())
+
+    @property
+    def profile(self) -> MockProfile:
+        """Expose the active behavior profile.
+
+        Args:
+            None.
+
+        Returns:
+            The profile used to plan calls.
+        """
+        return self._planner.profile
+
+    async def generate_text(
+        self,
+        request: TextGenerateRequest,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> TextGenerateResponse:
+        """Return deterministic text after the simulated generation time.
+
+        Args:
+            request: Normalized SDK text generation request.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            A normalized text generation response.
+        """
+        plan = self._planner.plan()
+        await self._begin(plan, model, context)
+        tokens = self._limit_tokens(plan, request.max_tokens)
+        if plan.token_delay_s:
+            await asyncio.sleep(plan.token_delay_s * len(tokens))
+
+        return TextGenerateResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            usage=self._text_usage(request, tokens),
+            text="".join(tokens),
+            finish_reason=self._finish_reason(plan, tokens),
+        )
+
+    async def stream_text(
+        self,
+        request: TextGenerateRequest,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> AsyncIterator[
+        AIStartEvent
+        | AITextStartEvent
+        | AITextDeltaEvent
+        | AITextEndEvent
+        | AIUsageEvent
+        | AIDoneEvent
+    ]:
+        """Stream one deterministic token per delta at the profile's token rate.
+
+        Args:
+            request: Normalized SDK text generation request.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            An async iterator of normalized stream events.
+        """
+        plan = self._planner.plan()
+        await self._begin(plan, model, context)
+        common = {
+            "request_id": context.request_id,
+            "provider": model.provider,
+            "model": model.model_id,
+            "attempt": 0,
+        }
+        tokens = self._limit_tokens(plan, request.max_tokens)
+        usage = self._text_usage(request, tokens)
+
+        yield AIStartEvent(**common)
+        yield AITextStartEvent(**common)
+        text = ""
+        for token in tokens:
+            if plan.token_delay_s:
+                await asyncio.sleep(plan.token_delay_s)
+            text += token
+            yield AITextDeltaEvent(**common, delta=token, text=text)
+        yield AITextEndEvent(**common, text=text)
+        yield AIUsageEvent(**common, usage=usage)
+        yield AIDoneEvent(
+            **common,
+            text=text,
+            finish_reason=self._finish_reason(plan, tokens),
+            usage=usage,
+        )
+
+    async def embed(
+        self,
+        request: EmbeddingRequest,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> EmbeddingResponse:
+        """Return deterministic unit vectors derived from each input.
+
+        Args:
+            request: Normalized SDK embedding request.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            A normalized embedding response.
+        """
+        plan = self._planner.plan()
+        await self._begin(plan, model, context)
+        inputs = [request.input] if isinstance(request.input, str) else request.input
+        dimensions = request.dimensions or self.profile.embedding_dimensions
+        input_tokens = sum(estimate_prompt_tokens(item) for item in inputs)
+
+        return EmbeddingResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            usage=AIUsage.from_counts(input_tokens=input_tokens),
+            vectors=[mock_embedding(item, dimensions) for item in inputs],
+            dimensions=dimensions,
+        )
+
+    async def generate_image(
+        self,
+        request: ImageGenerateRequest,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> ImageGenerateResponse:
+        """Return ``count`` placeholder PNG artifacts.
+
+        Args:
+            request: Normalized SDK image generation request.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            A normalized image generation response.
+        """
+        plan = self._planner.plan()
+        await self._begin(plan, model, context)
+
+        return ImageGenerateResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            artifacts=[
+                Artifact(
+                    kind=ArtifactKind.BINARY,
+                    content=MOCK_PNG_BYTES,
+                    mime_type="image/png",
+                    filename=f"image-{index}",
+                )
+                for index in range(1, request.count + 1)
+            ],
+            mime_type="image/png",
+        )
+
+    async def generate_audio(
+        self,
+        request: AudioGenerateRequest,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> AudioGenerateResponse:
+        """Return the input text bytes as a placeholder audio artifact.
+
+        Args:
+            request: Normalized SDK audio generation request.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            A normalized audio generation response.
+        """
+        plan = self._planner.plan()
+        await self._begin(plan, model, context)
+
+        return AudioGenerateResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            artifacts=[
+                Artifact(
+                    kind=ArtifactKind.BINARY,
+                    content=request.input_text.encode(),
+                    mime_type="application/octet-stream",
+                    filename=f"{context.request_id}.{request.format}",
+                )
+            ],
+            mime_type="application/octet-stream",
+        )
+
+    def audio_mime_type(self, request: AudioGenerateRequest, model: ResolvedModel) -> str | None:
+        """Return the MIME type of the placeholder audio.
+
+        Args:
+            request: Normalized SDK audio generation request.
+            model: Resolved provider/model pair selected by the router.
+
+        Returns:
+            ``application/octet-stream``.
+        """
+        return "application/octet-stream"
+
+    async def stream_audio(
+        self,
+        request: AudioGenerateRequest,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> AsyncIterator[bytes]:
+        """Stream the input words as placeholder audio chunks at the token rate.
+
+        Args:
+            request: Normalized SDK audio generation request.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            An async iterator of raw audio chunks.
+        """
+        plan = self._planner.plan()
+        await self._begin(plan, model, context)
+        for word in request.input_text.split():
+            if plan.token_delay_s:
+                await asyncio.sleep(plan.token_delay_s)
+            yield word.encode()
+
+    async def _begin(
+        self,
+        plan: MockCallPlan,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> None:
+        """Wait for the first byte and raise the fault selected by the plan.
+
+        Args:
+            plan: Pre-drawn call plan.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            None.
+        """
+        if plan.first_byte_delay_s:
+            await asyncio.sleep(plan.first_byte_delay_s)
+
+        if plan.fault is MockFault.RATE_LIMIT:
+            raise AIRateLimitError(
+                "Mock provider rate limited the request",
+                provider=model.provider,
+                model=model.model_id,
+                http_status=429,
+            )
+        if plan.fault is MockFault.SERVER_ERROR:
+            raise AIProviderUnavailableError(
+                "Mock provider returned a server error",
+                provider=model.provider,
+                model=model.model_id,
+                http_status=503,
+            )
+        if plan.fault is MockFault.STALL:
+            timeout_s = (context.timeout_ms or model.timeout_ms) / 1000
+            if plan.stall_s < timeout_s:
+                await asyncio.sleep(plan.stall_s)
+                return
+            # A stall longer than the budget surfaces exactly like a real read timeout.
+            await asyncio.sleep(timeout_s)
+            raise AITimeoutError(
+                "Mock provider stalled past the request timeout",
+                provider=model.provider,
+                model=model.model_id,
+            )
+
+    def _limit_tokens(self, plan: MockCallPlan, max_tokens: int | None) -> tuple[str, ...]:
+        """Truncate the planned output to the caller's token limit.
+
+        Args:
+            plan: Pre-drawn call plan.
+            max_tokens: Optional caller-provided output limit.
+
+        Returns:
+            The tokens that will be emitted.
+        """
+        if max_tokens is None:
+            return plan.tokens
+        return plan.tokens[:max_tokens]
+
+    def _finish_reason(self, plan: MockCallPlan, tokens: tuple[str, ...]) -> AIFinishReason:
+        """Report ``length`` when the caller's limit truncated the output.
+
+        Args:
+            plan: Pre-drawn call plan.
+            tokens: Tokens actually emitted.
+
+        Returns:
+            A normalized SDK finish reason.
+        """
+        if len(tokens) < len(plan.tokens):
+            return AIFinishReason.LENGTH
+        return AIFinishReason.STOP
+
+    def _text_usage(self, request: TextGenerateRequest, tokens: tuple[str, ...]) -> AIUsage:
+        """Build usage counters for one simulated text generation.
+
+        Args:
+            request: Normalized SDK text generation request.
+            tokens: Tokens emitted by the simulated model.
+
+        Returns:
+            A normalized usage object.
+        """
+        prompt = "\n".join(message.content for message in request.messages)
+        return AIUsage.from_counts(
+            input_tokens=estimate_prompt_tokens(prompt),
+            output_tokens=len(tokens),
+        )
@@ -0,0 +1,811 @@
+"""Local HTTP stand-in that speaks the OpenAI, Anthropic, and Gemini wire formats.
+
+Point a provider ``base_url`` at the matching prefix to exercise the real
+adapters, retry logic, and SSE parsing offline:
+
+- OpenAI-compatible: ``http://<host>/openai/v1``
+- Anthropic: ``http://<host>/anthropic/v1``
+- Gemini: ``http://<host>/gemini/v1beta``
+
+Run it standalone with ``python -m app.infra.ai.providers.mock.server``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import re
+import struct
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any, Literal
+from uuid import uuid4
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from .profile import (
+    MOCK_PNG_BYTES,
+    LatencyDistribution,
+    MockCallPlan,
+    MockFault,
+    MockPlanner,
+    MockProfile,
+    estimate_prompt_tokens,
+    mock_embedding,
+)
+
+WireFormat = Literal["openai", "anthropic", "gemini"]
+
+_DELAY_COMMENT = re.compile(r"^:\s*delay_ms=(\d+(?:\.\d+)?)\s*$")
+
+_ERROR_BODIES: dict[WireFormat, dict[MockFault, dict[str, Any]]] = {
+    "openai": {
+        MockFault.RATE_LIMIT: {
+            "error": {"type": "rate_limit_error", "message": "Rate limit reached"}
+        },
+        MockFault.SERVER_ERROR: {
+            "error": {"type": "server_error", "message": "The server is overloaded"}
+        },
+    },
+    "anthropic": {
+        MockFault.RATE_LIMIT: {
+            "type": "error",
+            "error": {"type": "rate_limit_error", "message": "Rate limit reached"},
+        },
+        MockFault.SERVER_ERROR: {
+            "type": "error",
+            "error": {"type": "overloaded_error", "message": "Overloaded"},
+        },
+    },
+    "gemini": {
+        MockFault.RATE_LIMIT: {
+            "error": {"code": 429, "status": "RESOURCE_EXHAUSTED", "message": "Quota exceeded"}
+        },
+        MockFault.SERVER_ERROR: {
+            "error": {"code": 503, "status": "UNAVAILABLE", "message": "The model is overloaded"}
+        },
+    },
+}
+
+_FAULT_STATUS = {MockFault.RATE_LIMIT: 429, MockFault.SERVER_ERROR: 503}
+
+
+def create_standin_app(profile: MockProfile | None = None) -> FastAPI:
+    """Build the stand-in ASGI application for one behavior profile.
+
+    Args:
+        profile: Optional behavior profile; defaults to zero latency and no faults.
+
+    Returns:
+        A FastAPI application serving the three provider wire formats.
+    """
+    planner = MockPlanner(profile or MockProfile())
+    app = FastAPI(title="AI provider stand-in", docs_url=None, redoc_url=None)
+    app.state.planner = planner
+    # File ids handed out by the upload endpoints, in order.
+    app.state.uploads = []
+
+    @app.post("/openai/v1/chat/completions")
+    async def openai_chat(request: Request) -> Response:
+        """Serve OpenAI chat completions, streamed as SSE when ``stream`` is set.
+
+        Args:
+            request: Incoming HTTP request.
+
+        Returns:
+            A chat completion, an SSE stream of chunks, or the planned fault.
+        """
+        body = await request.json()
+        plan = planner.plan()
+        if (error := await _apply_fault(plan, "openai")) is not None:
+            return error
+
+        tokens = _limit_tokens(plan, body.get("max_tokens"))
+        prompt_tokens = _prompt_tokens(body.get("messages", []))
+        finish_reason = "length" if len(tokens) < len(plan.tokens) else "stop"
+        if body.get("stream"):
+            replay = _replay_source(planner.profile, "openai")
+            if replay is not None:
+                return _sse_response(replay)
+            return _sse_response(
+                _openai_chunks(body.get("model", ""), plan, tokens, prompt_tokens, finish_reason)
+            )
+
+        await _sleep_tokens(plan, tokens)
+        return JSONResponse(
+            {
+                "id": f"chatcmpl-{uuid4().hex}",
+                "object": "chat.completion",
+                "model": body.get("model", ""),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "".join(tokens)},
+                        "finish_reason": finish_reason,
+                    }
+                ],
+                "usage": _openai_usage(prompt_tokens, len(tokens)),
+            },
+            headers=_request_id_headers(),
+        )
+
+    @app.post("/openai/v1/embeddings")
+    async def openai_embeddings(request: Request) -> Response:
+        """Serve OpenAI embeddings as float lists or base64, per ``encoding_format``.
+
+        Args:
+            request: Incoming HTTP request.
+
+        Returns:
+            An embedding list response, or the planned fault.
+        """
+        body = await request.json()
+        plan = planner.plan()
+        if (error := await _apply_fault(plan, "openai")) is not None:
+            return error
+
+        inputs = [body["input"]] if isinstance(body.get("input"), str) else body.get("input", [])
+        dimensions = body.get("dimensions") or planner.profile.embedding_dimensions
+        prompt_tokens = sum(estimate_prompt_tokens(item) for item in inputs)
+        return JSONResponse(
+            {
+                "object": "list",
+                "model": body.get("model", ""),
+                "data": [
+                    {
+                        "object": "embedding",
+                        "index": index,
+                        "embedding": _openai_embedding(
+                            mock_embedding(item, dimensions), body.get("encoding_format")
+                        ),
+                    }
+                    for index, item in enumerate(inputs)
+                ],
+                "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens},
+            },
+            headers=_request_id_headers(),
+        )
+
+    @app.post("/openai/v1/images/generations")
+    async def openai_images(request: Request) -> Response:
+        """Serve ``n`` placeholder PNG images as ``b64_json`` entries.
+
+        Args:
+            request: Incoming HTTP request.
+
+        Returns:
+            An image generation response, or the planned fault.
+        """
+        body = await request.json()
+        plan = planner.plan()
+        if (error := await _apply_fault(plan, "openai")) is not None:
+            return error
+
+        image = base64.b64encode(MOCK_PNG_BYTES).decode()
+        return JSONResponse(
+            {"data": [{"b64_json": image} for _ in range(body.get("n") or 1)]},
+            headers=_request_id_headers(),
+        )
+
+    @app.post("/openai/v1/audio/speech")
+    async def openai_speech(request: Request) -> Response:
+        """Stream the input words back as placeholder speech bytes at the token rate.
+
+        Args:
+            request: Incoming HTTP request.
+
+        Returns:
+            A streamed audio body, or the planned fault.
+        """
+        body = await request.json()
+        plan = planner.plan()
+        if (error := await _apply_fault(plan, "openai")) is not None:
+            return error
+
+        async def chunks() -> AsyncIterator[bytes]:
+            """Yield one chunk per input word.
+
+            Args:
+                None.
+
+            Returns:
+                An async iterator of audio chunks.
+            """
+            for word in str(body.get("input", "")).split():
+                if plan.token_delay_s:
+                    await asyncio.sleep(plan.token_delay_s)
+                yield word.encode()
+
+        return StreamingResponse(
+            chunks(), media_type="application/octet-stream", headers=_request_id_headers()
+        )
+
+    @app.post("/openai/v1/files")
+    async def openai_files(request: Request) -> Response:
+        """Accept an OpenAI file upload and hand out a new file id.
+
+        Args:
+            request: Incoming HTTP request.
+
+        Returns:
+            The created file object.
+        """
+        await request.body()
+        file_id = f"file-{uuid4().hex}"
+        app.state.uploads.append(file_id)
+        return JSONResponse(
+            {"id": file_id, "object": "file", "purpose": "user_data"},
+            headers=_request_id_headers(),
+        )
+
+    @app.post("/anthropic/v1/files")
+    async def anthropic_files(request: Request) -> Response:
+        """Accept an Anthropic Files API upload and hand out a new file id.
+
+        Args:
+            request: Incoming HTTP request.
+
+        Returns:
+            The created file object.
+        """
+        await request.body()
+        file_id = f"file_{uuid4().hex}"
+        app.state.uploads.append(file_id)
+        return JSONResponse(
+            {"id": file_id, "type": "file"}, headers={"request-id": f"req_{uuid4().hex}"}
+        )
+
+    @app.post("/anthropic/v1/messages")
+    async def anthropic_messages(request: Request) -> Response:
+        """Serve Anthropic messages, streamed as SSE events when ``stream`` is set.
+
+        Args:
+            request: Incoming HTTP request.
+
+        Returns:
+            A message, an SSE stream of message events, or the planned fault.
+        """
+        body = await request.json()
+        plan = planner.plan()
+        if (error := await _apply_fault(plan, "anthropic")) is not None:
+            return error
+
+        tokens = _limit_tokens(plan, body.get("max_tokens"))
+        prompt_tokens = _prompt_tokens(body.get("messages", []))
+        stop_reason = "max_tokens" if len(tokens) < len(plan.tokens) else "end_turn"
+        if body.get("stream"):
+            replay = _replay_source(planner.profile, "anthropic")
+            if replay is not None:
+                return _sse_response(replay)
+            return _sse_response(_anthropic_events(plan, tokens, prompt_tokens, stop_reason))
+
+        await _sleep_tokens(plan, tokens)
+        return JSONResponse(
+            {
+                "id": f"msg_{uuid4().hex}",
+                "type": "message",
+                "role": "assistant",
+                "model": body.get("model", ""),
+                "content": [{"type": "text", "text": "".join(tokens)}],
+                "stop_reason": stop_reason,
+                "usage": {"input_tokens": prompt_tokens, "output_tokens": len(tokens)},
+            },
+            headers={"request-id": f"req_{uuid4().hex}"},
+        )
+
+    @app.post("/gemini/upload/v1beta/files")
+    async def gemini_upload_start(request: Request) -> Response:
+        """Start a Gemini resumable upload and return its session URL.
+
+        Args:
+            request: Incoming HTTP request.
+
+        Returns:
+            An empty body carrying the ``x-goog-upload-url`` header.
+        """
+        await request.body()
+        session = uuid4().hex
+        return JSONResponse(
+            {},
+            headers={
+                "x-goog-upload-url": f"{request.base_url}gemini/upload/v1beta/files/{session}",
+                "x-goog-upload-status": "active",
+            },
+        )
+
+    @app.post("/gemini/upload/v1beta/files/{session}")
+    async def gemini_upload(session: str, request: Request) -> Response:
+        """Finish a Gemini resumable upload and return the stored file resource.
+
+        Args:
+            session: Upload session id from the start response.
+            request: Incoming HTTP request.
+
+        Returns:
+            The finalized file resource.
+        """
+        await request.body()
+        name = f"files/{session[:12]}"
+        app.state.uploads.append(name)
+        return JSONResponse(
+            {
+                "file": {
+                    "name": name,
+                    "uri": f"{request.base_url}gemini/v1beta/{name}",
+                    "mimeType": request.headers.get("content-type", ""),
+                    "state": "ACTIVE",
+                }
+            },
+            headers={"x-goog-upload-status": "final"},
+        )
+
+    @app.post("/gemini/v1beta/models/{target}")
+    async def gemini_models(target: str, request: Request) -> Response:
+        """Serve Gemini ``generateContent``, ``streamGenerateContent``, and ``embedContent``.
+
+        Args:
+            target: ``<model>:<action>`` path segment.
+            request: Incoming HTTP request.
+
+        Returns:
+            The action's response, an SSE stream, a 404 for unknown actions, or the planned fault.
+        """
+        body = await request.json()
+        _, _, action = target.partition(":")
+        plan = planner.plan()
+        if (error := await _apply_fault(plan, "gemini")) is not None:
+            return error
+
+        if action == "embedContent":
+            parts = body.get("content", {}).get("parts", [])
+            text = "".join(part.get("text", "") for part in parts)
+            dimensions = body.get("outputDimensionality") or planner.profile.embedding_dimensions
+            return JSONResponse(
+                {"embedding": {"values": mock_embedding(text, dimensions)}},
+                headers=_request_id_headers(),
+            )
+
+        generation_config = body.get("generationConfig", {})
+        if "IMAGE" in generation_config.get("responseModalities", []):
+            image = base64.b64encode(MOCK_PNG_BYTES).decode()
+            return JSONResponse(
+                {
+                    "candidates": [
+                        {
+                            "content": {
+                                "parts": [{"inlineData": {"mimeType": "image/png", "data": image}}]
+                            },
+                            "finishReason": "STOP",
+                        }
+                    ]
+                },
+                headers=_request_id_headers(),
+            )
+
+        tokens = _limit_tokens(plan, generation_config.get("maxOutputTokens"))
+        prompt_tokens = _prompt_tokens(body.get("contents", []))
+        finish_reason = "MAX_TOKENS" if len(tokens) < len(plan.tokens) else "STOP"
+        if action == "streamGenerateContent":
+            replay = _replay_source(planner.profile, "gemini")
+            if replay is not None:
+                return _sse_response(replay)
+            return _sse_response(_gemini_chunks(plan, tokens, prompt_tokens, finish_reason))
+        if action != "generateContent":
+            return JSONResponse(
+                {
+                    "error": {
+                        "code": 404,
+                        "status": "NOT_FOUND",
+                        "message": f"Unknown action {action}",
+                    }
+                },
+                status_code=404,
+            )
+
+        await _sleep_tokens(plan, tokens)
+        return JSONResponse(
+            {
+                "candidates": [
+                    {
+                        "content": {"role": "model", "parts": [{"text": "".join(tokens)}]},
+                        "finishReason": finish_reason,
+                    }
+                ],
+                "usageMetadata": _gemini_usage(prompt_tokens, len(tokens)),
+            },
+            headers=_request_id_headers(),
+        )
+
+    return app
+
+
+async def _apply_fault(plan: MockCallPlan, wire: WireFormat) -> Response | None:
+    """Wait for the first byte and build the error response selected by the plan.
+
+    Stalls simply hold the request open; the caller's own timeout decides whether
+    it surfaces as a failure.
+
+    Args:
+        plan: Pre-drawn call plan.
+        wire: Wire format used to shape the error body.
+
+    Returns:
+        An error response, or ``None`` when the call should proceed.
+    """
+    if plan.first_byte_delay_s:
+        await asyncio.sleep(plan.first_byte_delay_s)
+
+    if plan.fault is MockFault.STALL:
+        await asyncio.sleep(plan.stall_s)
+        return None
+    if plan.fault in _FAULT_STATUS:
+        headers = {"retry-after": "0"} if plan.fault is MockFault.RATE_LIMIT else None
+        return JSONResponse(
+            _ERROR_BODIES[wire][plan.fault],
+            status_code=_FAULT_STATUS[plan.fault],
+            headers=headers,
+        )
+    return None
+
+
+def _limit_tokens(plan: MockCallPlan, max_tokens: int | None) -> tuple[str, ...]:
+    """Truncate the planned output to the request's token limit.
+
+    Args:
+        plan: Pre-drawn call plan.
+        max_tokens: Optional output limit taken from the request body.
+
+    Returns:
+        The tokens that will be emitted.
+    """
+    if max_tokens is None:
+        return plan.tokens
+    return plan.tokens[:max_tokens]
+
+
+def _prompt_tokens(messages: list[Any]) -> int:
+    """Estimate prompt tokens from a provider-native message list.
+
+    Args:
+        messages: Raw ``messages`` or ``contents`` array from the request body.
+
+    Returns:
+        A positive token estimate.
+    """
+    return estimate_prompt_tokens(json.dumps(messages, ensure_ascii=False))
+
+
+async def _sleep_tokens(plan: MockCallPlan, tokens: tuple[str, ...]) -> None:
+    """Simulate the generation time of a non-streaming response.
+
+    Args:
+        plan: Pre-drawn call plan.
+        tokens: Tokens included in the response.
+
+    Returns:
+        None.
+    """
+    if plan.token_delay_s:
+        await asyncio.sleep(plan.token_delay_s * len(tokens))
+
+
+def _request_id_headers() -> dict[str, str]:
+    """Build the provider request id header shared by OpenAI and Gemini responses.
+
+    Args:
+        None.
+
+    Returns:
+        Response headers carrying a fresh request id.
+    """
+    return {"x-request-id": f"req_{uuid4().hex}"}
+
+
+def _openai_usage(prompt_tokens: int, completion_tokens: int) -> dict[str, int]:
+    """Build an OpenAI usage object.
+
+    Args:
+        prompt_tokens: Estimated prompt tokens.
+        completion_tokens: Emitted completion tokens.
+
+    Returns:
+        The OpenAI ``usage`` payload.
+    """
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _openai_embedding(vector: list[float], encoding_format: str | None) -> list[float] | str:
+    """Encode one embedding the way the OpenAI ``encoding_format`` option asks for.
+
+    Args:
+        vector: Embedding values.
+        encoding_format: ``base64`` for little-endian float32 bytes, else floats.
+
+    Returns:
+        The float list, or its base64-encoded float32 bytes.
+    """
+    if encoding_format != "base64":
+        return vector
+    return base64.b64encode(struct.pack(f"<{len(vector)}f", *vector)).decode("ascii")
+
+
+def _gemini_usage(prompt_tokens: int, candidate_tokens: int) -> dict[str, int]:
+    """Build a Gemini usage metadata object.
+
+    Args:
+        prompt_tokens: Estimated prompt tokens.
+        candidate_tokens: Emitted candidate tokens.
+
+    Returns:
+        The Gemini ``usageMetadata`` payload.
+    """
+    return {
+        "promptTokenCount": prompt_tokens,
+        "candidatesTokenCount": candidate_tokens,
+        "totalTokenCount": prompt_tokens + candidate_tokens,
+    }
+
+
+def _sse(payload: dict[str, Any] | str, event: str | None = None) -> bytes:
+    """Encode one SSE frame.
+
+    Args:
+        payload: JSON payload, or a raw string such as ``[DONE]``.
+        event: Optional SSE event name.
+
+    Returns:
+        The encoded frame.
+    """
+    data = payload if isinstance(payload, str) else json.dumps(payload, separators=(",", ":"))
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {data}\n\n".encode()
+
+
+def _sse_response(frames: AsyncIterator[bytes]) -> StreamingResponse:
+    """Wrap an SSE frame iterator in a streaming response.
+
+    Args:
+        frames: Async iterator of encoded SSE frames.
+
+    Returns:
+        A ``text/event-stream`` response.
+    """
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={**_request_id_headers(), "cache-control": "no-cache"},
+    )
+
+
+async def _openai_chunks(
+    model: str,
+    plan: MockCallPlan,
+    tokens: tuple[str, ...],
+    prompt_tokens: int,
+    finish_reason: str,
+) -> AsyncIterator[bytes]:
+    """Yield OpenAI chat completion chunks for one planned call.
+
+    Args:
+        model: Model id echoed back in every chunk.
+        plan: Pre-drawn call plan.
+        tokens: Tokens to emit.
+        prompt_tokens: Estimated prompt tokens.
+        finish_reason: OpenAI finish reason for the final chunk.
+
+    Returns:
+        An async iterator of encoded SSE frames.
+    """
+    chunk_id = f"chatcmpl-{uuid4().hex}"
+
+    def chunk(delta: dict[str, Any], reason: str | None) -> dict[str, Any]:
+        return {
+            "id": chunk_id,
+            "object": "chat.completion.chunk",
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": reason}],
+        }
+
+    yield _sse(chunk({"role": "assistant", "content": ""}, None))
+    for token in tokens:
+        if plan.token_delay_s:
+            await asyncio.sleep(plan.token_delay_s)
+        yield _sse(chunk({"content": token}, None))
+    yield _sse(chunk({}, finish_reason))
+    yield _sse(
+        {
+            "id": chunk_id,
+            "object": "chat.completion.chunk",
+            "model": model,
+            "choices": [],
+            "usage": _openai_usage(prompt_tokens, len(tokens)),
+        }
+    )
+    yield _sse("[DONE]")
+
+
+async def _anthropic_events(
+    plan: MockCallPlan,
+    tokens: tuple[str, ...],
+    prompt_tokens: int,
+    stop_reason: str,
+) -> AsyncIterator[bytes]:
+    """Yield Anthropic message stream events for one planned call.
+
+    Args:
+        plan: Pre-drawn call plan.
+        tokens: Tokens to emit.
+        prompt_tokens: Estimated prompt tokens.
+        stop_reason: Anthropic stop reason for the ``message_delta`` event.
+
+    Returns:
+        An async iterator of encoded SSE frames.
+    """
+    yield _sse(
+        {
+            "type": "message_start",
+            "message": {
+                "id": f"msg_{uuid4().hex}",
+                "type": "message",
+                "role": "assistant",
+                "content": [],
+                "usage": {"input_tokens": prompt_tokens, "output_tokens": 0},
+            },
+        },
+        "message_start",
+    )
+    yield _sse(
+        {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+        "content_block_start",
+    )
+    for token in tokens:
+        if plan.token_delay_s:
+            await asyncio.sleep(plan.token_delay_s)
+        yield _sse(
+            {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": token},
+            },
+            "content_block_delta",
+        )
+    yield _sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+    yield _sse(
+        {
+            "type": "message_delta",
+            "delta": {"stop_reason": stop_reason},
+            "usage": {"output_tokens": len(tokens)},
+        },
+        "message_delta",
+    )
+    yield _sse({"type": "message_stop"}, "message_stop")
+
+
+async def _gemini_chunks(
+    plan: MockCallPlan,
+    tokens: tuple[str, ...],
+    prompt_tokens: int,
+    finish_reason: str,
+) -> AsyncIterator[bytes]:
+    """Yield Gemini ``streamGenerateContent`` chunks for one planned call.
+
+    Args:
+        plan: Pre-drawn call plan.
+        tokens: Tokens to emit.
+        prompt_tokens: Estimated prompt tokens.
+        finish_reason: Gemini finish reason for the final chunk.
+
+    Returns:
+        An async iterator of encoded SSE frames.
+    """
+    for index, token in enumerate(tokens, start=1):
+        if plan.token_delay_s:
+            await asyncio.sleep(plan.token_delay_s)
+        candidate: dict[str, Any] = {"content": {"role": "model", "parts": [{"text": token}]}}
+        payload: dict[str, Any] = {"candidates": [candidate]}
+        if index == len(tokens):
+            candidate["finishReason"] = finish_reason
+            payload["usageMetadata"] = _gemini_usage(prompt_tokens, len(tokens))
+        yield _sse(payload)
+
+
+def _replay_source(profile: MockProfile, wire: WireFormat) -> AsyncIterator[bytes] | None:
+    """Return a replay iterator when a recording exists for the wire format.
+
+    Recordings live in ``<replay_path>/<wire>.sse`` and are replayed verbatim.
+    Comment lines of the form ``: delay_ms=N`` pause the replay for ``N``
+    milliseconds and are not forwarded, so recorded inter-event timing survives.
+
+    Args:
+        profile: Active behavior profile.
+        wire: Wire format of the streaming endpoint.
+
+    Returns:
+        An async iterator of raw body chunks, or ``None`` without a recording.
+    """
+    if profile.replay_path is None:
+        return None
+    path = Path(profile.replay_path) / f"{wire}.sse"
+    if not path.is_file():
+        return None
+    return _replay_file(path)
+
+
+async def _replay_file(path: Path) -> AsyncIterator[bytes]:
+    """Replay one recorded SSE body, honoring embedded delay comments.
+
+    Args:
+        path: Recorded ``.sse`` file.
+
+    Returns:
+        An async iterator of raw body chunks.
+    """
+    pending: list[str] = []
+    text = await asyncio.to_thread(path.read_text, encoding="utf-8")
+    for line in text.splitlines(keepends=True):
+        match = _DELAY_COMMENT.match(line.strip())
+        if match is None:
+            pending.append(line)
+            continue
+
+        if pending:
+            yield "".join(pending).encode()
+            pending.clear()
+        await asyncio.sleep(float(match.group(1)) / 1000)
+
+    if pending:
+        yield "".join(pending).encode()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Serve the stand-in with uvicorn.
+
+    Args:
+        argv: Optional command-line arguments; defaults to ``sys.argv``.
+
+    Returns:
+        None.
+    """
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the AI provider wire-format stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", choices=("fixed", "uniform", "lognormal"), default="fixed")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-spread-ms", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--output-tokens", type=int, default=16)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--stall-ms", type=float, default=30_000.0)
+    parser.add_argument("--replay-dir", default=None)
+    args = parser.parse_args(argv)
+
+    profile = MockProfile(
+        seed=args.seed,
+        latency=LatencyDistribution(
+            kind=args.latency, mean_ms=args.latency_ms, spread_ms=args.latency_spread_ms
+        ),
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        stall_rate=args.stall_rate,
+        stall_ms=args.stall_ms,
+        replay_path=args.replay_dir,
+    )
+    uvicorn.run(create_standin_app(profile), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
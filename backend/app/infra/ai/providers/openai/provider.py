@@ -4,14 +4,17 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import json
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Mapping
+from functools import partial
 from time import perf_counter
 from typing import Any
 
 import httpx
 
 from ...adapters.sse import parse_sse_messages
+from ...codec import DEFAULT_JSON_CODEC, JsonCodec
+from ...decoding import INLINE_DECODER, PayloadDecoder
+from ...embedding_matrix import EmbeddingMatrix
 from ...exceptions import (
     AIAuthError,
     AIConfigError,
@@ -26,9 +29,13 @@ from ...exceptions import (
 )
 from ...requests import (
     AudioGenerateRequest,
+    ContentPart,
     EmbeddingRequest,
     ImageGenerateRequest,
+    MediaPart,
     TextGenerateRequest,
+    TextMessage,
+    TextPart,
 )
 from ...responses import (
     AudioGenerateResponse,
@@ -36,6 +43,7 @@ from ...responses import (
     ImageGenerateResponse,
     TextGenerateResponse,
 )
+from ...spool import ArtifactSpooler
 from ...stream import (
     AIDoneEvent,
     AIStartEvent,
@@ -51,7 +59,9 @@ from ...types import (
     ArtifactKind,
     ProviderRequestContext,
     ResolvedModel,
+    ToolCall,
 )
+from ...uploads import UploadCache, upload_filename
 from ..base import ProviderAdapter
 
 
@@ -63,19 +73,35 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
         *,
         default_timeout_ms: int,
         http_client: httpx.AsyncClient | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        spooler: ArtifactSpooler | None = None,
+        decoder: PayloadDecoder | None = None,
+        codec: JsonCodec | None = None,
+        uploads: UploadCache | None = None,
     ) -> None:
         """Create the adapter with an injectable HTTPX client for testing.
 
         Args:
             default_timeout_ms: Default timeout applied when the request does not override it.
             http_client: Optional shared HTTP client injected by tests or application code.
+            transport: Optional transport for the adapter-owned client, such as the
+                DNS-caching transport used when connection warm-up is enabled.
+            spooler: Optional spooler that moves large audio and image payloads to disk.
+            decoder: Optional decoder that moves large response decoding off the event loop.
+            codec: Optional JSON codec for request bodies and responses.
+            uploads: Optional cache that uploads large files once and references
+                them by file id.
 
         Returns:
             None.
         """
         self._default_timeout_ms = default_timeout_ms
+        self._spooler = spooler
+        self._decoder = decoder or INLINE_DECODER
+        self._codec = codec or DEFAULT_JSON_CODEC
+        self._uploads = uploads
         self._owns_client = http_client is None
-        self._client = http_client or httpx.AsyncClient()
+        self._client = http_client or httpx.AsyncClient(transport=transport)
 
     async def aclose(self) -> None:
         """Close the underlying HTTP client when the adapter owns it.
@@ -88,6 +114,19 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
         """
         if self._owns_client:
             await self._client.aclose()
+        self._decoder.close()
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Expose the pooled HTTP client so its connections can be pre-warmed.
+
+        Args:
+            None.
+
+        Returns:
+            The HTTPX client used for provider calls.
+        """
+        return self._client
 
     async def generate_text(
         self,
@@ -106,7 +145,10 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             A normalized text generation response.
         """
         started_at = perf_counter()
-        payload = self._build_chat_payload(request=request, model=model, stream=False)
+        file_ids = await self._upload_media(request, model, context)
+        payload = self._build_chat_payload(
+            request=request, model=model, stream=False, file_ids=file_ids
+        )
         response = await self._request(
             "POST",
             "/chat/completions",
@@ -114,10 +156,11 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             context=context,
             json_body=payload,
         )
-        body = response.json()
+        body = self._codec.loads(response.content)
         choice = body["choices"][0]
         message = choice.get("message", {})
         text = message.get("content", "") or ""
+        tool_calls = self._parse_tool_calls(message.get("tool_calls"), model=model)
         usage = self._parse_usage(body.get("usage"))
         provider_request_id = self._extract_request_id(response)
         latency_ms = int((perf_counter() - started_at) * 1000)
@@ -131,7 +174,12 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             latency_ms=latency_ms,
             usage=usage,
             text=text,
-            finish_reason=self._map_finish_reason(choice.get("finish_reason")),
+            finish_reason=(
+                AIFinishReason.TOOL_USE
+                if tool_calls
+                else self._map_finish_reason(choice.get("finish_reason"))
+            ),
+            tool_calls=tool_calls,
         )
 
     async def stream_text(
@@ -157,7 +205,10 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
         Returns:
             An async iterator of normalized stream events.
         """
-        payload = self._build_chat_payload(request=request, model=model, stream=True)
+        file_ids = await self._upload_media(request, model, context)
+        payload = self._build_chat_payload(
+            request=request, model=model, stream=True, file_ids=file_ids
+        )
         payload["stream_options"] = {"include_usage": True}
 
         accumulated_text = ""
@@ -170,12 +221,14 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             async with self._client.stream(
                 "POST",
                 self._build_url(model, "/chat/completions"),
-                json=payload,
+                content=self._codec.dumps(payload),
                 headers=self._build_headers(model=model, context=context),
                 timeout=self._resolve_timeout(model, context),
             ) as response:
                 provider_request_id = self._extract_request_id(response)
                 if response.is_error:
+                    # Streamed bodies must be read before the error payload can be parsed.
+                    await response.aread()
                     await self._raise_response_error(response, model=model)
 
                 yield AIStartEvent(
@@ -190,7 +243,7 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
                     if message == "[DONE]":
                         break
 
-                    chunk = json.loads(message)
+                    chunk = self._codec.loads(message)
                     if chunk.get("usage"):
                         usage = self._parse_usage(chunk.get("usage"))
                         yield AIUsageEvent(
@@ -313,6 +366,11 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
         }
         if request.dimensions is not None:
             payload["dimensions"] = request.dimensions
+        # Array-backed requests take the base64 float32 wire form, which decodes
+        # straight into one contiguous array instead of a float object per value.
+        array_backed = request.vector_format != "list"
+        if array_backed:
+            payload["encoding_format"] = "base64"
 
         response = await self._request(
             "POST",
@@ -321,15 +379,30 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             context=context,
             json_body=payload,
         )
-        body = response.json()
-        vectors = [item["embedding"] for item in body.get("data", [])]
-        dimensions = len(vectors[0]) if vectors else 0
-        if any(len(vector) != dimensions for vector in vectors):
-            raise AIProviderUnavailableError(
-                "Provider returned inconsistent embedding dimensions",
-                provider=model.provider,
-                model=model.model_id,
-            )
+        body = await self._decoder.json(response, codec=self._codec)
+        rows = [item["embedding"] for item in body.get("data", [])]
+        vectors: list[list[float]] | None = None
+        matrix: EmbeddingMatrix | None = None
+        if array_backed:
+            try:
+                matrix = await self._decoder.embedding_matrix(rows, size=len(response.content))
+            except ValueError as exc:
+                raise AIProviderUnavailableError(
+                    "Provider returned malformed embeddings",
+                    provider=model.provider,
+                    model=model.model_id,
+                    raw_error=exc,
+                ) from exc
+            dimensions = matrix.dimensions
+        else:
+            dimensions = len(rows[0]) if rows else 0
+            if any(len(vector) != dimensions for vector in rows):
+                raise AIProviderUnavailableError(
+                    "Provider returned inconsistent embedding dimensions",
+                    provider=model.provider,
+                    model=model.model_id,
+                )
+            vectors = rows
 
         return EmbeddingResponse(
             request_id=context.request_id,
@@ -341,9 +414,24 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             latency_ms=int((perf_counter() - started_at) * 1000),
             usage=self._parse_usage(body.get("usage")),
             vectors=vectors,
+            matrix=matrix,
             dimensions=dimensions,
         )
 
+    def max_images_per_call(self, model: ResolvedModel) -> int | None:
+        """Return the per-call image limit; DALL-E 3 only accepts ``n=1``.
+
+        Args:
+            model: Resolved provider/model pair selected by the router.
+
+        Returns:
+            The catalog override, ``1`` for DALL-E 3, otherwise ``None``.
+        """
+        limit = super().max_images_per_call(model)
+        if limit is None and model.model_id.startswith("dall-e-3"):
+            return 1
+        return limit
+
     async def generate_image(
         self,
         request: ImageGenerateRequest,
@@ -379,8 +467,8 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             context=context,
             json_body=payload,
         )
-        body = response.json()
-        artifacts = self._parse_image_artifacts(
+        body = await self._decoder.json(response, codec=self._codec)
+        artifacts = await self._parse_image_artifacts(
             body.get("data", []), default_mime_type=f"image/{request.format}"
         )
         mime_type = artifacts[0].mime_type if artifacts else None
@@ -415,36 +503,40 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             A normalized audio generation response.
         """
         started_at = perf_counter()
-        payload: dict[str, Any] = {
-            "model": model.model_id,
-            "input": request.input_text,
-            "voice": request.voice,
-            "response_format": request.format,
-        }
-        if request.speed is not None:
-            payload["speed"] = request.speed
-        if request.sample_rate is not None:
-            payload["sample_rate"] = request.sample_rate
+        payload = self._build_speech_payload(request, model)
+
+        filename = f"{context.request_id}.{request.format}"
+        if self._spooler is not None:
+            artifact, provider_request_id = await self._spool_audio(
+                self._spooler,
+                payload,
+                model=model,
+                context=context,
+                default_mime_type=self._guess_audio_mime_type(request.format),
+                filename=filename,
+            )
+        else:
+            response = await self._request(
+                "POST",
+                "/audio/speech",
+                model=model,
+                context=context,
+                json_body=payload,
+            )
+            artifact = Artifact(
+                kind=ArtifactKind.BINARY,
+                content=response.content,
+                mime_type=response.headers.get(
+                    "content-type", self._guess_audio_mime_type(request.format)
+                ),
+                filename=filename,
+            )
+            provider_request_id = self._extract_request_id(response)
 
-        response = await self._request(
-            "POST",
-            "/audio/speech",
-            model=model,
-            context=context,
-            json_body=payload,
-        )
-        mime_type = response.headers.get(
-            "content-type", self._guess_audio_mime_type(request.format)
-        )
-        artifact = Artifact(
-            kind=ArtifactKind.BINARY,
-            content=response.content,
-            mime_type=mime_type,
-            filename=f"{context.request_id}.{request.format}",
-        )
+        mime_type = artifact.mime_type
         return AudioGenerateResponse(
             request_id=context.request_id,
-            provider_request_id=self._extract_request_id(response),
+            provider_request_id=provider_request_id,
             provider=model.provider,
             model=model.model_id,
             resolved_provider=model.provider,
@@ -456,6 +548,183 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             duration_ms=None,
         )
 
+    async def stream_audio(
+        self,
+        request: AudioGenerateRequest,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> AsyncIterator[bytes]:
+        """Stream ``/audio/speech`` body chunks as they arrive.
+
+        Args:
+            request: Normalized SDK audio generation request.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            An async iterator of raw audio chunks.
+        """
+        payload = self._build_speech_payload(request, model)
+        try:
+            async with self._client.stream(
+                "POST",
+                self._build_url(model, "/audio/speech"),
+                content=self._codec.dumps(payload),
+                headers=self._build_headers(model=model, context=context),
+                timeout=self._resolve_timeout(model, context),
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                    await self._raise_response_error(response, model=model)
+
+                async for chunk in response.aiter_bytes():
+                    if chunk:
+                        yield chunk
+        except asyncio.CancelledError as exc:
+            raise AIRequestCancelledError(
+                "Audio streaming was cancelled",
+                provider=model.provider,
+                model=model.model_id,
+                raw_error=exc,
+            ) from exc
+        except AIError:
+            raise
+        except httpx.TimeoutException as exc:
+            raise AITimeoutError(
+                "Provider audio stream timed out",
+                provider=model.provider,
+                model=model.model_id,
+                raw_error=exc,
+            ) from exc
+        except httpx.HTTPError as exc:
+            raise AITransportError(
+                "Provider audio stream transport failed",
+                provider=model.provider,
+                model=model.model_id,
+                raw_error=exc,
+            ) from exc
+
+    async def _spool_audio(
+        self,
+        spooler: ArtifactSpooler,
+        payload: dict[str, Any],
+        *,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+        default_mime_type: str,
+        filename: str,
+    ) -> tuple[Artifact, str | None]:
+        """Stream the ``/audio/speech`` body through the spooler in chunks.
+
+        Args:
+            spooler: Spooler that receives the streamed body.
+            payload: JSON payload accepted by the speech endpoint.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+            default_mime_type: MIME type used when the provider omits ``content-type``.
+            filename: Logical artifact filename.
+
+        Returns:
+            A tuple of ``(artifact, provider_request_id)``.
+        """
+        try:
+            async with self._client.stream(
+                "POST",
+                self._build_url(model, "/audio/speech"),
+                content=self._codec.dumps(payload),
+                headers=self._build_headers(model=model, context=context),
+                timeout=self._resolve_timeout(model, context),
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                    await self._raise_response_error(response, model=model)
+
+                artifact = await spooler.spool_stream(
+                    response.aiter_bytes(chunk_size=spooler.chunk_size_bytes),
+                    mime_type=response.headers.get("content-type", default_mime_type),
+                    filename=filename,
+                )
+                return artifact, self._extract_request_id(response)
+        except asyncio.CancelledError as exc:
+            raise AIRequestCancelledError(
+                "Provider request was cancelled",
+                provider=model.provider,
+                model=model.model_id,
+                raw_error=exc,
+            ) from exc
+        except AIError:
+            raise
+        except httpx.TimeoutException as exc:
+            raise AITimeoutError(
+                "Provider request timed out",
+                provider=model.provider,
+                model=model.model_id,
+                raw_error=exc,
+            ) from exc
+        except httpx.HTTPError as exc:
+            raise AITransportError(
+                "Provider transport request failed",
+                provider=model.provider,
+                model=model.model_id,
+                raw_error=exc,
+            ) from exc
+
+    async def upload_file(
+        self,
+        part: MediaPart,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> str:
+        """Upload one inline file through ``/files`` for use as a message input.
+
+        Args:
+            part: File part with inline data.
+            model: Resolved provider/model pair whose account receives the file.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            The file id later messages reference.
+        """
+        if part.data is None:
+            raise AIValidationError("Only inline media parts can be uploaded")
+        response = await self._request(
+            "POST",
+            "/files",
+            model=model,
+            context=context,
+            form={"purpose": "user_data"},
+            files={"file": (upload_filename(part), part.data, part.mime_type)},
+        )
+        return self._codec.loads(response.content)["id"]
+
+    async def _upload_media(
+        self,
+        request: TextGenerateRequest,
+        model: ResolvedModel,
+        context: ProviderRequestContext,
+    ) -> dict[str, str]:
+        """Upload the request's large file parts when an upload cache is configured.
+
+        Chat completions only reference files by id; images always travel inline
+        or by URL.
+
+        Args:
+            request: Normalized SDK text generation request.
+            model: Resolved provider/model pair selected by the router.
+            context: Per-call runtime context such as timeout and request id.
+
+        Returns:
+            File ids keyed by part digest.
+        """
+        if self._uploads is None:
+            return {}
+        return await self._uploads.references(
+            request,
+            provider=model.provider,
+            upload=partial(self.upload_file, model=model, context=context),
+            kinds=("file",),
+        )
+
     async def _request(
         self,
         method: str,
@@ -464,8 +733,10 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
         model: ResolvedModel,
         context: ProviderRequestContext,
         json_body: dict[str, Any] | None = None,
+        form: dict[str, str] | None = None,
+        files: dict[str, Any] | None = None,
     ) -> httpx.Response:
-        """Send one JSON request and normalize transport and HTTP errors.
+        """Send one JSON or multipart request and normalize transport and HTTP errors.
 
         Args:
             method: HTTP method name.
@@ -473,16 +744,23 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             model: Resolved provider/model pair selected by the router.
             context: Per-call runtime context such as timeout and request id.
             json_body: Optional JSON request payload.
+            form: Optional multipart form fields sent with ``files``.
+            files: Optional multipart files; HTTPX then sets the content type.
 
         Returns:
             The successful HTTP response object.
         """
+        headers = self._build_headers(model=model, context=context)
+        if files is not None:
+            headers.pop("Content-Type")
         try:
             response = await self._client.request(
                 method,
                 self._build_url(model, path),
-                json=json_body,
-                headers=self._build_headers(model=model, context=context),
+                content=None if json_body is None else self._codec.dumps(json_body),
+                data=form,
+                files=files,
+                headers=headers,
                 timeout=self._resolve_timeout(model, context),
             )
         except asyncio.CancelledError as exc:
@@ -564,6 +842,7 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
         request: TextGenerateRequest,
         model: ResolvedModel,
         stream: bool,
+        file_ids: Mapping[str, str] | None = None,
     ) -> dict[str, Any]:
         """Translate the stable text request into a chat-completions payload.
 
@@ -571,6 +850,7 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             request: Normalized SDK text generation request.
             model: Resolved provider/model pair selected by the router.
             stream: Whether the provider should return SSE events.
+            file_ids: Uploaded file ids keyed by media part digest.
 
         Returns:
             A JSON-serializable payload accepted by the chat-completions API.
@@ -578,7 +858,7 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
         payload: dict[str, Any] = {
             "model": model.model_id,
             "messages": [
-                {"role": message.role, "content": message.content} for message in request.messages
+                self._build_chat_message(message, file_ids or {}) for message in request.messages
             ],
             "stream": stream,
         }
@@ -590,6 +870,138 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             payload["stop"] = request.stop
         if request.response_format == "json":
             payload["response_format"] = {"type": "json_object"}
+        if request.tools:
+            payload["tools"] = [
+                {
+                    "type": "function",
+                    "function": {
+                        "name": tool.name,
+                        "description": tool.description,
+                        "parameters": tool.parameters,
+                    },
+                }
+                for tool in request.tools
+            ]
+            payload["tool_choice"] = request.tool_choice
+        return payload
+
+    def _build_chat_message(
+        self, message: TextMessage, file_ids: Mapping[str, str]
+    ) -> dict[str, Any]:
+        """Translate one SDK message, including tool calls, results and media.
+
+        Args:
+            message: SDK conversation message.
+            file_ids: Uploaded file ids keyed by media part digest.
+
+        Returns:
+            A chat-completions message object.
+        """
+        if message.parts:
+            content = [{"type": "text", "text": message.content}] if message.content else []
+            content.extend(self._build_content_part(part, file_ids) for part in message.parts)
+            return {"role": "user", "content": content}
+        if message.role == "tool":
+            return {
+                "role": "tool",
+                "tool_call_id": message.tool_call_id,
+                "content": message.content,
+            }
+        payload: dict[str, Any] = {"role": message.role, "content": message.content}
+        if message.tool_calls:
+            payload["content"] = message.content or None
+            payload["tool_calls"] = [
+                {
+                    "id": call.id,
+                    "type": "function",
+                    "function": {
+                        "name": call.name,
+                        "arguments": self._codec.dumps(call.arguments).decode(),
+                    },
+                }
+                for call in message.tool_calls
+            ]
+        return payload
+
+    def _build_content_part(self, part: ContentPart, file_ids: Mapping[str, str]) -> dict[str, Any]:
+        """Translate one content part into a chat-completions content part.
+
+        Args:
+            part: Text, image or file part.
+            file_ids: Uploaded file ids keyed by media part digest.
+
+        Returns:
+            A ``text``, ``image_url`` or ``file`` content part.
+        """
+        if isinstance(part, TextPart):
+            return {"type": "text", "text": part.text}
+        if part.type == "image" and part.url is not None:
+            return {"type": "image_url", "image_url": {"url": part.url}}
+        if part.url is not None:
+            raise AIValidationError("Chat completions cannot read files by URL")
+        if file_ids and part.digest in file_ids:
+            return {"type": "file", "file": {"file_id": file_ids[part.digest]}}
+        data_url = f"data:{part.mime_type};base64,{base64.b64encode(part.data).decode()}"
+        if part.type == "image":
+            return {"type": "image_url", "image_url": {"url": data_url}}
+        return {
+            "type": "file",
+            "file": {"filename": upload_filename(part), "file_data": data_url},
+        }
+
+    def _parse_tool_calls(
+        self, raw_calls: list[dict[str, Any]] | None, *, model: ResolvedModel
+    ) -> list[ToolCall]:
+        """Normalize chat-completions ``tool_calls`` into SDK tool calls.
+
+        Args:
+            raw_calls: Raw ``message.tool_calls`` entries.
+            model: Resolved provider/model pair used for error context.
+
+        Returns:
+            Function calls in provider-neutral form.
+        """
+        calls = []
+        for raw_call in raw_calls or []:
+            function = raw_call.get("function") or {}
+            try:
+                arguments = self._codec.loads(function.get("arguments") or "{}")
+            except ValueError as exc:
+                raise AIProviderUnavailableError(
+                    "Provider returned malformed tool call arguments",
+                    provider=model.provider,
+                    model=model.model_id,
+                    raw_error=exc,
+                ) from exc
+            calls.append(
+                ToolCall(
+                    id=raw_call.get("id", ""), name=function.get("name", ""), arguments=arguments
+                )
+            )
+        return calls
+
+    def _build_speech_payload(
+        self, request: AudioGenerateRequest, model: ResolvedModel
+    ) -> dict[str, Any]:
+        """Translate the stable audio request into an ``/audio/speech`` payload.
+
+        Args:
+            request: Normalized SDK audio generation request.
+            model: Resolved provider/model pair selected by the router.
+
+        Returns:
+            A JSON-serializable payload accepted by the speech endpoint.
+        """
+        payload: dict[str, Any] = {
+            "model": model.model_id,
+            "input": request.input_text,
+            "voice": request.voice,
+            "response_format": request.format,
+        }
+        if request.speed is not None:
+            payload["speed"] = request.speed
+        if request.sample_rate is not None:
+            payload["sample_rate"] = request.sample_rate
         return payload
 
     def _build_headers(
@@ -683,6 +1095,8 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
             return AIFinishReason.LENGTH
         if finish_reason == "content_filter":
             return AIFinishReason.CONTENT_FILTER
+        if finish_reason == "tool_calls":
+            return AIFinishReason.TOOL_USE
         return AIFinishReason.STOP
 
     def _extract_error(self, response: httpx.Response) -> tuple[str | None, str]:
@@ -706,7 +1120,7 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
 
         return None, response.text or f"Provider request failed with status {response.status_code}"
 
-    def _parse_image_artifacts(
+    async def _parse_image_artifacts(
         self,
         items: list[dict[str, Any]],
         *,
@@ -724,10 +1138,20 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
         artifacts: list[Artifact] = []
         for index, item in enumerate(items, start=1):
             if item.get("b64_json"):
+                if self._spooler is not None:
+                    artifacts.append(
+                        await self._spooler.spool_base64(
+                            item["b64_json"],
+                            mime_type=default_mime_type,
+                            filename=f"image-{index}",
+                        )
+                    )
+                    continue
+
                 artifacts.append(
                     Artifact(
                         kind=ArtifactKind.BINARY,
-                        content=base64.b64decode(item["b64_json"]),
+                        content=await self._decoder.b64decode(item["b64_json"]),
                         mime_type=default_mime_type,
                         filename=f"image-{index}",
                     )
@@ -746,6 +1170,18 @@ class OpenAICompatibleProviderAdapter(ProviderAdapter):
 
         return artifacts
 
+    def audio_mime_type(self, request: AudioGenerateRequest, model: ResolvedModel) -> str | None:
+        """Return the MIME type of streamed speech, which follows ``request.format``.
+
+        Args:
+            request: Normalized SDK audio generation request.
+            model: Resolved provider/model pair selected by the router.
+
+        Returns:
+            The MIME type of the requested format.
+        """
+        return self._guess_audio_mime_type(request.format)
+
     def _guess_audio_mime_type(self, output_format: str) -> str:
         """Best-effort map a response format string to a MIME type.
 
@@ -0,0 +1,261 @@
+"""Per-tenant and per-principal token and request quotas enforced in Redis.
+
+Before a request is dispatched, :class:`QuotaService` reserves its estimated
+tokens and one request against every configured daily and monthly window with a
+single Lua script call: either all counters fit and are incremented together, or
+nothing changes and :class:`AIQuotaExceededError` is raised. After the response,
+the reservation is reconciled against the actual :class:`AIUsage` in the
+background, so the request path pays one Redis round trip. Rejections are
+remembered in-process for a few seconds, so a tenant that keeps retrying after
+exhausting its quota is turned away without touching Redis.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import calendar
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from time import gmtime, strftime, time
+from typing import Any, Literal
+
+from redis.asyncio import Redis
+
+from app.core import log
+
+from .compaction import estimate_message_tokens
+from .exceptions import AIQuotaExceededError
+from .requests import AIRequest, EmbeddingRequest, TextGenerateRequest
+
+QuotaScope = Literal["tenant", "principal"]
+QuotaWindow = Literal["daily", "monthly"]
+QuotaMetric = Literal["tokens", "requests"]
+
+# Checks every counter first, then increments them all, so a rejected
+# reservation leaves no partial increments behind. New counters get a TTL that
+# outlives their window. Returns {0, 0} on success or {index, current} for the
+# first counter that would exceed its limit.
+_RESERVE_SCRIPT = """
+for i = 1, #KEYS do
+  local limit = tonumber(ARGV[3 * i - 2])
+  local amount = tonumber(ARGV[3 * i - 1])
+  local current = tonumber(redis.call('GET', KEYS[i]) or '0')
+  if amount > 0 and current + amount > limit then
+    return {i, current}
+  end
+end
+for i = 1, #KEYS do
+  local amount = tonumber(ARGV[3 * i - 1])
+  if redis.call('INCRBY', KEYS[i], amount) == amount then
+    redis.call('EXPIRE', KEYS[i], tonumber(ARGV[3 * i]))
+  end
+end
+return {0, 0}
+"""
+
+# Counters outlive their window by this long so late reconciliations still land.
+_TTL_SLACK_S = 3_600
+
+
+@dataclass(slots=True, frozen=True)
+class QuotaLimit:
+    """Cap one metric of one scope within one calendar window."""
+
+    scope: QuotaScope
+    window: QuotaWindow
+    metric: QuotaMetric
+    limit: int
+
+
+@dataclass(slots=True)
+class QuotaReservation:
+    """Remember what one request reserved so it can be reconciled."""
+
+    token_keys: list[str] = field(default_factory=list)
+    tokens: int = 0
+
+
+def estimate_request_tokens(request: AIRequest, *, default_output_tokens: int) -> int:
+    """Estimate the tokens a request will consume before it is sent.
+
+    Args:
+        request: Normalized SDK request.
+        default_output_tokens: Output budget assumed when ``max_tokens`` is unset.
+
+    Returns:
+        Estimated input plus output tokens; ``0`` for image and audio requests.
+    """
+    if isinstance(request, TextGenerateRequest):
+        prompt = sum(estimate_message_tokens(message) for message in request.messages)
+        return prompt + (request.max_tokens or default_output_tokens)
+    if isinstance(request, EmbeddingRequest):
+        texts = [request.input] if isinstance(request.input, str) else request.input
+        return sum(len(text) // 4 + 1 for text in texts)
+    return 0
+
+
+def _window_period(window: QuotaWindow, now: float) -> tuple[str, float]:
+    """Name the calendar window containing ``now`` and find its end.
+
+    Args:
+        window: ``daily`` or ``monthly``, in UTC.
+        now: Current epoch seconds.
+
+    Returns:
+        The period label and the epoch second at which the window ends.
+    """
+    moment = gmtime(now)
+    if window == "daily":
+        start = calendar.timegm((moment.tm_year, moment.tm_mon, moment.tm_mday, 0, 0, 0))
+        return strftime("%Y%m%d", moment), start + 86_400
+    year, month = (
+        (moment.tm_year + 1, 1) if moment.tm_mon == 12 else (moment.tm_year, moment.tm_mon + 1)
+    )
+    return strftime("%Y%m", moment), calendar.timegm((year, month, 1, 0, 0, 0))
+
+
+class QuotaService:
+    """Reserve and reconcile quota counters with one Redis round trip per request."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        limits: list[QuotaLimit],
+        *,
+        key_prefix: str = "ello:ai:quota",
+        reject_cache_s: float = 5.0,
+        clock: Callable[[], float] = time,
+    ) -> None:
+        """Configure the service.
+
+        Args:
+            redis: Async Redis client.
+            limits: Limits to enforce; limits of ``0`` or less are ignored.
+            key_prefix: Prefix of the counter keys.
+            reject_cache_s: Seconds a rejection is answered from memory.
+            clock: Epoch-seconds clock, injectable for tests.
+
+        Returns:
+            None.
+        """
+        self._redis = redis
+        self._script = redis.register_script(_RESERVE_SCRIPT)
+        self._limits = [limit for limit in limits if limit.limit > 0]
+        self._key_prefix = key_prefix
+        self._reject_cache_s = reject_cache_s
+        self._clock = clock
+        self._rejected: dict[str, float] = {}
+        self._pending: set[asyncio.Task[None]] = set()
+
+    async def reserve(self, *, tenant_id: Any, principal_id: Any, tokens: int) -> QuotaReservation:
+        """Reserve estimated tokens and one request in every applicable window.
+
+        Args:
+            tenant_id: Tenant the request is billed to, or ``None``.
+            principal_id: Principal that sent the request, or ``None``.
+            tokens: Estimated tokens of the request.
+
+        Returns:
+            The reservation to pass to :meth:`settle`.
+        """
+        now = self._clock()
+        owners = {"tenant": tenant_id, "principal": principal_id}
+        keys: list[str] = []
+        args: list[int] = []
+        limits: list[QuotaLimit] = []
+        reservation = QuotaReservation(tokens=tokens)
+        for limit in self._limits:
+            owner = owners[limit.scope]
+            if owner is None:
+                continue
+            period, ends_at = _window_period(limit.window, now)
+            key = f"{self._key_prefix}:{limit.scope}:{owner}:{limit.metric}:{period}"
+            amount = tokens if limit.metric == "tokens" else 1
+            if amount > 0 and self._rejected.get(key, 0.0) > now:
+                raise self._error(limit, owner)
+            keys.append(key)
+            args.extend((limit.limit, amount, int(ends_at - now) + _TTL_SLACK_S))
+            limits.append(limit)
+            if limit.metric == "tokens":
+                reservation.token_keys.append(key)
+        if not keys:
+            return reservation
+
+        rejected_index, _ = await self._script(keys=keys, args=args)
+        if rejected_index:
+            limit = limits[rejected_index - 1]
+            key = keys[rejected_index - 1]
+            _, ends_at = _window_period(limit.window, now)
+            self._rejected = {
+                cached: until for cached, until in self._rejected.items() if until > now
+            }
+            self._rejected[key] = min(now + self._reject_cache_s, ends_at)
+            raise self._error(limit, owners[limit.scope])
+        return reservation
+
+    def settle(self, reservation: QuotaReservation, actual_tokens: int) -> None:
+        """Reconcile a reservation with the tokens actually used, in the background.
+
+        Args:
+            reservation: Reservation returned by :meth:`reserve`.
+            actual_tokens: Tokens reported by the provider; ``0`` refunds a failed
+                request.
+
+        Returns:
+            None.
+        """
+        delta = actual_tokens - reservation.tokens
+        if not reservation.token_keys or delta == 0:
+            return
+        task = asyncio.create_task(self._adjust(reservation.token_keys, delta))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def aclose(self) -> None:
+        """Wait for background reconciliations to finish.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def _adjust(self, keys: list[str], delta: int) -> None:
+        """Apply one token correction to several counters in a pipeline.
+
+        Args:
+            keys: Token counter keys of the reservation.
+            delta: Tokens to add; negative to refund.
+
+        Returns:
+            None.
+        """
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.incrby(key, delta)
+                await pipe.execute()
+        except Exception as exc:
+            log.warning(f"Could not reconcile AI quota reservation: {exc!r}")
+        # A refund may have freed room, so stop answering rejections from memory.
+        for key in keys:
+            self._rejected.pop(key, None)
+
+    @staticmethod
+    def _error(limit: QuotaLimit, owner: Any) -> AIQuotaExceededError:
+        """Build the error for an exhausted limit.
+
+        Args:
+            limit: Exhausted limit.
+            owner: Tenant or principal id.
+
+        Returns:
+            The quota error.
+        """
+        return AIQuotaExceededError(
+            f"{limit.window.capitalize()} {limit.metric} quota of {limit.scope} {owner} "
+            f"is exhausted (limit {limit.limit})"
+        )
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
 
+from .catalog import load_catalog_file
 from .config import AISettings
 from .exceptions import AIConfigError, AIUnsupportedCapabilityError, AIValidationError
 from .types import AICapability, AIModality, ModelSpec, ProviderConfig, ResolvedModel
@@ -11,6 +14,7 @@ from .types import AICapability, AIModality, ModelSpec, ProviderConfig, Resolved
 _OPENAI_BASE_URL = "https://api.openai.com/v1"
 _ANTHROPIC_BASE_URL = "https://api.anthropic.com/v1"
 _GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+_MOCK_BASE_URL = "mock://local"
 
 
 def _default_input_modalities(capability: AICapability) -> tuple[AIModality, ...]:
@@ -41,20 +45,41 @@ def _default_output_modalities(capability: AICapability) -> tuple[AIModality, ..
     return (AIModality.TEXT,)
 
 
+_ADHOC_CACHE_LIMIT = 1024
+
+
+@dataclass(slots=True, frozen=True)
+class _ResolutionTable:
+    """Hold one immutable generation of precompiled resolutions."""
+
+    routes: Mapping[tuple[str, str], ResolvedModel]
+    # Ad-hoc resolutions are memoized per generation so a swap also drops them.
+    adhoc: dict[tuple[str, str, AICapability], ResolvedModel]
+
+
 class ModelRegistry:
-    """Store provider runtime configuration and optional model capability metadata."""
+    """Store provider runtime configuration and optional model capability metadata.
+
+    Providers, explicitly registered models, and the declarative catalog are
+    compiled into a read-only table keyed by ``(provider, model_or_alias)``.
+    Every mutation builds a complete new table and publishes it with a single
+    attribute assignment, so concurrent ``resolve`` calls always see either the
+    old or the new generation and never a partially built one.
+    """
 
     def __init__(
         self,
         *,
         models: Iterable[ModelSpec] | None = None,
         providers: Iterable[ProviderConfig] | None = None,
+        catalog: Iterable[ModelSpec] | None = None,
     ) -> None:
         """Initialize the registry with optional providers and models.
 
         Args:
             models: Optional iterable of model specs to register immediately.
             providers: Optional iterable of provider configs to register immediately.
+            catalog: Optional declarative catalog specs; explicit models take precedence.
 
         Returns:
             None.
@@ -62,12 +87,16 @@ class ModelRegistry:
         self._models_by_alias: dict[str, ModelSpec] = {}
         self._models_by_provider: dict[tuple[str, str], ModelSpec] = {}
         self._providers: dict[str, ProviderConfig] = {}
+        self._catalog: tuple[ModelSpec, ...] = tuple(catalog or ())
+        self._table = _ResolutionTable(routes=MappingProxyType({}), adhoc={})
 
         for provider in providers or ():
-            self.register_provider(provider)
+            self._providers[provider.name] = provider
 
         for model in models or ():
-            self.register_model(model)
+            self._add_model(model)
+
+        self._table = self._compile()
 
     def register_provider(self, provider: ProviderConfig) -> None:
         """Register or replace one provider runtime configuration.
@@ -79,6 +108,7 @@ class ModelRegistry:
             None.
         """
         self._providers[provider.name] = provider
+        self._table = self._compile()
 
     def register_model(self, spec: ModelSpec) -> None:
         """Register one concrete provider model with optional metadata.
@@ -89,17 +119,25 @@ class ModelRegistry:
         Returns:
             None.
         """
-        if spec.alias in self._models_by_alias:
-            raise AIConfigError(f"Duplicate model alias registered: {spec.alias}")
+        self._add_model(spec)
+        self._table = self._compile()
 
-        identity = (spec.provider, spec.model_id)
-        if identity in self._models_by_provider:
-            raise AIConfigError(
-                f"Duplicate model registered for provider '{spec.provider}' and model '{spec.model_id}'"
-            )
+    def replace_catalog(self, specs: Iterable[ModelSpec]) -> None:
+        """Atomically replace the declarative catalog.
 
-        self._models_by_alias[spec.alias] = spec
-        self._models_by_provider[identity] = spec
+        The new table is compiled before it is published; a catalog that fails
+        to compile leaves the current table untouched.
+
+        Args:
+            specs: Complete set of catalog specs replacing the previous catalog.
+
+        Returns:
+            None.
+        """
+        catalog = tuple(specs)
+        table = self._compile(catalog)
+        self._catalog = catalog
+        self._table = table
 
     def resolve(
         self,
@@ -112,50 +150,45 @@ class ModelRegistry:
 
         Args:
             provider: Provider selected by the caller or upstream policy layer.
-            model: Concrete provider model id selected by the caller.
+            model: Concrete provider model id or catalog alias selected by the caller.
             capability: Capability required by the current operation.
 
         Returns:
             The resolved model and provider configuration pair.
         """
-        provider_config = self._providers.get(provider)
-        if provider_config is None:
-            raise AIValidationError(f"Unknown AI provider: {provider}")
-
-        spec = self._models_by_provider.get((provider, model))
-        if spec is None:
-            # Business code may choose models dynamically. When no catalog entry is
-            # registered, the SDK still routes the request while preserving a stable
-            # capability envelope for downstream adapters and telemetry.
-            spec = ModelSpec(
-                alias=f"{provider}:{model}",
-                provider=provider,
-                model_id=model,
-                capabilities=(capability,),
-                input_modalities=_default_input_modalities(capability),
-                output_modalities=_default_output_modalities(capability),
-                supports_stream=capability is AICapability.TEXT_GENERATION,
-            )
-
-        if not spec.supports(capability):
+        table = self._table
+        resolved = table.routes.get((provider, model))
+        if resolved is None:
+            resolved = table.adhoc.get((provider, model, capability))
+            if resolved is None:
+                resolved = self._resolve_adhoc(
+                    table, provider=provider, model=model, capability=capability
+                )
+
+        if not resolved.spec.supports(capability):
             raise AIUnsupportedCapabilityError(
                 f"Model '{model}' does not support capability '{capability.value}'",
                 provider=provider,
                 model=model,
             )
 
-        return ResolvedModel(spec=spec, provider_config=provider_config)
+        return resolved
 
     def list_models(self) -> tuple[ModelSpec, ...]:
-        """Return all registered model specs.
+        """Return all registered and catalog model specs.
 
         Args:
             None.
 
         Returns:
-            A tuple containing every registered model spec.
+            A tuple containing every registered model spec followed by catalog-only specs.
         """
-        return tuple(self._models_by_alias.values())
+        registered = tuple(self._models_by_alias.values())
+        return registered + tuple(
+            spec
+            for spec in self._catalog
+            if (spec.provider, spec.model_id) not in self._models_by_provider
+        )
 
     def list_providers(self) -> tuple[ProviderConfig, ...]:
         """Return all registered provider runtime configurations.
@@ -168,6 +201,110 @@ class ModelRegistry:
         """
         return tuple(self._providers.values())
 
+    def _add_model(self, spec: ModelSpec) -> None:
+        """Validate and store one explicitly registered model.
+
+        Args:
+            spec: Concrete model spec to store in the registry.
+
+        Returns:
+            None.
+        """
+        if spec.alias in self._models_by_alias:
+            raise AIConfigError(f"Duplicate model alias registered: {spec.alias}")
+
+        identity = (spec.provider, spec.model_id)
+        if identity in self._models_by_provider:
+            raise AIConfigError(
+                f"Duplicate model registered for provider '{spec.provider}' and model '{spec.model_id}'"
+            )
+
+        self._models_by_alias[spec.alias] = spec
+        self._models_by_provider[identity] = spec
+
+    def _compile(self, catalog: tuple[ModelSpec, ...] | None = None) -> _ResolutionTable:
+        """Build a new resolution table from providers, catalog, and registered models.
+
+        Args:
+            catalog: Optional catalog to compile instead of the current one.
+
+        Returns:
+            A fully built table generation ready to publish.
+        """
+        catalog_specs = self._catalog if catalog is None else catalog
+        routes: dict[tuple[str, str], ResolvedModel] = {}
+        catalog_keys: set[tuple[str, str]] = set()
+
+        for spec in catalog_specs:
+            provider_config = self._providers.get(spec.provider)
+            if provider_config is None:
+                continue
+            resolved = ResolvedModel(spec=spec, provider_config=provider_config)
+            for name in dict.fromkeys((spec.model_id, spec.alias, *spec.aliases)):
+                key = (spec.provider, name)
+                if key in catalog_keys:
+                    raise AIConfigError(
+                        f"Duplicate catalog entry for provider '{spec.provider}' and model '{name}'"
+                    )
+                catalog_keys.add(key)
+                routes[key] = resolved
+
+        # Explicit registrations override catalog entries for the same model.
+        for spec in self._models_by_provider.values():
+            provider_config = self._providers.get(spec.provider)
+            if provider_config is None:
+                continue
+            resolved = ResolvedModel(spec=spec, provider_config=provider_config)
+            for name in (spec.model_id, spec.alias, *spec.aliases):
+                routes[(spec.provider, name)] = resolved
+
+        return _ResolutionTable(routes=MappingProxyType(routes), adhoc={})
+
+    def _resolve_adhoc(
+        self,
+        table: _ResolutionTable,
+        *,
+        provider: str,
+        model: str,
+        capability: AICapability,
+    ) -> ResolvedModel:
+        """Build and memoize a resolution for a model missing from the table.
+
+        Args:
+            table: Table generation the memoized entry belongs to.
+            provider: Provider selected by the caller.
+            model: Concrete provider model id selected by the caller.
+            capability: Capability required by the current operation.
+
+        Returns:
+            The resolved model and provider configuration pair.
+        """
+        provider_config = self._providers.get(provider)
+        if provider_config is None:
+            raise AIValidationError(f"Unknown AI provider: {provider}")
+
+        # Business code may choose models dynamically. When no catalog entry is
+        # registered, the SDK still routes the request while preserving a stable
+        # capability envelope for downstream adapters and telemetry.
+        spec = ModelSpec(
+            alias=f"{provider}:{model}",
+            provider=provider,
+            model_id=model,
+            capabilities=(capability,),
+            input_modalities=_default_input_modalities(capability),
+            output_modalities=_default_output_modalities(capability),
+            supports_stream=capability is AICapability.TEXT_GENERATION,
+            # Unknown models may accept images; the provider rejects them if not.
+            supports_vision=capability is AICapability.TEXT_GENERATION,
+        )
+        resolved = ResolvedModel(spec=spec, provider_config=provider_config)
+
+        # Bound the memo so arbitrary caller-chosen model names cannot grow it forever.
+        if len(table.adhoc) >= _ADHOC_CACHE_LIMIT:
+            table.adhoc.clear()
+        table.adhoc[(provider, model, capability)] = resolved
+        return resolved
+
 
 def build_default_registry(settings: AISettings) -> ModelRegistry:
     """Create the default registry from application settings.
@@ -182,7 +319,7 @@ def build_default_registry(settings: AISettings) -> ModelRegistry:
     technical_retry_backoff_ms = max(settings.technical_retry_backoff_ms, 0)
     default_timeout_ms = max(settings.default_timeout_ms, 1)
 
-    providers = (
+    providers = [
         ProviderConfig(
             name="openai",
             api_key=settings.openai.api_key or None,
@@ -208,6 +345,18 @@ def build_default_registry(settings: AISettings) -> ModelRegistry:
             max_retries=technical_retry_count,
             backoff_base_ms=technical_retry_backoff_ms,
         ),
-    )
+    ]
+    if settings.mock.enabled:
+        providers.append(
+            ProviderConfig(
+                name="mock",
+                api_key="mock",
+                base_url=_MOCK_BASE_URL,
+                timeout_ms=default_timeout_ms,
+                max_retries=technical_retry_count,
+                backoff_base_ms=technical_retry_backoff_ms,
+            )
+        )
 
-    return ModelRegistry(providers=providers)
+    catalog = load_catalog_file(settings.catalog_path) if settings.catalog_path else ()
+    return ModelRegistry(providers=providers, catalog=catalog)
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Any, Literal
+import hashlib
+from functools import cached_property
+from typing import Annotated, Any, Literal
 
-from pydantic import Field, field_validator
+from pydantic import ConfigDict, Field, field_validator, model_validator
 
 from app.core import ApiModel
 
+from .embedding_matrix import VectorFormat
+from .types import ToolCall
+
 
 class AIRequest(ApiModel):
     """Define fields shared by all SDK request types."""
@@ -19,11 +24,124 @@ class AIRequest(ApiModel):
     idempotency_key: str | None = None
 
 
+class TextPart(ApiModel):
+    """Carry a text segment of a multimodal message."""
+
+    type: Literal["text"] = "text"
+    text: str = Field(min_length=1)
+
+
+class MediaPart(ApiModel):
+    """Carry an image or file either inline as bytes or by URL.
+
+    Inline bytes travel as base64 in JSON. Large inline payloads may be uploaded
+    once to the provider's file API and referenced by id on later turns.
+    """
+
+    model_config = ConfigDict(ser_json_bytes="base64", val_json_bytes="base64")
+
+    data: bytes | None = None
+    url: str | None = None
+    mime_type: str = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def validate_source(self) -> MediaPart:
+        """Require exactly one of inline data and URL.
+
+        Args:
+            None.
+
+        Returns:
+            The validated part.
+        """
+        if (self.data is None) == (self.url is None):
+            raise ValueError("Media parts need exactly one of data and url")
+        return self
+
+    @cached_property
+    def digest(self) -> str:
+        """Hash the inline bytes so identical uploads can be shared.
+
+        Args:
+            None.
+
+        Returns:
+            A hex SHA-256 digest, or an empty string for URL parts.
+        """
+        return hashlib.sha256(self.data).hexdigest() if self.data is not None else ""
+
+
+class ImagePart(MediaPart):
+    """Attach an image to a user message."""
+
+    type: Literal["image"] = "image"
+
+
+class FilePart(MediaPart):
+    """Attach a document such as a PDF to a user message."""
+
+    type: Literal["file"] = "file"
+    filename: str | None = None
+
+
+ContentPart = Annotated[TextPart | ImagePart | FilePart, Field(discriminator="type")]
+
+
 class TextMessage(ApiModel):
-    """Represent one conversational message for text generation."""
+    """Represent one conversational message for text generation.
+
+    Assistant messages may carry ``tool_calls`` instead of text. ``tool`` messages
+    return one call's result and reference it through ``tool_call_id``; ``name``
+    repeats the tool name for providers that match results by name. User messages
+    may add ``parts`` such as images after ``content``.
+    """
+
+    role: Literal["system", "user", "assistant", "tool"]
+    content: str = ""
+    parts: list[ContentPart] = Field(default_factory=list)
+    tool_calls: list[ToolCall] = Field(default_factory=list)
+    tool_call_id: str | None = None
+    name: str | None = None
+
+    @model_validator(mode="after")
+    def validate_shape(self) -> TextMessage:
+        """Reject messages that no provider could represent.
+
+        Args:
+            None.
+
+        Returns:
+            The validated message.
+        """
+        if self.tool_calls and self.role != "assistant":
+            raise ValueError("Only assistant messages may carry tool calls")
+        if self.role == "tool" and not self.tool_call_id:
+            raise ValueError("Tool messages must reference a tool_call_id")
+        if self.parts and self.role != "user":
+            raise ValueError("Only user messages may carry content parts")
+        if not self.content and not self.tool_calls and not self.parts:
+            raise ValueError("Message content must not be empty")
+        return self
+
+    @property
+    def media(self) -> list[MediaPart]:
+        """List the image and file parts of the message.
+
+        Args:
+            None.
+
+        Returns:
+            The media parts in message order.
+        """
+        return [part for part in self.parts if isinstance(part, MediaPart)]
+
+
+class ToolDefinition(ApiModel):
+    """Describe one callable tool to the model with a JSON Schema for its arguments."""
 
-    role: Literal["system", "user", "assistant"]
-    content: str = Field(min_length=1)
+    name: str = Field(min_length=1, max_length=64, pattern=r"^[A-Za-z0-9_-]+$")
+    description: str = ""
+    parameters: dict[str, Any] = Field(default_factory=lambda: {"type": "object", "properties": {}})
 
 
 class TextGenerateRequest(AIRequest):
@@ -34,6 +152,8 @@ class TextGenerateRequest(AIRequest):
     max_tokens: int | None = Field(default=None, ge=1)
     response_format: Literal["text", "json"] = "text"
     stop: list[str] | None = None
+    tools: list[ToolDefinition] | None = None
+    tool_choice: Literal["auto", "required", "none"] = "auto"
 
 
 class EmbeddingRequest(AIRequest):
@@ -41,6 +161,7 @@ class EmbeddingRequest(AIRequest):
 
     input: str | list[str]
     dimensions: int | None = Field(default=None, ge=1)
+    vector_format: VectorFormat = "list"
 
     @field_validator("input")
     @classmethod
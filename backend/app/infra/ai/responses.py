@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
-from pydantic import Field
+from typing import Any
+
+from pydantic import (
+    Field,
+    ModelWrapValidatorHandler,
+    PrivateAttr,
+    TypeAdapter,
+    computed_field,
+    model_validator,
+)
 
 from app.core import ApiModel
 
-from .types import AIFinishReason, AIUsage, Artifact, AttemptRecord
+from .embedding_matrix import EmbeddingMatrix, VectorFormat
+from .exceptions import AIErrorPayload
+from .types import AIFinishReason, AIUsage, Artifact, AttemptRecord, ToolCall
 
 
 class AIResponse(ApiModel):
@@ -22,6 +33,7 @@ class AIResponse(ApiModel):
     usage: AIUsage = Field(default_factory=AIUsage)
     attempt_count: int = 1
     attempts: list[AttemptRecord] = Field(default_factory=list)
+    cache_hit: bool = False
 
 
 class TextGenerateResponse(AIResponse):
@@ -29,20 +41,123 @@ class TextGenerateResponse(AIResponse):
 
     text: str
     finish_reason: AIFinishReason
+    tool_calls: list[ToolCall] = Field(default_factory=list)
+
+
+_VECTORS_ADAPTER = TypeAdapter(list[list[float]])
 
 
 class EmbeddingResponse(AIResponse):
-    """Return a normalized embedding result."""
+    """Return a normalized embedding result.
+
+    Vectors are stored either as plain lists or, for array-backed requests, as an
+    :class:`EmbeddingMatrix` passed as ``matrix=``. ``vectors`` is always
+    available; for array-backed responses it is materialized from the matrix on
+    first access and only then pays the per-float Python object cost.
+    """
 
-    vectors: list[list[float]]
     dimensions: int
+    vector_format: VectorFormat = "list"
+
+    _vectors: list[list[float]] | None = PrivateAttr(default=None)
+    _matrix: EmbeddingMatrix | None = PrivateAttr(default=None)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _attach_vectors(
+        cls, data: Any, handler: ModelWrapValidatorHandler[EmbeddingResponse]
+    ) -> EmbeddingResponse:
+        """Move ``vectors`` or ``matrix`` input into private storage.
+
+        Args:
+            data: Raw constructor or validation input.
+            handler: Pydantic's validator for the remaining fields.
+
+        Returns:
+            The validated response with its vector storage attached.
+        """
+        if not isinstance(data, dict):
+            return handler(data)
+        data = dict(data)
+        vectors = data.pop("vectors", None)
+        matrix = data.pop("matrix", None)
+        if (vectors is None) == (matrix is None):
+            raise ValueError("Exactly one of vectors or matrix is required")
+        if matrix is not None and not isinstance(matrix, EmbeddingMatrix):
+            raise ValueError("matrix must be an EmbeddingMatrix")
+        if matrix is not None:
+            data.setdefault("vector_format", matrix.format)
+        response = handler(data)
+        if matrix is not None:
+            response._matrix = matrix
+        else:
+            response._vectors = _VECTORS_ADAPTER.validate_python(vectors)
+        return response
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def vectors(self) -> list[list[float]]:
+        """Return the vectors as plain lists.
+
+        Args:
+            None.
+
+        Returns:
+            One list of floats per input; quantized responses return their
+            dequantized approximation.
+        """
+        if self._vectors is None:
+            self._vectors = self._matrix.tolist() if self._matrix is not None else []
+        return self._vectors
+
+    @property
+    def matrix(self) -> EmbeddingMatrix | None:
+        """Return the array-backed batch.
+
+        Args:
+            None.
+
+        Returns:
+            The embedding matrix for array-backed responses, otherwise ``None``.
+        """
+        return self._matrix
+
+    def with_vector_format(self, vector_format: VectorFormat) -> EmbeddingResponse:
+        """Convert the response into the requested vector encoding.
+
+        Args:
+            vector_format: ``list`` or one of the array encodings.
+
+        Returns:
+            This response when it already matches, otherwise an array-backed copy
+            that no longer holds the plain-list vectors.
+        """
+        if vector_format == self.vector_format or vector_format == "list":
+            return self
+        matrix = self._matrix or EmbeddingMatrix.from_vectors(self.vectors)
+        converted = self.model_copy(update={"vector_format": vector_format})
+        converted._matrix = matrix.quantize(vector_format)
+        converted._vectors = None
+        return converted
+
+
+class ImageItemError(ApiModel):
+    """Report one requested image that a fanned-out call failed to produce."""
+
+    index: int
+    error: AIErrorPayload
 
 
 class ImageGenerateResponse(AIResponse):
-    """Return normalized image artifacts."""
+    """Return normalized image artifacts.
+
+    When ``count`` was split across several provider calls, ``errors`` lists the
+    images whose call failed while the others still returned artifacts.
+    """
 
     artifacts: list[Artifact]
     mime_type: str | None = None
+    errors: list[ImageItemError] = Field(default_factory=list)
 
 
 class AudioGenerateResponse(AIResponse):
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from .exceptions import AIUnsupportedCapabilityError
 from .registry import ModelRegistry
-from .requests import AIRequest
+from .requests import AIRequest, TextGenerateRequest
 from .types import AICapability, ResolvedModel
 
 
@@ -51,5 +51,44 @@ class AIRouter:
                 provider=resolved.provider,
                 model=resolved.model_id,
             )
+        if (
+            isinstance(request, TextGenerateRequest)
+            and not resolved.spec.supports_vision
+            and any(part.type == "image" for message in request.messages for part in message.parts)
+        ):
+            raise AIUnsupportedCapabilityError(
+                f"Model '{request.model}' does not accept image inputs",
+                provider=resolved.provider,
+                model=resolved.model_id,
+            )
 
         return resolved
+
+
+def apply_model_defaults[RequestT: AIRequest](
+    request: RequestT, resolved: ResolvedModel
+) -> RequestT:
+    """Fill request fields the caller left unset from the model's catalog defaults.
+
+    Args:
+        request: SDK request as supplied by the caller.
+        resolved: Resolved route whose spec may carry ``default_params``.
+
+    Returns:
+        The original request when nothing applies, otherwise a validated copy.
+    """
+    defaults = resolved.spec.default_params
+    if not defaults:
+        return request
+
+    fields = type(request).model_fields
+    updates = {
+        name: value
+        for name, value in defaults.items()
+        if name in fields and name not in request.model_fields_set
+    }
+    if not updates:
+        return request
+    # Validate the merged copy: model_copy(update=...) would skip field constraints.
+    values = {name: getattr(request, name) for name in request.model_fields_set}
+    return type(request).model_validate({**values, **updates})
@@ -0,0 +1,364 @@
+"""Weighted fair queueing of provider calls by priority class and tenant.
+
+One tenant's bulk job should not be able to fill a provider's concurrency and
+starve interactive chat for everyone else. :class:`FairScheduler` admits at most
+``max_concurrency`` calls per provider. Calls beyond that wait in two-level fair
+queues:
+
+- Priority classes (``interactive``, ``background``, ``batch``) share slots in
+  proportion to their weights (stride scheduling), so batch work still
+  progresses but interactive calls get most of a saturated provider.
+- Inside a class, tenants share that class's slots by start-time fair queueing,
+  so a tenant with 1000 queued calls does not delay a tenant with one.
+
+Queues are bounded. A full tenant queue rejects the call; a full scheduler evicts
+the newest waiter of a lower class before rejecting a higher-class arrival.
+Waiting longer than ``max_wait_ms`` also rejects. Rejections raise
+:class:`AIOverloadedError` and are counted per tenant, as is queue wait.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from itertools import count
+from time import perf_counter
+from typing import Literal
+
+from .exceptions import AIOverloadedError
+from .telemetry import AITelemetry
+
+PriorityClass = Literal["interactive", "background", "batch"]
+PRIORITY_CLASSES: tuple[PriorityClass, ...] = ("interactive", "background", "batch")
+
+
+@dataclass(eq=False, slots=True)
+class _Waiter:
+    """Track one queued call."""
+
+    tenant: str
+    priority: PriorityClass
+    start_tag: float
+    finish_tag: float
+    seq: int
+    future: asyncio.Future[None]
+    removed: bool = False
+
+
+@dataclass(slots=True)
+class _ClassQueue:
+    """Hold the fair queue of one priority class."""
+
+    weight: float
+    heap: list[tuple[float, int, _Waiter]] = field(default_factory=list)
+    size: int = 0
+    virtual_time: float = 0.0
+    pass_value: float = 0.0
+    tenant_finish: dict[str, float] = field(default_factory=dict)
+    tenant_sizes: dict[str, int] = field(default_factory=dict)
+
+
+class FairScheduler:
+    """Admit provider calls by weighted fair queueing across classes and tenants."""
+
+    def __init__(
+        self,
+        *,
+        provider: str,
+        max_concurrency: int,
+        class_weights: Mapping[PriorityClass, float],
+        tenant_weights: Mapping[str, float] | None = None,
+        max_queue: int = 1_000,
+        max_queue_per_tenant: int = 100,
+        max_wait_ms: int = 30_000,
+        telemetry: AITelemetry | None = None,
+    ) -> None:
+        """Configure the scheduler of one provider.
+
+        Args:
+            provider: Provider name used in errors and metrics.
+            max_concurrency: Calls allowed in flight at once.
+            class_weights: Relative share of each priority class.
+            tenant_weights: Relative share of specific tenants; others weigh ``1``.
+            max_queue: Calls allowed to wait across all classes and tenants.
+            max_queue_per_tenant: Calls one tenant may have waiting.
+            max_wait_ms: Longest a call may wait for a slot.
+            telemetry: Telemetry helper that records waits and rejections.
+
+        Returns:
+            None.
+        """
+        self._provider = provider
+        self._max_concurrency = max(max_concurrency, 1)
+        self._classes = {
+            priority: _ClassQueue(weight=max(class_weights.get(priority, 1.0), 1e-6))
+            for priority in PRIORITY_CLASSES
+        }
+        self._tenant_weights = dict(tenant_weights or {})
+        self._max_queue = max_queue
+        self._max_queue_per_tenant = max_queue_per_tenant
+        self._max_wait_s = max_wait_ms / 1000
+        self._telemetry = telemetry
+        self._active = 0
+        self._queued = 0
+        self._tenant_queued: dict[str, int] = {}
+        self._global_pass = 0.0
+        self._seq = count()
+
+    @property
+    def active(self) -> int:
+        """Return the number of calls holding a slot.
+
+        Args:
+            None.
+
+        Returns:
+            The in-flight call count.
+        """
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        """Return the number of calls waiting for a slot.
+
+        Args:
+            None.
+
+        Returns:
+            The queued call count.
+        """
+        return self._queued
+
+    @asynccontextmanager
+    async def slot(self, tenant: str, priority: PriorityClass) -> AsyncIterator[None]:
+        """Hold one provider slot for the duration of the block.
+
+        Args:
+            tenant: Tenant the call is billed to.
+            priority: Priority class of the call.
+
+        Returns:
+            An async context manager that waits for and releases the slot.
+        """
+        await self._acquire(tenant, priority)
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._dispatch()
+
+    async def _acquire(self, tenant: str, priority: PriorityClass) -> None:
+        """Take a slot now or wait in the fair queue.
+
+        Args:
+            tenant: Tenant the call is billed to.
+            priority: Priority class of the call.
+
+        Returns:
+            None.
+        """
+        queued_at = perf_counter()
+        if self._active < self._max_concurrency and self._queued == 0:
+            self._active += 1
+            self._record_wait(tenant, priority, queued_at)
+            return
+
+        self._make_room(tenant, priority)
+        waiter = self._enqueue(tenant, priority)
+        try:
+            async with asyncio.timeout(self._max_wait_s):
+                await waiter.future
+        except BaseException as exc:
+            if self._granted(waiter):
+                # The slot was handed over just as the wait ended; give it back.
+                self._active -= 1
+                self._dispatch()
+            elif not waiter.removed:
+                # Cancelling the wait also cancels the future; drop the queue entry.
+                self._remove(waiter)
+            if isinstance(exc, TimeoutError):
+                raise self._reject(
+                    tenant, priority, "wait_timeout", f"waited over {self._max_wait_s:g}s"
+                ) from exc
+            raise
+        self._record_wait(tenant, priority, queued_at)
+
+    def _make_room(self, tenant: str, priority: PriorityClass) -> None:
+        """Apply the queue bounds before a call is queued.
+
+        Args:
+            tenant: Tenant the call is billed to.
+            priority: Priority class of the call.
+
+        Returns:
+            None.
+        """
+        if self._tenant_queued.get(tenant, 0) >= self._max_queue_per_tenant:
+            raise self._reject(tenant, priority, "tenant_queue_full", "tenant queue is full")
+        if self._queued < self._max_queue:
+            return
+        rank = PRIORITY_CLASSES.index(priority)
+        for lower in reversed(PRIORITY_CLASSES[rank + 1 :]):
+            queue = self._classes[lower]
+            if queue.size:
+                victim = max(
+                    (entry[2] for entry in queue.heap if not entry[2].removed),
+                    key=lambda waiter: waiter.seq,
+                )
+                self._remove(victim)
+                victim.future.set_exception(
+                    self._reject(victim.tenant, lower, "evicted", "evicted by higher priority")
+                )
+                return
+        raise self._reject(tenant, priority, "queue_full", "scheduler queue is full")
+
+    def _enqueue(self, tenant: str, priority: PriorityClass) -> _Waiter:
+        """Add a call to its class queue with its fair-queueing tags.
+
+        Args:
+            tenant: Tenant the call is billed to.
+            priority: Priority class of the call.
+
+        Returns:
+            The queued waiter.
+        """
+        queue = self._classes[priority]
+        if queue.size == 0:
+            # An idle class must not bank credit while it had nothing to run.
+            queue.pass_value = max(queue.pass_value, self._global_pass)
+        start_tag = max(queue.virtual_time, queue.tenant_finish.get(tenant, 0.0))
+        finish_tag = start_tag + 1 / self._tenant_weights.get(tenant, 1.0)
+        queue.tenant_finish[tenant] = finish_tag
+        waiter = _Waiter(
+            tenant=tenant,
+            priority=priority,
+            start_tag=start_tag,
+            finish_tag=finish_tag,
+            seq=next(self._seq),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(queue.heap, (finish_tag, waiter.seq, waiter))
+        self._count(waiter, 1)
+        return waiter
+
+    def _dispatch(self) -> None:
+        """Hand free slots to the next waiters in fair order.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        while self._active < self._max_concurrency and self._queued:
+            queue = min(
+                (queue for queue in self._classes.values() if queue.size),
+                key=lambda queue: queue.pass_value,
+            )
+            _, _, waiter = heapq.heappop(queue.heap)
+            if waiter.removed:
+                continue
+            self._global_pass = queue.pass_value
+            queue.pass_value += 1 / queue.weight
+            queue.virtual_time = waiter.start_tag
+            self._count(waiter, -1)
+            self._active += 1
+            waiter.future.set_result(None)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        """Drop a waiter from its queue without granting it a slot.
+
+        Args:
+            waiter: Waiter to drop; its heap entry is skipped lazily.
+
+        Returns:
+            None.
+        """
+        waiter.removed = True
+        self._count(waiter, -1)
+
+    def _count(self, waiter: _Waiter, delta: int) -> None:
+        """Update queue sizes after a waiter joins or leaves.
+
+        Args:
+            waiter: Waiter that changed state.
+            delta: ``1`` when queued, ``-1`` when dispatched or removed.
+
+        Returns:
+            None.
+        """
+        queue = self._classes[waiter.priority]
+        queue.size += delta
+        if not queue.size:
+            # Only lazily skipped entries of removed waiters can be left behind.
+            queue.heap.clear()
+        self._queued += delta
+        tenant_size = queue.tenant_sizes.get(waiter.tenant, 0) + delta
+        if tenant_size:
+            queue.tenant_sizes[waiter.tenant] = tenant_size
+        else:
+            # A tenant with nothing queued restarts at the class's virtual time.
+            queue.tenant_sizes.pop(waiter.tenant, None)
+            queue.tenant_finish.pop(waiter.tenant, None)
+        queued = self._tenant_queued.get(waiter.tenant, 0) + delta
+        if queued:
+            self._tenant_queued[waiter.tenant] = queued
+        else:
+            self._tenant_queued.pop(waiter.tenant, None)
+
+    @staticmethod
+    def _granted(waiter: _Waiter) -> bool:
+        """Return whether a waiter received a slot.
+
+        Args:
+            waiter: Waiter to inspect.
+
+        Returns:
+            ``True`` when the waiter's future holds a result.
+        """
+        future = waiter.future
+        return future.done() and not future.cancelled() and future.exception() is None
+
+    def _reject(
+        self, tenant: str, priority: PriorityClass, reason: str, detail: str
+    ) -> AIOverloadedError:
+        """Count a shed call and build its error.
+
+        Args:
+            tenant: Tenant of the shed call.
+            priority: Priority class of the shed call.
+            reason: ``tenant_queue_full``, ``queue_full``, ``evicted``, or ``wait_timeout``.
+            detail: Human-readable reason.
+
+        Returns:
+            The error to raise for the shed call.
+        """
+        if self._telemetry is not None:
+            self._telemetry.record_scheduler_shed(
+                provider=self._provider, tenant=tenant, priority=priority, reason=reason
+            )
+        return AIOverloadedError(
+            f"{self._provider} is overloaded: {detail}", provider=self._provider
+        )
+
+    def _record_wait(self, tenant: str, priority: PriorityClass, queued_at: float) -> None:
+        """Record how long a call waited for its slot.
+
+        Args:
+            tenant: Tenant of the call.
+            priority: Priority class of the call.
+            queued_at: ``perf_counter`` value when the call arrived.
+
+        Returns:
+            None.
+        """
+        if self._telemetry is not None:
+            self._telemetry.record_scheduler_wait(
+                provider=self._provider,
+                tenant=tenant,
+                priority=priority,
+                wait_ms=(perf_counter() - queued_at) * 1000,
+            )
@@ -0,0 +1,67 @@
+"""Text segmentation helpers used to split long synthesis inputs."""
+
+from __future__ import annotations
+
+import re
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;。！？；…])\s+|(?<=[。！？；…])|\n+")
+
+
+def split_sentences(text: str, *, max_chars: int) -> list[str]:
+    """Split text on sentence boundaries into segments of at most ``max_chars``.
+
+    Short sentences are merged greedily so each provider call carries enough text
+    to keep prosody natural. A single sentence longer than ``max_chars`` is split
+    on the last whitespace inside the limit, or hard-split when none exists.
+
+    Args:
+        text: Input text to segment.
+        max_chars: Upper bound for the length of one segment.
+
+    Returns:
+        Ordered non-empty segments whose concatenation preserves the input words.
+    """
+    limit = max(max_chars, 1)
+    segments: list[str] = []
+    current = ""
+
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+
+        for piece in _split_long_sentence(sentence, limit):
+            if not current:
+                current = piece
+            elif len(current) + 1 + len(piece) <= limit:
+                current = f"{current} {piece}"
+            else:
+                segments.append(current)
+                current = piece
+
+    if current:
+        segments.append(current)
+    return segments
+
+
+def _split_long_sentence(sentence: str, limit: int) -> list[str]:
+    """Break one over-long sentence into pieces that fit the segment limit.
+
+    Args:
+        sentence: Sentence that may exceed the limit.
+        limit: Upper bound for the length of one piece.
+
+    Returns:
+        Ordered pieces of the sentence.
+    """
+    pieces: list[str] = []
+    remaining = sentence
+    while len(remaining) > limit:
+        cut = remaining.rfind(" ", 0, limit + 1)
+        if cut <= 0:
+            cut = limit
+        pieces.append(remaining[:cut].strip())
+        remaining = remaining[cut:].strip()
+    if remaining:
+        pieces.append(remaining)
+    return pieces
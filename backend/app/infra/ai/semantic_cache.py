@@ -0,0 +1,897 @@
+"""Semantic response cache for text generation backed by an in-process vector index.
+
+Requests whose normalized last user turn is close enough to a cached one, within
+the same tenant, model, and conversation context, are answered from the cache.
+NumPy is an optional dependency (``pip install ello-bot[semantic-cache]``) and is
+only imported when the cache is constructed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from time import time
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from app.core import log
+
+from .exceptions import AIConfigError, AIError
+from .requests import TextGenerateRequest
+from .responses import TextGenerateResponse
+from .telemetry import AITelemetry
+
+if TYPE_CHECKING:
+    import numpy as np
+    from redis.asyncio import Redis
+
+EmbedFunction = Callable[[str, dict[str, Any]], Awaitable[list[float]]]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_turn(text: str) -> str:
+    """Normalize a user turn so trivial formatting differences do not affect lookups.
+
+    Args:
+        text: Raw user message content.
+
+    Returns:
+        The NFKC-normalized, case-folded, whitespace-collapsed text.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
+@dataclass(slots=True)
+class CacheRecord:
+    """Store one cached response together with its embedding."""
+
+    partition: str
+    entry_id: str
+    vector: list[float]
+    response_json: str
+    prompt: str
+    created_at: float
+    expires_at: float
+
+    def to_json(self) -> str:
+        """Serialize the record for persistence stores.
+
+        Args:
+            None.
+
+        Returns:
+            A compact JSON document with the vector encoded as base64 float32.
+        """
+        import numpy as np
+
+        return json.dumps(
+            {
+                "partition": self.partition,
+                "entry_id": self.entry_id,
+                "vector": base64.b64encode(np.asarray(self.vector, dtype=np.float32)).decode(),
+                "response": self.response_json,
+                "prompt": self.prompt,
+                "created_at": self.created_at,
+                "expires_at": self.expires_at,
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, payload: str) -> CacheRecord:
+        """Deserialize a record written by :meth:`to_json`.
+
+        Args:
+            payload: JSON document produced by a persistence store.
+
+        Returns:
+            The decoded record.
+        """
+        import numpy as np
+
+        data = json.loads(payload)
+        vector = np.frombuffer(base64.b64decode(data["vector"]), dtype=np.float32)
+        return cls(
+            partition=data["partition"],
+            entry_id=data["entry_id"],
+            vector=vector.tolist(),
+            response_json=data["response"],
+            prompt=data["prompt"],
+            created_at=data["created_at"],
+            expires_at=data["expires_at"],
+        )
+
+
+@dataclass(slots=True)
+class SemanticCacheLookup:
+    """Carry the outcome of one lookup so a miss can be stored without re-embedding."""
+
+    partition: str
+    prompt: str
+    vector: np.ndarray
+    response: TextGenerateResponse | None = None
+    similarity: float | None = None
+    entry_id: str | None = None
+
+
+@dataclass(slots=True)
+class SemanticCacheStats:
+    """Count lookups and outcomes since process start."""
+
+    lookups: int = 0
+    hits: int = 0
+    bypassed: int = 0
+    false_positives: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the share of eligible lookups served from the cache.
+
+        Args:
+            None.
+
+        Returns:
+            Hits divided by lookups, or ``0.0`` before the first lookup.
+        """
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Return the share of hits later judged to be wrong.
+
+        Args:
+            None.
+
+        Returns:
+            False positives divided by hits, or ``0.0`` before the first hit.
+        """
+        return self.false_positives / self.hits if self.hits else 0.0
+
+
+class _Partition:
+    """Hold the vectors and metadata of one tenant/model/context partition.
+
+    Vectors live in one contiguous, L2-normalized float32 matrix so a lookup is a
+    single matrix-vector product. Deletions swap the last row into the hole to
+    keep the matrix dense. The arrays start empty and double on demand, so a
+    partition that only ever sees a few entries stays small.
+    """
+
+    def __init__(self, np_module: Any, dimensions: int, capacity: int) -> None:
+        """Create an empty partition without allocating rows.
+
+        Args:
+            np_module: Imported NumPy module.
+            dimensions: Embedding dimensionality.
+            capacity: Maximum number of entries before LRU eviction.
+
+        Returns:
+            None.
+        """
+        self._np = np_module
+        self.dimensions = dimensions
+        self.capacity = capacity
+        self.size = 0
+        self.vectors = np_module.zeros((0, dimensions), dtype=np_module.float32)
+        self.expires_at = np_module.zeros(0, dtype=np_module.float64)
+        self.last_used = np_module.zeros(0, dtype=np_module.float64)
+        self.records: list[CacheRecord] = []
+
+    def search(self, query: np.ndarray, now: float) -> tuple[int, float] | None:
+        """Find the most similar live entry.
+
+        Args:
+            query: L2-normalized query vector.
+            now: Current wall-clock time in seconds.
+
+        Returns:
+            ``(row, similarity)`` of the best live entry, or ``None`` when empty.
+        """
+        if self.size == 0:
+            return None
+        scores = self.vectors[: self.size] @ query
+        scores[self.expires_at[: self.size] <= now] = -2.0
+        row = int(scores.argmax())
+        if scores[row] <= -2.0:
+            return None
+        return row, float(scores[row])
+
+    def add(self, record: CacheRecord, vector: np.ndarray, now: float) -> CacheRecord | None:
+        """Insert one entry, evicting expired or least recently used rows when full.
+
+        Args:
+            record: Record describing the entry.
+            vector: L2-normalized embedding.
+            now: Current wall-clock time in seconds.
+
+        Returns:
+            The evicted record, if any.
+        """
+        evicted = None
+        if self.size >= self.capacity:
+            evicted = self.remove(self._eviction_candidate(now))
+        if self.size == len(self.vectors):
+            self._grow()
+
+        row = self.size
+        self.vectors[row] = vector
+        self.expires_at[row] = record.expires_at
+        self.last_used[row] = now
+        self.records.append(record)
+        self.size += 1
+        return evicted
+
+    def touch(self, row: int, now: float) -> None:
+        """Mark one entry as recently used.
+
+        Args:
+            row: Row index of the entry.
+            now: Current wall-clock time in seconds.
+
+        Returns:
+            None.
+        """
+        self.last_used[row] = now
+
+    def remove(self, row: int) -> CacheRecord:
+        """Delete one entry by swapping the last row into its place.
+
+        Args:
+            row: Row index to delete.
+
+        Returns:
+            The removed record.
+        """
+        last = self.size - 1
+        removed = self.records[row]
+        if row != last:
+            self.vectors[row] = self.vectors[last]
+            self.expires_at[row] = self.expires_at[last]
+            self.last_used[row] = self.last_used[last]
+            self.records[row] = self.records[last]
+        self.records.pop()
+        self.size = last
+        return removed
+
+    def remove_expired(self, now: float) -> list[CacheRecord]:
+        """Delete every expired entry.
+
+        Args:
+            now: Current wall-clock time in seconds.
+
+        Returns:
+            The removed records.
+        """
+        expired = self._np.flatnonzero(self.expires_at[: self.size] <= now)
+        # Highest rows first, so the row swapped into each hole is never an expired one.
+        return [self.remove(int(row)) for row in expired[::-1]]
+
+    def least_recently_used(self) -> int:
+        """Return the row that was used longest ago.
+
+        Args:
+            None.
+
+        Returns:
+            Row index of the least recently used entry.
+        """
+        return int(self.last_used[: self.size].argmin())
+
+    def row_of(self, entry_id: str) -> int | None:
+        """Locate an entry by id.
+
+        Args:
+            entry_id: Cache entry id.
+
+        Returns:
+            The row index, or ``None`` when the entry is gone.
+        """
+        for row, record in enumerate(self.records):
+            if record.entry_id == entry_id:
+                return row
+        return None
+
+    def _eviction_candidate(self, now: float) -> int:
+        """Pick the row to evict: any expired row first, otherwise the LRU row.
+
+        Args:
+            now: Current wall-clock time in seconds.
+
+        Returns:
+            Row index to evict.
+        """
+        expired = self._np.flatnonzero(self.expires_at[: self.size] <= now)
+        if expired.size:
+            return int(expired[0])
+        return self.least_recently_used()
+
+    def _grow(self) -> None:
+        """Double the backing arrays up to the partition capacity.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        np = self._np
+        new_size = min(max(len(self.vectors) * 2, 1), self.capacity)
+        vectors = np.zeros((new_size, self.dimensions), dtype=np.float32)
+        vectors[: self.size] = self.vectors[: self.size]
+        expires_at = np.zeros(new_size, dtype=np.float64)
+        expires_at[: self.size] = self.expires_at[: self.size]
+        last_used = np.zeros(new_size, dtype=np.float64)
+        last_used[: self.size] = self.last_used[: self.size]
+        self.vectors, self.expires_at, self.last_used = vectors, expires_at, last_used
+
+
+class SemanticCacheStore:
+    """Persist cache records; the base implementation keeps nothing."""
+
+    async def load(self) -> list[CacheRecord]:
+        """Load previously persisted records.
+
+        Args:
+            None.
+
+        Returns:
+            Persisted records, possibly including expired ones.
+        """
+        return []
+
+    async def put(self, record: CacheRecord) -> None:
+        """Persist one newly cached record.
+
+        Args:
+            record: Record to persist.
+
+        Returns:
+            None.
+        """
+
+    async def delete(self, record: CacheRecord) -> None:
+        """Remove one evicted or invalidated record.
+
+        Args:
+            record: Record to remove.
+
+        Returns:
+            None.
+        """
+
+    async def save(self, records: list[CacheRecord]) -> None:
+        """Write a full snapshot of the live records.
+
+        Args:
+            records: Every live record.
+
+        Returns:
+            None.
+        """
+
+
+class DiskCacheStore(SemanticCacheStore):
+    """Persist the cache as a JSON-lines snapshot written on shutdown."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Bind the store to one snapshot file.
+
+        Args:
+            path: Snapshot file path.
+
+        Returns:
+            None.
+        """
+        self._path = Path(path)
+
+    async def load(self) -> list[CacheRecord]:
+        """Read the snapshot file when it exists.
+
+        Args:
+            None.
+
+        Returns:
+            Records stored in the snapshot.
+        """
+        return await asyncio.to_thread(self._read)
+
+    async def save(self, records: list[CacheRecord]) -> None:
+        """Replace the snapshot atomically.
+
+        Args:
+            records: Every live record.
+
+        Returns:
+            None.
+        """
+        await asyncio.to_thread(self._write, records)
+
+    def _read(self) -> list[CacheRecord]:
+        """Parse the snapshot file.
+
+        Args:
+            None.
+
+        Returns:
+            Records stored in the snapshot.
+        """
+        if not self._path.is_file():
+            return []
+        with self._path.open(encoding="utf-8") as handle:
+            return [CacheRecord.from_json(line) for line in handle if line.strip()]
+
+    def _write(self, records: list[CacheRecord]) -> None:
+        """Write a temp file and rename it over the snapshot.
+
+        Args:
+            records: Every live record.
+
+        Returns:
+            None.
+        """
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=self._path.parent, delete=False, suffix=".tmp"
+        ) as handle:
+            for record in records:
+                handle.write(record.to_json())
+                handle.write("\n")
+        os.replace(handle.name, self._path)
+
+
+class RedisCacheStore(SemanticCacheStore):
+    """Write records through to Redis so restarted or new workers start warm.
+
+    Records are only read by :meth:`load` at startup; each worker keeps its own
+    in-process index and does not see entries other workers add afterwards.
+    """
+
+    def __init__(self, redis: Redis, *, key_prefix: str = "ai:semantic-cache") -> None:
+        """Bind the store to a Redis client.
+
+        Args:
+            redis: Async Redis client created with ``decode_responses=True``.
+            key_prefix: Prefix for per-record keys.
+
+        Returns:
+            None.
+        """
+        self._redis = redis
+        self._key_prefix = key_prefix
+
+    async def load(self) -> list[CacheRecord]:
+        """Scan every record key under the prefix.
+
+        Args:
+            None.
+
+        Returns:
+            Records currently stored in Redis.
+        """
+        records = []
+        async for key in self._redis.scan_iter(match=f"{self._key_prefix}:*", count=500):
+            payload = await self._redis.get(key)
+            if payload:
+                records.append(CacheRecord.from_json(payload))
+        return records
+
+    async def put(self, record: CacheRecord) -> None:
+        """Store one record with a Redis TTL that matches its expiry.
+
+        Args:
+            record: Record to persist.
+
+        Returns:
+            None.
+        """
+        ttl_s = max(int(record.expires_at - time()), 1)
+        await self._redis.set(self._key(record), record.to_json(), ex=ttl_s)
+
+    async def delete(self, record: CacheRecord) -> None:
+        """Delete one record key.
+
+        Args:
+            record: Record to remove.
+
+        Returns:
+            None.
+        """
+        await self._redis.delete(self._key(record))
+
+    def _key(self, record: CacheRecord) -> str:
+        """Build the Redis key for one record.
+
+        Args:
+            record: Cache record.
+
+        Returns:
+            The namespaced Redis key.
+        """
+        return f"{self._key_prefix}:{record.entry_id}"
+
+
+class SemanticCache:
+    """Answer paraphrased text requests from previously generated responses."""
+
+    def __init__(
+        self,
+        *,
+        embed: EmbedFunction,
+        telemetry: AITelemetry,
+        similarity_threshold: float = 0.92,
+        ttl_s: float = 3600.0,
+        max_entries_per_partition: int = 1000,
+        max_entries: int = 10000,
+        sweep_interval_s: float = 60.0,
+        verify_sample_rate: float = 0.0,
+        store: SemanticCacheStore | None = None,
+    ) -> None:
+        """Configure the cache.
+
+        Args:
+            embed: Coroutine that embeds one normalized turn with the request metadata.
+            telemetry: Telemetry helper that records cache metrics.
+            similarity_threshold: Minimum cosine similarity for a hit.
+            ttl_s: Lifetime of one cached response in seconds.
+            max_entries_per_partition: LRU capacity of one tenant/model/context partition.
+            max_entries: Capacity across all partitions; the least recently used
+                partition gives up its least recently used entry when exceeded.
+            sweep_interval_s: Minimum time between sweeps that drop expired entries
+                and empty partitions.
+            verify_sample_rate: Share of hits re-generated in the background to detect
+                false positives.
+            store: Optional persistence backend.
+
+        Returns:
+            None.
+        """
+        try:
+            import numpy
+        except ImportError as exc:
+            raise AIConfigError(
+                "The semantic cache requires NumPy; install the 'semantic-cache' extra"
+            ) from exc
+
+        self._np = numpy
+        self._embed = embed
+        self._telemetry = telemetry
+        self._threshold = similarity_threshold
+        self._ttl_s = ttl_s
+        self._capacity = max(max_entries_per_partition, 1)
+        self._max_entries = max(max_entries, 1)
+        self._sweep_interval_s = sweep_interval_s
+        self._next_sweep_at = 0.0
+        self._entries = 0
+        self._verify_sample_rate = verify_sample_rate
+        self._store = store or SemanticCacheStore()
+        # Ordered from least to most recently used partition.
+        self._partitions: OrderedDict[str, _Partition] = OrderedDict()
+        self._background: set[asyncio.Task[None]] = set()
+        self.stats = SemanticCacheStats()
+
+    async def load(self) -> int:
+        """Restore live records from the persistence store.
+
+        Args:
+            None.
+
+        Returns:
+            The number of restored records.
+        """
+        now = time()
+        restored = 0
+        for record in await self._store.load():
+            if record.expires_at <= now:
+                continue
+            self._insert(record, self._normalize_vector(record.vector), now)
+            restored += 1
+        return restored
+
+    async def aclose(self) -> None:
+        """Wait for background work and write a final snapshot.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        await self._store.save(
+            [record for partition in self._partitions.values() for record in partition.records]
+        )
+
+    def is_eligible(self, request: TextGenerateRequest) -> bool:
+        """Return whether a request may be served from or stored in the cache.
+
+        Args:
+            request: Text generation request.
+
+        Returns:
+            ``True`` when the last turn is a user message, no tools are offered, no
+            message carries images or files, and the caller did not opt out.
+        """
+        return (
+            request.messages[-1].role == "user"
+            and not request.tools
+            and not any(message.parts for message in request.messages)
+            and request.metadata.get("semantic_cache", True) is not False
+        )
+
+    async def lookup(self, request: TextGenerateRequest) -> SemanticCacheLookup | None:
+        """Search the request's partition for a sufficiently similar cached turn.
+
+        Args:
+            request: Text generation request.
+
+        Returns:
+            ``None`` for ineligible requests, otherwise a lookup whose ``response``
+            is set on a hit.
+        """
+        if not self.is_eligible(request):
+            self.stats.bypassed += 1
+            self._telemetry.record_semantic_cache_lookup(
+                provider=request.provider, model=request.model, result="bypass"
+            )
+            return None
+
+        prompt = normalize_turn(request.messages[-1].content)
+        vector = self._normalize_vector(await self._embed(prompt, request.metadata))
+        lookup = SemanticCacheLookup(
+            partition=self._partition_key(request), prompt=prompt, vector=vector
+        )
+        self.stats.lookups += 1
+
+        now = time()
+        partition = self._partitions.get(lookup.partition)
+        match = partition.search(vector, now) if partition is not None else None
+        if match is not None:
+            row, similarity = match
+            lookup.similarity = similarity
+            if similarity >= self._threshold:
+                partition.touch(row, now)
+                self._partitions.move_to_end(lookup.partition)
+                record = partition.records[row]
+                lookup.entry_id = record.entry_id
+                lookup.response = TextGenerateResponse.model_validate_json(record.response_json)
+                self.stats.hits += 1
+
+        self._telemetry.record_semantic_cache_lookup(
+            provider=request.provider,
+            model=request.model,
+            result="hit" if lookup.response is not None else "miss",
+            similarity=lookup.similarity,
+        )
+        return lookup
+
+    async def store(self, lookup: SemanticCacheLookup, response: TextGenerateResponse) -> None:
+        """Cache a freshly generated response for the looked-up turn.
+
+        Args:
+            lookup: Miss returned by :meth:`lookup` for the same request.
+            response: Response generated by the provider.
+
+        Returns:
+            None.
+        """
+        now = time()
+        record = CacheRecord(
+            partition=lookup.partition,
+            entry_id=uuid4().hex,
+            vector=lookup.vector.tolist(),
+            response_json=response.model_dump_json(),
+            prompt=lookup.prompt,
+            created_at=now,
+            expires_at=now + self._ttl_s,
+        )
+        evicted = self._insert(record, lookup.vector, now)
+        await self._store.put(record)
+        self.stats.evictions += len(evicted)
+        for stale in evicted:
+            await self._store.delete(stale)
+
+    def should_verify(self) -> bool:
+        """Decide whether the current hit should be re-generated for verification.
+
+        Args:
+            None.
+
+        Returns:
+            ``True`` for the sampled share of hits.
+        """
+        return self._verify_sample_rate > 0 and random.random() < self._verify_sample_rate
+
+    def verify_in_background(
+        self,
+        lookup: SemanticCacheLookup,
+        metadata: dict[str, Any],
+        regenerate: Callable[[], Awaitable[TextGenerateResponse]],
+    ) -> None:
+        """Re-generate a served hit and flag it as a false positive when answers diverge.
+
+        Args:
+            lookup: Hit that was served.
+            metadata: Request metadata forwarded to the embedding call.
+            regenerate: Coroutine factory producing a fresh provider response.
+
+        Returns:
+            None.
+        """
+        task = asyncio.create_task(self._verify(lookup, metadata, regenerate))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def report_false_positive(self, partition: str, entry_id: str) -> bool:
+        """Record that a served hit was wrong and evict the entry.
+
+        Args:
+            partition: Partition key from the lookup.
+            entry_id: Entry id from the lookup.
+
+        Returns:
+            ``True`` when the entry was still cached and got evicted.
+        """
+        self.stats.false_positives += 1
+        self._telemetry.record_semantic_cache_false_positive()
+        partition_index = self._partitions.get(partition)
+        row = partition_index.row_of(entry_id) if partition_index is not None else None
+        if row is None:
+            return False
+        await self._store.delete(self._remove(partition, partition_index, row))
+        return True
+
+    async def _verify(
+        self,
+        lookup: SemanticCacheLookup,
+        metadata: dict[str, Any],
+        regenerate: Callable[[], Awaitable[TextGenerateResponse]],
+    ) -> None:
+        """Compare a cached answer with a fresh one.
+
+        Args:
+            lookup: Hit that was served.
+            metadata: Request metadata forwarded to the embedding call.
+            regenerate: Coroutine factory producing a fresh provider response.
+
+        Returns:
+            None.
+        """
+        if lookup.response is None or lookup.entry_id is None:
+            return
+        try:
+            fresh = await regenerate()
+            cached_vector = self._normalize_vector(
+                await self._embed(normalize_turn(lookup.response.text), metadata)
+            )
+            fresh_vector = self._normalize_vector(
+                await self._embed(normalize_turn(fresh.text), metadata)
+            )
+        except AIError as exc:
+            log.warning(f"Semantic cache verification skipped: {exc.message}")
+            return
+        if float(cached_vector @ fresh_vector) < self._threshold:
+            await self.report_false_positive(lookup.partition, lookup.entry_id)
+
+    def _insert(self, record: CacheRecord, vector: np.ndarray, now: float) -> list[CacheRecord]:
+        """Add one record to its partition, creating the partition on first use.
+
+        Expired entries are swept first when the sweep interval has passed, then
+        the per-partition and global capacities are enforced.
+
+        Args:
+            record: Record to insert.
+            vector: L2-normalized embedding.
+            now: Current wall-clock time in seconds.
+
+        Returns:
+            The records evicted to make room.
+        """
+        evicted = self._sweep(now) if now >= self._next_sweep_at else []
+        partition = self._partitions.get(record.partition)
+        if partition is None or partition.dimensions != vector.shape[0]:
+            if partition is not None:
+                self._entries -= partition.size
+                evicted.extend(partition.records)
+            partition = _Partition(self._np, vector.shape[0], self._capacity)
+            self._partitions[record.partition] = partition
+        self._partitions.move_to_end(record.partition)
+
+        displaced = partition.add(record, vector, now)
+        self._entries += 1
+        if displaced is not None:
+            self._entries -= 1
+            evicted.append(displaced)
+        while self._entries > self._max_entries:
+            key, oldest = next(iter(self._partitions.items()))
+            evicted.append(self._remove(key, oldest, oldest.least_recently_used()))
+        return evicted
+
+    def _remove(self, key: str, partition: _Partition, row: int) -> CacheRecord:
+        """Delete one entry and drop its partition once it is empty.
+
+        Args:
+            key: Partition key.
+            partition: Partition holding the entry.
+            row: Row index to delete.
+
+        Returns:
+            The removed record.
+        """
+        removed = partition.remove(row)
+        self._entries -= 1
+        if partition.size == 0:
+            del self._partitions[key]
+        return removed
+
+    def _sweep(self, now: float) -> list[CacheRecord]:
+        """Drop expired entries from every partition and forget empty partitions.
+
+        Args:
+            now: Current wall-clock time in seconds.
+
+        Returns:
+            The removed records.
+        """
+        self._next_sweep_at = now + self._sweep_interval_s
+        removed: list[CacheRecord] = []
+        for key, partition in list(self._partitions.items()):
+            removed.extend(partition.remove_expired(now))
+            if partition.size == 0:
+                del self._partitions[key]
+        self._entries -= len(removed)
+        return removed
+
+    def _normalize_vector(self, values: list[float]) -> np.ndarray:
+        """Convert an embedding into an L2-normalized float32 array.
+
+        Args:
+            values: Raw embedding values.
+
+        Returns:
+            The normalized vector.
+        """
+        vector = self._np.asarray(values, dtype=self._np.float32)
+        norm = float(self._np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _partition_key(self, request: TextGenerateRequest) -> str:
+        """Build the partition key from tenant, model, and conversation context.
+
+        Everything except the last user turn is hashed into the key, so a cached
+        answer is only reused under the same system prompt, history, output
+        format, and sampling controls (temperature, token limit, stop sequences).
+
+        Args:
+            request: Text generation request.
+
+        Returns:
+            The partition key.
+        """
+        tenant = str(request.metadata.get("tenant_id", "-"))
+        context = json.dumps(
+            [
+                request.response_format,
+                request.temperature,
+                request.max_tokens,
+                request.stop,
+                [[message.role, message.content] for message in request.messages[:-1]],
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        digest = hashlib.sha256(context.encode()).hexdigest()[:16]
+        return f"{tenant}|{request.provider}:{request.model}|{digest}"
@@ -0,0 +1,190 @@
+"""Disk spooling for large generated artifacts."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import mimetypes
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from typing import BinaryIO
+
+from .types import Artifact, ArtifactKind
+
+
+class ArtifactSpooler:
+    """Move large provider payloads into temp files instead of in-memory ``bytes``.
+
+    Payloads at or below ``inline_threshold_bytes`` stay inline as ``BINARY``
+    artifacts. Larger payloads are written in bounded chunks and returned as
+    ``FILE`` artifacts; the caller owns the spooled file and must delete it.
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: str | None = None,
+        inline_threshold_bytes: int = 1024 * 1024,
+        chunk_size_bytes: int = 64 * 1024,
+    ) -> None:
+        """Configure spool location and thresholds.
+
+        Args:
+            directory: Target directory for spooled files; defaults to the system temp dir.
+            inline_threshold_bytes: Largest payload kept inline in memory.
+            chunk_size_bytes: Write granularity used while spooling.
+
+        Returns:
+            None.
+        """
+        self._directory = directory
+        self._inline_threshold_bytes = max(inline_threshold_bytes, 0)
+        self._chunk_size_bytes = max(chunk_size_bytes, 3)
+
+    @property
+    def chunk_size_bytes(self) -> int:
+        """Return the read and write granularity used while spooling.
+
+        Args:
+            None.
+
+        Returns:
+            The chunk size in bytes.
+        """
+        return self._chunk_size_bytes
+
+    async def spool_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        *,
+        mime_type: str | None,
+        filename: str | None,
+    ) -> Artifact:
+        """Consume a streamed response body into an inline or file-backed artifact.
+
+        Args:
+            chunks: Async iterator of raw body chunks.
+            mime_type: MIME type reported for the payload.
+            filename: Logical artifact filename.
+
+        Returns:
+            A ``BINARY`` artifact for small payloads, otherwise a ``FILE`` artifact.
+        """
+        buffered: list[bytes] = []
+        buffered_size = 0
+        handle: BinaryIO | None = None
+
+        try:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+
+                if handle is None:
+                    buffered.append(chunk)
+                    buffered_size += len(chunk)
+                    if buffered_size <= self._inline_threshold_bytes:
+                        continue
+
+                    # Crossing the threshold: flush the in-memory prefix and keep streaming to disk.
+                    handle = self._open_spool_file(mime_type)
+                    pending = b"".join(buffered)
+                    buffered.clear()
+                    await asyncio.to_thread(handle.write, pending)
+                    continue
+
+                await asyncio.to_thread(handle.write, chunk)
+        except BaseException:
+            if handle is not None:
+                handle.close()
+                os.unlink(handle.name)
+            raise
+
+        if handle is None:
+            return Artifact(
+                kind=ArtifactKind.BINARY,
+                content=b"".join(buffered),
+                mime_type=mime_type,
+                filename=filename,
+            )
+
+        handle.close()
+        return Artifact(
+            kind=ArtifactKind.FILE,
+            path=handle.name,
+            mime_type=mime_type,
+            filename=filename,
+        )
+
+    async def spool_base64(
+        self,
+        data: str,
+        *,
+        mime_type: str | None,
+        filename: str | None,
+    ) -> Artifact:
+        """Decode a base64 payload into an inline or file-backed artifact.
+
+        Args:
+            data: Base64-encoded payload returned by the provider.
+            mime_type: MIME type reported for the payload.
+            filename: Logical artifact filename.
+
+        Returns:
+            A ``BINARY`` artifact for small payloads, otherwise a ``FILE`` artifact.
+        """
+        if len(data) // 4 * 3 <= self._inline_threshold_bytes:
+            return Artifact(
+                kind=ArtifactKind.BINARY,
+                content=base64.b64decode(data),
+                mime_type=mime_type,
+                filename=filename,
+            )
+
+        path = await asyncio.to_thread(self._decode_base64_to_file, data, mime_type)
+        return Artifact(
+            kind=ArtifactKind.FILE,
+            path=path,
+            mime_type=mime_type,
+            filename=filename,
+        )
+
+    def _decode_base64_to_file(self, data: str, mime_type: str | None) -> str:
+        """Decode base64 incrementally so only one chunk of decoded bytes is alive at a time.
+
+        Args:
+            data: Base64-encoded payload.
+            mime_type: MIME type used to pick the file suffix.
+
+        Returns:
+            The path of the written spool file.
+        """
+        # Base64 decodes in 4-character groups, so each slice must stay group-aligned.
+        step = self._chunk_size_bytes // 3 * 4
+        handle = self._open_spool_file(mime_type)
+        try:
+            with handle:
+                for offset in range(0, len(data), step):
+                    handle.write(base64.b64decode(data[offset : offset + step]))
+        except BaseException:
+            os.unlink(handle.name)
+            raise
+        return handle.name
+
+    def _open_spool_file(self, mime_type: str | None) -> BinaryIO:
+        """Create a named spool file that survives closing.
+
+        Args:
+            mime_type: MIME type used to pick the file suffix.
+
+        Returns:
+            An open binary file handle.
+        """
+        suffix = mimetypes.guess_extension(mime_type or "") or ""
+        return tempfile.NamedTemporaryFile(
+            mode="wb",
+            dir=self._directory,
+            prefix="ai-artifact-",
+            suffix=suffix,
+            delete=False,
+        )
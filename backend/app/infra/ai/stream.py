@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from time import time
+from typing import Any
 
 from pydantic import Field
 
@@ -87,6 +88,36 @@ class AIErrorEvent(AIStreamEvent):
     partial_text: str | None = None
 
 
+class AIJSONPartialEvent(AIStreamEvent):
+    """Emit one JSON value that finished parsing while the stream is still running.
+
+    ``path`` addresses the value from the root, for example ``["items", 0, "name"]``;
+    an empty path carries the complete root document.
+    """
+
+    event: str = "json_partial"
+    path: list[str | int]
+    value: Any
+
+
+class AIAudioChunkEvent(AIStreamEvent):
+    """Emit one chunk of synthesized audio in playback order."""
+
+    event: str = "audio_chunk"
+    segment_index: int
+    sequence: int
+    data: bytes = Field(repr=False)
+    mime_type: str | None = None
+
+
+class AIAudioDoneEvent(AIStreamEvent):
+    """Mark successful completion of a streamed synthesis."""
+
+    event: str = "audio_done"
+    segment_count: int
+    total_bytes: int
+
+
 AnyAIStreamEvent = (
     AIStartEvent
     | AITextStartEvent
@@ -97,6 +128,10 @@ AnyAIStreamEvent = (
     | AIErrorEvent
 )
 
+AnyAIJSONStreamEvent = AnyAIStreamEvent | AIJSONPartialEvent
+
+AnyAIAudioStreamEvent = AIAudioChunkEvent | AIAudioDoneEvent | AIErrorEvent
+
 
 def set_event_attempt(
     event: AnyAIStreamEvent,
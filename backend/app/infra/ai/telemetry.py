@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from contextlib import AbstractContextManager
+from time import perf_counter
 from typing import Any
 
 from opentelemetry import metrics, trace
@@ -10,6 +12,8 @@ from opentelemetry.trace import Status, StatusCode
 
 from .config import AISettings
 from .exceptions import AIError
+from .latency import RollingPercentiles
+from .ledger import AILedger, LedgerRecord
 from .responses import AIResponse
 from .types import AIUsage, ResolvedModel
 
@@ -17,16 +21,18 @@ from .types import AIUsage, ResolvedModel
 class AITelemetry:
     """Encapsulate tracing, metrics, and optional content recording for AI calls."""
 
-    def __init__(self, settings: AISettings) -> None:
+    def __init__(self, settings: AISettings, *, ledger: AILedger | None = None) -> None:
         """Initialize no-op-safe OpenTelemetry primitives for AI instrumentation.
 
         Args:
             settings: AI SDK configuration that controls content recording behavior.
+            ledger: Optional ledger that receives one record per finished call.
 
         Returns:
             None.
         """
         self._settings = settings
+        self._ledger = ledger
         self._tracer = trace.get_tracer("app.infra.ai")
         self._meter = metrics.get_meter("app.infra.ai")
         self._request_counter = self._meter.create_counter("ai.request.count")
@@ -34,6 +40,27 @@ class AITelemetry:
         self._latency_histogram = self._meter.create_histogram("ai.request.latency.ms")
         self._input_token_counter = self._meter.create_counter("ai.request.input_tokens")
         self._output_token_counter = self._meter.create_counter("ai.request.output_tokens")
+        self._ttft_histogram = self._meter.create_histogram("ai.stream.time_to_first_delta.ms")
+        self._inter_delta_histogram = self._meter.create_histogram("ai.stream.inter_delta_gap.ms")
+        self._tokens_per_second_histogram = self._meter.create_histogram(
+            "ai.stream.output_tokens_per_second"
+        )
+        self._first_chunk_histogram = self._meter.create_histogram(
+            "ai.stream.time_to_first_chunk.ms"
+        )
+        self._semantic_cache_counter = self._meter.create_counter("ai.semantic_cache.lookups")
+        self._semantic_cache_similarity = self._meter.create_histogram(
+            "ai.semantic_cache.similarity"
+        )
+        self._semantic_cache_false_positives = self._meter.create_counter(
+            "ai.semantic_cache.false_positives"
+        )
+        self._compaction_counter = self._meter.create_counter("ai.compaction.decisions")
+        self._compaction_saved_tokens = self._meter.create_histogram("ai.compaction.saved_tokens")
+        self._scheduler_wait_histogram = self._meter.create_histogram("ai.scheduler.queue_wait.ms")
+        self._scheduler_shed_counter = self._meter.create_counter("ai.scheduler.shed")
+        self._idempotent_replay_counter = self._meter.create_counter("ai.idempotency.replays")
+        self._stream_stats: dict[tuple[str, str], StreamLatencyStats] = {}
 
     def start_request_span(
         self,
@@ -96,12 +123,31 @@ class AITelemetry:
         }
         return self._tracer.start_as_current_span("ai.provider.attempt", attributes=attributes)
 
-    def record_success(self, *, operation_name: str, response: AIResponse) -> None:
+    @property
+    def ledger(self) -> AILedger | None:
+        """Expose the call ledger so its owner can start and stop it.
+
+        Args:
+            None.
+
+        Returns:
+            The ledger, or ``None`` when calls are not recorded.
+        """
+        return self._ledger
+
+    def record_success(
+        self,
+        *,
+        operation_name: str,
+        response: AIResponse,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> None:
         """Record success metrics for a completed request.
 
         Args:
             operation_name: Logical SDK operation name such as ``text.generate``.
             response: Final normalized SDK response.
+            metadata: Metadata of the originating request, used by the ledger.
 
         Returns:
             None.
@@ -114,6 +160,10 @@ class AITelemetry:
         self._request_counter.add(1, attributes)
         self._latency_histogram.record(response.latency_ms, attributes)
         self._record_usage(response.usage, attributes)
+        if self._ledger is not None:
+            self._ledger.append(
+                LedgerRecord.from_response(operation_name, response, metadata or {})
+            )
 
     def record_failure(
         self,
@@ -123,6 +173,9 @@ class AITelemetry:
         model: str | None,
         error: AIError,
         latency_ms: int | None = None,
+        request_id: str | None = None,
+        attempt_count: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
     ) -> None:
         """Record failure metrics for a request or attempt.
 
@@ -132,6 +185,9 @@ class AITelemetry:
             model: Optional model associated with the failure.
             error: Normalized SDK exception raised by the operation.
             latency_ms: Optional latency captured before the failure.
+            request_id: Optional SDK request id, used by the ledger.
+            attempt_count: Optional number of attempts made, used by the ledger.
+            metadata: Metadata of the originating request, used by the ledger.
 
         Returns:
             None.
@@ -145,6 +201,19 @@ class AITelemetry:
         self._failure_counter.add(1, attributes)
         if latency_ms is not None:
             self._latency_histogram.record(latency_ms, attributes)
+        if self._ledger is not None:
+            self._ledger.append(
+                LedgerRecord.from_error(
+                    operation_name,
+                    provider=provider,
+                    model=model,
+                    error=error,
+                    latency_ms=latency_ms,
+                    request_id=request_id,
+                    attempt_count=attempt_count,
+                    metadata=metadata or {},
+                )
+            )
 
     def enrich_success_span(self, span: Any, response: AIResponse) -> None:
         """Attach normalized response metadata to an open span.
@@ -210,6 +279,265 @@ class AITelemetry:
 
         span.add_event("ai.prompt.preview", {"preview": self._sanitize_content(prompt_preview)})
 
+    def start_stream_timer(self, *, model: ResolvedModel, attempt: int) -> StreamAttemptTimer:
+        """Start latency bookkeeping for one streaming attempt.
+
+        Args:
+            model: Resolved provider/model pair selected by the router.
+            attempt: One-based execution attempt index.
+
+        Returns:
+            A timer that must be fed every visible delta and finished once.
+        """
+        return StreamAttemptTimer(
+            self, provider=model.provider, model=model.model_id, attempt=attempt
+        )
+
+    def record_time_to_first_chunk(
+        self,
+        span: Any,
+        *,
+        operation_name: str,
+        model: ResolvedModel,
+        latency_ms: float,
+    ) -> None:
+        """Record when the first binary chunk of a streamed artifact became available.
+
+        Args:
+            span: Active request span to enrich.
+            operation_name: Logical SDK operation name such as ``audio.stream``.
+            model: Resolved provider/model pair selected by the router.
+            latency_ms: Elapsed time since the request started.
+
+        Returns:
+            None.
+        """
+        self._first_chunk_histogram.record(
+            latency_ms,
+            {
+                "operation_name": operation_name,
+                "provider": model.provider,
+                "model": model.model_id,
+            },
+        )
+        span.set_attribute("ai.stream.time_to_first_chunk_ms", round(latency_ms, 3))
+
+    def record_semantic_cache_lookup(
+        self,
+        *,
+        provider: str,
+        model: str,
+        result: str,
+        similarity: float | None = None,
+    ) -> None:
+        """Record the outcome of one semantic cache lookup.
+
+        Args:
+            provider: Provider named by the request.
+            model: Model named by the request.
+            result: ``hit``, ``miss``, or ``bypass``.
+            similarity: Best similarity score found, when any entry was compared.
+
+        Returns:
+            None.
+        """
+        attributes = {"provider": provider, "model": model, "result": result}
+        self._semantic_cache_counter.add(1, attributes)
+        if similarity is not None:
+            self._semantic_cache_similarity.record(similarity, attributes)
+
+    def record_semantic_cache_false_positive(self) -> None:
+        """Count one cached answer that was judged wrong.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        self._semantic_cache_false_positives.add(1)
+
+    def record_compaction(
+        self,
+        *,
+        provider: str,
+        model: str,
+        strategy: str,
+        outcome: str,
+        original_tokens: int,
+        compacted_tokens: int,
+    ) -> None:
+        """Record one conversation compaction decision.
+
+        Args:
+            provider: Provider named by the request.
+            model: Model named by the request.
+            strategy: Configured compaction strategy.
+            outcome: ``skipped``, ``over_budget``, ``windowed``, ``summary_reused``,
+                or ``summarized``.
+            original_tokens: Estimated prompt tokens before compaction.
+            compacted_tokens: Estimated prompt tokens after compaction.
+
+        Returns:
+            None.
+        """
+        attributes = {
+            "provider": provider,
+            "model": model,
+            "strategy": strategy,
+            "outcome": outcome,
+        }
+        self._compaction_counter.add(1, attributes)
+        if outcome != "skipped":
+            self._compaction_saved_tokens.record(original_tokens - compacted_tokens, attributes)
+
+    def record_scheduler_wait(
+        self, *, provider: str, tenant: str, priority: str, wait_ms: float
+    ) -> None:
+        """Record how long one call waited for a provider slot.
+
+        Args:
+            provider: Provider whose scheduler admitted the call.
+            tenant: Tenant the call is billed to.
+            priority: Priority class of the call.
+            wait_ms: Time spent queued, ``0`` when a slot was free.
+
+        Returns:
+            None.
+        """
+        self._scheduler_wait_histogram.record(
+            wait_ms, {"provider": provider, "tenant": tenant, "priority": priority}
+        )
+
+    def record_scheduler_shed(
+        self, *, provider: str, tenant: str, priority: str, reason: str
+    ) -> None:
+        """Count one call rejected by a provider scheduler.
+
+        Args:
+            provider: Provider whose scheduler shed the call.
+            tenant: Tenant the call is billed to.
+            priority: Priority class of the call.
+            reason: ``tenant_queue_full``, ``queue_full``, ``evicted``, or ``wait_timeout``.
+
+        Returns:
+            None.
+        """
+        self._scheduler_shed_counter.add(
+            1, {"provider": provider, "tenant": tenant, "priority": priority, "reason": reason}
+        )
+
+    def record_idempotent_replay(self, *, operation_name: str, provider: str, model: str) -> None:
+        """Count one call answered from the idempotency store instead of a provider.
+
+        Args:
+            operation_name: Logical SDK operation name such as ``text.generate``.
+            provider: Provider named by the request.
+            model: Model named by the request.
+
+        Returns:
+            None.
+        """
+        self._idempotent_replay_counter.add(
+            1, {"operation": operation_name, "provider": provider, "model": model}
+        )
+
+    def record_time_to_first_delta(
+        self, *, provider: str, model: str, attempt: int, latency_ms: float
+    ) -> None:
+        """Record how long a streaming attempt took to produce its first text delta.
+
+        Args:
+            provider: Provider name used by the route.
+            model: Concrete provider model id.
+            attempt: One-based execution attempt index.
+            latency_ms: Time from the attempt start to the first delta.
+
+        Returns:
+            None.
+        """
+        self._ttft_histogram.record(
+            latency_ms, {"provider": provider, "model": model, "attempt": attempt}
+        )
+        self._stream_stats_for(provider, model).ttft_ms.add(latency_ms)
+
+    def record_inter_delta_gap(
+        self, *, provider: str, model: str, attempt: int, gap_ms: float
+    ) -> None:
+        """Record the pause between two consecutive text deltas of one attempt.
+
+        Args:
+            provider: Provider name used by the route.
+            model: Concrete provider model id.
+            attempt: One-based execution attempt index.
+            gap_ms: Time since the previous delta.
+
+        Returns:
+            None.
+        """
+        self._inter_delta_histogram.record(
+            gap_ms, {"provider": provider, "model": model, "attempt": attempt}
+        )
+        self._stream_stats_for(provider, model).inter_delta_ms.add(gap_ms)
+
+    def record_output_tokens_per_second(
+        self, *, provider: str, model: str, attempt: int, tokens_per_second: float
+    ) -> None:
+        """Record the generation throughput of one completed streaming attempt.
+
+        Args:
+            provider: Provider name used by the route.
+            model: Concrete provider model id.
+            attempt: One-based execution attempt index.
+            tokens_per_second: Output tokens divided by the time after the first delta.
+
+        Returns:
+            None.
+        """
+        self._tokens_per_second_histogram.record(
+            tokens_per_second, {"provider": provider, "model": model, "attempt": attempt}
+        )
+        self._stream_stats_for(provider, model).output_tokens_per_second.add(tokens_per_second)
+
+    def stream_latency_percentiles(
+        self, *, provider: str, model: str
+    ) -> dict[str, dict[str, float]]:
+        """Return rolling streaming latency percentiles for one provider model.
+
+        Args:
+            provider: Provider name used by the route.
+            model: Concrete provider model id.
+
+        Returns:
+            Percentile snapshots keyed by ``ttft_ms``, ``inter_delta_ms``, and
+            ``output_tokens_per_second``; empty when the model has not streamed yet.
+        """
+        stats = self._stream_stats.get((provider, model))
+        if stats is None:
+            return {}
+        return {
+            "ttft_ms": stats.ttft_ms.snapshot(),
+            "inter_delta_ms": stats.inter_delta_ms.snapshot(),
+            "output_tokens_per_second": stats.output_tokens_per_second.snapshot(),
+        }
+
+    def _stream_stats_for(self, provider: str, model: str) -> StreamLatencyStats:
+        """Return the rolling stream statistics bucket for one provider model.
+
+        Args:
+            provider: Provider name used by the route.
+            model: Concrete provider model id.
+
+        Returns:
+            The existing or newly created statistics bucket.
+        """
+        key = (provider, model)
+        stats = self._stream_stats.get(key)
+        if stats is None:
+            stats = StreamLatencyStats(self._settings.stream_stats_window)
+            self._stream_stats[key] = stats
+        return stats
+
     def _record_usage(self, usage: AIUsage, attributes: dict[str, Any]) -> None:
         """Emit token metrics when usage information is available.
 
@@ -233,3 +561,124 @@ class AITelemetry:
             The truncated preview string.
         """
         return content[: self._settings.content_preview_chars]
+
+
+class StreamLatencyStats:
+    """Hold rolling streaming latency windows for one provider model."""
+
+    __slots__ = ("ttft_ms", "inter_delta_ms", "output_tokens_per_second")
+
+    def __init__(self, window_size: int) -> None:
+        """Create empty rolling windows.
+
+        Args:
+            window_size: Maximum number of recent samples kept per window.
+
+        Returns:
+            None.
+        """
+        self.ttft_ms = RollingPercentiles(window_size)
+        self.inter_delta_ms = RollingPercentiles(window_size)
+        self.output_tokens_per_second = RollingPercentiles(window_size)
+
+
+class StreamAttemptTimer:
+    """Measure time-to-first-delta, inter-delta gaps, and throughput for one attempt."""
+
+    def __init__(self, telemetry: AITelemetry, *, provider: str, model: str, attempt: int) -> None:
+        """Start the attempt clock.
+
+        Args:
+            telemetry: Telemetry helper that owns the instruments.
+            provider: Provider name used by the route.
+            model: Concrete provider model id.
+            attempt: One-based execution attempt index.
+
+        Returns:
+            None.
+        """
+        self._telemetry = telemetry
+        self._provider = provider
+        self._model = model
+        self._attempt = attempt
+        self._started_at = perf_counter()
+        self._first_delta_at: float | None = None
+        self._last_delta_at: float | None = None
+        self._delta_count = 0
+        self._max_gap_ms = 0.0
+        self._gap_window = RollingPercentiles(window_size=4096)
+
+    def restart(self) -> None:
+        """Reset the attempt clock, for example once a provider slot was acquired.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        self._started_at = perf_counter()
+
+    def on_delta(self) -> None:
+        """Record the arrival of one text delta.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        now = perf_counter()
+        self._delta_count += 1
+        if self._first_delta_at is None:
+            self._first_delta_at = now
+            self._telemetry.record_time_to_first_delta(
+                provider=self._provider,
+                model=self._model,
+                attempt=self._attempt,
+                latency_ms=(now - self._started_at) * 1000,
+            )
+        else:
+            gap_ms = (now - self._last_delta_at) * 1000  # type: ignore[operator]
+            self._telemetry.record_inter_delta_gap(
+                provider=self._provider, model=self._model, attempt=self._attempt, gap_ms=gap_ms
+            )
+            self._gap_window.add(gap_ms)
+            self._max_gap_ms = max(self._max_gap_ms, gap_ms)
+        self._last_delta_at = now
+
+    def finish(self, span: Any, usage: AIUsage | None = None) -> None:
+        """Record throughput and attach the attempt measurements to a span.
+
+        Args:
+            span: Active attempt span to enrich.
+            usage: Final usage when the attempt completed successfully.
+
+        Returns:
+            None.
+        """
+        span.set_attribute("ai.stream.delta_count", self._delta_count)
+        if self._first_delta_at is None:
+            return
+
+        span.set_attribute(
+            "ai.stream.ttft_ms", round((self._first_delta_at - self._started_at) * 1000, 3)
+        )
+        gaps = self._gap_window.snapshot((0.5, 0.99))
+        if gaps:
+            span.set_attribute("ai.stream.inter_delta_p50_ms", round(gaps["p50"], 3))
+            span.set_attribute("ai.stream.inter_delta_p99_ms", round(gaps["p99"], 3))
+            span.set_attribute("ai.stream.inter_delta_max_ms", round(self._max_gap_ms, 3))
+
+        generation_seconds = perf_counter() - self._first_delta_at
+        if usage is None or usage.output_tokens <= 0 or generation_seconds <= 0:
+            return
+
+        tokens_per_second = usage.output_tokens / generation_seconds
+        self._telemetry.record_output_tokens_per_second(
+            provider=self._provider,
+            model=self._model,
+            attempt=self._attempt,
+            tokens_per_second=tokens_per_second,
+        )
+        span.set_attribute("ai.stream.output_tokens_per_second", round(tokens_per_second, 3))
@@ -0,0 +1,330 @@
+"""Per-route timeouts learned from observed provider latency.
+
+A single static timeout is too lenient for fast chat models and too tight for
+slow image generation. :class:`AdaptiveTimeouts` keeps a rolling latency window
+per ``(provider, model, capability)`` and derives each route's timeout as a high
+percentile times a safety multiplier, clamped between a floor and a ceiling.
+Routes with too few samples keep their configured timeout. Windows can be
+persisted to Redis so a restart does not fall back to the static defaults.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+
+from app.core import log
+
+from .latency import RollingPercentiles
+
+TimeoutKey = tuple[str, str, str]
+
+# Recomputing the percentile sorts the whole window, so it is refreshed only after
+# this many new samples instead of on every request.
+_RECOMPUTE_EVERY = 8
+
+
+@dataclass(slots=True)
+class LearnedTimeout:
+    """Describe the learned timeout of one route for inspection."""
+
+    provider: str
+    model: str
+    capability: str
+    samples: int
+    percentile_ms: float | None
+    timeout_ms: int | None
+
+
+class LatencyStore:
+    """Keep latency windows in process memory only."""
+
+    async def load(self) -> dict[TimeoutKey, list[float]]:
+        """Load persisted latency windows.
+
+        Args:
+            None.
+
+        Returns:
+            Samples keyed by route; always empty for the in-memory store.
+        """
+        return {}
+
+    async def save(self, windows: dict[TimeoutKey, list[float]]) -> None:
+        """Persist changed latency windows.
+
+        Args:
+            windows: Samples keyed by route.
+
+        Returns:
+            None.
+        """
+        return None
+
+
+class RedisLatencyStore(LatencyStore):
+    """Persist latency windows in one Redis hash shared by all workers."""
+
+    def __init__(
+        self, redis: Redis, *, key: str = "ello:ai:timeouts", ttl_s: int = 7 * 86_400
+    ) -> None:
+        """Bind the store to a Redis client.
+
+        Args:
+            redis: Async Redis client created with ``decode_responses=True``.
+            key: Hash key holding one field per route.
+            ttl_s: Lifetime of the hash after its last write.
+
+        Returns:
+            None.
+        """
+        self._redis = redis
+        self._key = key
+        self._ttl_s = ttl_s
+
+    async def load(self) -> dict[TimeoutKey, list[float]]:
+        """Read every persisted route window.
+
+        Args:
+            None.
+
+        Returns:
+            Samples keyed by route.
+        """
+        fields = await self._redis.hgetall(self._key)
+        windows: dict[TimeoutKey, list[float]] = {}
+        for field, payload in fields.items():
+            provider, model, capability = json.loads(field)
+            windows[(provider, model, capability)] = [float(value) for value in json.loads(payload)]
+        return windows
+
+    async def save(self, windows: dict[TimeoutKey, list[float]]) -> None:
+        """Overwrite the persisted windows of the given routes.
+
+        Args:
+            windows: Samples keyed by route.
+
+        Returns:
+            None.
+        """
+        if not windows:
+            return
+        mapping = {
+            json.dumps(list(key)): json.dumps([round(value, 1) for value in samples])
+            for key, samples in windows.items()
+        }
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(self._key, mapping=mapping)
+            pipe.expire(self._key, self._ttl_s)
+            await pipe.execute()
+
+
+class AdaptiveTimeouts:
+    """Learn per-route timeouts from recent attempt latency."""
+
+    def __init__(
+        self,
+        *,
+        quantile: float = 0.99,
+        multiplier: float = 2.0,
+        floor_ms: int = 1_000,
+        ceiling_ms: int = 300_000,
+        min_samples: int = 20,
+        window_size: int = 512,
+        store: LatencyStore | None = None,
+        persist_interval_s: float = 30.0,
+    ) -> None:
+        """Configure the estimator.
+
+        Args:
+            quantile: Latency percentile the timeout is based on, in ``[0, 1]``.
+            multiplier: Safety factor applied to that percentile.
+            floor_ms: Smallest timeout ever derived.
+            ceiling_ms: Largest timeout ever derived.
+            min_samples: Samples a route needs before its timeout is learned.
+            window_size: Recent samples kept per route.
+            store: Persistence backend; defaults to memory only.
+            persist_interval_s: Seconds between background saves; ``0`` saves only on close.
+
+        Returns:
+            None.
+        """
+        self._quantile = quantile
+        self._multiplier = multiplier
+        self._floor_ms = floor_ms
+        self._ceiling_ms = max(ceiling_ms, floor_ms)
+        self._min_samples = max(min_samples, 1)
+        self._window_size = window_size
+        self._store = store or LatencyStore()
+        self._persist_interval_s = persist_interval_s
+        self._windows: dict[TimeoutKey, RollingPercentiles] = {}
+        self._learned: dict[TimeoutKey, tuple[float, int]] = {}
+        self._pending: dict[TimeoutKey, int] = {}
+        self._dirty: set[TimeoutKey] = set()
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Restore persisted windows and start background persistence.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        try:
+            restored = await self._store.load()
+        except Exception as exc:
+            log.warning(f"Could not restore learned AI timeouts: {exc!r}")
+            restored = {}
+        for key, samples in restored.items():
+            window = self._window(key)
+            window.extend(samples)
+            self._pending[key] = _RECOMPUTE_EVERY
+        if restored:
+            log.info(f"Restored learned AI timeouts for {len(restored)} routes")
+        if self._persist_interval_s > 0 and self._task is None:
+            self._task = asyncio.create_task(self._persist_loop())
+
+    async def aclose(self) -> None:
+        """Stop background persistence and save pending changes.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    def observe(self, provider: str, model: str, capability: str, latency_ms: float) -> None:
+        """Record the latency of one attempt.
+
+        Args:
+            provider: Provider name.
+            model: Provider model id.
+            capability: Capability value such as ``text_generation``.
+            latency_ms: Attempt latency; for timed-out attempts, the time waited.
+
+        Returns:
+            None.
+        """
+        key = (provider, model, capability)
+        self._window(key).add(latency_ms)
+        self._pending[key] = self._pending.get(key, 0) + 1
+        self._dirty.add(key)
+
+    def timeout_ms(self, provider: str, model: str, capability: str, default_ms: int) -> int:
+        """Return the effective timeout of a route.
+
+        Args:
+            provider: Provider name.
+            model: Provider model id.
+            capability: Capability value such as ``text_generation``.
+            default_ms: Configured timeout used until enough samples exist.
+
+        Returns:
+            The learned timeout, or ``default_ms`` for routes still warming up.
+        """
+        learned = self._refresh((provider, model, capability))
+        return learned[1] if learned is not None else default_ms
+
+    def snapshot(self) -> list[LearnedTimeout]:
+        """Describe every route with observed latency.
+
+        Args:
+            None.
+
+        Returns:
+            One entry per route, sorted by provider, model, and capability.
+        """
+        entries = []
+        for key in sorted(self._windows):
+            learned = self._refresh(key)
+            entries.append(
+                LearnedTimeout(
+                    provider=key[0],
+                    model=key[1],
+                    capability=key[2],
+                    samples=len(self._windows[key]),
+                    percentile_ms=learned[0] if learned is not None else None,
+                    timeout_ms=learned[1] if learned is not None else None,
+                )
+            )
+        return entries
+
+    async def flush(self) -> None:
+        """Persist the windows that changed since the last save.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if not self._dirty:
+            return
+        keys, self._dirty = self._dirty, set()
+        windows = {key: self._windows[key].samples() for key in keys}
+        try:
+            await self._store.save(windows)
+        except Exception as exc:
+            log.warning(f"Could not persist learned AI timeouts: {exc!r}")
+            self._dirty |= keys
+
+    def _window(self, key: TimeoutKey) -> RollingPercentiles:
+        """Return the latency window of a route, creating it on first use.
+
+        Args:
+            key: Route key.
+
+        Returns:
+            The route's rolling window.
+        """
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = RollingPercentiles(self._window_size)
+        return window
+
+    def _refresh(self, key: TimeoutKey) -> tuple[float, int] | None:
+        """Recompute a route's learned timeout when enough new samples arrived.
+
+        Args:
+            key: Route key.
+
+        Returns:
+            ``(percentile_ms, timeout_ms)``, or ``None`` below ``min_samples``.
+        """
+        window = self._windows.get(key)
+        if window is None or len(window) < self._min_samples:
+            return None
+        learned = self._learned.get(key)
+        if learned is None or self._pending.get(key, 0) >= _RECOMPUTE_EVERY:
+            percentile = window.percentile(self._quantile) or 0.0
+            timeout = int(percentile * self._multiplier)
+            learned = (percentile, min(max(timeout, self._floor_ms), self._ceiling_ms))
+            self._learned[key] = learned
+            self._pending[key] = 0
+        return learned
+
+    async def _persist_loop(self) -> None:
+        """Save changed windows on an interval until cancelled.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        while True:
+            await asyncio.sleep(self._persist_interval_s)
+            await self.flush()
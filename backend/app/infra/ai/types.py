@@ -49,6 +49,14 @@ class ArtifactKind(StrEnum):
     URL = "url"
 
 
+class ToolCall(ApiModel):
+    """Represent one function call requested by a model, in provider-neutral form."""
+
+    id: str
+    name: str
+    arguments: dict[str, Any] = Field(default_factory=dict)
+
+
 class AIUsage(ApiModel):
     """Represent token usage in a provider-agnostic format."""
 
@@ -93,6 +101,7 @@ class Artifact(ApiModel):
     path: str | None = None
     url: str | None = None
     filename: str | None = None
+    index: int | None = None
 
     @model_validator(mode="after")
     def validate_payload(self) -> Artifact:
@@ -132,6 +141,28 @@ class AttemptRecord(ApiModel):
     provider_request_id: str | None = None
 
 
+@dataclass(slots=True, frozen=True)
+class ModelPricing:
+    """Store per-million-token list prices for one model."""
+
+    input_per_million_usd: float = 0.0
+    output_per_million_usd: float = 0.0
+
+    def estimate_usd(self, usage: AIUsage) -> float:
+        """Estimate the cost of one call from its token usage.
+
+        Args:
+            usage: Normalized token usage reported by the provider.
+
+        Returns:
+            The estimated cost in US dollars.
+        """
+        return (
+            usage.input_tokens * self.input_per_million_usd
+            + usage.output_tokens * self.output_per_million_usd
+        ) / 1_000_000
+
+
 @dataclass(slots=True, frozen=True)
 class ModelSpec:
     """Describe one routable model entry inside the registry."""
@@ -146,6 +177,11 @@ class ModelSpec:
     supports_json: bool = False
     supports_vision: bool = False
     provider_options: dict[str, Any] = field(default_factory=dict)
+    aliases: tuple[str, ...] = ()
+    context_window: int | None = None
+    max_output_tokens: int | None = None
+    pricing: ModelPricing | None = None
+    default_params: dict[str, Any] = field(default_factory=dict)
 
     def supports(self, capability: AICapability) -> bool:
         """Return whether the model advertises the requested capability.
@@ -0,0 +1,205 @@
+"""Upload large multimodal inputs once and reference them by provider file id.
+
+Inlining an image as base64 re-sends megabytes on every turn of a conversation
+that keeps it in history. :class:`UploadCache` pushes media parts of at least
+``min_bytes`` to the provider's file API the first time they are seen and
+remembers the returned reference by provider and content hash. Later requests
+then carry only the reference. References live in process memory and, when
+Redis is configured, in Redis so every worker shares them. Both expire after
+``ttl_s``, which must stay below the provider's own file retention.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import mimetypes
+from collections.abc import Awaitable, Callable, Collection
+from time import monotonic
+
+from redis.asyncio import Redis
+
+from app.core import log
+
+from .requests import MediaPart, TextGenerateRequest
+
+Upload = Callable[[MediaPart], Awaitable[str]]
+
+
+def upload_filename(part: MediaPart) -> str:
+    """Name an uploaded part after its filename or its content hash.
+
+    Args:
+        part: Media part with inline data.
+
+    Returns:
+        The file name sent with the upload.
+    """
+    filename = getattr(part, "filename", None)
+    if filename:
+        return filename
+    extension = mimetypes.guess_extension(part.mime_type) or ""
+    return f"{part.type}-{part.digest[:16]}{extension}"
+
+
+class UploadCache:
+    """Cache provider file references keyed by provider and content hash."""
+
+    def __init__(
+        self,
+        redis: Redis | None = None,
+        *,
+        key_prefix: str = "ello:ai:upload",
+        ttl_s: int = 86_400,
+        min_bytes: int = 256 * 1024,
+        max_local_entries: int = 4096,
+    ) -> None:
+        """Configure the cache.
+
+        Args:
+            redis: Optional async Redis client created with ``decode_responses=True``.
+            key_prefix: Prefix of the Redis keys.
+            ttl_s: Seconds a file reference is reused before uploading again.
+            min_bytes: Smallest inline payload worth uploading.
+            max_local_entries: References kept in process memory.
+
+        Returns:
+            None.
+        """
+        self._redis = redis
+        self._key_prefix = key_prefix
+        self._ttl_s = ttl_s
+        self._min_bytes = min_bytes
+        self._max_local_entries = max_local_entries
+        self._local: dict[str, tuple[str, float]] = {}
+        self._in_flight: dict[str, asyncio.Future[str | None]] = {}
+
+    async def references(
+        self,
+        request: TextGenerateRequest,
+        *,
+        provider: str,
+        upload: Upload,
+        kinds: Collection[str] = ("image", "file"),
+    ) -> dict[str, str]:
+        """Upload the request's large media parts that are not cached yet.
+
+        Args:
+            request: Text request whose messages may carry media parts.
+            provider: Provider name; file ids are only valid on the account that uploaded them.
+            upload: Adapter callback that uploads one part and returns its reference.
+            kinds: Part types the provider can reference by id.
+
+        Returns:
+            File references keyed by part digest; parts missing here stay inline.
+        """
+        parts = {
+            part.digest: part
+            for message in request.messages
+            for part in message.media
+            if part.type in kinds and part.data is not None and len(part.data) >= self._min_bytes
+        }
+        if not parts:
+            return {}
+        references = await asyncio.gather(
+            *(self._reference(provider, part, upload) for part in parts.values())
+        )
+        return dict(zip(parts, references, strict=True))
+
+    async def _reference(self, provider: str, part: MediaPart, upload: Upload) -> str:
+        """Return the cached reference of one part, uploading it on a miss.
+
+        Args:
+            provider: Provider name.
+            part: Media part with inline data.
+            upload: Adapter upload callback.
+
+        Returns:
+            The provider file reference.
+        """
+        key = f"{self._key_prefix}:{provider}:{part.digest}"
+        while True:
+            cached = self._local.get(key)
+            if cached is not None and cached[1] > monotonic():
+                return cached[0]
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+            # A failed upload resolves to ``None`` so its waiters try on their own.
+            reference = await asyncio.shield(in_flight)
+            if reference is not None:
+                return reference
+
+        future: asyncio.Future[str | None] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            stored = await self._load(key)
+            if stored is None:
+                reference, ttl_s = await upload(part), self._ttl_s
+                await self._save(key, reference)
+            else:
+                reference, ttl_s = stored
+        except BaseException:
+            del self._in_flight[key]
+            future.set_result(None)
+            raise
+        self._remember(key, reference, ttl_s)
+        del self._in_flight[key]
+        future.set_result(reference)
+        return reference
+
+    async def _load(self, key: str) -> tuple[str, float] | None:
+        """Read a reference another worker stored.
+
+        Args:
+            key: Redis key of the part.
+
+        Returns:
+            The reference and its remaining seconds, or ``None`` when absent or
+            Redis is unavailable.
+        """
+        if self._redis is None:
+            return None
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                reference, ttl_s = await pipe.get(key).ttl(key).execute()
+        except Exception as exc:
+            log.warning(f"Upload cache unavailable, uploading again: {exc!r}")
+            return None
+        if reference is None or ttl_s <= 0:
+            return None
+        return reference, float(ttl_s)
+
+    async def _save(self, key: str, reference: str) -> None:
+        """Share a fresh reference with other workers.
+
+        Args:
+            key: Redis key of the part.
+            reference: Provider file reference.
+
+        Returns:
+            None.
+        """
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(key, reference, ex=self._ttl_s)
+        except Exception as exc:
+            log.warning(f"Could not store upload reference for {key}: {exc!r}")
+
+    def _remember(self, key: str, reference: str, ttl_s: float) -> None:
+        """Keep a reference in process memory until it expires.
+
+        Args:
+            key: Cache key of the part.
+            reference: Provider file reference.
+            ttl_s: Seconds the reference stays valid.
+
+        Returns:
+            None.
+        """
+        if len(self._local) >= self._max_local_entries and key not in self._local:
+            now = monotonic()
+            self._local = {k: v for k, v in self._local.items() if v[1] > now}
+            if len(self._local) >= self._max_local_entries:
+                self._local.pop(next(iter(self._local)))
+        self._local[key] = (reference, monotonic() + ttl_s)
@@ -0,0 +1,469 @@
+"""Provider connection pre-warming and in-process DNS caching.
+
+A fresh worker otherwise pays DNS, TCP, and TLS setup on its first request to
+every provider. :class:`ConnectionWarmer` opens a few pooled connections per
+configured provider at startup and keeps them from idling out with periodic
+``HEAD`` pings. :class:`DNSCache` is plugged into the adapters' connection pools
+through :func:`build_provider_transport`, so reconnects use cached addresses and
+expired entries are refreshed in the background instead of on the request path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ipaddress
+import socket
+import urllib.request
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+
+import httpcore
+import httpx
+
+from app.core import log
+
+ResolveFunction = Callable[[str, int], Awaitable[list[str]]]
+
+
+async def _getaddrinfo(host: str, port: int) -> list[str]:
+    """Resolve a host with the event loop's resolver.
+
+    Args:
+        host: Hostname to resolve.
+        port: Destination port, used to pick stream-capable addresses.
+
+    Returns:
+        Unique IP addresses in resolver order.
+    """
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return list(dict.fromkeys(str(info[4][0]) for info in infos))
+
+
+@dataclass(slots=True)
+class _DNSEntry:
+    """Cache the addresses of one host until ``expires_at``."""
+
+    addresses: list[str]
+    expires_at: float
+
+
+class DNSCache:
+    """Cache resolved addresses per host with a TTL and stale-while-refresh reads.
+
+    The first lookup of a host waits for the resolver; concurrent first lookups
+    share one query. Once a host is cached, lookups never wait: expired entries
+    are still returned while one background task refreshes them, and a failed
+    refresh keeps the previous addresses.
+    """
+
+    def __init__(self, *, ttl_s: float = 300.0, resolve: ResolveFunction | None = None) -> None:
+        """Configure the cache.
+
+        Args:
+            ttl_s: Seconds an entry is served before it is refreshed.
+            resolve: Resolver coroutine; defaults to ``loop.getaddrinfo``.
+
+        Returns:
+            None.
+        """
+        self._ttl_s = ttl_s
+        self._resolve = resolve or _getaddrinfo
+        self._entries: dict[tuple[str, int], _DNSEntry] = {}
+        self._inflight: dict[tuple[str, int], asyncio.Task[list[str]]] = {}
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        """Return addresses for a host, resolving only on a cold miss.
+
+        Args:
+            host: Hostname or IP literal.
+            port: Destination port.
+
+        Returns:
+            IP addresses to try in order.
+        """
+        with contextlib.suppress(ValueError):
+            ipaddress.ip_address(host)
+            return [host]
+
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry is None:
+            return await asyncio.shield(self._lookup(key))
+        if entry.expires_at <= monotonic():
+            self._lookup(key)
+        return entry.addresses
+
+    async def refresh(self) -> None:
+        """Re-resolve every cached host that has expired.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        now = monotonic()
+        tasks = [
+            self._lookup(key) for key, entry in self._entries.items() if entry.expires_at <= now
+        ]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _lookup(self, key: tuple[str, int]) -> asyncio.Task[list[str]]:
+        """Start or join the resolver query for one host.
+
+        Args:
+            key: ``(host, port)`` pair.
+
+        Returns:
+            The task that stores and returns the fresh addresses.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._query(key))
+            self._inflight[key] = task
+        return task
+
+    async def _query(self, key: tuple[str, int]) -> list[str]:
+        """Run one resolver query and store its result.
+
+        Args:
+            key: ``(host, port)`` pair.
+
+        Returns:
+            The resolved addresses.
+        """
+        try:
+            addresses = await self._resolve(*key)
+            if not addresses:
+                raise OSError(f"No addresses found for {key[0]}")
+        except OSError as exc:
+            if key in self._entries:
+                log.warning(f"Keeping cached addresses for {key[0]}: {exc}")
+                return self._entries[key].addresses
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self._entries[key] = _DNSEntry(addresses=addresses, expires_at=monotonic() + self._ttl_s)
+        return addresses
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """Open TCP connections to addresses from a :class:`DNSCache`.
+
+    Only address lookup changes. TLS still verifies and sends SNI for the original
+    hostname because httpcore takes ``server_hostname`` from the request origin.
+    """
+
+    def __init__(
+        self, dns_cache: DNSCache, backend: httpcore.AsyncNetworkBackend | None = None
+    ) -> None:
+        """Wrap a network backend.
+
+        Args:
+            dns_cache: Shared DNS cache.
+            backend: Backend that opens sockets; defaults to httpcore's AnyIO backend.
+
+        Returns:
+            None.
+        """
+        self._dns_cache = dns_cache
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable[Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """Connect to the first reachable cached address of ``host``.
+
+        Args:
+            host: Hostname from the request URL.
+            port: Destination port.
+            timeout: Connect timeout in seconds.
+            local_address: Optional local bind address.
+            socket_options: Optional socket options.
+
+        Returns:
+            The connected network stream.
+        """
+        try:
+            addresses = await self._dns_cache.resolve(host, port)
+        except OSError as exc:
+            raise httpcore.ConnectError(f"Could not resolve {host}: {exc}") from exc
+
+        error: Exception | None = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                error = exc
+        assert error is not None
+        raise error
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Iterable[Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """Delegate Unix socket connections unchanged.
+
+        Args:
+            path: Socket path.
+            timeout: Connect timeout in seconds.
+            socket_options: Optional socket options.
+
+        Returns:
+            The connected network stream.
+        """
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        """Delegate sleeping to the wrapped backend.
+
+        Args:
+            seconds: Sleep duration.
+
+        Returns:
+            None.
+        """
+        await self._backend.sleep(seconds)
+
+
+class _ProviderTransport(httpx.AsyncHTTPTransport):
+    """HTTPX transport whose connection pool resolves hosts through a DNS cache.
+
+    HTTPX ignores proxy environment variables once a client is given a custom
+    transport, so this transport applies them itself when ``trust_env`` is set:
+    requests to hosts not excluded by ``NO_PROXY`` go through the configured
+    ``HTTP_PROXY``/``HTTPS_PROXY``/``ALL_PROXY``, whose pools resolve names on the
+    proxy side. ``SSL_CERT_FILE`` and ``SSL_CERT_DIR`` are honoured the same way
+    HTTPX honours them.
+    """
+
+    def __init__(self, dns_cache: DNSCache, *, limits: httpx.Limits, trust_env: bool) -> None:
+        """Build the transport.
+
+        Args:
+            dns_cache: Shared DNS cache.
+            limits: Connection pool limits.
+            trust_env: Whether proxy and CA bundle environment variables apply.
+
+        Returns:
+            None.
+        """
+        # HTTPX does not expose httpcore's ``network_backend`` option, so the direct
+        # pool is built here, with the settings ``AsyncHTTPTransport`` would use plus
+        # the caching backend, instead of through ``super().__init__``.
+        self._ssl_context = httpx.create_ssl_context(trust_env=trust_env)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=self._ssl_context,
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=CachingNetworkBackend(dns_cache),
+        )
+        proxies = urllib.request.getproxies() if trust_env else {}
+        self._proxies: dict[str, httpx.AsyncHTTPTransport] = {}
+        for scheme in ("http", "https"):
+            url = proxies.get(scheme) or proxies.get("all")
+            if url:
+                self._proxies[scheme] = httpx.AsyncHTTPTransport(
+                    verify=self._ssl_context, limits=limits, proxy=url
+                )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request directly or through the proxy configured for its host.
+
+        Args:
+            request: Outgoing request.
+
+        Returns:
+            The provider response.
+        """
+        proxy = self._proxies.get(request.url.scheme)
+        if proxy is not None and not urllib.request.proxy_bypass(request.url.host):
+            return await proxy.handle_async_request(request)
+        return await super().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the direct pool and every proxy pool.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        await super().aclose()
+        for proxy in self._proxies.values():
+            await proxy.aclose()
+
+
+def build_provider_transport(
+    dns_cache: DNSCache,
+    *,
+    keepalive_expiry_s: float = 120.0,
+    max_keepalive_connections: int = 20,
+    max_connections: int = 100,
+    trust_env: bool = True,
+) -> httpx.AsyncBaseTransport:
+    """Create an adapter transport with cached DNS and long-lived idle connections.
+
+    Args:
+        dns_cache: Shared DNS cache.
+        keepalive_expiry_s: Seconds an idle pooled connection is kept; must exceed
+            the warmer's ping interval.
+        max_keepalive_connections: Idle connections kept per pool.
+        max_connections: Total connections allowed per pool.
+        trust_env: Whether proxy and CA bundle environment variables apply.
+
+    Returns:
+        An HTTPX transport for ``httpx.AsyncClient(transport=...)``.
+    """
+    return _ProviderTransport(
+        dns_cache,
+        trust_env=trust_env,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_s,
+        ),
+    )
+
+
+@dataclass(slots=True)
+class WarmupTarget:
+    """Name one provider endpoint and the adapter client that should reach it."""
+
+    provider: str
+    base_url: str
+    http_client: httpx.AsyncClient
+
+
+class ConnectionWarmer:
+    """Pre-open pooled provider connections and keep them warm with idle pings."""
+
+    def __init__(
+        self,
+        targets: list[WarmupTarget],
+        *,
+        connections_per_provider: int = 2,
+        ping_interval_s: float = 30.0,
+        timeout_s: float = 5.0,
+        dns_cache: DNSCache | None = None,
+    ) -> None:
+        """Configure the warmer.
+
+        Args:
+            targets: Provider endpoints to warm.
+            connections_per_provider: Connections opened and kept per provider.
+            ping_interval_s: Seconds between keep-alive rounds; ``0`` disables them.
+            timeout_s: Timeout of one warm-up request.
+            dns_cache: DNS cache refreshed before each keep-alive round.
+
+        Returns:
+            None.
+        """
+        self._targets = targets
+        self._connections = max(connections_per_provider, 1)
+        self._ping_interval_s = ping_interval_s
+        self._timeout_s = timeout_s
+        self._dns_cache = dns_cache
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Warm every target once and start the keep-alive loop.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        warmed = await self.warm()
+        log.info(f"Pre-warmed AI provider connections: {warmed}")
+        if self._ping_interval_s > 0 and self._task is None:
+            self._task = asyncio.create_task(self._keep_alive())
+
+    async def stop(self) -> None:
+        """Stop the keep-alive loop.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def warm(self) -> dict[str, int]:
+        """Send concurrent ``HEAD`` requests so each provider pool holds open connections.
+
+        Concurrent requests cannot share a connection, so ``connections_per_provider``
+        parallel requests leave that many idle connections in the pool. Any HTTP
+        status counts as success; only the handshake matters.
+
+        Args:
+            None.
+
+        Returns:
+            Reachable connections per provider.
+        """
+        counts = await asyncio.gather(*(self._warm_target(target) for target in self._targets))
+        return {target.provider: count for target, count in zip(self._targets, counts, strict=True)}
+
+    async def _warm_target(self, target: WarmupTarget) -> int:
+        """Open or refresh the pooled connections of one provider.
+
+        Args:
+            target: Provider endpoint.
+
+        Returns:
+            Number of requests that reached the provider.
+        """
+        results = await asyncio.gather(
+            *(
+                target.http_client.head(target.base_url, timeout=self._timeout_s)
+                for _ in range(self._connections)
+            ),
+            return_exceptions=True,
+        )
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            log.warning(f"AI connection warm-up to {target.provider} failed: {failures[0]!r}")
+        return len(results) - len(failures)
+
+    async def _keep_alive(self) -> None:
+        """Refresh DNS and ping every target until cancelled.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        while True:
+            await asyncio.sleep(self._ping_interval_s)
+            if self._dns_cache is not None:
+                await self._dns_cache.refresh()
+            await self.warm()
@@ -0,0 +1,15 @@
+from .agent import ToolAgent, ToolRunResult
+from .exceptions import ToolLoopLimitError
+from .executor import ToolExecutor, ToolResult
+from .registry import Tool, ToolHandler, ToolRegistry
+
+__all__ = [
+    "Tool",
+    "ToolAgent",
+    "ToolExecutor",
+    "ToolHandler",
+    "ToolLoopLimitError",
+    "ToolRegistry",
+    "ToolResult",
+    "ToolRunResult",
+]
@@ -0,0 +1,109 @@
+"""Tool-calling loop on top of the AI client."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from app.infra.ai.client import AIClient
+from app.infra.ai.requests import TextGenerateRequest, TextMessage
+from app.infra.ai.responses import TextGenerateResponse
+
+from .exceptions import ToolLoopLimitError
+from .executor import ToolExecutor, ToolResult
+from .registry import ToolRegistry
+
+
+@dataclass(slots=True)
+class ToolRunResult:
+    """Return the final answer together with the transcript that produced it."""
+
+    response: TextGenerateResponse
+    messages: list[TextMessage]
+    turns: int
+    tool_results: list[ToolResult] = field(default_factory=list)
+
+
+class ToolAgent:
+    """Alternate model turns and tool execution until the model answers in text.
+
+    Every model turn that requests tools is appended to the transcript as one
+    assistant message. All of its calls run concurrently through the
+    :class:`ToolExecutor`, and their results go back to the model in a single
+    follow-up request. Adapters map OpenAI ``tool_calls``, Anthropic ``tool_use``
+    blocks, and Gemini ``functionCall`` parts to the same :class:`ToolCall` shape,
+    so the loop is provider-neutral.
+    """
+
+    def __init__(
+        self,
+        client: AIClient,
+        registry: ToolRegistry,
+        *,
+        executor: ToolExecutor | None = None,
+        max_turns: int = 8,
+    ) -> None:
+        """Configure the loop.
+
+        Args:
+            client: Async AI client used for model turns.
+            registry: Tools offered to the model.
+            executor: Executor that runs tool calls; built from ``registry`` when omitted.
+            max_turns: Most model turns before the loop gives up.
+
+        Returns:
+            None.
+        """
+        self._client = client
+        self._registry = registry
+        self._executor = executor or ToolExecutor(registry)
+        self._max_turns = max(max_turns, 1)
+
+    @property
+    def executor(self) -> ToolExecutor:
+        """Expose the executor for latency stats.
+
+        Args:
+            None.
+
+        Returns:
+            The tool executor.
+        """
+        return self._executor
+
+    async def run(self, request: TextGenerateRequest) -> ToolRunResult:
+        """Run the conversation until the model stops calling tools.
+
+        Each model turn is a different call, so an ``idempotency_key`` on the
+        request is suffixed with the turn number before it is sent.
+
+        Args:
+            request: Initial request; ``tools`` defaults to every registered tool.
+
+        Returns:
+            The final response, the full transcript, and every tool result.
+        """
+        tools = request.tools if request.tools is not None else self._registry.definitions()
+        messages = list(request.messages)
+        results: list[ToolResult] = []
+        for turn in range(1, self._max_turns + 1):
+            update = {"messages": messages, "tools": tools}
+            if request.idempotency_key is not None:
+                update["idempotency_key"] = f"{request.idempotency_key}:{turn}"
+            response = await self._client.text.generate(request.model_copy(update=update))
+            if not response.tool_calls:
+                return ToolRunResult(
+                    response=response, messages=messages, turns=turn, tool_results=results
+                )
+
+            messages.append(
+                TextMessage(role="assistant", content=response.text, tool_calls=response.tool_calls)
+            )
+            turn_results = await self._executor.execute(response.tool_calls)
+            results.extend(turn_results)
+            messages.extend(result.to_message() for result in turn_results)
+
+        raise ToolLoopLimitError(
+            f"Model still requested tools after {self._max_turns} turns",
+            provider=request.provider,
+            model=request.model,
+        )
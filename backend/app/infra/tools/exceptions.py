@@ -0,0 +1,11 @@
+"""Errors raised by tool-calling loops."""
+
+from __future__ import annotations
+
+from app.infra.ai.exceptions import AIError
+
+
+class ToolLoopLimitError(AIError):
+    """Raise when a model keeps requesting tools past the turn limit."""
+
+    default_code = "AI_TOOL_LOOP_LIMIT"
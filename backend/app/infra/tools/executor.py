@@ -0,0 +1,262 @@
+"""Concurrent execution of the tool calls from one model turn."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from opentelemetry import metrics, trace
+
+from app.core import log
+from app.infra.ai.latency import RollingPercentiles
+from app.infra.ai.requests import TextMessage
+from app.infra.ai.types import ToolCall
+
+from .registry import Tool, ToolRegistry
+
+
+@dataclass(slots=True)
+class ToolResult:
+    """Carry the outcome of one tool call back to the model."""
+
+    call: ToolCall
+    content: str
+    is_error: bool = False
+    latency_ms: float = 0.0
+
+    def to_message(self) -> TextMessage:
+        """Wrap the result as the ``tool`` message that answers its call.
+
+        Args:
+            None.
+
+        Returns:
+            A tool message referencing the originating call.
+        """
+        return TextMessage(
+            role="tool", content=self.content, tool_call_id=self.call.id, name=self.call.name
+        )
+
+
+class ToolExecutor:
+    """Run independent tool calls concurrently with timeouts and concurrency caps.
+
+    Calls from one model turn start together. Each call is bounded by its tool's
+    ``timeout_s`` (or the executor default) and waits for a slot in the tool's own
+    ``max_concurrency`` before taking one of the executor-wide slots, so calls
+    queued behind a capped tool do not hold global slots other tools could use.
+    Failures, unknown tools, and timeouts become error results the model can react
+    to instead of aborting the whole turn. Execution time and queue wait are
+    recorded per tool as ``tool.execution.latency.ms`` and
+    ``tool.execution.queue_wait.ms``, and :meth:`latency_snapshot` ranks tools by
+    recent tail latency.
+
+    Synchronous handlers run on a dedicated pool with one thread per global slot.
+    A thread cannot be interrupted, so a timed-out synchronous handler keeps its
+    pool thread until it returns. The pool size bounds how many such threads can
+    pile up, and later synchronous calls wait for a free thread within their own
+    timeout.
+    """
+
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        *,
+        default_timeout_s: float = 30.0,
+        max_concurrency: int = 16,
+        stats_window: int = 512,
+    ) -> None:
+        """Bind the executor to a registry.
+
+        Args:
+            registry: Tools that may be called.
+            default_timeout_s: Per-call timeout for tools without their own.
+            max_concurrency: Most tool calls running at once across all tools.
+            stats_window: Recent latency samples kept per tool.
+
+        Returns:
+            None.
+        """
+        self._registry = registry
+        self._default_timeout_s = default_timeout_s
+        self._slots = asyncio.Semaphore(max(max_concurrency, 1))
+        self._threads = ThreadPoolExecutor(
+            max_workers=max(max_concurrency, 1), thread_name_prefix="tool"
+        )
+        self._tool_slots: dict[str, asyncio.Semaphore] = {}
+        self._stats_window = stats_window
+        self._latency: dict[str, RollingPercentiles] = {}
+        self._tracer = trace.get_tracer("app.infra.tools")
+        meter = metrics.get_meter("app.infra.tools")
+        self._call_counter = meter.create_counter("tool.execution.count")
+        self._latency_histogram = meter.create_histogram("tool.execution.latency.ms")
+        self._queue_histogram = meter.create_histogram("tool.execution.queue_wait.ms")
+
+    async def execute(self, calls: Sequence[ToolCall]) -> list[ToolResult]:
+        """Run every call of one model turn concurrently.
+
+        Args:
+            calls: Tool calls requested by the model.
+
+        Returns:
+            One result per call, in the order the model requested them.
+        """
+        return list(await asyncio.gather(*(self._run(call) for call in calls)))
+
+    def latency_snapshot(self) -> dict[str, dict[str, float]]:
+        """Report recent execution latency per tool, slowest first.
+
+        Args:
+            None.
+
+        Returns:
+            ``p50``/``p90``/``p99`` milliseconds keyed by tool name, ordered by ``p90``.
+        """
+        snapshot = {name: window.snapshot() for name, window in self._latency.items() if window}
+        return dict(sorted(snapshot.items(), key=lambda item: item[1]["p90"], reverse=True))
+
+    async def _run(self, call: ToolCall) -> ToolResult:
+        """Run one call inside its concurrency slots and timeout.
+
+        Args:
+            call: Tool call requested by the model.
+
+        Returns:
+            The call's result, or an error result describing what went wrong.
+        """
+        tool = self._registry.get(call.name)
+        if tool is None:
+            return self._finish(call, f"Unknown tool {call.name!r}", "unknown", 0.0)
+
+        queued_at = perf_counter()
+        async with self._tool_slot(tool), self._slots:
+            queue_ms = (perf_counter() - queued_at) * 1000
+            self._queue_histogram.record(queue_ms, {"tool": tool.name})
+            timeout_s = tool.timeout_s if tool.timeout_s is not None else self._default_timeout_s
+            with self._tracer.start_as_current_span("tool.execute") as span:
+                span.set_attribute("tool.name", tool.name)
+                span.set_attribute("tool.call_id", call.id)
+                span.set_attribute("tool.queue_wait_ms", round(queue_ms, 3))
+                started_at = perf_counter()
+                try:
+                    async with asyncio.timeout(timeout_s):
+                        value = await self._invoke(tool, call.arguments)
+                except TimeoutError:
+                    outcome, content = "timeout", f"Tool {tool.name!r} timed out after {timeout_s}s"
+                except Exception as exc:
+                    log.warning(f"Tool {tool.name} failed: {exc!r}")
+                    outcome, content = "error", f"Tool {tool.name!r} failed: {exc}"
+                else:
+                    outcome, content = "ok", _serialize(value)
+                latency_ms = (perf_counter() - started_at) * 1000
+                span.set_attribute("tool.outcome", outcome)
+        return self._finish(call, content, outcome, latency_ms)
+
+    def _tool_slot(self, tool: Tool) -> asyncio.Semaphore | _NoLimit:
+        """Return the per-tool concurrency gate.
+
+        Args:
+            tool: Tool about to run.
+
+        Returns:
+            A semaphore sized to ``tool.max_concurrency``, or a no-op gate.
+        """
+        if tool.max_concurrency is None:
+            return _NO_LIMIT
+        slot = self._tool_slots.get(tool.name)
+        if slot is None:
+            slot = self._tool_slots[tool.name] = asyncio.Semaphore(max(tool.max_concurrency, 1))
+        return slot
+
+    async def _invoke(self, tool: Tool, arguments: dict[str, Any]) -> Any:
+        """Call the handler, off the event loop when it is synchronous.
+
+        Args:
+            tool: Tool to call.
+            arguments: Keyword arguments chosen by the model.
+
+        Returns:
+            The handler's return value.
+        """
+        if inspect.iscoroutinefunction(tool.handler):
+            return await tool.handler(**arguments)
+        call = functools.partial(tool.handler, **arguments)
+        result = await asyncio.get_running_loop().run_in_executor(
+            self._threads, contextvars.copy_context().run, call
+        )
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    def _finish(self, call: ToolCall, content: str, outcome: str, latency_ms: float) -> ToolResult:
+        """Record metrics for one finished call and build its result.
+
+        Args:
+            call: Tool call requested by the model.
+            content: Serialized result or error description.
+            outcome: ``ok``, ``error``, ``timeout``, or ``unknown``.
+            latency_ms: Handler execution time.
+
+        Returns:
+            The tool result.
+        """
+        attributes = {"tool": call.name, "outcome": outcome}
+        self._call_counter.add(1, attributes)
+        if outcome != "unknown":
+            self._latency_histogram.record(latency_ms, attributes)
+            window = self._latency.get(call.name)
+            if window is None:
+                window = self._latency[call.name] = RollingPercentiles(self._stats_window)
+            window.add(latency_ms)
+        return ToolResult(
+            call=call, content=content, is_error=outcome != "ok", latency_ms=latency_ms
+        )
+
+
+class _NoLimit:
+    """Stand in for a semaphore when a tool has no concurrency cap."""
+
+    async def __aenter__(self) -> None:
+        """Enter without waiting.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Exit without releasing anything.
+
+        Args:
+            exc_info: Exception details, ignored.
+
+        Returns:
+            None.
+        """
+
+
+_NO_LIMIT = _NoLimit()
+
+
+def _serialize(value: Any) -> str:
+    """Render a tool's return value as text for the model.
+
+    Args:
+        value: Handler return value.
+
+    Returns:
+        Strings unchanged, everything else as compact JSON.
+    """
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
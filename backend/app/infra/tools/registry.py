@@ -0,0 +1,155 @@
+"""Tool registry shared by agent loops."""
+
+from __future__ import annotations
+
+import inspect
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.infra.ai.requests import ToolDefinition
+
+ToolHandler = Callable[..., Awaitable[Any] | Any]
+
+
+@dataclass(slots=True)
+class Tool:
+    """Bind a model-facing tool definition to the code that runs it.
+
+    The handler receives the model's arguments as keyword arguments. Coroutine
+    functions run on the event loop; plain functions run in a worker thread so
+    blocking I/O does not stall other tool calls.
+    """
+
+    name: str
+    handler: ToolHandler
+    description: str = ""
+    parameters: dict[str, Any] = field(default_factory=lambda: {"type": "object", "properties": {}})
+    timeout_s: float | None = None
+    max_concurrency: int | None = None
+
+    def definition(self) -> ToolDefinition:
+        """Describe the tool to the model.
+
+        Args:
+            None.
+
+        Returns:
+            The provider-neutral tool definition.
+        """
+        return ToolDefinition(
+            name=self.name, description=self.description, parameters=self.parameters
+        )
+
+
+class ToolRegistry:
+    """Hold the tools an agent may call, keyed by name."""
+
+    def __init__(self) -> None:
+        """Create an empty registry.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        self._tools: dict[str, Tool] = {}
+
+    def __contains__(self, name: object) -> bool:
+        """Return whether a tool is registered.
+
+        Args:
+            name: Tool name.
+
+        Returns:
+            ``True`` when a tool with that name exists.
+        """
+        return name in self._tools
+
+    def __len__(self) -> int:
+        """Return the number of registered tools.
+
+        Args:
+            None.
+
+        Returns:
+            The tool count.
+        """
+        return len(self._tools)
+
+    def register(self, tool: Tool) -> Tool:
+        """Add one tool.
+
+        Args:
+            tool: Tool to register.
+
+        Returns:
+            The registered tool.
+        """
+        if tool.name in self._tools:
+            raise ValueError(f"Tool {tool.name!r} is already registered")
+        # Validate the name and schema the same way requests will.
+        tool.definition()
+        self._tools[tool.name] = tool
+        return tool
+
+    def tool(
+        self,
+        *,
+        name: str | None = None,
+        description: str | None = None,
+        parameters: dict[str, Any] | None = None,
+        timeout_s: float | None = None,
+        max_concurrency: int | None = None,
+    ) -> Callable[[ToolHandler], ToolHandler]:
+        """Register a function as a tool with a decorator.
+
+        Args:
+            name: Tool name; defaults to the function name.
+            description: Model-facing description; defaults to the docstring summary.
+            parameters: JSON Schema of the keyword arguments.
+            timeout_s: Per-call timeout overriding the executor default.
+            max_concurrency: Most calls of this tool allowed to run at once.
+
+        Returns:
+            A decorator that registers the function and returns it unchanged.
+        """
+
+        def decorator(handler: ToolHandler) -> ToolHandler:
+            doc = inspect.getdoc(handler) or ""
+            tool = Tool(
+                name=name or handler.__name__,
+                handler=handler,
+                description=description if description is not None else doc.split("\n\n")[0],
+                timeout_s=timeout_s,
+                max_concurrency=max_concurrency,
+            )
+            if parameters is not None:
+                tool.parameters = parameters
+            self.register(tool)
+            return handler
+
+        return decorator
+
+    def get(self, name: str) -> Tool | None:
+        """Look up a tool by name.
+
+        Args:
+            name: Tool name requested by the model.
+
+        Returns:
+            The tool, or ``None`` when it is not registered.
+        """
+        return self._tools.get(name)
+
+    def definitions(self) -> list[ToolDefinition]:
+        """Describe every registered tool to the model.
+
+        Args:
+            None.
+
+        Returns:
+            Tool definitions in registration order.
+        """
+        return [tool.definition() for tool in self._tools.values()]
@@ -23,8 +23,9 @@ from app.core import (
 from app.core.database import engine
 from app.core.observability import init_observability
 from app.core.redis import close_redis, redis_client
-from app.infra.ai.client import close_ai_client
-from app.modules import iam_router
+from app.infra.ai.broker import close_stream_broker
+from app.infra.ai.client import close_ai_client, start_ai_client
+from app.modules import ai_router, iam_router
 
 STATIC_DIR = Path(__file__).resolve().parent / "static"
 
@@ -75,8 +76,10 @@ async def lifespan(_app: FastAPI):
     log.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     log.info(f"Debug mode: {settings.DEBUG}")
     await _bootstrap_iam_state()
+    await start_ai_client()
     yield
     log.info("Shutting down application...")
+    await close_stream_broker()
     await close_ai_client()
     await close_redis()
     await engine.dispose()
@@ -136,6 +139,7 @@ app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
 app.include_router(iam_router)
+app.include_router(ai_router)
 
 
 def main():
@@ -1,5 +1,7 @@
+from .ai import ai_router
 from .iam import iam_router
 
 __all__ = [
+    "ai_router",
     "iam_router",
 ]
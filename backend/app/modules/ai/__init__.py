@@ -0,0 +1,39 @@
+"""AI module public interface."""
+
+from .errors import AiErrorCode
+from .multiplex import MULTIPLEX_PROTOCOL, StreamMultiplexer, encode_multiplex_frame
+from .router import router as ai_router
+from .schemas import (
+    ChatStreamRequest,
+    LearnedTimeoutResponse,
+    StreamCancelMessage,
+    StreamClientMessage,
+    StreamCreditMessage,
+    StreamStartMessage,
+)
+from .streaming import (
+    SSE_HEADERS,
+    brokered_event_frames,
+    event_stream_response,
+    relay_sse,
+    sdk_event_frames,
+)
+
+__all__ = [
+    "AiErrorCode",
+    "ChatStreamRequest",
+    "LearnedTimeoutResponse",
+    "MULTIPLEX_PROTOCOL",
+    "SSE_HEADERS",
+    "StreamCancelMessage",
+    "StreamClientMessage",
+    "StreamCreditMessage",
+    "StreamMultiplexer",
+    "StreamStartMessage",
+    "brokered_event_frames",
+    "encode_multiplex_frame",
+    "event_stream_response",
+    "relay_sse",
+    "sdk_event_frames",
+    "ai_router",
+]
@@ -0,0 +1,25 @@
+from enum import Enum, unique
+
+
+@unique
+class AiErrorCode(Enum):
+    """AI module business error code enum."""
+
+    STREAM_NOT_FOUND = ("B0301", "Generation stream not found or expired")
+    STREAM_RESUME_DISABLED = ("B0302", "Resumable generation streams are disabled")
+    ADAPTIVE_TIMEOUTS_DISABLED = ("B0303", "Adaptive timeouts are disabled")
+    STREAM_MESSAGE_INVALID = ("B0304", "Invalid stream message")
+    STREAM_ID_IN_USE = ("B0305", "Stream id is already in use on this connection")
+    STREAM_LIMIT_REACHED = ("B0306", "Too many concurrent streams on this connection")
+
+    def __init__(self, error_code: str, error_msg: str) -> None:
+        self._error_code = error_code
+        self._error_msg = error_msg
+
+    @property
+    def error_code(self) -> str:
+        return self._error_code
+
+    @property
+    def error_msg(self) -> str:
+        return self._error_msg
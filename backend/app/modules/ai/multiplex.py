@@ -0,0 +1,272 @@
+"""Multiplex many chat generations over one WebSocket connection.
+
+A dashboard that watches dozens of generations would otherwise need one HTTP
+stream each and run into browser connection limits. Over one WebSocket, the
+client sends JSON control messages (``start``, ``cancel``, ``credit``) that name
+a stream with a client-chosen id, and the server sends one frame per SDK stream
+event tagged with that id.
+
+Flow control is per stream: a stream may send ``initial_credit`` frames, after
+which it stops reading from the SDK stream until the client grants more with a
+``credit`` message. A slow consumer of one stream therefore throttles that
+generation, and coalescing merges its deltas meanwhile, without holding back the
+other streams or growing server memory. ``cancel`` and a closed connection close
+the SDK stream, which cancels the provider call.
+
+Frames are JSON text by default. With ``?encoding=binary`` they are binary:
+``[id length: u8][id][event length: u8][event][payload JSON]``, which spares
+clients from parsing an envelope around every delta. Lengths count UTF-8 bytes,
+and stream ids are limited to 64 bytes so they always fit the prefix.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import struct
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Literal
+
+from fastapi import WebSocket
+from pydantic import TypeAdapter, ValidationError
+
+from app.core import Result
+from app.infra.ai.exceptions import AIError
+from app.infra.ai.stream import AnyAIStreamEvent
+
+from .errors import AiErrorCode
+from .schemas import (
+    ChatStreamRequest,
+    StreamCancelMessage,
+    StreamClientMessage,
+    StreamCreditMessage,
+    StreamStartMessage,
+)
+
+FrameEncoding = Literal["json", "binary"]
+
+MULTIPLEX_PROTOCOL = "ello.ai.v1"
+
+_CLIENT_MESSAGE: TypeAdapter[StreamClientMessage] = TypeAdapter(StreamClientMessage)
+_U8 = struct.Struct("!B")
+
+
+def encode_multiplex_frame(
+    stream_id: str | None, event: str, payload: bytes, *, encoding: FrameEncoding
+) -> str | bytes:
+    """Wrap one event payload in a frame tagged with its stream id.
+
+    Args:
+        stream_id: Client-chosen stream id, or ``None`` for connection-level frames.
+        event: Event name such as ``delta`` or ``done``.
+        payload: Serialized JSON payload, embedded without re-encoding.
+        encoding: ``json`` for text frames or ``binary`` for length-prefixed frames.
+
+    Returns:
+        A text frame for ``json`` or a bytes frame for ``binary``.
+    """
+    if encoding == "binary":
+        raw_id = (stream_id or "").encode()
+        raw_event = event.encode()
+        if len(raw_id) > 255 or len(raw_event) > 255:
+            raise ValueError("Binary frame ids and event names must fit in 255 UTF-8 bytes")
+        return b"".join(
+            (_U8.pack(len(raw_id)), raw_id, _U8.pack(len(raw_event)), raw_event, payload)
+        )
+    return f'{{"id":{json.dumps(stream_id)},"event":"{event}","data":{payload.decode()}}}'
+
+
+@dataclass(slots=True)
+class _Stream:
+    """Track one generation running on the connection."""
+
+    credit: int
+    task: asyncio.Task[None] | None = None
+    credit_granted: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class StreamMultiplexer:
+    """Serve many chat generations over one accepted WebSocket."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        open_stream: Callable[[ChatStreamRequest], AsyncIterator[AnyAIStreamEvent]],
+        *,
+        encoding: FrameEncoding = "json",
+        max_streams: int = 32,
+        initial_credit: int = 64,
+    ) -> None:
+        """Bind the multiplexer to a connection.
+
+        Args:
+            websocket: Accepted WebSocket connection.
+            open_stream: Opens the SDK stream for one ``start`` message.
+            encoding: Frame encoding chosen by the client.
+            max_streams: Generations allowed to run at once on the connection.
+            initial_credit: Frames a stream may send before it needs more credit.
+
+        Returns:
+            None.
+        """
+        self._websocket = websocket
+        self._open_stream = open_stream
+        self._encoding: FrameEncoding = encoding
+        self._max_streams = max_streams
+        self._initial_credit = initial_credit
+        self._streams: dict[str, _Stream] = {}
+        # Credit bounds what each stream can queue, so the outbox needs no bound.
+        self._outbox: asyncio.Queue[str | bytes] = asyncio.Queue()
+        self._closed = False
+
+    async def serve(self) -> None:
+        """Handle client messages until the connection closes.
+
+        Client messages must be text frames; a binary frame is answered with a
+        ``rejected`` frame like any other invalid message.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        writer = asyncio.create_task(self._write())
+        try:
+            while True:
+                message = await self._websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                if message.get("text") is None:
+                    self._reject(None, AiErrorCode.STREAM_MESSAGE_INVALID)
+                    continue
+                self._handle(message["text"])
+        finally:
+            self._closed = True
+            tasks = [stream.task for stream in self._streams.values() if stream.task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            writer.cancel()
+            with contextlib.suppress(Exception, asyncio.CancelledError):
+                await writer
+
+    def _handle(self, raw: str) -> None:
+        """Apply one client message.
+
+        Args:
+            raw: JSON text of the message.
+
+        Returns:
+            None.
+        """
+        try:
+            message = _CLIENT_MESSAGE.validate_json(raw)
+        except ValidationError:
+            self._reject(None, AiErrorCode.STREAM_MESSAGE_INVALID)
+            return
+
+        if isinstance(message, StreamStartMessage):
+            if message.id in self._streams:
+                self._reject(message.id, AiErrorCode.STREAM_ID_IN_USE)
+                return
+            if len(self._streams) >= self._max_streams:
+                self._reject(message.id, AiErrorCode.STREAM_LIMIT_REACHED)
+                return
+            stream = _Stream(credit=self._initial_credit)
+            self._streams[message.id] = stream
+            stream.task = asyncio.create_task(self._pump(message.id, stream, message.request))
+        elif isinstance(message, StreamCancelMessage):
+            stream = self._streams.get(message.id)
+            if stream is not None and stream.task is not None:
+                stream.task.cancel()
+        elif isinstance(message, StreamCreditMessage):
+            stream = self._streams.get(message.id)
+            if stream is not None:
+                stream.credit += message.frames
+                stream.credit_granted.set()
+
+    async def _pump(self, stream_id: str, stream: _Stream, request: ChatStreamRequest) -> None:
+        """Forward one SDK stream to the connection within its credit.
+
+        Args:
+            stream_id: Client-chosen stream id.
+            stream: Flow-control state of the stream.
+            request: Chat request from the ``start`` message.
+
+        Returns:
+            None.
+        """
+        try:
+            async with aclosing(self._open_stream(request)) as events:
+                async for event in events:
+                    while stream.credit <= 0:
+                        stream.credit_granted.clear()
+                        await stream.credit_granted.wait()
+                    stream.credit -= 1
+                    self._send(
+                        stream_id,
+                        event.event,
+                        event.__pydantic_serializer__.to_json(event, by_alias=True),
+                    )
+        except AIError as exc:
+            # Failures raised before the SDK could emit a terminal event (for
+            # example an unknown model) still reach the client as an error frame.
+            payload = exc.to_payload()
+            self._send(
+                stream_id, "error", payload.__pydantic_serializer__.to_json(payload, by_alias=True)
+            )
+        except asyncio.CancelledError:
+            if not self._closed:
+                self._send(stream_id, "cancelled", b"null")
+        finally:
+            self._streams.pop(stream_id, None)
+
+    async def _write(self) -> None:
+        """Send queued frames in order; the socket's drain paces the writer.
+
+        Args:
+            None.
+
+        Returns:
+            None.
+        """
+        while True:
+            frame = await self._outbox.get()
+            if isinstance(frame, bytes):
+                await self._websocket.send_bytes(frame)
+            else:
+                await self._websocket.send_text(frame)
+
+    def _send(self, stream_id: str | None, event: str, payload: bytes) -> None:
+        """Queue one frame for the writer.
+
+        Args:
+            stream_id: Stream the frame belongs to, or ``None``.
+            event: Event name.
+            payload: Serialized JSON payload.
+
+        Returns:
+            None.
+        """
+        self._outbox.put_nowait(
+            encode_multiplex_frame(stream_id, event, payload, encoding=self._encoding)
+        )
+
+    def _reject(self, stream_id: str | None, code: AiErrorCode) -> None:
+        """Answer a message that could not be applied.
+
+        Args:
+            stream_id: Stream named by the message, if it could be read.
+            code: Business error explaining the rejection.
+
+        Returns:
+            None.
+        """
+        result = Result.fail(code.error_code, code.error_msg)
+        self._send(
+            stream_id, "rejected", result.__pydantic_serializer__.to_json(result, by_alias=True)
+        )
@@ -0,0 +1,259 @@
+"""AI router: streaming chat over Server-Sent Events and WebSocket, and AI runtime inspection."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Header, Query, Request, WebSocket, WebSocketException, status
+from fastapi.responses import StreamingResponse
+
+from app.core import (
+    AuthContext,
+    AuthException,
+    BusinessException,
+    CommonErrorCode,
+    CurrentAuthDep,
+    CurrentWsAuthDep,
+    Result,
+)
+from app.infra.ai.broker import StreamBrokerDep
+from app.infra.ai.client import AIClient, AIClientDep
+from app.infra.ai.coalesce import coalesce_text_deltas
+from app.infra.ai.requests import TextGenerateRequest
+from app.infra.ai.stream import AnyAIStreamEvent
+from app.modules.iam.consts import PermissionCode
+from app.modules.iam.queries import IamQueriesDep
+
+from .errors import AiErrorCode
+from .multiplex import MULTIPLEX_PROTOCOL, FrameEncoding, StreamMultiplexer
+from .schemas import ChatStreamRequest, LearnedTimeoutResponse
+from .streaming import brokered_event_frames, event_stream_response, sdk_event_frames
+
+router = APIRouter(prefix="/api/ai", tags=["AI"])
+
+GENERATION_ID_HEADER = "X-Generation-Id"
+
+
+def _stream_owner(auth) -> str:
+    """Build the owner tag that guards resumption of a generation.
+
+    Args:
+        auth: The authenticated request context.
+
+    Returns:
+        The owner tag for the current tenant and principal.
+    """
+    return f"{auth.tenant_id}:{auth.principal_id}"
+
+
+def _client_stream(
+    ai_client: AIClient, request: TextGenerateRequest
+) -> AsyncIterator[AnyAIStreamEvent]:
+    """Open an SDK text stream shaped for client-facing transports.
+
+    Args:
+        ai_client: The shared async AI client.
+        request: The SDK text generation request.
+
+    Returns:
+        SDK stream events, with small deltas merged when coalescing is enabled.
+    """
+    events = ai_client.text.stream(request)
+    coalesce = ai_client.settings.stream_coalesce
+    if not coalesce.enabled:
+        return events
+    return coalesce_text_deltas(
+        events,
+        max_delay_ms=coalesce.max_delay_ms,
+        max_chars=coalesce.max_chars,
+        max_chars_ceiling=coalesce.max_chars_ceiling,
+    )
+
+
+def _chat_request(body: ChatStreamRequest, auth: AuthContext) -> TextGenerateRequest:
+    """Build the SDK request for a chat stream started by the caller.
+
+    Args:
+        body: The validated chat request.
+        auth: The authenticated request context.
+
+    Returns:
+        The SDK text generation request tagged with the caller's identity.
+    """
+    return TextGenerateRequest(
+        provider=body.provider,
+        model=body.model,
+        messages=body.messages,
+        temperature=body.temperature,
+        max_tokens=body.max_tokens,
+        response_format=body.response_format,
+        metadata={
+            "tenant_id": auth.tenant_id,
+            "principal_id": auth.principal_id,
+            "priority": "interactive",
+        },
+    )
+
+
+@router.post("/chat/stream", response_class=StreamingResponse)
+async def stream_chat(
+    body: ChatStreamRequest,
+    request: Request,
+    auth: CurrentAuthDep,
+    ai_client: AIClientDep,
+    broker: StreamBrokerDep,
+):
+    """Stream a chat completion to the caller as Server-Sent Events.
+
+    Each SDK stream event is sent as one ``event: <name>`` frame with an ``id``.
+    Idle gaps carry ``: ping`` comments. Without the stream broker, a client
+    disconnect cancels the upstream provider stream. With it, the generation runs
+    to completion in the background and the ``X-Generation-Id`` response header
+    names the stream to resume.
+
+    Args:
+        body: The validated request body.
+        request: The incoming FastAPI request object.
+        auth: The authenticated request context.
+        ai_client: The shared async AI client.
+        broker: The shared stream broker, or ``None`` when disabled.
+
+    Returns:
+        A ``text/event-stream`` streaming response.
+    """
+    events = _client_stream(ai_client, _chat_request(body, auth))
+    heartbeat_s = ai_client.settings.stream_heartbeat_s
+    if broker is None:
+        return event_stream_response(
+            sdk_event_frames(events), request.receive, heartbeat_s=heartbeat_s
+        )
+
+    generation_id = await broker.publish(events, owner=_stream_owner(auth))
+    return event_stream_response(
+        brokered_event_frames(broker.subscribe(generation_id)),
+        request.receive,
+        heartbeat_s=heartbeat_s,
+        headers={GENERATION_ID_HEADER: generation_id},
+    )
+
+
+@router.websocket("/chat/ws")
+async def multiplex_chat(
+    websocket: WebSocket,
+    auth: CurrentWsAuthDep,
+    ai_client: AIClientDep,
+    encoding: FrameEncoding = "json",
+):
+    """Run many chat streams over one WebSocket connection.
+
+    The client sends ``start``, ``cancel``, and ``credit`` messages as JSON text;
+    every server frame carries the id of the stream it belongs to. See
+    :mod:`app.modules.ai.multiplex` for the protocol.
+
+    The client must offer the ``ello.ai.v1`` subprotocol, which the server echoes.
+    A browser that authenticates with a ``bearer.<token>`` subprotocol needs it,
+    because it rejects a handshake that echoes none of the offered protocols;
+    connections without it are closed with protocol-error code 1002.
+
+    Args:
+        websocket: The WebSocket connection.
+        auth: The authenticated connection context.
+        ai_client: The shared async AI client.
+        encoding: ``json`` for text frames or ``binary`` for length-prefixed frames.
+
+    Returns:
+        None.
+    """
+    if MULTIPLEX_PROTOCOL not in websocket.scope.get("subprotocols", []):
+        raise WebSocketException(
+            code=status.WS_1002_PROTOCOL_ERROR,
+            reason=f"The {MULTIPLEX_PROTOCOL} subprotocol is required",
+        )
+    await websocket.accept(subprotocol=MULTIPLEX_PROTOCOL)
+    settings = ai_client.settings.stream_multiplex
+    await StreamMultiplexer(
+        websocket,
+        lambda body: _client_stream(ai_client, _chat_request(body, auth)),
+        encoding=encoding,
+        max_streams=settings.max_streams_per_connection,
+        initial_credit=settings.initial_credit,
+    ).serve()
+
+
+@router.get("/chat/streams/{generation_id}", response_class=StreamingResponse)
+async def resume_chat_stream(
+    generation_id: str,
+    request: Request,
+    auth: CurrentAuthDep,
+    ai_client: AIClientDep,
+    broker: StreamBrokerDep,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+    cursor: str | None = Query(default=None, alias="lastEventId"),
+):
+    """Replay and follow a running or finished generation.
+
+    ``EventSource`` sends ``Last-Event-ID`` automatically when it reconnects; a
+    freshly loaded page can pass the last id it stored as ``?lastEventId=``.
+    Without either, the generation is replayed from the beginning.
+
+    Args:
+        generation_id: The generation identifier from ``X-Generation-Id``.
+        request: The incoming FastAPI request object.
+        auth: The authenticated request context.
+        ai_client: The shared async AI client.
+        broker: The shared stream broker, or ``None`` when disabled.
+        last_event_id: The ``Last-Event-ID`` request header.
+        cursor: The ``lastEventId`` query parameter.
+
+    Returns:
+        A ``text/event-stream`` streaming response.
+    """
+    if broker is None:
+        raise BusinessException(AiErrorCode.STREAM_RESUME_DISABLED)
+    # Unknown, expired, and foreign generations look the same to the caller.
+    if await broker.owner_of(generation_id) != _stream_owner(auth):
+        raise BusinessException(AiErrorCode.STREAM_NOT_FOUND)
+
+    return event_stream_response(
+        brokered_event_frames(
+            broker.subscribe(generation_id, last_event_id=last_event_id or cursor)
+        ),
+        request.receive,
+        heartbeat_s=ai_client.settings.stream_heartbeat_s,
+        headers={GENERATION_ID_HEADER: generation_id},
+    )
+
+
+@router.get("/admin/timeouts", response_model=Result[list[LearnedTimeoutResponse]])
+async def list_learned_timeouts(
+    auth: CurrentAuthDep,
+    queries: IamQueriesDep,
+    ai_client: AIClientDep,
+):
+    """List the timeouts learned per provider, model, and capability.
+
+    Routes below the configured sample minimum report ``null`` and still use their
+    provider's static timeout. The values are local to the worker serving the call.
+
+    Args:
+        auth: The authenticated request context.
+        queries: The IAM query service for read operations.
+        ai_client: The shared async AI client.
+
+    Returns:
+        The learned timeout of every route with observed latency.
+    """
+    codes = await queries.get_permission_codes(
+        auth.tenant_id, auth.principal_id, auth.authz_version
+    )
+    if PermissionCode.TENANT_MANAGE not in codes:
+        raise AuthException(CommonErrorCode.FORBIDDEN)
+    timeouts = ai_client.adaptive_timeouts
+    if timeouts is None:
+        raise BusinessException(AiErrorCode.ADAPTIVE_TIMEOUTS_DISABLED)
+    return Result.ok(
+        data=[
+            LearnedTimeoutResponse.model_validate(entry, from_attributes=True)
+            for entry in timeouts.snapshot()
+        ]
+    )
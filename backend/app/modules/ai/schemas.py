@@ -0,0 +1,80 @@
+"""AI module request and response schemas."""
+
+from __future__ import annotations
+
+from typing import Annotated, Literal
+
+from pydantic import AfterValidator, Field
+
+from app.core import ApiModel
+from app.infra.ai.requests import TextMessage
+
+MAX_STREAM_ID_BYTES = 64
+
+
+def _check_stream_id(value: str) -> str:
+    """Bound a stream id by its UTF-8 size, which binary frames prefix as one byte.
+
+    Args:
+        value: Client-chosen stream id.
+
+    Returns:
+        The unchanged id.
+    """
+    if len(value.encode()) > MAX_STREAM_ID_BYTES:
+        raise ValueError(f"Stream id must be at most {MAX_STREAM_ID_BYTES} bytes in UTF-8")
+    return value
+
+
+StreamId = Annotated[str, Field(min_length=1), AfterValidator(_check_stream_id)]
+
+
+class ChatStreamRequest(ApiModel):
+    """Request body for the streaming chat endpoint."""
+
+    provider: str = Field(min_length=1)
+    model: str = Field(min_length=1)
+    messages: list[TextMessage] = Field(min_length=1)
+    temperature: float | None = Field(default=None, ge=0, le=2)
+    max_tokens: int | None = Field(default=None, ge=1)
+    response_format: Literal["text", "json"] = "text"
+
+
+class StreamStartMessage(ApiModel):
+    """Start one chat generation on a multiplexed connection."""
+
+    type: Literal["start"]
+    id: StreamId
+    request: ChatStreamRequest
+
+
+class StreamCancelMessage(ApiModel):
+    """Cancel one running generation on a multiplexed connection."""
+
+    type: Literal["cancel"]
+    id: StreamId
+
+
+class StreamCreditMessage(ApiModel):
+    """Allow the server to send more frames of one generation."""
+
+    type: Literal["credit"]
+    id: StreamId
+    frames: int = Field(ge=1, le=10_000)
+
+
+StreamClientMessage = Annotated[
+    StreamStartMessage | StreamCancelMessage | StreamCreditMessage,
+    Field(discriminator="type"),
+]
+
+
+class LearnedTimeoutResponse(ApiModel):
+    """Learned timeout of one provider, model, and capability route."""
+
+    provider: str
+    model: str
+    capability: str
+    samples: int
+    percentile_ms: float | None = None
+    timeout_ms: int | None = None
@@ -0,0 +1,150 @@
+"""Relay SDK stream events to HTTP clients as Server-Sent Events."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from contextlib import aclosing
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+
+from app.infra.ai.adapters.sse import encode_sse_comment, encode_sse_event, encode_stream_event
+from app.infra.ai.broker import BrokeredEvent
+from app.infra.ai.exceptions import AIError
+from app.infra.ai.prefetch import Prefetcher
+from app.infra.ai.stream import AIStreamEvent
+
+# ``X-Accel-Buffering`` tells nginx not to buffer this response even when the
+# location has ``proxy_buffering on``; ``no-transform`` keeps gzip proxies from
+# holding chunks back.
+SSE_HEADERS: Mapping[str, str] = {
+    "Cache-Control": "no-cache, no-transform",
+    "X-Accel-Buffering": "no",
+    "Connection": "keep-alive",
+}
+
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+
+
+async def _wait_for_disconnect(receive: Receive) -> None:
+    """Block until the ASGI server reports that the client went away.
+
+    Args:
+        receive: ASGI receive callable of the current request.
+
+    Returns:
+        None.
+    """
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def sdk_event_frames(events: AsyncIterator[AIStreamEvent]) -> AsyncIterator[bytes]:
+    """Encode SDK stream events as SSE frames with sequential ids.
+
+    Args:
+        events: SDK stream events, typically ``ai_client.text.stream(...)``.
+
+    Returns:
+        An async iterator of SSE-encoded byte chunks.
+    """
+    sequence = 0
+    async with aclosing(events) as stream:
+        try:
+            async for event in stream:
+                sequence += 1
+                yield encode_stream_event(event, event_id=str(sequence))
+        except AIError as exc:
+            # Failures raised before the SDK could emit a terminal event (for
+            # example an unknown model) still reach the client as an SSE frame.
+            payload = exc.to_payload()
+            yield encode_sse_event(
+                "error", payload.__pydantic_serializer__.to_json(payload, by_alias=True)
+            )
+
+
+async def brokered_event_frames(events: AsyncIterator[BrokeredEvent]) -> AsyncIterator[bytes]:
+    """Encode broker events as SSE frames whose ids are Redis Stream entry ids.
+
+    Args:
+        events: Events from :meth:`StreamBroker.subscribe`.
+
+    Returns:
+        An async iterator of SSE-encoded byte chunks.
+    """
+    async with aclosing(events) as stream:
+        async for event in stream:
+            yield encode_sse_event(event.event, event.data, event_id=event.entry_id)
+
+
+async def relay_sse(
+    frames: AsyncIterator[bytes],
+    receive: Receive,
+    *,
+    heartbeat_s: float,
+) -> AsyncIterator[bytes]:
+    """Relay SSE frames with heartbeats and disconnect cancellation.
+
+    One task reads the frames and reads at most one frame ahead of the server,
+    whose ``send`` waits for the socket to drain, so a slow client throttles the
+    source instead of queueing tokens in memory. Reading from a single task keeps
+    the SDK's span scopes in one context. While waiting, a comment frame is written
+    every ``heartbeat_s`` so idle proxies keep the connection open. When the client
+    disconnects, the reading task is stopped, which closes a directly relayed
+    provider stream.
+
+    Args:
+        frames: SSE-encoded frames, from :func:`sdk_event_frames` or
+            :func:`brokered_event_frames`.
+        receive: ASGI receive callable used to observe client disconnects.
+        heartbeat_s: Idle interval between heartbeat comments.
+
+    Returns:
+        An async iterator of SSE-encoded byte chunks.
+    """
+    prefetcher = Prefetcher(frames)
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(receive))
+    # A disconnect ends the reader, which wakes the wait below with the end marker.
+    disconnect.add_done_callback(lambda _: prefetcher.stop())
+    try:
+        while True:
+            while not await prefetcher.wait(heartbeat_s):
+                yield encode_sse_comment("ping")
+            if disconnect.done():
+                return
+            try:
+                frame = prefetcher.get_nowait()
+            except StopAsyncIteration:
+                return
+            yield frame
+    finally:
+        disconnect.cancel()
+        await prefetcher.aclose()
+
+
+def event_stream_response(
+    frames: AsyncIterator[bytes],
+    receive: Receive,
+    *,
+    heartbeat_s: float,
+    headers: Mapping[str, str] | None = None,
+) -> StreamingResponse:
+    """Wrap SSE frames in a ``StreamingResponse``.
+
+    Args:
+        frames: SSE-encoded frames.
+        receive: ASGI receive callable of the current request.
+        heartbeat_s: Idle interval between heartbeat comments.
+        headers: Extra response headers.
+
+    Returns:
+        A ``text/event-stream`` response with proxy-safe headers.
+    """
+    return StreamingResponse(
+        relay_sse(frames, receive, heartbeat_s=heartbeat_s),
+        media_type="text/event-stream",
+        headers={**SSE_HEADERS, **(headers or {})},
+    )
@@ -0,0 +1,4 @@
+"""Offline micro-benchmarks for backend hot paths.
+
+Run modules from ``backend/``, for example ``python -m benchmarks.ai_client``.
+"""
@@ -0,0 +1,410 @@
+"""Measure AI SDK overhead per request and per streamed token.
+
+The suite drives ``AIClient`` against the in-process ``MockProviderAdapter`` with
+zero simulated latency, so every measured microsecond is spent in the SDK:
+request validation, routing, span and event construction, response
+finalization, and telemetry.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.ai_client --compare       # diff against the committed baseline
+    python -m benchmarks.ai_client --save          # refresh the committed baseline
+    python -m benchmarks.ai_client --only text.stream --iterations 500
+
+Compare mode exits non-zero when any scenario's CPU per operation regresses
+beyond ``--threshold`` so CI can gate on it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from time import perf_counter, process_time
+
+# Importing the SDK loads ``app.core`` settings; mirror the test defaults so the
+# benchmark runs without a configured environment.
+os.environ.setdefault("DEBUG", "true")
+os.environ.setdefault("OTEL_ENABLED", "false")
+
+from app.infra.ai.client import AIClient  # noqa: E402
+from app.infra.ai.config import AISettings  # noqa: E402
+from app.infra.ai.providers.mock import MockProfile, MockProviderAdapter  # noqa: E402
+from app.infra.ai.registry import ModelRegistry  # noqa: E402
+from app.infra.ai.requests import (  # noqa: E402
+    EmbeddingRequest,
+    TextGenerateRequest,
+    TextMessage,
+)
+from app.infra.ai.telemetry import AITelemetry  # noqa: E402
+from app.infra.ai.types import ProviderConfig  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "ai_client.json"
+
+Operation = Callable[[], Awaitable[int]]
+
+
+@dataclass(slots=True)
+class ScenarioResult:
+    """Store the measurements for one benchmark scenario."""
+
+    name: str
+    iterations: int
+    tokens_per_op: int
+    ops_per_sec: float
+    cpu_us_per_op: float
+    cpu_us_per_token: float | None
+    peak_alloc_bytes_per_op: int
+    retained_blocks_per_op: float
+
+
+def build_client(*, output_tokens: int, embedding_dimensions: int) -> AIClient:
+    """Wire an ``AIClient`` to a zero-latency mock provider.
+
+    Args:
+        output_tokens: Tokens produced by every simulated text call.
+        embedding_dimensions: Vector size returned by simulated embedding calls.
+
+    Returns:
+        A client whose only provider is ``mock``.
+    """
+    settings = AISettings()
+    registry = ModelRegistry(
+        providers=[
+            ProviderConfig(
+                name="mock",
+                api_key="mock",
+                base_url="mock://local",
+                timeout_ms=settings.default_timeout_ms,
+                max_retries=0,
+                backoff_base_ms=0,
+            )
+        ]
+    )
+    adapter = MockProviderAdapter(
+        MockProfile(output_tokens=output_tokens, embedding_dimensions=embedding_dimensions)
+    )
+    return AIClient(
+        registry=registry,
+        adapters={"mock": adapter},
+        telemetry=AITelemetry(settings),
+        settings=settings,
+    )
+
+
+def build_operations(client: AIClient, *, batch_size: int) -> dict[str, Operation]:
+    """Build the benchmark scenarios as zero-argument coroutines.
+
+    Each operation constructs its request inside the timed region so request
+    validation is part of the measured cost, and returns the number of output
+    tokens it produced.
+
+    Args:
+        client: Client under test.
+        batch_size: Number of inputs per embedding call.
+
+    Returns:
+        A mapping of scenario name to operation.
+    """
+    inputs = [f"benchmark input {index}" for index in range(batch_size)]
+
+    def text_request() -> TextGenerateRequest:
+        return TextGenerateRequest(
+            provider="mock",
+            model="bench",
+            messages=[
+                TextMessage(role="system", content="You are a benchmark."),
+                TextMessage(role="user", content="Measure the SDK overhead."),
+            ],
+        )
+
+    async def text_generate() -> int:
+        response = await client.text.generate(text_request())
+        return response.usage.output_tokens
+
+    async def text_stream() -> int:
+        deltas = 0
+        async for event in client.text.stream(text_request()):
+            if event.event == "text_delta":
+                deltas += 1
+        return deltas
+
+    async def embedding_embed() -> int:
+        await client.embedding.embed(
+            EmbeddingRequest(provider="mock", model="bench-embed", input=inputs)
+        )
+        return 0
+
+    return {
+        "text.generate": text_generate,
+        "text.stream": text_stream,
+        "embedding.embed": embedding_embed,
+    }
+
+
+async def measure(
+    name: str, operation: Operation, *, iterations: int, warmup: int
+) -> ScenarioResult:
+    """Measure throughput, CPU, and allocations for one scenario.
+
+    Timing and allocation tracking run in separate passes because
+    ``tracemalloc`` inflates CPU time several times over.
+
+    Args:
+        name: Scenario name.
+        operation: Coroutine factory to benchmark.
+        iterations: Timed iterations.
+        warmup: Untimed iterations run first to populate caches.
+
+    Returns:
+        The scenario measurements.
+    """
+    for _ in range(warmup):
+        await operation()
+
+    gc.collect()
+    tokens = 0
+    wall_started = perf_counter()
+    cpu_started = process_time()
+    for _ in range(iterations):
+        tokens += await operation()
+    cpu_elapsed = process_time() - cpu_started
+    wall_elapsed = perf_counter() - wall_started
+
+    alloc_iterations = max(iterations // 10, 1)
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    peak_total = 0
+    for _ in range(alloc_iterations):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        await operation()
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - current
+    tracemalloc.stop()
+    gc.collect()
+    blocks_after = sys.getallocatedblocks()
+
+    tokens_per_op = tokens // iterations
+    cpu_us_per_op = cpu_elapsed / iterations * 1_000_000
+    return ScenarioResult(
+        name=name,
+        iterations=iterations,
+        tokens_per_op=tokens_per_op,
+        ops_per_sec=round(iterations / wall_elapsed, 1),
+        cpu_us_per_op=round(cpu_us_per_op, 2),
+        cpu_us_per_token=round(cpu_us_per_op / tokens_per_op, 3) if tokens_per_op else None,
+        peak_alloc_bytes_per_op=peak_total // alloc_iterations,
+        retained_blocks_per_op=round((blocks_after - blocks_before) / alloc_iterations, 2),
+    )
+
+
+async def run_suite(
+    *,
+    iterations: int,
+    warmup: int,
+    output_tokens: int,
+    batch_size: int,
+    embedding_dimensions: int,
+    only: list[str] | None = None,
+) -> list[ScenarioResult]:
+    """Run every selected scenario against a fresh client.
+
+    Args:
+        iterations: Timed iterations per scenario.
+        warmup: Warmup iterations per scenario.
+        output_tokens: Tokens produced by every simulated text call.
+        batch_size: Number of inputs per embedding call.
+        embedding_dimensions: Vector size returned by simulated embedding calls.
+        only: Optional subset of scenario names to run.
+
+    Returns:
+        Results in scenario order.
+    """
+    client = build_client(output_tokens=output_tokens, embedding_dimensions=embedding_dimensions)
+    operations = build_operations(client, batch_size=batch_size)
+    results = []
+    for name, operation in operations.items():
+        if only and name not in only:
+            continue
+        results.append(await measure(name, operation, iterations=iterations, warmup=warmup))
+    await client.aclose()
+    return results
+
+
+def build_report(results: list[ScenarioResult], parameters: dict[str, int]) -> dict[str, object]:
+    """Assemble a JSON-serializable report with environment metadata.
+
+    Args:
+        results: Scenario measurements.
+        parameters: Suite parameters used for the run.
+
+    Returns:
+        The report document stored as a baseline.
+    """
+    return {
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "scenarios": {result.name: asdict(result) for result in results},
+    }
+
+
+def compare_reports(
+    current: dict[str, object], baseline: dict[str, object], *, threshold: float
+) -> list[str]:
+    """List scenarios whose CPU per operation regressed beyond the threshold.
+
+    Args:
+        current: Report from this run.
+        baseline: Previously stored report.
+        threshold: Allowed relative slowdown, for example ``0.1`` for 10%.
+
+    Returns:
+        Human-readable regression descriptions; empty when none regressed.
+    """
+    regressions: list[str] = []
+    baseline_scenarios = baseline.get("scenarios", {})
+    for name, result in current["scenarios"].items():
+        previous = baseline_scenarios.get(name)
+        if not previous or not previous["cpu_us_per_op"]:
+            continue
+        ratio = result["cpu_us_per_op"] / previous["cpu_us_per_op"] - 1
+        if ratio > threshold:
+            regressions.append(
+                f"{name}: {previous['cpu_us_per_op']:.2f} -> {result['cpu_us_per_op']:.2f} "
+                f"us/op (+{ratio:.1%})"
+            )
+    return regressions
+
+
+def format_table(results: list[ScenarioResult], baseline: dict[str, object] | None) -> str:
+    """Render results as a fixed-width table with optional baseline deltas.
+
+    Args:
+        results: Scenario measurements.
+        baseline: Optional stored report to diff against.
+
+    Returns:
+        The rendered table.
+    """
+    header = (
+        f"{'scenario':<18}{'ops/s':>10}{'cpu us/op':>12}{'cpu us/tok':>12}"
+        f"{'peak B/op':>12}{'blocks/op':>11}{'vs base':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    baseline_scenarios = (baseline or {}).get("scenarios", {})
+    for result in results:
+        per_token = f"{result.cpu_us_per_token:.3f}" if result.cpu_us_per_token else "-"
+        delta = "-"
+        previous = baseline_scenarios.get(result.name)
+        if previous and previous["cpu_us_per_op"]:
+            delta = f"{result.cpu_us_per_op / previous['cpu_us_per_op'] - 1:+.1%}"
+        lines.append(
+            f"{result.name:<18}{result.ops_per_sec:>10.1f}{result.cpu_us_per_op:>12.2f}"
+            f"{per_token:>12}{result.peak_alloc_bytes_per_op:>12}"
+            f"{result.retained_blocks_per_op:>11.2f}{delta:>10}"
+        )
+    return "\n".join(lines)
+
+
+def _git_commit() -> str | None:
+    """Return the current git commit hash when available.
+
+    Args:
+        None.
+
+    Returns:
+        The short commit hash, or ``None`` outside a git checkout.
+    """
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the suite from the command line.
+
+    Args:
+        argv: Optional command-line arguments; defaults to ``sys.argv``.
+
+    Returns:
+        Process exit code; ``1`` when ``--compare`` found a regression.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark AI SDK per-request overhead.")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--output-tokens", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--embedding-dimensions", type=int, default=256)
+    parser.add_argument("--only", action="append", help="Run only the named scenario.")
+    parser.add_argument(
+        "--save",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help="Write the report JSON; defaults to the committed baseline path.",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help="Diff against a stored report; defaults to the committed baseline.",
+    )
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    parameters = {
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "output_tokens": args.output_tokens,
+        "batch_size": args.batch_size,
+        "embedding_dimensions": args.embedding_dimensions,
+    }
+    results = asyncio.run(run_suite(**parameters, only=args.only))
+    report = build_report(results, parameters)
+
+    baseline = None
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline.get("parameters") != parameters:
+            print("warning: baseline was recorded with different parameters", file=sys.stderr)
+
+    print(format_table(results, baseline))
+
+    if args.save is not None:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if baseline is not None:
+        regressions = compare_reports(report, baseline, threshold=args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
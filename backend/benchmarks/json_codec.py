@@ -0,0 +1,214 @@
+"""Compare JSON codecs on the payloads provider adapters encode and decode.
+
+Each installed codec from :mod:`app.infra.ai.codec` encodes and decodes the same
+provider-shaped documents: a chat request with a long history, one streamed
+chat chunk, an embedding response with number lists, and an image response with
+inline base64 data. The table reports microseconds per operation and the speedup
+over the standard library.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.json_codec
+    python -m benchmarks.json_codec --only stream_chunk --iterations 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import os
+import random
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from time import perf_counter
+from typing import Any
+
+# Importing the SDK loads ``app.core`` settings; mirror the test defaults so the
+# benchmark runs without a configured environment.
+os.environ.setdefault("DEBUG", "true")
+os.environ.setdefault("OTEL_ENABLED", "false")
+
+from app.infra.ai.codec import JsonCodec, get_json_codec  # noqa: E402
+from app.infra.ai.exceptions import AIConfigError  # noqa: E402
+
+
+@dataclass(slots=True)
+class CodecResult:
+    """Store the timings of one codec on one payload."""
+
+    payload: str
+    codec: str
+    size_bytes: int
+    encode_us: float
+    decode_us: float
+
+
+def build_payloads(seed: int = 0) -> dict[str, Any]:
+    """Build provider-shaped documents with deterministic content.
+
+    Args:
+        seed: Seed for the generated text and vectors.
+
+    Returns:
+        A mapping of payload name to JSON document.
+    """
+    rng = random.Random(seed)
+    words = ["model", "token", "stream", "réponse", "latency", "provider", "缓存", "vector"]
+
+    def sentence(length: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(length))
+
+    return {
+        "chat_request": {
+            "model": "gpt-4.1",
+            "temperature": 0.2,
+            "stream": True,
+            "messages": [
+                {"role": "user" if index % 2 else "assistant", "content": sentence(80)}
+                for index in range(40)
+            ],
+        },
+        "stream_chunk": {
+            "id": "chatcmpl-8f1c",
+            "object": "chat.completion.chunk",
+            "created": 1_760_000_000,
+            "model": "gpt-4.1",
+            "choices": [{"index": 0, "delta": {"content": " token"}, "finish_reason": None}],
+        },
+        "embedding_response": {
+            "object": "list",
+            "model": "text-embedding-3-small",
+            "data": [
+                {"index": index, "embedding": [rng.uniform(-1, 1) for _ in range(1536)]}
+                for index in range(16)
+            ],
+            "usage": {"prompt_tokens": 320, "total_tokens": 320},
+        },
+        "image_response": {
+            "created": 1_760_000_000,
+            "data": [{"b64_json": base64.b64encode(rng.randbytes(1_500_000)).decode()}],
+        },
+    }
+
+
+def available_codecs() -> list[JsonCodec]:
+    """List the codecs importable in this environment, standard library first.
+
+    Args:
+        None.
+
+    Returns:
+        The installed codecs.
+    """
+    codecs = []
+    for name in ("stdlib", "orjson", "msgspec"):
+        try:
+            codecs.append(get_json_codec(name))
+        except AIConfigError:
+            continue
+    return codecs
+
+
+def _time_per_op(operation: Callable[[], object], iterations: int) -> float:
+    """Time an operation and return microseconds per call.
+
+    Args:
+        operation: Zero-argument callable to time.
+        iterations: Timed calls.
+
+    Returns:
+        Microseconds per call.
+    """
+    for _ in range(max(iterations // 10, 1)):
+        operation()
+    started = perf_counter()
+    for _ in range(iterations):
+        operation()
+    return (perf_counter() - started) / iterations * 1_000_000
+
+
+def run_suite(
+    *, iterations: int, only: list[str] | None = None, seed: int = 0
+) -> list[CodecResult]:
+    """Time every codec on every selected payload.
+
+    Large payloads run fewer iterations so each measurement takes similar time.
+
+    Args:
+        iterations: Timed iterations for a 1 KiB payload.
+        only: Optional subset of payload names.
+        seed: Seed for the generated payloads.
+
+    Returns:
+        Results grouped by payload, in codec order.
+    """
+    results = []
+    for name, document in build_payloads(seed).items():
+        if only and name not in only:
+            continue
+        reference = get_json_codec("stdlib").dumps(document)
+        scaled = max(iterations * 1024 // len(reference), 5)
+        for codec in available_codecs():
+            encoded = codec.dumps(document)
+            if codec.loads(encoded) != document:
+                raise AssertionError(f"{codec.name} does not round-trip {name}")
+            results.append(
+                CodecResult(
+                    payload=name,
+                    codec=codec.name,
+                    size_bytes=len(encoded),
+                    encode_us=round(_time_per_op(partial(codec.dumps, document), scaled), 2),
+                    decode_us=round(_time_per_op(partial(codec.loads, encoded), scaled), 2),
+                )
+            )
+    return results
+
+
+def format_table(results: list[CodecResult]) -> str:
+    """Render results with speedups relative to the standard library.
+
+    Args:
+        results: Codec measurements.
+
+    Returns:
+        The rendered table.
+    """
+    header = (
+        f"{'payload':<20}{'codec':<9}{'bytes':>10}{'encode us':>12}{'x':>7}"
+        f"{'decode us':>12}{'x':>7}"
+    )
+    lines = [header, "-" * len(header)]
+    baseline = {result.payload: result for result in results if result.codec == "stdlib"}
+    for result in results:
+        base = baseline[result.payload]
+        lines.append(
+            f"{result.payload:<20}{result.codec:<9}{result.size_bytes:>10}"
+            f"{result.encode_us:>12.2f}{base.encode_us / result.encode_us:>7.1f}"
+            f"{result.decode_us:>12.2f}{base.decode_us / result.decode_us:>7.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the comparison from the command line.
+
+    Args:
+        argv: Optional command-line arguments; defaults to ``sys.argv``.
+
+    Returns:
+        Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark JSON codecs on provider payloads.")
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--only", action="append", help="Run only the named payload.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(format_table(run_suite(iterations=args.iterations, only=args.only, seed=args.seed)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import json
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+import pytest
+
+from app.infra.ai.client import AIClient
+from app.infra.ai.config import AISettings
+from app.infra.ai.idempotency import _RELEASE_SCRIPT
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.quota import _RESERVE_SCRIPT
+from app.infra.ai.registry import ModelRegistry
+from app.infra.ai.telemetry import AITelemetry
+from app.infra.ai.types import ModelSpec, ProviderConfig
+
+
+class FakeRedis:
+    """Keep the Redis commands used by the AI infrastructure in memory.
+
+    Every command or pipeline execution counts as one round trip. Commands named
+    in ``failing`` raise ``ConnectionError``, including inside pipelines.
+    """
+
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.streams: dict[str, list[tuple[str, dict[str, str]]]] = {}
+        self.ttls: dict[str, int] = {}
+        self.failing: set[str] = set()
+        self.round_trips = 0
+        self._pipelined = False
+        self._changed = asyncio.Condition()
+
+    def _command(self, name: str) -> None:
+        if name in self.failing:
+            raise ConnectionError(f"redis {name} failed")
+        if not self._pipelined:
+            self.round_trips += 1
+
+    async def set(self, key, value, nx=False, ex=None):
+        self._command("set")
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+
+    async def get(self, key):
+        self._command("get")
+        return self.values.get(key)
+
+    async def delete(self, *keys):
+        self._command("delete")
+        return sum(1 for key in keys if self.values.pop(key, None) is not None)
+
+    async def exists(self, *keys):
+        self._command("exists")
+        return sum(1 for key in keys if key in self.values or key in self.streams)
+
+    async def incrby(self, key, amount):
+        self._command("incrby")
+        self.values[key] = self.values.get(key, 0) + amount
+        return self.values[key]
+
+    async def expire(self, key, seconds):
+        self._command("expire")
+        self.ttls[key] = seconds
+
+    async def ttl(self, key):
+        self._command("ttl")
+        return self.ttls.get(key, -1)
+
+    async def hgetall(self, key):
+        self._command("hgetall")
+        return dict(self.hashes.get(key, {}))
+
+    async def hset(self, key, mapping):
+        self._command("hset")
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def scan_iter(self, match="*", count=None):
+        self._command("scan_iter")
+        for key in list(self.values):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        self._command("xadd")
+        entries = self.streams.setdefault(key, [])
+        entry_id = f"{len(entries) + 1}-0"
+        entries.append((entry_id, dict(fields)))
+        async with self._changed:
+            self._changed.notify_all()
+        return entry_id
+
+    async def xread(self, streams, count=None, block=None):
+        self._command("xread")
+        ((key, cursor),) = streams.items()
+
+        def newer():
+            major = int(cursor.split("-")[0])
+            entries = self.streams.get(key, [])
+            return [entry for entry in entries if int(entry[0].split("-")[0]) > major]
+
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(newer), timeout=block / 1000)
+            except TimeoutError:
+                return []
+        return [[key, newer()[:count]]]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, source):
+        scripts = {_RESERVE_SCRIPT: self._reserve, _RELEASE_SCRIPT: self._release}
+        return scripts[source]
+
+    async def _reserve(self, keys, args):
+        """Run the quota reservation script: check every counter, then add to all."""
+        self._command("evalsha")
+        for index, key in enumerate(keys):
+            limit, amount = args[3 * index], args[3 * index + 1]
+            current = self.values.get(key, 0)
+            if amount > 0 and current + amount > limit:
+                return [index + 1, current]
+        for index, key in enumerate(keys):
+            if key not in self.values:
+                self.ttls[key] = args[3 * index + 2]
+            self.values[key] = self.values.get(key, 0) + args[3 * index + 1]
+        return [0, 0]
+
+    async def _release(self, keys, args):
+        """Run the idempotency release script: delete the marker its owner wrote."""
+        self._command("evalsha")
+        current = self.values.get(keys[0])
+        if current is not None and json.loads(current).get("owner") == args[0]:
+            del self.values[keys[0]]
+            return 1
+        return 0
+
+
+class FakePipeline:
+    """Queue fake Redis commands and run them as one round trip on execute."""
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._calls: list[tuple[str, tuple, dict]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self._redis._command("execute")
+        calls, self._calls = self._calls, []
+        self._redis._pipelined = True
+        try:
+            return [
+                await getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in calls
+            ]
+        finally:
+            self._redis._pipelined = False
+
+
+def build_client(
+    adapters: Mapping[str, ProviderAdapter],
+    *,
+    base_url: str | Mapping[str, str] = "mock://local",
+    timeout_ms: int = 1000,
+    max_retries: int = 0,
+    models: Sequence[ModelSpec] = (),
+    settings: AISettings | None = None,
+    telemetry: AITelemetry | None = None,
+    **options: Any,
+) -> AIClient:
+    """Build a client with one provider configuration per adapter.
+
+    Args:
+        adapters: Adapters keyed by provider name.
+        base_url: Base URL of every provider, or one per provider name.
+        timeout_ms: Default timeout of every provider.
+        max_retries: Retries of every provider; backoff is always zero.
+        models: Model specs registered ahead of ad hoc resolution.
+        settings: AI settings; defaults to ``AISettings()``.
+        telemetry: Telemetry to record into; defaults to one built from ``settings``.
+        **options: Further keyword arguments of :class:`AIClient`.
+
+    Returns:
+        The client.
+    """
+    settings = settings or AISettings()
+    registry = ModelRegistry(
+        models=models,
+        providers=[
+            ProviderConfig(
+                name=name,
+                api_key="key",
+                base_url=base_url if isinstance(base_url, str) else base_url[name],
+                timeout_ms=timeout_ms,
+                max_retries=max_retries,
+                backoff_base_ms=0,
+            )
+            for name in adapters
+        ],
+    )
+    return AIClient(
+        registry=registry,
+        adapters=dict(adapters),
+        telemetry=telemetry or AITelemetry(settings),
+        settings=settings,
+        **options,
+    )
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    """Provide an empty in-memory Redis shared by everything in one test."""
+    return FakeRedis()
+
+
+@pytest.fixture
+def make_client() -> Callable[..., AIClient]:
+    """Provide the factory that wires adapters into a client with test defaults."""
+    return build_client
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core import AuthContext, AuthException, auth_exception_handler, require_auth
+from app.infra.ai.client import get_ai_client_dependency
+from app.infra.ai.config import AIAdaptiveTimeoutSettings, AISettings
+from app.infra.ai.exceptions import AITimeoutError
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.requests import EmbeddingRequest
+from app.infra.ai.responses import EmbeddingResponse
+from app.infra.ai.timeouts import AdaptiveTimeouts, RedisLatencyStore
+from app.modules.ai import ai_router
+from app.modules.iam.consts import PermissionCode
+from app.modules.iam.queries import get_iam_queries
+
+
+class _TimedAdapter(ProviderAdapter):
+    """Record the timeout of each call and optionally fail it as timed out."""
+
+    def __init__(self) -> None:
+        self.timeouts: list[int] = []
+        self.time_out = False
+
+    async def embed(self, request, model, context):
+        self.timeouts.append(context.timeout_ms)
+        if self.time_out:
+            raise AITimeoutError("slow")
+        return EmbeddingResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            vectors=[[0.0]],
+            dimensions=1,
+        )
+
+
+def _settings(**timeout_settings) -> AISettings:
+    return AISettings(adaptive_timeouts=AIAdaptiveTimeoutSettings(enabled=True, **timeout_settings))
+
+
+def test_learned_timeout_is_percentile_times_multiplier_within_bounds() -> None:
+    """Ensure routes keep their default until enough samples exist, then clamp."""
+    timeouts = AdaptiveTimeouts(
+        quantile=0.9, multiplier=2.0, floor_ms=500, ceiling_ms=5_000, min_samples=10
+    )
+    for latency_ms in range(100, 1000, 100):
+        timeouts.observe("openai", "fast", "text_generation", latency_ms)
+    assert timeouts.timeout_ms("openai", "fast", "text_generation", 60_000) == 60_000
+
+    timeouts.observe("openai", "fast", "text_generation", 1000)
+    assert timeouts.timeout_ms("openai", "fast", "text_generation", 60_000) == 1_800
+
+    for _ in range(10):
+        timeouts.observe("openai", "tiny", "embedding", 1)
+        timeouts.observe("openai", "image", "image_generation", 20_000)
+    assert timeouts.timeout_ms("openai", "tiny", "embedding", 60_000) == 500
+    assert timeouts.timeout_ms("openai", "image", "image_generation", 60_000) == 5_000
+    assert [entry.timeout_ms for entry in timeouts.snapshot()] == [1_800, 5_000, 500]
+
+
+@pytest.mark.asyncio
+async def test_client_applies_learned_timeouts_and_counts_timeouts(make_client) -> None:
+    """Ensure learned timeouts reach adapters, explicit ones win, and timeouts are observed."""
+    adapter = _TimedAdapter()
+    client = make_client(
+        {"fake": adapter}, timeout_ms=60_000, settings=_settings(min_samples=3, floor_ms=2_000)
+    )
+    request = {"provider": "fake", "model": "e", "input": ["x"]}
+
+    for _ in range(4):
+        await client.embedding.embed(EmbeddingRequest(**request))
+    await client.embedding.embed(EmbeddingRequest(**request, timeout_ms=123))
+    adapter.time_out = True
+    with pytest.raises(AITimeoutError):
+        await client.embedding.embed(EmbeddingRequest(**request))
+
+    assert adapter.timeouts == [60_000, 60_000, 60_000, 2_000, 123, 2_000]
+    (entry,) = client.adaptive_timeouts.snapshot()
+    assert (entry.capability, entry.samples) == ("embedding", 6)
+
+
+@pytest.mark.asyncio
+async def test_redis_store_restores_windows_after_restart(fake_redis) -> None:
+    """Ensure windows flushed by one process are learned immediately by the next."""
+    first = AdaptiveTimeouts(min_samples=5, floor_ms=1, store=RedisLatencyStore(fake_redis))
+    for _ in range(5):
+        first.observe("gemini", "g", "text_generation", 400)
+    await first.aclose()
+
+    second = AdaptiveTimeouts(min_samples=5, floor_ms=1, store=RedisLatencyStore(fake_redis))
+    await second.start()
+    await second.aclose()
+    assert second.timeout_ms("gemini", "g", "text_generation", 60_000) == 800
+
+
+@pytest.mark.asyncio
+async def test_store_failures_keep_defaults_and_retry_the_flush(fake_redis) -> None:
+    """Ensure an unreachable store neither fails startup nor loses unsaved windows."""
+    fake_redis.failing = {"hgetall", "execute"}
+    timeouts = AdaptiveTimeouts(min_samples=1, floor_ms=1, store=RedisLatencyStore(fake_redis))
+    await timeouts.start()
+    timeouts.observe("gemini", "g", "text_generation", 400)
+    await timeouts.flush()
+    assert fake_redis.hashes == {}
+
+    fake_redis.failing.clear()
+    await timeouts.aclose()
+    assert len(fake_redis.hashes) == 1
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoint_requires_tenant_manage(make_client) -> None:
+    """Ensure learned timeouts are listed only for principals with tenant.manage."""
+    client = make_client({"fake": _TimedAdapter()}, settings=_settings(min_samples=1))
+    client.adaptive_timeouts.observe("fake", "e", "embedding", 1500)
+    granted: set[str] = set()
+
+    class _Queries:
+        async def get_permission_codes(self, tenant_id, principal_id, authz_version):
+            return granted
+
+    app = FastAPI()
+    app.include_router(ai_router)
+    app.add_exception_handler(AuthException, auth_exception_handler)
+    app.dependency_overrides[require_auth] = lambda: AuthContext(
+        session_id=1,
+        principal_id=2,
+        tenant_id=3,
+        principal_type="user",
+        session_version=1,
+        authz_version=1,
+    )
+    app.dependency_overrides[get_iam_queries] = _Queries
+    app.dependency_overrides[get_ai_client_dependency] = lambda: client
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as http_client:
+        denied = await http_client.get("/api/ai/admin/timeouts")
+        granted.add(PermissionCode.TENANT_MANAGE)
+        allowed = await http_client.get("/api/ai/admin/timeouts")
+
+    assert denied.json()["code"] == "A0006"
+    assert allowed.json()["data"] == [
+        {
+            "provider": "fake",
+            "model": "e",
+            "capability": "embedding",
+            "samples": 1,
+            "percentileMs": 1500.0,
+            "timeoutMs": 3000,
+        }
+    ]
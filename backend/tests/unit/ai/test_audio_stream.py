@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.infra.ai.config import AISettings
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.requests import AudioGenerateRequest
+from app.infra.ai.segmentation import split_sentences
+
+
+class _SegmentEchoAdapter(ProviderAdapter):
+    """Echo each segment back as audio, finishing later segments first."""
+
+    def __init__(self, hang: bool = False) -> None:
+        self.active = 0
+        self.max_active = 0
+        self.hang = hang
+
+    def audio_mime_type(self, request, model):
+        return "audio/mpeg"
+
+    async def stream_audio(self, request, model, context):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            # Later segments finish sooner so ordering must come from the client.
+            await asyncio.sleep(0.01 / len(request.input_text))
+            for word in request.input_text.split():
+                yield word.encode()
+            if self.hang:
+                await asyncio.Event().wait()
+        finally:
+            self.active -= 1
+
+
+def test_split_sentences_merges_short_and_splits_long_sentences() -> None:
+    """Ensure segments respect sentence boundaries and the character limit."""
+    text = "Hi. How are you? 我很好。This sentence is definitely too long for one segment"
+
+    segments = split_sentences(text, max_chars=20)
+
+    assert segments[0] == "Hi. How are you?"
+    assert all(len(segment) <= 20 for segment in segments)
+    assert " ".join(segments).split() == text.replace("。", "。 ").split()
+
+
+@pytest.mark.asyncio
+async def test_audio_stream_emits_segments_in_order_with_bounded_parallelism(make_client) -> None:
+    """Ensure concurrent segment synthesis is re-sequenced and capped by the window."""
+    adapter = _SegmentEchoAdapter()
+    settings = AISettings(audio_stream_segment_chars=12, audio_stream_concurrency=2)
+    client = make_client({"fake": adapter}, settings=settings)
+
+    events = [
+        event
+        async for event in client.audio.stream(
+            AudioGenerateRequest(
+                provider="fake",
+                model="tts",
+                input_text="One two. Three four. Five six. Seven.",
+            )
+        )
+    ]
+
+    chunks = [event for event in events if event.event == "audio_chunk"]
+    assert b" ".join(event.data for event in chunks) == b"One two. Three four. Five six. Seven."
+    assert [event.segment_index for event in chunks] == sorted(
+        event.segment_index for event in chunks
+    )
+    assert {event.mime_type for event in chunks} == {"audio/mpeg"}
+    assert events[-1].event == "audio_done"
+    assert events[-1].segment_count == 4
+    assert adapter.max_active == 2
+
+    adapter.hang = True
+    stream = client.audio.stream(
+        AudioGenerateRequest(provider="fake", model="tts", input_text="One two. Three four.")
+    )
+    await anext(stream)
+    await stream.aclose()
+    assert adapter.active == 0
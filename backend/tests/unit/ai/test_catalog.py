@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from app.infra.ai.catalog import CatalogWatcher, load_catalog_file
+from app.infra.ai.client import AIClient
+from app.infra.ai.config import AISettings
+from app.infra.ai.exceptions import AIConfigError, AIUnsupportedCapabilityError
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.registry import ModelRegistry
+from app.infra.ai.requests import TextGenerateRequest, TextMessage
+from app.infra.ai.responses import TextGenerateResponse
+from app.infra.ai.telemetry import AITelemetry
+from app.infra.ai.types import AICapability, AIFinishReason, AIUsage, ProviderConfig
+
+_PROVIDER = ProviderConfig(
+    name="fake",
+    api_key="key",
+    base_url="http://fake",
+    timeout_ms=1000,
+    max_retries=0,
+    backoff_base_ms=0,
+)
+
+_CATALOG_YAML = """
+models:
+  - provider: fake
+    model_id: fake-large-2025
+    alias: fake-large
+    aliases: [large]
+    capabilities: [text_gen]
+    supports_stream: true
+    context_window: 128000
+    pricing:
+      input_per_million_usd: 2.0
+      output_per_million_usd: 8.0
+    default_params:
+      temperature: 0.1
+"""
+
+
+class _EchoAdapter(ProviderAdapter):
+    """Echo the effective temperature so tests can observe default params."""
+
+    async def generate_text(self, request, model, context):
+        return TextGenerateResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            usage=AIUsage.from_counts(input_tokens=1_000_000, output_tokens=500_000),
+            text=str(request.temperature),
+            finish_reason=AIFinishReason.STOP,
+        )
+
+
+def _write_json_catalog(path, model_id: str) -> None:
+    path.write_text(
+        json.dumps(
+            {"models": [{"provider": "fake", "modelId": model_id, "capabilities": ["embedding"]}]}
+        ),
+        encoding="utf-8",
+    )
+
+
+def test_catalog_resolves_aliases_from_precompiled_table(tmp_path) -> None:
+    """Ensure catalog aliases and ids hit the same prebuilt route without re-construction."""
+    catalog_path = tmp_path / "models.yaml"
+    catalog_path.write_text(_CATALOG_YAML, encoding="utf-8")
+    registry = ModelRegistry(providers=[_PROVIDER], catalog=load_catalog_file(catalog_path))
+
+    by_alias = registry.resolve(
+        provider="fake", model="large", capability=AICapability.TEXT_GENERATION
+    )
+    by_id = registry.resolve(
+        provider="fake", model="fake-large-2025", capability=AICapability.TEXT_GENERATION
+    )
+
+    assert by_alias is by_id
+    assert (
+        registry.resolve(
+            provider="fake", model="fake-large", capability=AICapability.TEXT_GENERATION
+        )
+        is by_id
+    )
+    assert by_alias.model_id == "fake-large-2025"
+    assert by_alias.spec.context_window == 128000
+    with pytest.raises(AIUnsupportedCapabilityError):
+        registry.resolve(provider="fake", model="large", capability=AICapability.EMBEDDING)
+
+
+@pytest.mark.parametrize(
+    "default_params", [{"temperature": 5}, {"maxTokens": 10}, {"dimensions": 8}]
+)
+def test_catalog_rejects_defaults_requests_would_reject(tmp_path, default_params) -> None:
+    """Ensure out-of-range or unknown default params fail when the catalog loads."""
+    catalog_path = tmp_path / "models.json"
+    catalog_path.write_text(
+        json.dumps(
+            {
+                "models": [
+                    {
+                        "provider": "fake",
+                        "modelId": "m",
+                        "capabilities": ["text_gen"],
+                        "defaultParams": default_params,
+                    }
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(AIConfigError):
+        load_catalog_file(catalog_path)
+
+
+def test_adhoc_resolution_is_memoized() -> None:
+    """Ensure repeated ad-hoc lookups reuse one resolved route per capability."""
+    registry = ModelRegistry(providers=[_PROVIDER])
+
+    first = registry.resolve(provider="fake", model="m", capability=AICapability.EMBEDDING)
+    second = registry.resolve(provider="fake", model="m", capability=AICapability.EMBEDDING)
+
+    assert first is second
+
+
+@pytest.mark.asyncio
+async def test_catalog_defaults_and_pricing_apply_to_calls(tmp_path) -> None:
+    """Ensure catalog default params fill unset fields and pricing fills cost estimates."""
+    catalog_path = tmp_path / "models.yaml"
+    catalog_path.write_text(_CATALOG_YAML, encoding="utf-8")
+    settings = AISettings()
+    client = AIClient(
+        registry=ModelRegistry(providers=[_PROVIDER], catalog=load_catalog_file(catalog_path)),
+        adapters={"fake": _EchoAdapter()},
+        telemetry=AITelemetry(settings),
+        settings=settings,
+    )
+
+    defaulted = await client.text.generate(
+        TextGenerateRequest(
+            provider="fake", model="large", messages=[TextMessage(role="user", content="hi")]
+        )
+    )
+    explicit = await client.text.generate(
+        TextGenerateRequest(
+            provider="fake",
+            model="large",
+            temperature=0.9,
+            messages=[TextMessage(role="user", content="hi")],
+        )
+    )
+
+    assert defaulted.text == "0.1"
+    assert explicit.text == "0.9"
+    assert defaulted.usage.estimated_cost_usd == pytest.approx(6.0)
+
+
+@pytest.mark.asyncio
+async def test_catalog_watcher_swaps_table_and_keeps_previous_on_error(tmp_path) -> None:
+    """Ensure reloads publish a new table atomically and ignore broken files."""
+    catalog_path = tmp_path / "models.json"
+    _write_json_catalog(catalog_path, "embed-v1")
+    registry = ModelRegistry(providers=[_PROVIDER], catalog=load_catalog_file(catalog_path))
+    watcher = CatalogWatcher(registry, catalog_path)
+
+    _write_json_catalog(catalog_path, "embed-v2")
+    os.utime(catalog_path, ns=(1, 1))
+    assert await watcher.reload_if_changed()
+    assert registry.resolve(
+        provider="fake", model="embed-v2", capability=AICapability.EMBEDDING
+    ).spec.capabilities == (AICapability.EMBEDDING,)
+    assert [spec.model_id for spec in registry.list_models()] == ["embed-v2"]
+
+    catalog_path.write_text("{not json", encoding="utf-8")
+    os.utime(catalog_path, ns=(2, 2))
+    assert not await watcher.reload_if_changed()
+    assert [spec.model_id for spec in registry.list_models()] == ["embed-v2"]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core import AuthContext, require_auth
+from app.infra.ai.broker import get_stream_broker_dependency
+from app.infra.ai.client import get_ai_client_dependency
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.providers.mock import MockProfile, MockProviderAdapter
+from app.infra.ai.requests import TextGenerateRequest, TextMessage
+from app.infra.ai.stream import AIStartEvent, AITextDeltaEvent
+from app.modules.ai import ai_router, relay_sse, sdk_event_frames
+
+
+class _HangingAdapter(ProviderAdapter):
+    """Emit one delta, then wait forever so the test can observe cancellation."""
+
+    def __init__(self) -> None:
+        self.closed = asyncio.Event()
+
+    async def stream_text(self, request, model, context):
+        common = {
+            "request_id": context.request_id,
+            "provider": model.provider,
+            "model": model.model_id,
+            "attempt": 1,
+        }
+        try:
+            yield AIStartEvent(**common)
+            yield AITextDeltaEvent(delta="Hel", text="Hel", **common)
+            await asyncio.Event().wait()
+        finally:
+            self.closed.set()
+
+
+_scope: ContextVar[str | None] = ContextVar("scope", default=None)
+
+
+async def _scoped_frames(count: int):
+    """Hold a context variable across yields, as OpenTelemetry span scopes do."""
+    token = _scope.set("open")
+    try:
+        for index in range(count):
+            await asyncio.sleep(0)
+            yield f"{index}".encode()
+    finally:
+        # Raises ValueError when the generator was stepped from another context.
+        _scope.reset(token)
+
+
+def _request(provider: str) -> TextGenerateRequest:
+    return TextGenerateRequest(
+        provider=provider, model="m", messages=[TextMessage(role="user", content="hi")]
+    )
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_upstream_stream_after_heartbeats(make_client) -> None:
+    """Ensure idle gaps emit heartbeats and a client disconnect closes the provider stream."""
+    adapter = _HangingAdapter()
+    client = make_client({"hang": adapter})
+    disconnected = asyncio.Event()
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    frames: list[bytes] = []
+    async for frame in relay_sse(
+        sdk_event_frames(client.text.stream(_request("hang"))), receive, heartbeat_s=0.01
+    ):
+        frames.append(frame)
+        if frame.startswith(b": ping"):
+            disconnected.set()
+
+    assert frames[0].startswith(b"id: 1\nevent: start\n")
+    assert frames[1].startswith(b"id: 2\nevent: text_delta\n")
+    assert frames[-1] == b": ping\n\n"
+    await asyncio.wait_for(adapter.closed.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_relay_reads_the_source_in_one_context() -> None:
+    """Ensure context variables set by the source survive until it closes."""
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    frames = [frame async for frame in relay_sse(_scoped_frames(3), receive, heartbeat_s=1)]
+
+    assert frames == [b"0", b"1", b"2"]
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_endpoint_sends_unbuffered_event_stream(make_client) -> None:
+    """Ensure the endpoint streams SDK events with proxy-safe SSE headers."""
+    app = FastAPI()
+    app.include_router(ai_router)
+    app.dependency_overrides[require_auth] = lambda: AuthContext(
+        session_id=1,
+        principal_id=2,
+        tenant_id=3,
+        principal_type="user",
+        session_version=1,
+        authz_version=1,
+    )
+    app.dependency_overrides[get_stream_broker_dependency] = lambda: None
+    app.dependency_overrides[get_ai_client_dependency] = lambda: make_client(
+        {"mock": MockProviderAdapter(MockProfile(seed=1, output_tokens=3))}
+    )
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as http_client:
+        response = await http_client.post(
+            "/api/ai/chat/stream",
+            json={
+                "provider": "mock",
+                "model": "m",
+                "messages": [{"role": "user", "content": "hi"}],
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["x-accel-buffering"] == "no"
+    assert response.headers["cache-control"].startswith("no-cache")
+    assert "event: text_delta" in response.text
+    assert response.text.rstrip().split("\n\n")[-1].split("\n")[1] == "event: done"
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+
+import pytest
+
+from app.infra.ai.coalesce import coalesce_text_deltas
+from app.infra.ai.stream import AIDoneEvent, AIStartEvent, AITextDeltaEvent
+from app.infra.ai.types import AIFinishReason
+
+_COMMON = {"request_id": "r", "provider": "fake", "model": "m", "attempt": 1}
+_scope: ContextVar[str | None] = ContextVar("scope", default=None)
+
+
+async def _token_stream(count: int, *, gap_s: float = 0.0):
+    yield AIStartEvent(**_COMMON)
+    text = ""
+    for _ in range(count):
+        await asyncio.sleep(gap_s)
+        text += "ab"
+        yield AITextDeltaEvent(delta="ab", text=text, **_COMMON)
+    yield AIDoneEvent(text=text, finish_reason=AIFinishReason.STOP, **_COMMON)
+
+
+@pytest.mark.asyncio
+async def test_bursts_are_merged_without_delaying_first_token() -> None:
+    """Ensure a burst of tiny deltas collapses into size-bounded frames in order."""
+    events = [
+        event
+        async for event in coalesce_text_deltas(_token_stream(200), max_delay_ms=20, max_chars=64)
+    ]
+    deltas = [event for event in events if isinstance(event, AITextDeltaEvent)]
+
+    assert events[0].event == "start"
+    assert deltas[0].delta == "ab"
+    assert events[-1].event == "done"
+    assert "".join(delta.delta for delta in deltas) == "ab" * 200
+    assert deltas[-1].text == "ab" * 200
+    assert len(deltas) <= 1 + 400 // 64 + 1
+
+
+@pytest.mark.asyncio
+async def test_time_threshold_flushes_slow_deltas() -> None:
+    """Ensure a delta never waits in the buffer much longer than the delay window."""
+    events = [
+        event
+        async for event in coalesce_text_deltas(
+            _token_stream(4, gap_s=0.03), max_delay_ms=5, max_chars=1024
+        )
+    ]
+
+    assert sum(isinstance(event, AITextDeltaEvent) for event in events) == 4
+
+
+@pytest.mark.asyncio
+async def test_budget_grows_for_slow_consumers() -> None:
+    """Ensure frames grow beyond the base size when the consumer is the bottleneck."""
+    sizes = []
+    async for event in coalesce_text_deltas(
+        _token_stream(300), max_delay_ms=1, max_chars=8, max_chars_ceiling=256
+    ):
+        if isinstance(event, AITextDeltaEvent):
+            sizes.append(len(event.delta))
+            await asyncio.sleep(0.005)
+
+    assert max(sizes) > 8
+    assert max(sizes) <= 256 + 2
+
+
+@pytest.mark.asyncio
+async def test_upstream_runs_in_one_context_and_closes_early() -> None:
+    """Ensure context set by the upstream survives across reads and an early stop closes it."""
+    closed = asyncio.Event()
+
+    async def scoped_stream():
+        token = _scope.set("open")
+        try:
+            async for event in _token_stream(50, gap_s=0.001):
+                yield event
+        finally:
+            # Raises ValueError when the generator was stepped from another context.
+            _scope.reset(token)
+            closed.set()
+
+    stream = coalesce_text_deltas(scoped_stream(), max_delay_ms=1, max_chars=4)
+    events = [await anext(stream) for _ in range(3)]
+    await stream.aclose()
+
+    assert [event.event for event in events] == ["start", "text_delta", "text_delta"]
+    assert closed.is_set()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from app.infra.ai.codec import JsonCodec, get_json_codec
+from app.infra.ai.providers.anthropic import AnthropicProviderAdapter
+from app.infra.ai.providers.gemini import GeminiProviderAdapter
+from app.infra.ai.providers.mock import MockProfile
+from app.infra.ai.providers.mock.server import create_standin_app
+from app.infra.ai.providers.openai import OpenAICompatibleProviderAdapter
+from app.infra.ai.requests import TextGenerateRequest, TextMessage
+
+
+@pytest.mark.parametrize("name", ["stdlib", "orjson", "msgspec"])
+def test_codecs_write_compact_utf8_and_raise_value_error(name: str) -> None:
+    """Ensure every codec encodes like HTTPX does and fails decodes with ``ValueError``."""
+    if name != "stdlib":
+        pytest.importorskip(name)
+    codec = get_json_codec(name)
+    document = {"content": "réponse 缓存", "values": [1, 2.5, None, True]}
+
+    assert codec.dumps(document) == '{"content":"réponse 缓存","values":[1,2.5,null,true]}'.encode()
+    assert codec.loads(codec.dumps(document)) == document
+    assert codec.loads('{"a":1}') == {"a": 1}
+    with pytest.raises(ValueError):
+        codec.loads(b"{not json")
+
+
+@pytest.mark.asyncio
+async def test_adapters_send_and_parse_through_the_codec(make_client) -> None:
+    """Ensure all three adapters encode bodies and parse responses and chunks with the codec."""
+    stdlib = get_json_codec("stdlib")
+    calls = {"dumps": 0, "loads": 0}
+
+    def dumps(value):
+        calls["dumps"] += 1
+        return stdlib.dumps(value)
+
+    def loads(data):
+        calls["loads"] += 1
+        return stdlib.loads(data)
+
+    codec = JsonCodec(name="counting", dumps=dumps, loads=loads)
+    http_client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_standin_app(MockProfile(output_tokens=3)))
+    )
+    adapters = {
+        "openai": OpenAICompatibleProviderAdapter(
+            default_timeout_ms=1000, http_client=http_client, codec=codec
+        ),
+        "anthropic": AnthropicProviderAdapter(
+            default_timeout_ms=1000, http_client=http_client, codec=codec
+        ),
+        "gemini": GeminiProviderAdapter(
+            default_timeout_ms=1000, http_client=http_client, codec=codec
+        ),
+    }
+    base_urls = {
+        "openai": "http://standin/openai/v1",
+        "anthropic": "http://standin/anthropic/v1",
+        "gemini": "http://standin/gemini/v1beta",
+    }
+    client = make_client(adapters, base_url=base_urls)
+
+    for provider in adapters:
+        request = TextGenerateRequest(
+            provider=provider, model="m", messages=[TextMessage(role="user", content="hi")]
+        )
+        response = await client.text.generate(request)
+        assert response.text
+        before = dict(calls)
+        events = [event.event async for event in client.text.stream(request)]
+        assert events[-1] == "done"
+        assert calls["dumps"] == before["dumps"] + 1
+        assert calls["loads"] > before["loads"] + 1
+    await client.aclose()
+
+    assert calls["dumps"] == 6
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import pytest
+
+from app.infra.ai.compaction import SUMMARY_PREFIX, ConversationCompactor
+from app.infra.ai.config import AICompactionSettings, AISettings
+from app.infra.ai.exceptions import AIProviderUnavailableError
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.requests import TextGenerateRequest, TextMessage
+from app.infra.ai.responses import TextGenerateResponse
+from app.infra.ai.telemetry import AITelemetry
+from app.infra.ai.types import AIFinishReason
+
+
+def _conversation(turns: int) -> list[TextMessage]:
+    messages = [TextMessage(role="system", content="You are terse.")]
+    for index in range(turns):
+        messages.append(TextMessage(role="user", content=f"question {index} " + "x" * 80))
+        messages.append(TextMessage(role="assistant", content=f"answer {index} " + "y" * 80))
+    return messages
+
+
+def _request(messages: list[TextMessage], **metadata) -> TextGenerateRequest:
+    return TextGenerateRequest(provider="fake", model="m", messages=messages, metadata=metadata)
+
+
+class _RecordingAdapter(ProviderAdapter):
+    """Answer every call and remember the messages each model received."""
+
+    def __init__(self, *, fail_summaries: bool = False) -> None:
+        self.calls: list[tuple[str, list[TextMessage]]] = []
+        self.fail_summaries = fail_summaries
+
+    async def generate_text(self, request, model, context):
+        self.calls.append((model.model_id, request.messages))
+        if model.model_id == "summary" and self.fail_summaries:
+            raise AIProviderUnavailableError("down", provider=model.provider, model=model.model_id)
+        return TextGenerateResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            text="summary" if model.model_id == "summary" else "reply",
+            finish_reason=AIFinishReason.STOP,
+        )
+
+
+def _settings(**compaction) -> AISettings:
+    return AISettings(
+        compaction=AICompactionSettings(
+            enabled=True, summary_provider="fake", summary_model="summary", **compaction
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_window_pins_system_and_recent_turns() -> None:
+    """Ensure the window drops the oldest history first and keeps pinned messages."""
+    compactor = ConversationCompactor(
+        telemetry=AITelemetry(AISettings()), max_prompt_tokens=200, keep_recent_messages=2
+    )
+    messages = _conversation(10)
+
+    compacted, decision = await compactor.compact(_request(messages))
+
+    assert compacted.messages[0] == messages[0]
+    assert compacted.messages[-2:] == messages[-2:]
+    assert compacted.messages[1:] == messages[-(len(compacted.messages) - 1) :]
+    assert decision.outcome == "windowed"
+    assert decision.compacted_tokens <= 200 < decision.original_tokens
+
+
+@pytest.mark.asyncio
+async def test_summaries_are_incremental_per_conversation() -> None:
+    """Ensure later turns only summarize messages the cached summary does not cover."""
+    seen: list[tuple[str | None, int]] = []
+
+    async def summarize(previous, messages, metadata):
+        seen.append((previous, len(messages)))
+        return f"summary of {len(messages)}"
+
+    compactor = ConversationCompactor(
+        telemetry=AITelemetry(AISettings()),
+        strategy="summarize",
+        max_prompt_tokens=110,
+        keep_recent_messages=2,
+        summarize=summarize,
+    )
+    messages = _conversation(6)
+
+    first, decision = await compactor.compact(_request(messages, conversation_id="c1"))
+    second, _ = await compactor.compact(_request(messages[:], conversation_id="c1"))
+    longer = messages + _conversation(1)[1:]
+    third, last = await compactor.compact(_request(longer, conversation_id="c1"))
+
+    assert first.messages[1].content == f"{SUMMARY_PREFIX}summary of 10"
+    assert decision.outcome == "summarized"
+    assert second.messages == first.messages
+    assert seen == [(None, 10), ("summary of 10", 2)]
+    assert last.summarized_messages == 2
+    assert third.messages[-2:] == longer[-2:]
+
+
+@pytest.mark.asyncio
+async def test_client_falls_back_to_window_when_summary_fails(make_client) -> None:
+    """Ensure a summary model outage still sends a compacted prompt."""
+    adapter = _RecordingAdapter(fail_summaries=True)
+    client = make_client(
+        {"fake": adapter},
+        settings=_settings(strategy="summarize", max_prompt_tokens=120, keep_recent_messages=2),
+    )
+    messages = _conversation(8)
+
+    response = await client.text.generate(_request(messages, conversation_id="c2"))
+
+    assert response.text == "reply"
+    model_id, sent = adapter.calls[-1]
+    assert model_id == "m"
+    assert sent[0] == messages[0]
+    assert sent[-2:] == messages[-2:]
+    assert len(sent) < len(messages)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import base64
+import threading
+
+import httpx
+import pytest
+
+from app.infra.ai.decoding import PayloadDecoder, decode_base64_sliced
+from app.infra.ai.providers.mock import MockProfile
+from app.infra.ai.providers.mock.server import MOCK_PNG_BYTES, create_standin_app
+from app.infra.ai.providers.openai import OpenAICompatibleProviderAdapter
+from app.infra.ai.requests import EmbeddingRequest, ImageGenerateRequest
+
+_BASE_URL = "http://standin/openai/v1"
+
+
+def _standin_adapter(decoder: PayloadDecoder | None) -> OpenAICompatibleProviderAdapter:
+    http_client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_standin_app(MockProfile(embedding_dimensions=64)))
+    )
+    return OpenAICompatibleProviderAdapter(
+        default_timeout_ms=1000, http_client=http_client, decoder=decoder
+    )
+
+
+@pytest.mark.asyncio
+async def test_decoder_offloads_only_payloads_above_threshold() -> None:
+    """Ensure small payloads decode inline and large ones decode in slices on the pool."""
+    decoder = PayloadDecoder(threshold_bytes=64, slice_bytes=6)
+    payload = bytes(range(256)) * 3 + b"xy"
+    encoded = base64.b64encode(payload).decode()
+
+    def thread_name(_: object) -> str:
+        return threading.current_thread().name
+
+    assert await decoder.run("json", 63, thread_name, None) == threading.current_thread().name
+    assert (await decoder.run("json", 64, thread_name, None)).startswith("ai-decode")
+    assert await decoder.b64decode(encoded) == payload
+    assert await decoder.b64decode(base64.b64encode(b"ab").decode()) == b"ab"
+    assert decode_base64_sliced(encoded, 1) == payload
+    decoder.close()
+
+
+@pytest.mark.asyncio
+async def test_openai_adapter_decodes_images_off_loop(make_client) -> None:
+    """Ensure offloaded decoding returns the images the stand-in encoded."""
+    decoder = PayloadDecoder(threshold_bytes=1, slice_bytes=9)
+    client = make_client({"openai": _standin_adapter(decoder)}, base_url=_BASE_URL)
+
+    images = await client.image.generate(
+        ImageGenerateRequest(provider="openai", model="i", prompt="a cat", count=2)
+    )
+    await client.aclose()
+    decoder.close()
+
+    assert [artifact.content for artifact in images.artifacts] == [MOCK_PNG_BYTES] * 2
+
+
+@pytest.mark.asyncio
+async def test_openai_adapter_decodes_embeddings_off_loop(make_client) -> None:
+    """Ensure offloaded base64 embeddings match the ones decoded inline."""
+    pytest.importorskip("numpy")
+    decoder = PayloadDecoder(threshold_bytes=1, slice_bytes=9)
+    offloaded = make_client({"openai": _standin_adapter(decoder)}, base_url=_BASE_URL)
+    inline = make_client({"openai": _standin_adapter(None)}, base_url=_BASE_URL)
+    embedding = EmbeddingRequest(
+        provider="openai", model="e", input=["alpha", "beta"], vector_format="float32"
+    )
+
+    offloaded_vectors = await offloaded.embedding.embed(embedding)
+    inline_vectors = await inline.embedding.embed(embedding)
+    await offloaded.aclose()
+    await inline.aclose()
+    decoder.close()
+
+    assert offloaded_vectors.vectors == inline_vectors.vectors
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import sys
+
+import httpx
+import pytest
+
+from app.infra.ai.embedding_matrix import EmbeddingMatrix
+from app.infra.ai.exceptions import AIConfigError
+from app.infra.ai.providers.mock import MockProfile, MockProviderAdapter
+from app.infra.ai.providers.mock.server import create_standin_app
+from app.infra.ai.providers.openai import OpenAICompatibleProviderAdapter
+from app.infra.ai.requests import EmbeddingRequest
+
+
+def _standin_adapter() -> OpenAICompatibleProviderAdapter:
+    http_client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_standin_app(MockProfile(embedding_dimensions=96)))
+    )
+    return OpenAICompatibleProviderAdapter(default_timeout_ms=1000, http_client=http_client)
+
+
+@pytest.fixture
+def np():
+    """Provide NumPy, skipping array tests when the embeddings extra is absent."""
+    return pytest.importorskip("numpy")
+
+
+@pytest.mark.asyncio
+async def test_openai_base64_decodes_into_float32_matrix(make_client, np) -> None:
+    """Ensure array-backed responses match the list path and materialize lists lazily."""
+    client = make_client({"openai": _standin_adapter()}, base_url="http://standin/openai/v1")
+    request = {"provider": "openai", "model": "e", "input": ["alpha", "beta", "gamma"]}
+
+    plain = await client.embedding.embed(EmbeddingRequest(**request))
+    packed = await client.embedding.embed(EmbeddingRequest(**request, vector_format="float32"))
+
+    assert plain.matrix is None
+    assert packed.vector_format == "float32"
+    assert packed.matrix.array.dtype == np.float32
+    assert packed.matrix.array.shape == (3, 96)
+    assert packed.matrix.array.flags.c_contiguous
+    assert packed.matrix.buffer().nbytes == 3 * 96 * 4
+    assert packed._vectors is None
+    np.testing.assert_allclose(packed.vectors, plain.vectors, rtol=1e-6)
+    assert packed.model_dump()["vectors"] == packed.vectors
+
+
+@pytest.mark.asyncio
+async def test_quantized_formats_preserve_similarity(make_client, np) -> None:
+    """Ensure int8 and binary batches stay close to the float32 vectors."""
+    client = make_client({"mock": MockProviderAdapter(MockProfile(seed=3))})
+    request = {"provider": "mock", "model": "e", "input": ["a", "b"], "dimensions": 64}
+
+    exact = await client.embedding.embed(EmbeddingRequest(**request, vector_format="float32"))
+    int8 = await client.embedding.embed(EmbeddingRequest(**request, vector_format="int8"))
+    binary = await client.embedding.embed(EmbeddingRequest(**request, vector_format="binary"))
+
+    assert int8.matrix.array.dtype == np.int8
+    assert int8.matrix.scales.shape == (2,)
+    np.testing.assert_allclose(
+        int8.matrix.to_float32(), exact.matrix.array, atol=float(int8.matrix.scales.max())
+    )
+    assert binary.matrix.array.shape == (2, 8)
+    assert binary.dimensions == 64
+    assert np.array_equal(binary.matrix.to_float32() > 0, exact.matrix.array > 0)
+
+
+def test_matrix_rejects_ragged_provider_rows(np) -> None:
+    """Ensure inconsistent provider dimensions are reported instead of padded."""
+    with pytest.raises(ValueError):
+        EmbeddingMatrix.from_provider_rows([[0.1, 0.2], [0.3]])
+
+
+@pytest.mark.asyncio
+async def test_list_vectors_work_without_numpy(monkeypatch, make_client) -> None:
+    """Ensure list embeddings need no extra and array formats name the missing one."""
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    client = make_client({"openai": _standin_adapter()}, base_url="http://standin/openai/v1")
+    request = {"provider": "openai", "model": "e", "input": ["alpha", "beta"]}
+
+    plain = await client.embedding.embed(EmbeddingRequest(**request))
+    with pytest.raises(AIConfigError, match="'embeddings' extra"):
+        await client.embedding.embed(EmbeddingRequest(**request, vector_format="float32"))
+
+    assert plain.matrix is None
+    assert [len(vector) for vector in plain.vectors] == [96, 96]
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.infra.ai.embedding_matrix import EmbeddingMatrix
+from app.infra.ai.exceptions import AIIdempotencyConflictError, AIProviderUnavailableError
+from app.infra.ai.idempotency import IdempotencyStore
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.requests import EmbeddingRequest, ImageGenerateRequest
+from app.infra.ai.responses import EmbeddingResponse, ImageGenerateResponse
+from app.infra.ai.types import Artifact, ArtifactKind
+
+
+class _ImageAdapter(ProviderAdapter):
+    """Count image calls and return one binary artifact per call."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.fail_next = False
+
+    async def generate_image(self, request, model, context):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        if self.fail_next:
+            self.fail_next = False
+            raise AIProviderUnavailableError("down")
+        return ImageGenerateResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=20,
+            artifacts=[Artifact(kind=ArtifactKind.BINARY, content=bytes([self.calls, 0, 255]))],
+        )
+
+
+class _SpoolingAdapter(ProviderAdapter):
+    """Return spooled file artifacts and float32 embedding matrices."""
+
+    def __init__(self, spool_dir) -> None:
+        self.spool_dir = spool_dir
+
+    async def generate_image(self, request, model, context):
+        path = self.spool_dir / f"{context.request_id}.png"
+        path.write_bytes(b"spooled")
+        return ImageGenerateResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            artifacts=[Artifact(kind=ArtifactKind.FILE, path=str(path), mime_type="image/png")],
+        )
+
+    async def embed(self, request, model, context):
+        return EmbeddingResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            dimensions=2,
+            matrix=EmbeddingMatrix.from_vectors([[0.5, -0.25]]),
+        )
+
+
+def _store(redis) -> IdempotencyStore:
+    return IdempotencyStore(redis, poll_interval_ms=5, max_poll_interval_ms=10)
+
+
+def _request(prompt: str = "a cat", key: str = "k1") -> ImageGenerateRequest:
+    return ImageGenerateRequest(
+        provider="fake",
+        model="img",
+        prompt=prompt,
+        idempotency_key=key,
+        metadata={"tenant_id": 3},
+    )
+
+
+@pytest.mark.asyncio
+async def test_retries_share_one_call_across_workers(fake_redis, make_client) -> None:
+    """Ensure concurrent and later retries on any worker reuse a single provider call."""
+    adapter = _ImageAdapter()
+    first_worker = make_client({"fake": adapter}, idempotency=_store(fake_redis))
+    second_worker = make_client({"fake": adapter}, idempotency=_store(fake_redis))
+
+    responses = await asyncio.gather(
+        first_worker.image.generate(_request()),
+        first_worker.image.generate(_request()),
+        second_worker.image.generate(_request()),
+    )
+    replayed = await second_worker.image.generate(_request())
+
+    assert adapter.calls == 1
+    assert {response.request_id for response in [*responses, replayed]} == {responses[0].request_id}
+    assert replayed.artifacts[0].content == bytes([1, 0, 255])
+    assert "ello:ai:idempotency:3:image.generate:k1" in fake_redis.values
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_release_the_key_and_reuse_is_rejected(fake_redis, make_client) -> None:
+    """Ensure a failure lets the retry run again and a reused key must match its request."""
+    adapter = _ImageAdapter()
+    client = make_client({"fake": adapter}, idempotency=_store(fake_redis))
+
+    adapter.fail_next = True
+    with pytest.raises(AIProviderUnavailableError):
+        await client.image.generate(_request())
+    assert fake_redis.values == {}
+
+    await client.image.generate(_request())
+    with pytest.raises(AIIdempotencyConflictError):
+        await client.image.generate(_request(prompt="a dog"))
+    await client.image.generate(_request(prompt="a dog", key="k2"))
+
+    assert adapter.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_replays_inline_spooled_files_and_rebuild_embedding_matrices(
+    tmp_path, fake_redis, make_client
+) -> None:
+    """Ensure replays survive spool cleanup and keep array-backed embeddings."""
+    pytest.importorskip("numpy")
+
+    def worker():
+        return make_client({"fake": _SpoolingAdapter(tmp_path)}, idempotency=_store(fake_redis))
+
+    client = worker()
+
+    first = await client.image.generate(_request())
+    for path in tmp_path.iterdir():
+        path.unlink()
+    replayed = await worker().image.generate(_request())
+
+    assert first.artifacts[0].kind == ArtifactKind.FILE
+    assert replayed.artifacts[0].kind == ArtifactKind.BINARY
+    assert replayed.artifacts[0].content == b"spooled"
+    assert replayed.artifacts[0].mime_type == "image/png"
+
+    request = EmbeddingRequest(
+        provider="fake", model="embed", input="hi", idempotency_key="e1", vector_format="float32"
+    )
+    await client.embedding.embed(request)
+    embedding = await worker().embedding.embed(request)
+
+    assert embedding.vector_format == "float32"
+    assert embedding.matrix is not None
+    assert embedding.matrix.array.tolist() == [[0.5, -0.25]]
+
+
+@pytest.mark.asyncio
+async def test_unavailable_store_runs_calls_directly(fake_redis, make_client) -> None:
+    """Ensure Redis errors never fail the call and a failed release only logs."""
+    adapter = _ImageAdapter()
+    client = make_client({"fake": adapter}, idempotency=_store(fake_redis))
+
+    fake_redis.failing.add("set")
+    await client.image.generate(_request())
+    await client.image.generate(_request())
+    assert adapter.calls == 2
+    assert fake_redis.values == {}
+
+    fake_redis.failing = {"evalsha"}
+    adapter.fail_next = True
+    with pytest.raises(AIProviderUnavailableError):
+        await client.image.generate(_request(key="k2"))
+    assert "ello:ai:idempotency:3:image.generate:k2" in fake_redis.values
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.infra.ai.config import AISettings
+from app.infra.ai.exceptions import AIRateLimitError
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.providers.gemini import GeminiProviderAdapter
+from app.infra.ai.providers.mock import MockProfile
+from app.infra.ai.providers.mock.server import MOCK_PNG_BYTES, create_standin_app
+from app.infra.ai.requests import ImageGenerateRequest
+from app.infra.ai.responses import ImageGenerateResponse
+from app.infra.ai.types import AIUsage, Artifact, ArtifactKind
+
+
+class _TwoPerCallAdapter(ProviderAdapter):
+    """Return at most two images per call and fail the listed calls."""
+
+    def __init__(self, failing_calls: set[int] | None = None) -> None:
+        self.failing_calls = failing_calls or set()
+        self.counts: list[int] = []
+        self.running = 0
+        self.peak = 0
+
+    def max_images_per_call(self, model):
+        return 2
+
+    async def generate_image(self, request, model, context):
+        call = len(self.counts)
+        self.counts.append(request.count)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if call in self.failing_calls:
+            raise AIRateLimitError("slow down", provider=model.provider, model=model.model_id)
+        return ImageGenerateResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            usage=AIUsage.from_counts(output_tokens=request.count),
+            artifacts=[
+                Artifact(kind=ArtifactKind.BINARY, content=f"{call}".encode())
+                for _ in range(request.count)
+            ],
+        )
+
+
+@pytest.mark.asyncio
+async def test_fan_out_merges_partial_results_within_the_concurrency_cap(make_client) -> None:
+    """Ensure failed calls become per-image errors while the other images are returned."""
+    adapter = _TwoPerCallAdapter(failing_calls={1})
+    client = make_client({"fake": adapter}, settings=AISettings(image_fan_out_concurrency=2))
+    request = ImageGenerateRequest(provider="fake", model="i", prompt="a cat", count=5)
+
+    response = await client.image.generate(request)
+
+    assert adapter.counts == [2, 2, 1]
+    assert adapter.peak == 2
+    assert [artifact.content for artifact in response.artifacts] == [b"0", b"0", b"2"]
+    assert [artifact.index for artifact in response.artifacts] == [0, 1, 4]
+    assert [error.index for error in response.errors] == [2, 3]
+    assert response.errors[0].error.error_type == "AIRateLimitError"
+    assert response.usage.output_tokens == 3
+    assert response.attempt_count == 2
+
+    failing = _TwoPerCallAdapter(failing_calls={0, 1})
+    client = make_client({"fake": failing})
+    with pytest.raises(AIRateLimitError):
+        await client.image.generate(request.model_copy(update={"count": 3}))
+
+
+@pytest.mark.asyncio
+async def test_gemini_generates_one_image_per_call(make_client) -> None:
+    """Ensure Gemini image requests are split into single-image calls to the provider."""
+    app = create_standin_app(MockProfile())
+    calls = 0
+
+    async def count_calls(request: httpx.Request) -> None:
+        nonlocal calls
+        calls += 1
+
+    adapter = GeminiProviderAdapter(
+        default_timeout_ms=1000,
+        http_client=httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), event_hooks={"request": [count_calls]}
+        ),
+    )
+    client = make_client({"gemini": adapter}, base_url="http://standin/gemini/v1beta")
+
+    response = await client.image.generate(
+        ImageGenerateRequest(provider="gemini", model="g", prompt="a cat", count=3)
+    )
+    await client.aclose()
+
+    assert calls == 3
+    assert [artifact.content for artifact in response.artifacts] == [MOCK_PNG_BYTES] * 3
+    assert [artifact.index for artifact in response.artifacts] == [0, 1, 2]
+    assert response.errors == []
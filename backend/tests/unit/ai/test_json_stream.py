@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.infra.ai.exceptions import AIOutputParseError
+from app.infra.ai.json_stream import IncrementalJSONParser
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.requests import TextGenerateRequest, TextMessage
+from app.infra.ai.stream import AIDoneEvent, AITextDeltaEvent
+from app.infra.ai.types import AIFinishReason
+
+_DOCUMENT = {
+    "title": 'Say "hi" \\ é你',
+    "items": [{"id": 1, "score": -2.5e3, "ok": True}, {"id": 2, "tags": [], "note": None}],
+    "empty": {},
+}
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[index : index + size] for index in range(0, len(text), size)]
+
+
+class _ChunkAdapter(ProviderAdapter):
+    """Stream fixed chunks and record how many were pulled before closing."""
+
+    def __init__(self, chunks: list[str]) -> None:
+        self.chunks = chunks
+        self.sent = 0
+        self.closed = False
+
+    async def stream_text(self, request, model, context):
+        common = {
+            "request_id": context.request_id,
+            "provider": model.provider,
+            "model": model.model_id,
+            "attempt": 1,
+        }
+        text = ""
+        try:
+            for chunk in self.chunks:
+                self.sent += 1
+                text += chunk
+                yield AITextDeltaEvent(delta=chunk, text=text, **common)
+            yield AIDoneEvent(text=text, finish_reason=AIFinishReason.STOP, **common)
+        finally:
+            self.closed = True
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_parser_matches_json_loads_for_any_chunking(size: int) -> None:
+    """Ensure chunk boundaries inside strings, escapes, and numbers do not matter."""
+    text = "```json\n" + json.dumps(_DOCUMENT, indent=1) + "\n```"
+    parser = IncrementalJSONParser()
+
+    completed = [pair for chunk in _chunks(text, size) for pair in parser.feed(chunk)]
+
+    assert parser.close() == _DOCUMENT
+    assert completed[0] == (("title",), _DOCUMENT["title"])
+    assert (("items", 0, "id"), 1) in completed
+    assert completed.index((("items", 0), _DOCUMENT["items"][0])) < completed.index(
+        (("items", 1, "id"), 2)
+    )
+    assert completed[-1] == ((), _DOCUMENT)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Sure! Here is the JSON", '{"a" 1}', '{"a": tru}', "[1, 2]]", '{"a": 1} trailing'],
+)
+def test_parser_rejects_malformed_output_early(text: str) -> None:
+    """Ensure malformed output fails at the first offending character."""
+    parser = IncrementalJSONParser()
+
+    with pytest.raises(AIOutputParseError):
+        for char in text:
+            parser.feed(char)
+
+
+@pytest.mark.asyncio
+async def test_stream_json_emits_partials_before_done(make_client) -> None:
+    """Ensure fields are emitted while the stream is still running."""
+    adapter = _ChunkAdapter(_chunks(json.dumps(_DOCUMENT), 4))
+    client = make_client({"fake": adapter})
+    request = TextGenerateRequest(
+        provider="fake", model="m", messages=[TextMessage(role="user", content="json")]
+    )
+
+    events = [event async for event in client.text.stream_json(request)]
+    names = [event.event for event in events]
+    partials = [event for event in events if event.event == "json_partial"]
+
+    assert names.index("json_partial") < names.index("done")
+    assert partials[0].path == ["title"]
+    assert partials[-1].path == []
+    assert partials[-1].value == _DOCUMENT
+
+
+@pytest.mark.asyncio
+async def test_stream_json_aborts_malformed_output(make_client) -> None:
+    """Ensure malformed output stops pulling from the provider and ends with an error."""
+    adapter = _ChunkAdapter(["Sure", ", here", " is", " your", " JSON"])
+    client = make_client({"fake": adapter})
+    request = TextGenerateRequest(
+        provider="fake", model="m", messages=[TextMessage(role="user", content="json")]
+    )
+
+    events = [event async for event in client.text.stream_json(request)]
+
+    assert events[-1].event == "error"
+    assert events[-1].error.error_code == "AI_OUTPUT_PARSE_ERROR"
+    assert adapter.sent == 1
+    assert adapter.closed
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.infra.ai.config import AISettings
+from app.infra.ai.exceptions import AIRateLimitError
+from app.infra.ai.ledger import (
+    LEDGER_COLUMNS,
+    AILedger,
+    LedgerRecord,
+    LedgerSink,
+    ParquetLedgerSink,
+    PostgresLedgerSink,
+)
+from app.infra.ai.providers.mock import MockProfile, MockProviderAdapter
+from app.infra.ai.requests import TextGenerateRequest, TextMessage
+from app.infra.ai.telemetry import AITelemetry
+
+
+class _MemorySink(LedgerSink):
+    """Keep written batches in memory and optionally fail writes."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[LedgerRecord]] = []
+        self.fail = False
+
+    async def write(self, records):
+        if self.fail:
+            raise ConnectionError("database is down")
+        self.batches.append(records)
+
+
+def _record(request_id: str, tenant_id: int | None = 1) -> LedgerRecord:
+    return LedgerRecord(
+        recorded_at=datetime(2026, 10, 19, tzinfo=UTC),
+        request_id=request_id,
+        operation="text.generate",
+        tenant_id=tenant_id,
+        principal_id=None,
+        provider="p",
+        model="m",
+        resolved_provider="p",
+        resolved_model="m",
+        success=True,
+        latency_ms=12,
+        attempt_count=1,
+        input_tokens=3,
+        output_tokens=4,
+        total_tokens=7,
+    )
+
+
+@pytest.mark.asyncio
+async def test_ledger_flushes_in_batches_and_drops_instead_of_blocking() -> None:
+    """Ensure a full buffer drops the oldest record and failed writes are counted."""
+    sink = _MemorySink()
+    ledger = AILedger(sink, capacity=3, batch_size=2)
+
+    for index in range(4):
+        ledger.append(_record(f"r{index}"))
+    assert (ledger.pending, ledger.dropped) == (3, 1)
+
+    await ledger.flush()
+    assert [[record.request_id for record in batch] for batch in sink.batches] == [
+        ["r1", "r2"],
+        ["r3"],
+    ]
+
+    sink.fail = True
+    ledger.append(_record("r4"))
+    await ledger.aclose()
+    assert (ledger.pending, ledger.dropped) == (0, 2)
+
+
+@pytest.mark.asyncio
+async def test_client_records_successes_and_failures(make_client) -> None:
+    """Ensure telemetry feeds one ledger record per finished call."""
+    sink = _MemorySink()
+    settings = AISettings()
+    adapters = {
+        "ok": MockProviderAdapter(MockProfile(seed=1, output_tokens=4)),
+        "limited": MockProviderAdapter(MockProfile(seed=1, rate_limit_rate=1.0)),
+    }
+    client = make_client(
+        adapters, max_retries=1, telemetry=AITelemetry(settings, ledger=AILedger(sink))
+    )
+    metadata = {"tenant_id": 5, "principal_id": "9"}
+
+    await client.start()
+    response = await client.text.generate(
+        TextGenerateRequest(
+            provider="ok",
+            model="m",
+            messages=[TextMessage(role="user", content="hi")],
+            metadata=metadata,
+        )
+    )
+    with pytest.raises(AIRateLimitError):
+        await client.text.generate(
+            TextGenerateRequest(
+                provider="limited",
+                model="m",
+                messages=[TextMessage(role="user", content="hi")],
+                metadata=metadata,
+            )
+        )
+    await client.aclose()
+
+    success, failure = [record for batch in sink.batches for record in batch]
+    assert (success.request_id, success.tenant_id, success.principal_id) == (
+        response.request_id,
+        5,
+        9,
+    )
+    assert success.total_tokens == response.usage.total_tokens
+    assert (failure.success, failure.error_code, failure.attempt_count) == (
+        False,
+        "AI_RATE_LIMIT_ERROR",
+        2,
+    )
+
+
+@pytest.mark.asyncio
+async def test_postgres_sink_copies_each_batch() -> None:
+    """Ensure the Postgres sink sends a batch as one COPY of the ledger columns."""
+    copies = []
+
+    class _Driver:
+        async def copy_records_to_table(self, table, *, records, columns):
+            copies.append((table, records, columns))
+
+    class _Raw:
+        driver_connection = _Driver()
+
+    class _Connection:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return None
+
+        async def get_raw_connection(self):
+            return _Raw()
+
+    class _Engine:
+        def connect(self):
+            return _Connection()
+
+    await PostgresLedgerSink(_Engine()).write([_record("a"), _record("b", tenant_id=None)])
+
+    ((table, records, columns),) = copies
+    assert (table, columns) == ("ai_call_ledger", LEDGER_COLUMNS)
+    assert [row[1] for row in records] == ["a", "b"]
+    assert records[1][LEDGER_COLUMNS.index("tenant_id")] is None
+
+
+@pytest.mark.asyncio
+async def test_parquet_sink_rotates_complete_files(tmp_path) -> None:
+    """Ensure Parquet files rotate by row count and only appear once complete."""
+    parquet = pytest.importorskip("pyarrow.parquet")
+    sink = ParquetLedgerSink(tmp_path, rotate_rows=2)
+
+    await sink.write([_record("a"), _record("b")])
+    await sink.write([_record("c")])
+    assert len(list(tmp_path.glob("*.parquet"))) == 1
+    await sink.aclose()
+
+    files = sorted(tmp_path.glob("*.parquet"))
+    assert len(files) == 2
+    assert not list(tmp_path.glob("*.inprogress"))
+    rows = [row for path in files for row in parquet.read_table(path).to_pylist()]
+    assert [row["request_id"] for row in rows] == ["a", "b", "c"]
+    assert rows[0]["total_tokens"] == 7
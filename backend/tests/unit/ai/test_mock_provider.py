@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from app.infra.ai.exceptions import AIProviderUnavailableError, AIRateLimitError
+from app.infra.ai.providers.anthropic import AnthropicProviderAdapter
+from app.infra.ai.providers.gemini import GeminiProviderAdapter
+from app.infra.ai.providers.mock import MockProfile, MockProviderAdapter
+from app.infra.ai.providers.mock.server import create_standin_app
+from app.infra.ai.providers.openai import OpenAICompatibleProviderAdapter
+from app.infra.ai.requests import EmbeddingRequest, TextGenerateRequest, TextMessage
+
+
+def _text_request(provider: str) -> TextGenerateRequest:
+    return TextGenerateRequest(
+        provider=provider,
+        model="m",
+        messages=[TextMessage(role="user", content="hi")],
+    )
+
+
+def _standin_adapter(name: str, profile: MockProfile):
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_standin_app(profile)))
+    if name == "openai":
+        return OpenAICompatibleProviderAdapter(default_timeout_ms=1000, http_client=http_client)
+    if name == "anthropic":
+        return AnthropicProviderAdapter(default_timeout_ms=1000, http_client=http_client)
+    return GeminiProviderAdapter(default_timeout_ms=1000, http_client=http_client)
+
+
+_STANDIN_BASE_URLS = {
+    "openai": "http://standin/openai/v1",
+    "anthropic": "http://standin/anthropic/v1",
+    "gemini": "http://standin/gemini/v1beta",
+}
+
+
+@pytest.mark.asyncio
+async def test_mock_adapter_is_deterministic_per_seed(make_client) -> None:
+    """Ensure two adapters with the same seed produce identical outputs and embeddings."""
+    outputs = []
+    for _ in range(2):
+        client = make_client({"mock": MockProviderAdapter(MockProfile(seed=7))})
+        response = await client.text.generate(_text_request("mock"))
+        embedding = await client.embedding.embed(
+            EmbeddingRequest(provider="mock", model="e", input=["a", "b"])
+        )
+        outputs.append((response.text, embedding.vectors))
+
+    assert outputs[0] == outputs[1]
+    assert len(outputs[0][0].split()) == 16
+
+
+@pytest.mark.asyncio
+async def test_mock_adapter_injects_retryable_faults(make_client) -> None:
+    """Ensure injected 5xx faults surface as retryable provider errors after retries."""
+    adapter = MockProviderAdapter(MockProfile(server_error_rate=1.0))
+    client = make_client({"mock": adapter}, max_retries=1)
+
+    with pytest.raises(AIProviderUnavailableError) as exc_info:
+        await client.text.generate(_text_request("mock"))
+
+    assert exc_info.value.retryable
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("provider", ["openai", "anthropic", "gemini"])
+async def test_standin_serves_each_wire_format(provider: str, make_client) -> None:
+    """Ensure the real adapters parse the stand-in's streaming and unary responses."""
+    profile = MockProfile(seed=3, output_tokens=5)
+    client = make_client(
+        {provider: _standin_adapter(provider, profile)}, base_url=_STANDIN_BASE_URLS[provider]
+    )
+
+    response = await client.text.generate(_text_request(provider))
+    events = [event async for event in client.text.stream(_text_request(provider))]
+
+    assert len(response.text.split()) == 5
+    assert events[-1].event == "done"
+    assert len(events[-1].text.split()) == 5
+    assert events[-1].usage.output_tokens == 5
+
+
+@pytest.mark.asyncio
+async def test_standin_rate_limit_maps_to_sdk_error(make_client) -> None:
+    """Ensure a 429 from the stand-in is classified as a rate-limit error."""
+    adapter = _standin_adapter("openai", MockProfile(rate_limit_rate=1.0))
+    client = make_client({"openai": adapter}, base_url=_STANDIN_BASE_URLS["openai"])
+
+    with pytest.raises(AIRateLimitError):
+        await client.text.generate(_text_request("openai"))
+
+
+@pytest.mark.asyncio
+async def test_standin_replays_recorded_stream(tmp_path, make_client) -> None:
+    """Ensure recorded SSE files are replayed and delay comments are stripped."""
+    (tmp_path / "openai.sse").write_text(
+        'data: {"choices":[{"index":0,"delta":{"content":"re"}}]}\n\n'
+        ": delay_ms=1\n"
+        'data: {"choices":[{"index":0,"delta":{"content":"play"},"finish_reason":"stop"}]}\n\n'
+        "data: [DONE]\n\n",
+        encoding="utf-8",
+    )
+    adapter = _standin_adapter("openai", MockProfile(replay_path=str(tmp_path)))
+    client = make_client({"openai": adapter}, base_url=_STANDIN_BASE_URLS["openai"])
+
+    events = [event async for event in client.text.stream(_text_request("openai"))]
+
+    assert events[-1].event == "done"
+    assert events[-1].text == "replay"
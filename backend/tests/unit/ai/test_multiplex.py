@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import struct
+
+import pytest
+from fastapi import FastAPI, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from app.core import AuthContext, require_ws_auth
+from app.infra.ai.client import get_ai_client_dependency
+from app.infra.ai.providers.mock import MockProfile, MockProviderAdapter
+from app.infra.ai.stream import AITextDeltaEvent
+from app.modules.ai import MULTIPLEX_PROTOCOL, StreamMultiplexer, ai_router
+
+_CHAT = {"provider": "mock", "model": "m", "messages": [{"role": "user", "content": "hi"}]}
+
+
+class _FakeWebSocket:
+    """Feed client messages from a queue and collect server frames."""
+
+    def __init__(self) -> None:
+        self.inbox: asyncio.Queue[str | bytes | None] = asyncio.Queue()
+        self.frames: asyncio.Queue[str | bytes] = asyncio.Queue()
+
+    async def receive(self) -> dict:
+        message = await self.inbox.get()
+        if message is None:
+            return {"type": "websocket.disconnect", "code": 1000}
+        if isinstance(message, bytes):
+            return {"type": "websocket.receive", "bytes": message}
+        return {"type": "websocket.receive", "text": message}
+
+    async def send_text(self, data: str) -> None:
+        await self.frames.put(data)
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self.frames.put(data)
+
+    def send(self, message: dict) -> None:
+        self.inbox.put_nowait(json.dumps(message))
+
+    async def next_frame(self) -> str | bytes:
+        return await asyncio.wait_for(self.frames.get(), timeout=1)
+
+
+def _decode_binary(frame: bytes) -> tuple[str, str, object]:
+    (id_length,) = struct.unpack_from("!B", frame)
+    stream_id = frame[1 : 1 + id_length].decode()
+    offset = 1 + id_length
+    (event_length,) = struct.unpack_from("!B", frame, offset)
+    event = frame[offset + 1 : offset + 1 + event_length].decode()
+    return stream_id, event, json.loads(frame[offset + 1 + event_length :])
+
+
+def _delta(index: int) -> AITextDeltaEvent:
+    return AITextDeltaEvent(
+        request_id="r", provider="p", model="m", attempt=1, delta=str(index), text=str(index)
+    )
+
+
+def _app(client) -> FastAPI:
+    app = FastAPI()
+    app.include_router(ai_router)
+    app.dependency_overrides[require_ws_auth] = lambda: AuthContext(
+        session_id=1,
+        principal_id=2,
+        tenant_id=3,
+        principal_type="user",
+        session_version=1,
+        authz_version=1,
+    )
+    app.dependency_overrides[get_ai_client_dependency] = lambda: client
+    return app
+
+
+def test_endpoint_multiplexes_streams_tagged_by_id(make_client) -> None:
+    """Ensure two streams on one socket each run to ``done`` with frames tagged by id."""
+    client = make_client({"mock": MockProviderAdapter(MockProfile(seed=1, output_tokens=3))})
+    app = _app(client)
+
+    with (
+        TestClient(app) as http_client,
+        http_client.websocket_connect(
+            "/api/ai/chat/ws", subprotocols=[MULTIPLEX_PROTOCOL]
+        ) as websocket,
+    ):
+        assert websocket.accepted_subprotocol == MULTIPLEX_PROTOCOL
+        websocket.send_text(json.dumps({"type": "start", "id": "a", "request": _CHAT}))
+        websocket.send_text(json.dumps({"type": "start", "id": "b", "request": _CHAT}))
+        events: dict[str, list[str]] = {"a": [], "b": []}
+        while not all(names and names[-1] == "done" for names in events.values()):
+            frame = websocket.receive_json()
+            events[frame["id"]].append(frame["event"])
+
+    for names in events.values():
+        assert names[0] == "start"
+        assert "text_delta" in names
+
+
+def test_endpoint_requires_the_multiplex_subprotocol(make_client) -> None:
+    """Ensure a handshake offering only the bearer protocol is closed with 1002."""
+    app = _app(make_client({"mock": MockProviderAdapter(MockProfile(seed=1))}))
+
+    with (
+        TestClient(app) as http_client,
+        pytest.raises(WebSocketDisconnect) as disconnect,
+        http_client.websocket_connect("/api/ai/chat/ws", subprotocols=["bearer.token"]),
+    ):
+        pass
+
+    assert disconnect.value.code == 1002
+
+
+@pytest.mark.asyncio
+async def test_stream_waits_for_credit_and_uses_binary_frames() -> None:
+    """Ensure a stream stops reading at zero credit and resumes when granted more."""
+    websocket = _FakeWebSocket()
+    produced = 0
+
+    async def open_stream(request):
+        nonlocal produced
+        for index in range(5):
+            produced += 1
+            yield _delta(index)
+
+    serve = asyncio.create_task(
+        StreamMultiplexer(websocket, open_stream, encoding="binary", initial_credit=2).serve()
+    )
+    websocket.send({"type": "start", "id": "s1", "request": _CHAT})
+
+    first = [_decode_binary(await websocket.next_frame()) for _ in range(2)]
+    await asyncio.sleep(0.02)
+    assert [(stream_id, event) for stream_id, event, _ in first] == [("s1", "text_delta")] * 2
+    assert websocket.frames.empty()
+    assert produced == 3
+
+    websocket.send({"type": "credit", "id": "s1", "frames": 10})
+    rest = [_decode_binary(await websocket.next_frame()) for _ in range(3)]
+    assert [data["delta"] for _, _, data in first + rest] == ["0", "1", "2", "3", "4"]
+
+    websocket.inbox.put_nowait(None)
+    await asyncio.wait_for(serve, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_cancel_closes_upstream_and_bad_messages_are_rejected() -> None:
+    """Ensure cancel closes only its stream and invalid messages get ``rejected`` frames."""
+    websocket = _FakeWebSocket()
+    closed: list[str] = []
+
+    async def open_stream(request):
+        try:
+            yield _delta(0)
+            await asyncio.Event().wait()
+        finally:
+            closed.append(request.model)
+
+    serve = asyncio.create_task(StreamMultiplexer(websocket, open_stream, max_streams=2).serve())
+    websocket.send({"type": "start", "id": "a", "request": {**_CHAT, "model": "a"}})
+    websocket.send({"type": "start", "id": "b", "request": {**_CHAT, "model": "b"}})
+    frames = [json.loads(await websocket.next_frame()) for _ in range(2)]
+    assert {frame["id"] for frame in frames} == {"a", "b"}
+
+    websocket.send({"type": "start", "id": "a", "request": _CHAT})
+    websocket.send({"type": "start", "id": "c", "request": _CHAT})
+    websocket.inbox.put_nowait("not json")
+    websocket.inbox.put_nowait(json.dumps({"type": "cancel", "id": "b"}).encode())
+    websocket.send({"type": "start", "id": "€" * 30, "request": _CHAT})
+    rejected = [json.loads(await websocket.next_frame()) for _ in range(5)]
+    assert [(frame["id"], frame["event"], frame["data"]["code"]) for frame in rejected] == [
+        ("a", "rejected", "B0305"),
+        ("c", "rejected", "B0306"),
+        (None, "rejected", "B0304"),
+        (None, "rejected", "B0304"),
+        (None, "rejected", "B0304"),
+    ]
+
+    websocket.send({"type": "cancel", "id": "a"})
+    assert json.loads(await websocket.next_frame()) == {
+        "id": "a",
+        "event": "cancelled",
+        "data": None,
+    }
+    assert closed == ["a"]
+
+    websocket.inbox.put_nowait(None)
+    await asyncio.wait_for(serve, timeout=1)
+    assert closed == ["a", "b"]
+    assert websocket.frames.empty()
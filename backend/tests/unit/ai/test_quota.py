@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import calendar
+from contextlib import aclosing
+
+import pytest
+
+from app.infra.ai.config import AIQuotaSettings, AISettings
+from app.infra.ai.exceptions import AIQuotaExceededError, AIRateLimitError
+from app.infra.ai.providers.mock import MockProfile, MockProviderAdapter
+from app.infra.ai.quota import (
+    QuotaLimit,
+    QuotaService,
+    _window_period,
+    estimate_request_tokens,
+)
+from app.infra.ai.requests import EmbeddingRequest, TextGenerateRequest, TextMessage
+
+_NOW = calendar.timegm((2026, 12, 31, 23, 0, 0))
+
+
+def _service(redis, *limits: QuotaLimit) -> QuotaService:
+    return QuotaService(redis, list(limits), key_prefix="q", clock=lambda: _NOW)
+
+
+@pytest.mark.asyncio
+async def test_reservations_are_all_or_nothing_and_rejections_cached(fake_redis) -> None:
+    """Ensure a rejected reservation changes no counter and repeats skip Redis."""
+    quota = _service(
+        fake_redis,
+        QuotaLimit("tenant", "daily", "tokens", 100),
+        QuotaLimit("principal", "monthly", "requests", 2),
+    )
+
+    await quota.reserve(tenant_id=1, principal_id=7, tokens=60)
+    with pytest.raises(AIQuotaExceededError, match="Daily tokens quota of tenant 1"):
+        await quota.reserve(tenant_id=1, principal_id=7, tokens=60)
+    assert fake_redis.values == {
+        "q:tenant:1:tokens:20261231": 60,
+        "q:principal:7:requests:202612": 1,
+    }
+    assert fake_redis.round_trips == 2
+
+    with pytest.raises(AIQuotaExceededError):
+        await quota.reserve(tenant_id=1, principal_id=7, tokens=60)
+    assert fake_redis.round_trips == 2
+
+    await quota.reserve(tenant_id=1, principal_id=8, tokens=0)
+    await quota.reserve(tenant_id=2, principal_id=7, tokens=30)
+    with pytest.raises(AIQuotaExceededError, match="Monthly requests quota of principal 7"):
+        await quota.reserve(tenant_id=2, principal_id=7, tokens=30)
+    assert fake_redis.ttls["q:tenant:1:tokens:20261231"] == 3_600 + 3_600
+
+
+def test_embedding_estimates_count_texts_not_characters() -> None:
+    """Ensure a single string input is estimated as one text like a one-item list."""
+    single = EmbeddingRequest(provider="p", model="e", input="x" * 400)
+    batch = EmbeddingRequest(provider="p", model="e", input=["x" * 400, "y" * 8])
+
+    assert estimate_request_tokens(single, default_output_tokens=500) == 101
+    assert estimate_request_tokens(batch, default_output_tokens=500) == 101 + 3
+
+
+def test_windows_roll_over_at_utc_boundaries() -> None:
+    """Ensure daily and monthly windows end at the next UTC day and month."""
+    assert _window_period("daily", _NOW) == ("20261231", calendar.timegm((2027, 1, 1, 0, 0, 0)))
+    assert _window_period("monthly", _NOW) == ("202612", calendar.timegm((2027, 1, 1, 0, 0, 0)))
+
+
+@pytest.mark.asyncio
+async def test_client_reconciles_usage_and_refunds_failures(fake_redis, make_client) -> None:
+    """Ensure the client settles reservations against actual usage and refunds errors."""
+    settings = AISettings(quota=AIQuotaSettings(enabled=True, default_output_tokens=500))
+    quota = _service(fake_redis, QuotaLimit("tenant", "daily", "tokens", 10_000))
+    adapter = MockProviderAdapter(MockProfile(seed=1, output_tokens=4))
+    client = make_client({"mock": adapter}, settings=settings, quota=quota)
+    request = TextGenerateRequest(
+        provider="mock",
+        model="m",
+        messages=[TextMessage(role="user", content="hello")],
+        metadata={"tenant_id": 5},
+    )
+
+    response = await client.text.generate(request)
+    await quota.aclose()
+    assert fake_redis.values["q:tenant:5:tokens:20261231"] == response.usage.total_tokens
+
+    events = [event async for event in client.text.stream(request)]
+    await quota.aclose()
+    assert fake_redis.values["q:tenant:5:tokens:20261231"] == (
+        response.usage.total_tokens + events[-1].usage.total_tokens
+    )
+
+    before = fake_redis.values["q:tenant:5:tokens:20261231"]
+    client._adapters["mock"] = MockProviderAdapter(MockProfile(seed=1, rate_limit_rate=1.0))
+    with pytest.raises(AIRateLimitError):
+        await client.text.generate(request)
+    events = [event async for event in client.text.stream(request)]
+    await quota.aclose()
+    assert events[-1].event == "error"
+    assert fake_redis.values["q:tenant:5:tokens:20261231"] == before
+
+    client._adapters["mock"] = adapter
+    async with aclosing(client.text.stream(request)) as stream:
+        async for event in stream:
+            if event.event == "done":
+                break
+    await quota.aclose()
+    assert fake_redis.values["q:tenant:5:tokens:20261231"] == before + event.usage.total_tokens
+
+
+@pytest.mark.asyncio
+async def test_failed_reconciliation_is_logged_and_clears_cached_rejections(fake_redis) -> None:
+    """Ensure a Redis error while settling is swallowed and rejections are re-checked."""
+    quota = _service(fake_redis, QuotaLimit("tenant", "daily", "tokens", 100))
+    reservation = await quota.reserve(tenant_id=1, principal_id=None, tokens=80)
+    with pytest.raises(AIQuotaExceededError):
+        await quota.reserve(tenant_id=1, principal_id=None, tokens=30)
+
+    fake_redis.failing.add("incrby")
+    quota.settle(reservation, 10)
+    await quota.aclose()
+    assert fake_redis.values == {"q:tenant:1:tokens:20261231": 80}
+
+    fake_redis.failing.clear()
+    round_trips = fake_redis.round_trips
+    with pytest.raises(AIQuotaExceededError):
+        await quota.reserve(tenant_id=1, principal_id=None, tokens=30)
+    assert fake_redis.round_trips == round_trips + 1
+
+
+@pytest.mark.asyncio
+async def test_reservations_fail_closed_when_redis_is_down(fake_redis) -> None:
+    """Ensure an unreachable Redis rejects the request instead of skipping the quota."""
+    quota = _service(fake_redis, QuotaLimit("tenant", "daily", "tokens", 100))
+    fake_redis.failing.add("evalsha")
+
+    with pytest.raises(ConnectionError):
+        await quota.reserve(tenant_id=1, principal_id=None, tokens=10)
+    assert fake_redis.values == {}
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.infra.ai.config import AISchedulerSettings, AISettings
+from app.infra.ai.exceptions import AIOverloadedError
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.requests import EmbeddingRequest
+from app.infra.ai.responses import EmbeddingResponse
+from app.infra.ai.scheduler import FairScheduler
+
+
+def _scheduler(**overrides) -> FairScheduler:
+    options = {
+        "provider": "p",
+        "max_concurrency": 1,
+        "class_weights": {"interactive": 3.0, "background": 2.0, "batch": 1.0},
+    }
+    return FairScheduler(**(options | overrides))
+
+
+async def _drain(scheduler: FairScheduler, calls: list[tuple[str, str, str]]) -> list[str]:
+    """Queue calls behind a held slot, release it, and return the service order."""
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot("holder", "interactive"):
+            await release.wait()
+
+    async def call(tenant: str, priority: str, label: str) -> None:
+        async with scheduler.slot(tenant, priority):
+            order.append(label)
+            await asyncio.sleep(0)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    tasks = []
+    for tenant, priority, label in calls:
+        tasks.append(asyncio.create_task(call(tenant, priority, label)))
+        await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(holder, *tasks, return_exceptions=True)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_tenants_share_a_class_fairly() -> None:
+    """Ensure a tenant's backlog does not delay another tenant's calls."""
+    calls = [("bulk", "batch", f"bulk{i}") for i in range(6)]
+    calls += [("chat", "batch", "chat0"), ("chat", "batch", "chat1")]
+
+    order = await _drain(_scheduler(), calls)
+
+    assert order[:4] == ["bulk0", "chat0", "bulk1", "chat1"]
+    assert order[4:] == ["bulk2", "bulk3", "bulk4", "bulk5"]
+
+
+@pytest.mark.asyncio
+async def test_priority_classes_share_slots_by_weight() -> None:
+    """Ensure interactive calls overtake queued batch work without starving it."""
+    calls = [("t", "batch", "B") for _ in range(8)]
+    calls += [("t", "interactive", "I") for _ in range(8)]
+
+    order = await _drain(_scheduler(), calls)
+
+    assert "".join(order[:8]).count("I") == 6
+    assert sorted(order) == ["B"] * 8 + ["I"] * 8
+
+
+@pytest.mark.asyncio
+async def test_bounded_queues_shed_load() -> None:
+    """Ensure full queues reject or evict lower classes and long waits time out."""
+    scheduler = _scheduler(max_queue=2, max_queue_per_tenant=2, max_wait_ms=50)
+    release = asyncio.Event()
+
+    async def call(tenant: str, priority: str) -> str:
+        async with scheduler.slot(tenant, priority):
+            await release.wait()
+            return tenant
+
+    holder = asyncio.create_task(call("holder", "interactive"))
+    await asyncio.sleep(0)
+    batch_old = asyncio.create_task(call("a", "batch"))
+    await asyncio.sleep(0)
+    batch_new = asyncio.create_task(call("a", "batch"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AIOverloadedError):
+        await call("a", "interactive")
+    interactive = asyncio.create_task(call("b", "interactive"))
+    await asyncio.sleep(0)
+    with pytest.raises(AIOverloadedError):
+        await batch_new
+    with pytest.raises(AIOverloadedError):
+        await call("c", "batch")
+
+    results = await asyncio.gather(batch_old, interactive, return_exceptions=True)
+    assert all(isinstance(result, AIOverloadedError) for result in results)
+    release.set()
+    assert await holder == "holder"
+    assert (scheduler.active, scheduler.queued) == (0, 0)
+
+
+class _SlowAdapter(ProviderAdapter):
+    """Track how many embed calls run at once."""
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.peak = 0
+
+    async def embed(self, request, model, context):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return EmbeddingResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            vectors=[[0.0]],
+            dimensions=1,
+        )
+
+
+@pytest.mark.asyncio
+async def test_client_limits_provider_concurrency_per_scheduler(make_client) -> None:
+    """Ensure the client routes adapter calls through the provider's scheduler."""
+    settings = AISettings(
+        scheduler=AISchedulerSettings(enabled=True, max_concurrency_per_provider=2)
+    )
+    adapter = _SlowAdapter()
+    client = make_client({"slow": adapter}, settings=settings)
+
+    await asyncio.gather(
+        *(
+            client.embedding.embed(
+                EmbeddingRequest(
+                    provider="slow",
+                    model="e",
+                    input=["x"],
+                    metadata={"tenant_id": i % 3, "priority": "batch"},
+                )
+            )
+            for i in range(6)
+        )
+    )
+
+    assert adapter.peak == 2
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.infra.ai.config import AISemanticCacheSettings, AISettings
+from app.infra.ai.exceptions import AIProviderUnavailableError
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.requests import TextGenerateRequest, TextMessage
+from app.infra.ai.responses import EmbeddingResponse, TextGenerateResponse
+from app.infra.ai.semantic_cache import DiskCacheStore, RedisCacheStore
+from app.infra.ai.types import AIFinishReason, AIUsage
+
+_TOPICS = ("capital of france", "weather", "refund")
+
+
+class _TopicAdapter(ProviderAdapter):
+    """Embed by topic keyword so paraphrases land on the same vector."""
+
+    def __init__(self) -> None:
+        self.generate_calls = 0
+
+    async def generate_text(self, request, model, context):
+        self.generate_calls += 1
+        return TextGenerateResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            usage=AIUsage.from_counts(input_tokens=10, output_tokens=5),
+            text=f"answer #{self.generate_calls}",
+            finish_reason=AIFinishReason.STOP,
+        )
+
+    async def embed(self, request, model, context):
+        text = request.input if isinstance(request.input, str) else request.input[0]
+        vector = [1.0 if topic in text else 0.0 for topic in _TOPICS] + [0.01]
+        return EmbeddingResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            vectors=[vector],
+            dimensions=len(vector),
+        )
+
+
+def _settings(**cache_options) -> AISettings:
+    return AISettings(
+        semantic_cache=AISemanticCacheSettings(
+            enabled=True, embedding_provider="fake", embedding_model="embed", **cache_options
+        )
+    )
+
+
+def _request(content: str, **metadata) -> TextGenerateRequest:
+    return TextGenerateRequest(
+        provider="fake",
+        model="m",
+        messages=[TextMessage(role="user", content=content)],
+        metadata=metadata,
+    )
+
+
+@pytest.mark.asyncio
+async def test_paraphrase_is_served_from_cache_within_tenant(make_client) -> None:
+    """Ensure paraphrases hit the cache while other tenants and topics miss."""
+    adapter = _TopicAdapter()
+    client = make_client({"fake": adapter}, settings=_settings())
+
+    first = await client.text.generate(_request("What is the capital of France?", tenant_id="a"))
+    paraphrase = await client.text.generate(
+        _request("  the CAPITAL of   France, please", tenant_id="a")
+    )
+    other_tenant = await client.text.generate(
+        _request("What is the capital of France?", tenant_id="b")
+    )
+    other_topic = await client.text.generate(_request("How is the weather?", tenant_id="a"))
+
+    assert not first.cache_hit
+    assert paraphrase.cache_hit
+    assert paraphrase.text == first.text
+    assert paraphrase.request_id != first.request_id
+    assert paraphrase.usage.total_tokens == 0
+    assert not other_tenant.cache_hit
+    assert not other_topic.cache_hit
+    assert adapter.generate_calls == 3
+    assert client.semantic_cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_opt_out_and_expiry_bypass_cache(make_client) -> None:
+    """Ensure opted-out requests skip the cache and expired entries are not served."""
+    adapter = _TopicAdapter()
+    client = make_client({"fake": adapter}, settings=_settings(ttl_s=0))
+
+    await client.text.generate(_request("refund please"))
+    expired = await client.text.generate(_request("refund please"))
+    opted_out = await client.text.generate(_request("refund please", semantic_cache=False))
+
+    assert not expired.cache_hit
+    assert not opted_out.cache_hit
+    assert client.semantic_cache.stats.bypassed == 1
+
+
+@pytest.mark.asyncio
+async def test_partition_evicts_least_recently_used_entry(make_client) -> None:
+    """Ensure a full partition evicts the least recently used response."""
+    adapter = _TopicAdapter()
+    client = make_client({"fake": adapter}, settings=_settings(max_entries_per_partition=2))
+
+    await client.text.generate(_request("capital of france"))
+    await client.text.generate(_request("weather"))
+    await client.text.generate(_request("capital of france"))
+    await client.text.generate(_request("refund"))
+
+    assert (await client.text.generate(_request("capital of france"))).cache_hit
+    assert not (await client.text.generate(_request("weather"))).cache_hit
+    assert client.semantic_cache.stats.evictions >= 1
+
+
+@pytest.mark.asyncio
+async def test_disk_store_restores_entries_and_false_positive_evicts(tmp_path, make_client) -> None:
+    """Ensure snapshots survive restarts and reported false positives are evicted."""
+    path = tmp_path / "cache.jsonl"
+    writer = make_client(
+        {"fake": _TopicAdapter()}, settings=_settings(), semantic_cache_store=DiskCacheStore(path)
+    )
+    await writer.text.generate(_request("weather"))
+    await writer.aclose()
+
+    reader = make_client(
+        {"fake": _TopicAdapter()}, settings=_settings(), semantic_cache_store=DiskCacheStore(path)
+    )
+    await reader.start()
+    hit = await reader.text.generate(_request("weather today"))
+    assert hit.cache_hit
+
+    cache = reader.semantic_cache
+    lookup = await cache.lookup(_request("weather"))
+    assert await cache.report_false_positive(lookup.partition, lookup.entry_id)
+    assert not (await reader.text.generate(_request("weather"))).cache_hit
+    assert cache.stats.false_positive_rate > 0
+
+
+@pytest.mark.asyncio
+async def test_global_cap_and_sweep_bound_partitions(make_client) -> None:
+    """Ensure the global cap evicts across partitions and sweeps drop expired partitions."""
+    adapter = _TopicAdapter()
+    client = make_client({"fake": adapter}, settings=_settings(max_entries=2))
+    cache = client.semantic_cache
+
+    for tenant in ("a", "b", "c"):
+        await client.text.generate(_request("weather", tenant_id=tenant))
+
+    assert sorted(key.split("|")[0] for key in cache._partitions) == ["b", "c"]
+    assert not (await client.text.generate(_request("weather", tenant_id="a"))).cache_hit
+
+    expiring = make_client(
+        {"fake": _TopicAdapter()}, settings=_settings(ttl_s=0, sweep_interval_s=0)
+    )
+    for tenant in ("a", "b", "c"):
+        await expiring.text.generate(_request("weather", tenant_id=tenant))
+    assert len(expiring.semantic_cache._partitions) == 1
+
+
+@pytest.mark.asyncio
+async def test_sampling_controls_are_part_of_the_partition(make_client) -> None:
+    """Ensure answers are not reused across different temperature, token, or stop settings."""
+    adapter = _TopicAdapter()
+    client = make_client({"fake": adapter}, settings=_settings())
+    request = _request("weather")
+
+    await client.text.generate(request)
+    assert (await client.text.generate(request)).cache_hit
+    for update in ({"temperature": 1.5}, {"max_tokens": 5}, {"stop": ["\n"]}):
+        assert not (await client.text.generate(request.model_copy(update=update))).cache_hit
+
+
+@pytest.mark.asyncio
+async def test_embedding_failures_fall_through_to_the_provider(make_client) -> None:
+    """Ensure an unavailable embedding model costs the cache, not the request."""
+    adapter = _TopicAdapter()
+    client = make_client({"fake": adapter}, settings=_settings())
+
+    async def unavailable(request, model, context):
+        raise AIProviderUnavailableError("embeddings down")
+
+    adapter.embed = unavailable
+    first = await client.text.generate(_request("weather"))
+    second = await client.text.generate(_request("weather"))
+
+    assert not first.cache_hit
+    assert not second.cache_hit
+    assert adapter.generate_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_cache_writes_still_return_the_response(fake_redis, make_client) -> None:
+    """Ensure a store that cannot persist entries does not discard a paid generation."""
+    adapter = _TopicAdapter()
+    client = make_client(
+        {"fake": adapter},
+        settings=_settings(),
+        semantic_cache_store=RedisCacheStore(fake_redis),
+    )
+    fake_redis.failing.add("set")
+
+    response = await client.text.generate(_request("weather"))
+
+    assert response.text == "answer #1"
+    assert not response.cache_hit
+    assert fake_redis.values == {}
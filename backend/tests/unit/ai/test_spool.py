@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import base64
+import os
+
+import httpx
+import pytest
+
+from app.infra.ai.providers.openai import OpenAICompatibleProviderAdapter
+from app.infra.ai.requests import AudioGenerateRequest
+from app.infra.ai.spool import ArtifactSpooler
+from app.infra.ai.types import ArtifactKind
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_spool_stream_keeps_small_payloads_inline(tmp_path) -> None:
+    """Ensure payloads under the threshold never touch the disk."""
+    spooler = ArtifactSpooler(directory=str(tmp_path), inline_threshold_bytes=8)
+
+    artifact = await spooler.spool_stream(
+        _chunks(b"abc", b"def"), mime_type="audio/mpeg", filename="a.mp3"
+    )
+
+    assert artifact.kind is ArtifactKind.BINARY
+    assert artifact.content == b"abcdef"
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_spool_stream_and_base64_write_large_payloads_to_files(tmp_path) -> None:
+    """Ensure payloads above the threshold become file artifacts with identical bytes."""
+    spooler = ArtifactSpooler(directory=str(tmp_path), inline_threshold_bytes=4, chunk_size_bytes=5)
+    payload = bytes(range(256)) * 3
+
+    streamed = await spooler.spool_stream(
+        _chunks(payload[:3], payload[3:100], payload[100:]),
+        mime_type="audio/mpeg",
+        filename="a.mp3",
+    )
+    decoded = await spooler.spool_base64(
+        base64.b64encode(payload).decode(), mime_type="image/png", filename="image-1"
+    )
+
+    for artifact in (streamed, decoded):
+        assert artifact.kind is ArtifactKind.FILE
+        assert artifact.content is None
+        with open(artifact.path, "rb") as handle:
+            assert handle.read() == payload
+    assert streamed.path.endswith(".mp3")
+    assert decoded.path.endswith(".png")
+
+
+class _RecordingSpooler(ArtifactSpooler):
+    """Keep the size of every chunk handed to the spooler."""
+
+    def __init__(self, **options) -> None:
+        super().__init__(**options)
+        self.chunk_sizes: list[int] = []
+
+    async def spool_stream(self, chunks, *, mime_type, filename):
+        async def recorded():
+            async for chunk in chunks:
+                self.chunk_sizes.append(len(chunk))
+                yield chunk
+
+        return await super().spool_stream(recorded(), mime_type=mime_type, filename=filename)
+
+
+@pytest.mark.asyncio
+async def test_openai_speech_is_read_in_spool_sized_chunks(tmp_path, make_client) -> None:
+    """Ensure the speech body is read in the configured chunk size while spooling."""
+    spooler = _RecordingSpooler(
+        directory=str(tmp_path), inline_threshold_bytes=10, chunk_size_bytes=40
+    )
+    body = bytes(range(100))
+    adapter = OpenAICompatibleProviderAdapter(
+        default_timeout_ms=1000,
+        spooler=spooler,
+        http_client=httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200, content=body, headers={"content-type": "audio/mpeg"}
+                )
+            )
+        ),
+    )
+    client = make_client({"openai": adapter}, base_url="http://fake/v1")
+
+    response = await client.audio.generate(
+        AudioGenerateRequest(provider="openai", model="tts-1", input_text="hi")
+    )
+
+    assert spooler.chunk_sizes == [40, 40, 20]
+    with open(response.artifacts[0].path, "rb") as handle:
+        assert handle.read() == body
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.infra.ai.broker import StreamBroker
+from app.infra.ai.providers.mock import MockProfile, MockProviderAdapter
+from app.infra.ai.requests import TextGenerateRequest, TextMessage
+
+
+def _adapters() -> dict[str, MockProviderAdapter]:
+    return {"mock": MockProviderAdapter(MockProfile(seed=2, output_tokens=4))}
+
+
+def _request(provider: str = "mock") -> TextGenerateRequest:
+    return TextGenerateRequest(
+        provider=provider, model="m", messages=[TextMessage(role="user", content="hi")]
+    )
+
+
+@pytest.mark.asyncio
+async def test_subscribers_resume_from_any_entry_of_one_generation(fake_redis, make_client) -> None:
+    """Ensure one producer feeds full replays and resumed subscribers alike."""
+    broker = StreamBroker(fake_redis, block_ms=200)
+    generation_id = await broker.publish(
+        make_client(_adapters()).text.stream(_request()), owner="1:2"
+    )
+
+    full = [event async for event in broker.subscribe(generation_id)]
+    resumed = [
+        event async for event in broker.subscribe(generation_id, last_event_id=full[2].entry_id)
+    ]
+
+    assert full[-1].event == "done"
+    assert [event.entry_id for event in resumed] == [event.entry_id for event in full[3:]]
+    assert json.loads(full[-1].data)["text"]
+    assert await broker.owner_of(generation_id) == "1:2"
+    await broker.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("last_event_id", ["abc", "$", "1-0\n", "+"])
+async def test_malformed_last_event_ids_replay_from_the_start(
+    fake_redis, make_client, last_event_id
+) -> None:
+    """Ensure a client-supplied id that is not an entry id never reaches XREAD."""
+    broker = StreamBroker(fake_redis, block_ms=200)
+    generation_id = await broker.publish(
+        make_client(_adapters()).text.stream(_request()), owner="1:2"
+    )
+
+    full = [event async for event in broker.subscribe(generation_id)]
+    replayed = [
+        event async for event in broker.subscribe(generation_id, last_event_id=last_event_id)
+    ]
+
+    assert [event.entry_id for event in replayed] == [event.entry_id for event in full]
+    await broker.aclose()
+
+
+@pytest.mark.asyncio
+async def test_producer_survives_subscriber_leaving_and_records_routing_errors(
+    fake_redis, make_client
+) -> None:
+    """Ensure dropping a subscriber keeps the generation running and errors are stored."""
+    client = make_client(_adapters())
+    broker = StreamBroker(fake_redis, block_ms=200)
+    generation_id = await broker.publish(client.text.stream(_request()), owner="1:2")
+
+    subscription = broker.subscribe(generation_id)
+    await anext(subscription)
+    await subscription.aclose()
+    late = [event async for event in broker.subscribe(generation_id)]
+
+    failed_id = await broker.publish(client.text.stream(_request(provider="unknown")), owner="1:2")
+    failed = [event async for event in broker.subscribe(failed_id)]
+
+    assert late[-1].event == "done"
+    assert [event.event for event in failed] == ["error"]
+    await broker.aclose()
+
+
+@pytest.mark.asyncio
+async def test_producer_closes_upstream_when_redis_rejects_appends(fake_redis, make_client) -> None:
+    """Ensure a Redis failure ends the producer quietly and closes the SDK stream."""
+    closed = asyncio.Event()
+
+    async def events():
+        try:
+            async for event in make_client(_adapters()).text.stream(_request()):
+                yield event
+        finally:
+            closed.set()
+
+    fake_redis.failing.add("xadd")
+    broker = StreamBroker(fake_redis, block_ms=200)
+    await broker.publish(events(), owner="1:2")
+    [producer] = broker._producers
+    await producer
+
+    assert closed.is_set()
+    assert producer.exception() is None
+    await broker.aclose()
+
+
+@pytest.mark.asyncio
+async def test_subscribing_to_an_expired_generation_ends_immediately(fake_redis) -> None:
+    """Ensure a generation without a stream or owner key yields nothing."""
+    broker = StreamBroker(fake_redis, block_ms=10)
+
+    events = [event async for event in broker.subscribe("missing")]
+
+    assert events == []
+    assert await broker.owner_of("missing") is None
+    await broker.aclose()
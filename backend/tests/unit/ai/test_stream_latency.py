@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from app.infra.ai.config import AISchedulerSettings, AISettings
+from app.infra.ai.latency import RollingPercentiles
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.requests import TextGenerateRequest, TextMessage
+from app.infra.ai.stream import AIDoneEvent, AIStartEvent, AITextDeltaEvent
+from app.infra.ai.telemetry import AITelemetry
+from app.infra.ai.types import AIFinishReason, AIUsage
+
+
+class _TickingAdapter(ProviderAdapter):
+    """Emit a fixed number of deltas separated by a short sleep."""
+
+    def __init__(self, delay_s: float = 0.002) -> None:
+        self.delay_s = delay_s
+
+    async def stream_text(self, request, model, context):
+        common = {
+            "request_id": context.request_id,
+            "provider": model.provider,
+            "model": model.model_id,
+            "attempt": 0,
+        }
+        yield AIStartEvent(**common)
+        text = ""
+        for token in ("a", "b", "c"):
+            await asyncio.sleep(self.delay_s)
+            text += token
+            yield AITextDeltaEvent(**common, delta=token, text=text)
+        yield AIDoneEvent(
+            **common,
+            text=text,
+            finish_reason=AIFinishReason.STOP,
+            usage=AIUsage.from_counts(input_tokens=1, output_tokens=3),
+        )
+
+
+def test_rolling_percentiles_use_nearest_rank() -> None:
+    """Ensure percentile queries only consider the bounded recent window."""
+    window = RollingPercentiles(window_size=4)
+    window.extend([100.0, 1.0, 2.0, 3.0, 4.0])
+
+    assert len(window) == 4
+    assert window.percentile(0.5) == 2.0
+    assert window.snapshot((0.5, 0.99)) == {"p50": 2.0, "p99": 4.0}
+
+
+@pytest.mark.asyncio
+async def test_stream_text_records_per_model_latency_percentiles(make_client) -> None:
+    """Ensure streaming attempts feed TTFT, gap, and throughput windows for the model."""
+    settings = AISettings()
+    telemetry = AITelemetry(settings)
+    client = make_client({"fake": _TickingAdapter()}, telemetry=telemetry)
+
+    events = [
+        event
+        async for event in client.text.stream(
+            TextGenerateRequest(
+                provider="fake",
+                model="m",
+                messages=[TextMessage(role="user", content="hi")],
+            )
+        )
+    ]
+
+    assert events[-1].event == "done"
+    stats = telemetry.stream_latency_percentiles(provider="fake", model="m")
+    assert set(stats["ttft_ms"]) == {"p50", "p90", "p99"}
+    assert stats["inter_delta_ms"]["p50"] > 0
+    assert stats["output_tokens_per_second"]["p50"] > 0
+
+
+@pytest.mark.asyncio
+async def test_consumers_that_stop_at_done_still_record_throughput(make_client) -> None:
+    """Ensure closing the stream right after ``done`` keeps the attempt's measurements."""
+    telemetry = AITelemetry(AISettings())
+    client = make_client({"fake": _TickingAdapter()}, telemetry=telemetry)
+    request = TextGenerateRequest(
+        provider="fake", model="m", messages=[TextMessage(role="user", content="hi")]
+    )
+
+    async with aclosing(client.text.stream(request)) as stream:
+        async for event in stream:
+            if event.event == "done":
+                break
+
+    stats = telemetry.stream_latency_percentiles(provider="fake", model="m")
+    assert stats["output_tokens_per_second"]["p50"] > 0
+
+
+@pytest.mark.asyncio
+async def test_ttft_excludes_the_wait_for_a_provider_slot(make_client) -> None:
+    """Ensure a stream queued behind the scheduler does not count its wait as TTFT."""
+    settings = AISettings(
+        scheduler=AISchedulerSettings(enabled=True, max_concurrency_per_provider=1)
+    )
+    telemetry = AITelemetry(settings)
+    client = make_client(
+        {"fake": _TickingAdapter(delay_s=0.02)}, settings=settings, telemetry=telemetry
+    )
+    request = TextGenerateRequest(
+        provider="fake", model="m", messages=[TextMessage(role="user", content="hi")]
+    )
+
+    async def consume() -> None:
+        async for _ in client.text.stream(request):
+            pass
+
+    await asyncio.gather(consume(), consume())
+
+    stats = telemetry.stream_latency_percentiles(provider="fake", model="m")
+    assert stats["ttft_ms"]["p99"] < 50
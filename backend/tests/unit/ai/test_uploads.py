@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.infra.ai.exceptions import AIUnsupportedCapabilityError
+from app.infra.ai.providers.anthropic import AnthropicProviderAdapter
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.providers.gemini import GeminiProviderAdapter
+from app.infra.ai.providers.mock import MockProfile
+from app.infra.ai.providers.mock.server import create_standin_app
+from app.infra.ai.providers.openai import OpenAICompatibleProviderAdapter
+from app.infra.ai.requests import FilePart, ImagePart, TextGenerateRequest, TextMessage
+from app.infra.ai.types import AICapability, AIModality, ModelSpec
+from app.infra.ai.uploads import UploadCache
+
+BASE_URLS = {
+    "openai": "http://standin/openai/v1",
+    "anthropic": "http://standin/anthropic/v1",
+    "gemini": "http://standin/gemini/v1beta",
+}
+ADAPTERS = {
+    "openai": OpenAICompatibleProviderAdapter,
+    "anthropic": AnthropicProviderAdapter,
+    "gemini": GeminiProviderAdapter,
+}
+IMAGE = b"\x89PNG" + bytes(range(256)) * 4
+
+
+class _RecordingTransport(httpx.AsyncBaseTransport):
+    """Forward to the stand-in while keeping every request."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self.inner = inner
+        self.requests: list[httpx.Request] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        self.requests.append(request)
+        return await self.inner.handle_async_request(request)
+
+
+def _standin(
+    provider: str, uploads: UploadCache | None, app: FastAPI | None = None
+) -> tuple[ProviderAdapter, _RecordingTransport, FastAPI]:
+    app = app or create_standin_app(MockProfile(output_tokens=2))
+    transport = _RecordingTransport(httpx.ASGITransport(app=app))
+    adapter = ADAPTERS[provider](
+        default_timeout_ms=1000,
+        http_client=httpx.AsyncClient(transport=transport),
+        uploads=uploads,
+    )
+    return adapter, transport, app
+
+
+def _request(provider: str, *parts) -> TextGenerateRequest:
+    return TextGenerateRequest(
+        provider=provider,
+        model="m",
+        messages=[TextMessage(role="user", content="Describe this.", parts=list(parts))],
+    )
+
+
+def _message_bodies(transport: _RecordingTransport) -> list[dict]:
+    return [
+        json.loads(request.content)
+        for request in transport.requests
+        if "files" not in request.url.path
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("provider", ["anthropic", "gemini"])
+async def test_large_images_upload_once_and_are_referenced(provider: str, make_client) -> None:
+    """Ensure a repeated large image is uploaded once and later requests reference it."""
+    adapter, transport, app = _standin(provider, UploadCache(min_bytes=1024))
+    client = make_client({provider: adapter}, base_url=BASE_URLS[provider])
+    image = ImagePart(data=IMAGE, mime_type="image/png")
+
+    await client.text.generate(_request(provider, image))
+    events = [event.event async for event in client.text.stream(_request(provider, image))]
+    await client.aclose()
+
+    assert events[-1] == "done"
+    assert len(app.state.uploads) == 1
+    bodies = _message_bodies(transport)
+    assert len(bodies) == 2
+    for body in bodies:
+        if provider == "anthropic":
+            block = body["messages"][0]["content"][1]
+            assert block == {
+                "type": "image",
+                "source": {"type": "file", "file_id": app.state.uploads[0]},
+            }
+        else:
+            part = body["contents"][0]["parts"][1]
+            assert part["fileData"]["fileUri"].endswith(app.state.uploads[0])
+    if provider == "anthropic":
+        message_requests = [r for r in transport.requests if r.url.path.endswith("/messages")]
+        assert all("files-api" in r.headers["anthropic-beta"] for r in message_requests)
+
+
+@pytest.mark.asyncio
+async def test_openai_uploads_files_and_keeps_images_and_small_files_inline(make_client) -> None:
+    """Ensure chat completions reference large files by id while images stay data URLs."""
+    adapter, transport, app = _standin("openai", UploadCache(min_bytes=1024))
+    client = make_client({"openai": adapter}, base_url=BASE_URLS["openai"])
+
+    await client.text.generate(
+        _request(
+            "openai",
+            ImagePart(data=IMAGE, mime_type="image/png"),
+            FilePart(data=b"%PDF" * 512, mime_type="application/pdf", filename="report.pdf"),
+            FilePart(data=b"%PDF-small", mime_type="application/pdf"),
+        )
+    )
+    await client.aclose()
+
+    [body] = _message_bodies(transport)
+    text, image, large, small = body["messages"][0]["content"]
+    assert text == {"type": "text", "text": "Describe this."}
+    assert image["image_url"]["url"].startswith("data:image/png;base64,")
+    assert large == {"type": "file", "file": {"file_id": app.state.uploads[0]}}
+    assert small["file"]["file_data"].startswith("data:application/pdf;base64,")
+    assert len(app.state.uploads) == 1
+
+
+@pytest.mark.asyncio
+async def test_catalog_models_without_vision_reject_images(make_client) -> None:
+    """Ensure images sent to a text-only catalog model fail before any provider call."""
+    spec = ModelSpec(
+        alias="text-only",
+        provider="anthropic",
+        model_id="m",
+        capabilities=(AICapability.TEXT_GENERATION,),
+        input_modalities=(AIModality.TEXT,),
+        output_modalities=(AIModality.TEXT,),
+    )
+    adapter, transport, _ = _standin("anthropic", None)
+    client = make_client({"anthropic": adapter}, base_url=BASE_URLS["anthropic"], models=(spec,))
+
+    with pytest.raises(AIUnsupportedCapabilityError):
+        await client.text.generate(
+            _request("anthropic", ImagePart(url="https://x/a.png", mime_type="image/png"))
+        )
+    await client.aclose()
+
+    assert transport.requests == []
+
+
+@pytest.mark.asyncio
+async def test_workers_share_references_and_upload_again_without_redis(
+    fake_redis, make_client
+) -> None:
+    """Ensure references stored in Redis are reused and an outage only costs an upload."""
+    image = ImagePart(data=IMAGE, mime_type="image/png")
+    app = create_standin_app(MockProfile(output_tokens=2))
+    for failing in (set(), set(), {"execute", "set"}):
+        fake_redis.failing = failing
+        adapter, _, _ = _standin("anthropic", UploadCache(fake_redis, min_bytes=1024), app)
+        client = make_client({"anthropic": adapter}, base_url=BASE_URLS["anthropic"])
+        response = await client.text.generate(_request("anthropic", image))
+        await client.aclose()
+        assert response.text
+
+    assert len(app.state.uploads) == 2
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.infra.ai.warmup import ConnectionWarmer, DNSCache, WarmupTarget, build_provider_transport
+
+
+async def _serve_keepalive(connections: list[str]) -> asyncio.Server:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connections.append(str(writer.get_extra_info("peername")))
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 204 No Content\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+
+    async def guarded(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await handle(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    return await asyncio.start_server(guarded, "127.0.0.1", 0)
+
+
+@pytest.mark.asyncio
+async def test_dns_cache_serves_stale_entries_while_refreshing() -> None:
+    """Ensure only cold misses wait for the resolver and concurrent misses share one query."""
+    calls: list[str] = []
+    release = asyncio.Event()
+
+    async def resolve(host: str, port: int) -> list[str]:
+        calls.append(host)
+        await release.wait()
+        return [f"10.0.0.{len(calls)}"]
+
+    cache = DNSCache(ttl_s=0.0, resolve=resolve)
+    first = [asyncio.create_task(cache.resolve("api.test", 443)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*first) == [["10.0.0.1"]] * 3
+
+    # The entry already expired (ttl 0): it is returned immediately and refreshed behind.
+    release.clear()
+    assert await cache.resolve("api.test", 443) == ["10.0.0.1"]
+    release.set()
+    await asyncio.sleep(0.01)
+    assert await cache.resolve("api.test", 443) == ["10.0.0.2"]
+    assert await cache.resolve("127.0.0.1", 443) == ["127.0.0.1"]
+    assert calls.count("api.test") >= 2
+
+
+@pytest.mark.asyncio
+async def test_provider_transport_reuses_warm_connections_via_cached_dns() -> None:
+    """Ensure warmed connections are reused and hosts resolve through the cache."""
+    connections: list[str] = []
+    server = await _serve_keepalive(connections)
+    port = server.sockets[0].getsockname()[1]
+    lookups: list[str] = []
+
+    async def resolve(host: str, port: int) -> list[str]:
+        lookups.append(host)
+        return ["127.0.0.1"]
+
+    cache = DNSCache(ttl_s=60.0, resolve=resolve)
+    client = httpx.AsyncClient(transport=build_provider_transport(cache))
+    warmer = ConnectionWarmer(
+        [WarmupTarget("openai", f"http://provider.test:{port}/v1", client)],
+        connections_per_provider=2,
+        ping_interval_s=0,
+    )
+    try:
+        assert await warmer.warm() == {"openai": 2}
+        for _ in range(3):
+            response = await client.get(f"http://provider.test:{port}/v1/models")
+            assert response.status_code == 204
+    finally:
+        await client.aclose()
+        server.close()
+        await server.wait_closed()
+
+    assert len(connections) == 2
+    assert lookups == ["provider.test"]
+
+
+@pytest.mark.asyncio
+async def test_warmer_pings_on_interval_and_tolerates_failures() -> None:
+    """Ensure keep-alive rounds repeat and an unreachable provider does not stop them."""
+    heads: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "down.test":
+            raise httpx.ConnectError("unreachable", request=request)
+        heads.append(request.method)
+        return httpx.Response(401)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    warmer = ConnectionWarmer(
+        [
+            WarmupTarget("openai", "https://up.test/v1", client),
+            WarmupTarget("gemini", "https://down.test/v1", client),
+        ],
+        connections_per_provider=2,
+        ping_interval_s=0.01,
+    )
+    await warmer.start()
+    await asyncio.sleep(0.05)
+    await warmer.stop()
+
+    assert set(heads) == {"HEAD"}
+    assert len(heads) >= 4
+    assert await warmer.warm() == {"openai": 2, "gemini": 0}
+
+
+@pytest.mark.asyncio
+async def test_provider_transport_honours_proxy_environment(monkeypatch) -> None:
+    """Ensure proxied hosts go through HTTP_PROXY while NO_PROXY hosts use cached DNS."""
+    connections: list[str] = []
+    server = await _serve_keepalive(connections)
+    port = server.sockets[0].getsockname()[1]
+    lookups: list[str] = []
+
+    async def resolve(host: str, port: int) -> list[str]:
+        lookups.append(host)
+        return ["127.0.0.1"]
+
+    monkeypatch.setenv("HTTP_PROXY", f"http://127.0.0.1:{port}")
+    monkeypatch.setenv("NO_PROXY", "direct.test")
+    client = httpx.AsyncClient(
+        transport=build_provider_transport(DNSCache(ttl_s=60.0, resolve=resolve))
+    )
+    try:
+        assert (await client.get("http://proxied.test/v1/models")).status_code == 204
+        assert (await client.get(f"http://direct.test:{port}/v1/models")).status_code == 204
+    finally:
+        await client.aclose()
+        server.close()
+        await server.wait_closed()
+
+    assert lookups == ["direct.test"]
+    assert len(connections) == 2
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from time import perf_counter
+
+import httpx
+import pytest
+
+from app.infra.ai.client import AIClient
+from app.infra.ai.config import AISettings
+from app.infra.ai.providers.anthropic import AnthropicProviderAdapter
+from app.infra.ai.providers.base import ProviderAdapter
+from app.infra.ai.providers.openai import OpenAICompatibleProviderAdapter
+from app.infra.ai.registry import ModelRegistry
+from app.infra.ai.requests import TextGenerateRequest, TextMessage
+from app.infra.ai.responses import TextGenerateResponse
+from app.infra.ai.telemetry import AITelemetry
+from app.infra.ai.types import AIFinishReason, ProviderConfig, ToolCall
+from app.infra.tools import ToolAgent, ToolExecutor, ToolRegistry
+
+
+def _client(name: str, adapter: ProviderAdapter) -> AIClient:
+    settings = AISettings()
+    return AIClient(
+        registry=ModelRegistry(
+            providers=[
+                ProviderConfig(
+                    name=name,
+                    api_key="key",
+                    base_url="http://fake",
+                    timeout_ms=1000,
+                    max_retries=0,
+                    backoff_base_ms=0,
+                )
+            ]
+        ),
+        adapters={name: adapter},
+        telemetry=AITelemetry(settings),
+        settings=settings,
+    )
+
+
+def _registry() -> ToolRegistry:
+    registry = ToolRegistry()
+
+    @registry.tool(max_concurrency=1)
+    async def weather(city: str) -> dict:
+        """Look up the weather."""
+        await asyncio.sleep(0.05)
+        return {"city": city, "temp_c": 21}
+
+    @registry.tool(timeout_s=0.05)
+    async def slow() -> str:
+        """Never finish in time."""
+        await asyncio.sleep(1)
+        return "late"
+
+    @registry.tool()
+    def clock() -> str:
+        """Read the clock from a worker thread."""
+        return "12:00"
+
+    return registry
+
+
+class _ScriptedAdapter(ProviderAdapter):
+    """Ask for tools on the first turn and answer once results arrive."""
+
+    def __init__(self) -> None:
+        self.requests: list[TextGenerateRequest] = []
+        self.idempotency_keys: list[str | None] = []
+
+    async def generate_text(self, request, model, context):
+        self.requests.append(request)
+        self.idempotency_keys.append(context.idempotency_key)
+        first_turn = request.messages[-1].role == "user"
+        calls = [
+            ToolCall(id="a", name="clock"),
+            ToolCall(id="b", name="slow"),
+            ToolCall(id="c", name="missing"),
+        ]
+        return TextGenerateResponse(
+            request_id=context.request_id,
+            provider=model.provider,
+            model=model.model_id,
+            resolved_provider=model.provider,
+            resolved_model=model.model_id,
+            latency_ms=0,
+            text="" if first_turn else "done",
+            finish_reason=AIFinishReason.TOOL_USE if first_turn else AIFinishReason.STOP,
+            tool_calls=calls if first_turn else [],
+        )
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_calls_concurrently_within_caps() -> None:
+    """Ensure calls overlap, per-tool caps serialize, and failures become results."""
+    executor = ToolExecutor(_registry())
+
+    started = perf_counter()
+    results = await executor.execute(
+        [ToolCall(id="1", name="slow"), ToolCall(id="2", name="clock")]
+        + [ToolCall(id=f"w{i}", name="weather", arguments={"city": "Oslo"}) for i in range(2)]
+    )
+    elapsed = perf_counter() - started
+
+    assert [result.call.id for result in results] == ["1", "2", "w0", "w1"]
+    assert results[0].is_error and "timed out" in results[0].content
+    assert results[1].content == "12:00"
+    assert json.loads(results[2].content) == {"city": "Oslo", "temp_c": 21}
+    assert 0.1 <= elapsed < 0.3
+    assert set(executor.latency_snapshot()) == {"slow", "clock", "weather"}
+
+
+@pytest.mark.asyncio
+async def test_agent_sends_all_results_in_one_follow_up() -> None:
+    """Ensure one tool turn produces exactly one follow-up request with every result."""
+    adapter = _ScriptedAdapter()
+    agent = ToolAgent(_client("fake", adapter), _registry())
+
+    result = await agent.run(
+        TextGenerateRequest(
+            provider="fake", model="m", messages=[TextMessage(role="user", content="time?")]
+        )
+    )
+
+    assert result.response.text == "done"
+    assert result.turns == 2
+    assert len(adapter.requests) == 2
+    assert {tool.name for tool in adapter.requests[0].tools} == {"weather", "slow", "clock"}
+    follow_up = adapter.requests[1].messages
+    assert follow_up[1].tool_calls[0].name == "clock"
+    assert [(m.role, m.tool_call_id, m.content) for m in follow_up[2:]][0] == ("tool", "a", "12:00")
+    assert [m.tool_call_id for m in follow_up[2:]] == ["a", "b", "c"]
+    assert follow_up[4].content.startswith("Unknown tool")
+
+
+@pytest.mark.asyncio
+async def test_agent_derives_one_idempotency_key_per_turn() -> None:
+    """Ensure each model turn sends its own idempotency key instead of reusing the caller's."""
+    adapter = _ScriptedAdapter()
+    agent = ToolAgent(_client("fake", adapter), _registry())
+
+    result = await agent.run(
+        TextGenerateRequest(
+            provider="fake",
+            model="m",
+            idempotency_key="run-1",
+            messages=[TextMessage(role="user", content="time?")],
+        )
+    )
+
+    assert result.turns == 2
+    assert adapter.idempotency_keys == ["run-1:1", "run-1:2"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("provider", ["openai", "anthropic"])
+async def test_adapters_map_tool_calls_both_ways(provider: str) -> None:
+    """Ensure provider wire formats round-trip through the common tool-call shape."""
+    sent: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(json.loads(request.content))
+        if provider == "openai":
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": "call_1",
+                        "type": "function",
+                        "function": {"name": "weather", "arguments": '{"city": "Oslo"}'},
+                    }
+                ],
+            }
+            body = {"choices": [{"message": message, "finish_reason": "tool_calls"}]}
+        else:
+            body = {
+                "content": [
+                    {
+                        "type": "tool_use",
+                        "id": "call_1",
+                        "name": "weather",
+                        "input": {"city": "Oslo"},
+                    }
+                ],
+                "stop_reason": "tool_use",
+            }
+        return httpx.Response(200, json=body)
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    adapter_cls = (
+        OpenAICompatibleProviderAdapter if provider == "openai" else AnthropicProviderAdapter
+    )
+    client = _client(provider, adapter_cls(default_timeout_ms=1000, http_client=http_client))
+    registry = _registry()
+    call = ToolCall(id="call_0", name="clock")
+
+    response = await client.text.generate(
+        TextGenerateRequest(
+            provider=provider,
+            model="m",
+            tools=registry.definitions(),
+            messages=[
+                TextMessage(role="user", content="weather?"),
+                TextMessage(role="assistant", tool_calls=[call]),
+                TextMessage(role="tool", tool_call_id="call_0", content="12:00"),
+            ],
+        )
+    )
+
+    assert response.finish_reason == AIFinishReason.TOOL_USE
+    assert response.tool_calls == [
+        ToolCall(id="call_1", name="weather", arguments={"city": "Oslo"})
+    ]
+    payload = sent[0]
+    if provider == "openai":
+        assert payload["tools"][0]["function"]["name"] == "weather"
+        assert payload["messages"][1]["tool_calls"][0]["function"]["arguments"] == "{}"
+        assert payload["messages"][2] == {
+            "role": "tool",
+            "tool_call_id": "call_0",
+            "content": "12:00",
+        }
+    else:
+        assert payload["tools"][0]["input_schema"] == {"type": "object", "properties": {}}
+        assert payload["messages"][1]["content"][0]["type"] == "tool_use"
+        assert payload["messages"][2]["content"][0]["tool_use_id"] == "call_0"
+
+
+@pytest.mark.asyncio
+async def test_calls_queued_behind_a_capped_tool_leave_global_slots_free() -> None:
+    """Ensure waiting for a per-tool slot does not occupy an executor-wide slot."""
+    registry = ToolRegistry()
+    started: dict[str, float] = {}
+
+    @registry.tool(max_concurrency=1)
+    async def serial(n: int) -> int:
+        """Run one at a time."""
+        await asyncio.sleep(0.05)
+        return n
+
+    @registry.tool()
+    async def quick() -> str:
+        """Record when it started."""
+        started["quick"] = perf_counter()
+        return "ok"
+
+    executor = ToolExecutor(registry, max_concurrency=2)
+    began = perf_counter()
+    results = await executor.execute(
+        [ToolCall(id=f"s{i}", name="serial", arguments={"n": i}) for i in range(3)]
+        + [ToolCall(id="q", name="quick")]
+    )
+
+    assert [result.content for result in results] == ["0", "1", "2", "ok"]
+    assert started["quick"] - began < 0.04